@@ -0,0 +1,151 @@
+"""
+Generación de atributos AD&D 2e (Manual del Jugador, capítulo 1)
+
+Los dados se tiran por bloques: un solo random_bytes() para todas las tiradas
+de d6 que hacen falta, descartando los bytes 252-255 para que las seis caras
+sigan siendo equiprobables. Así una tirada de seis atributos es una llamada
+al generador en vez de 18-36 llamadas a randint().
+
+attribute_matrix() genera N filas de seis atributos de una vez y
+qualification_rates() calcula qué fracción cumple los requisitos de cada
+clase, para estadísticas y para el generador masivo de PNJ.
+
+Sin `rng` se usa el flujo 'atributos' de la sesión (core/azar.py) y cada
+lote es un evento numerado del flujo, repetible con seek().
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .azar import face_table, random_bytes, stream
+from .esquema import ATTRIBUTE_KEYS
+
+
+# Tabla de traducción byte -> cara del d6 (252 = 6 * 42, el resto se descarta)
+_D6_FACES, _D6_REJECTED = face_table(6)
+
+
+def d6_batch(count: int, rng=None) -> bytes:
+    """`count` tiradas de d6 (valores 1-6) en un bloque de bytes"""
+    if rng is None:
+        rng = stream('atributos')
+        rng.advance()
+    rolls = b''
+    while len(rolls) < count:
+        missing = count - len(rolls)
+        # ~1.6% de bytes descartados: se pide un poco más para no repetir
+        rolls += random_bytes(rng, missing + (missing >> 5) + 4).translate(_D6_FACES, _D6_REJECTED)
+    return rolls[:count]
+
+
+# Dados por fila de seis atributos en cada método
+DICE_PER_ROW = {1: 18, 2: 36, 3: 18, 4: 24}
+
+
+def attribute_matrix(method: int, count: int, rng=None) -> List[Tuple[int, ...]]:
+    """
+    Matriz (count, 6) de atributos con el método indicado, con todos los
+    dados de la matriz tirados en un único bloque
+    """
+    if method not in DICE_PER_ROW:
+        raise ValueError(f"Método de atributos no válido: {method}")
+    rolls = d6_batch(count * DICE_PER_ROW[method], rng)
+
+    if method == 4:
+        scores = [a + b + c + d - min(a, b, c, d)
+                  for a, b, c, d in zip(rolls[0::4], rolls[1::4], rolls[2::4], rolls[3::4])]
+    else:
+        scores = [a + b + c for a, b, c in zip(rolls[0::3], rolls[1::3], rolls[2::3])]
+    if method == 2:
+        # 12 tiradas por fila, se quedan las 6 mejores
+        return [tuple(sorted(scores[i:i + 12], reverse=True)[:6])
+                for i in range(0, len(scores), 12)]
+    return list(zip(*[iter(scores)] * 6))
+
+
+def _threshold(minimum: int) -> bytes:
+    """Tabla de traducción: puntuación -> 1 si llega al mínimo, 0 si no"""
+    return bytes(score >= minimum for score in range(256))
+
+
+def qualification_rates(classes: Dict[str, Dict], matrix: Sequence[Sequence[int]],
+                        adjustments: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+    """
+    Fracción de filas de `matrix` que cumplen los requisitos de cada clase
+    (classes en el formato de ADnDDataLoader.classes: {'requisitos': {'FUE': 9}}).
+    adjustments: ajustes raciales ({'CON': 1, 'CAR': -1}) aplicados antes de comparar.
+
+    Cada columna se guarda como bytes y cada requisito se convierte con
+    translate() en una máscara de 0/1 por fila; las máscaras, leídas como
+    enteros, se combinan con & y se cuentan los bytes a 1 del resultado.
+    """
+    if not matrix:
+        return {name: 0.0 for name in classes}
+    columns = {}
+    for attr, column in zip(ATTRIBUTE_KEYS, zip(*matrix)):
+        column = bytes(column)
+        shift = (adjustments or {}).get(attr, 0)
+        if shift:
+            column = column.translate(bytes(min(255, max(0, score + shift)) for score in range(256)))
+        columns[attr] = column
+
+    masks: Dict[Tuple[str, int], int] = {}
+    everyone = int.from_bytes(bytes([1]) * len(matrix), 'little')
+    rates = {}
+    for name, data in classes.items():
+        qualified = everyone
+        for attr, minimum in (data.get('requisitos') or {}).items():
+            if attr not in columns:
+                continue
+            key = (attr, minimum)
+            if key not in masks:
+                masks[key] = int.from_bytes(columns[attr].translate(_threshold(minimum)), 'little')
+            qualified &= masks[key]
+        rates[name] = qualified.to_bytes(len(matrix), 'little').count(1) / len(matrix)
+    return rates
+
+
+class AttributeGenerator:
+    """Genera atributos según las reglas de AD&D 2e"""
+
+    @staticmethod
+    def roll_3d6(rng=None):
+        """Método estándar: 3d6"""
+        return sum(d6_batch(3, rng))
+
+    @staticmethod
+    def roll_4d6_drop_lowest(rng=None):
+        """Método heroico: 4d6, descarta el más bajo"""
+        rolls = d6_batch(4, rng)
+        return sum(rolls) - min(rolls)
+
+    @staticmethod
+    def method_1(rng=None) -> List[int]:
+        """Método 1: Tirar 3d6 seis veces, asignar en orden"""
+        return list(attribute_matrix(1, 1, rng)[0])
+
+    @staticmethod
+    def method_2(rng=None) -> List[int]:
+        """Método 2: Tirar 3d6 doce veces, escoger los mejores 6"""
+        return list(attribute_matrix(2, 1, rng)[0])
+
+    @staticmethod
+    def method_3(rng=None) -> List[int]:
+        """Método 3: Tirar 3d6 seis veces, asignar donde se desee"""
+        return list(attribute_matrix(3, 1, rng)[0])
+
+    @staticmethod
+    def method_4(rng=None) -> List[int]:
+        """Método 4 (Heroico): 4d6 descartando el más bajo, seis veces"""
+        return list(attribute_matrix(4, 1, rng)[0])
+
+    # Versiones por lotes
+    matrix = staticmethod(attribute_matrix)
+    qualification_rates = staticmethod(qualification_rates)
+
+
+METHODS = {
+    1: AttributeGenerator.method_1,
+    2: AttributeGenerator.method_2,
+    3: AttributeGenerator.method_3,
+    4: AttributeGenerator.method_4,
+}
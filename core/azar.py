@@ -0,0 +1,377 @@
+"""
+Generadores aleatorios con contador, reproducibles y posicionables
+
+Cada flujo (CounterStream) tiene una clave derivada de la semilla de la
+sesión y de su nombre ('dados', 'atributos', 'encuentros', 'combate/Orco 1'...).
+Los números del evento N salen de BLAKE2b(clave, N, bloque), así que:
+
+    - ningún otro código que use `random` altera las tiradas de la sesión
+    - cualquier tirada se puede repetir sabiendo semilla, flujo y número
+    - un flujo se puede guardar (tell), restaurar (seek) y dividir entre
+      varios trabajadores (spawn/split) sin que sus secuencias se solapen
+
+CounterStream hereda de random.Random: randint, choice, shuffle...
+funcionan igual y se puede pasar donde el código espera un `rng`. También
+tiene randbytes() (en random.Random sólo desde Python 3.9); random_bytes()
+sirve para cualquier generador.
+
+El servicio de la sesión se obtiene con get_rng_service() y se sustituye con
+set_rng_service(), igual que el destino de eventos por defecto. La
+semilla de la sesión se puede fijar con la variable de entorno ADND_SEED.
+"""
+
+import hashlib
+import os
+import random
+import struct
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+BLOCK_BITS = 512  # BLAKE2b con digest de 64 bytes
+_BLOCK_BYTES = BLOCK_BITS // 8
+_PERSON = b'adnd2e-rng'
+_COUNTER = struct.Struct('<QQ')  # (evento, bloque)
+
+Seed = Union[int, str, bytes]
+
+
+def _seed_bytes(seed: Seed) -> bytes:
+    if isinstance(seed, bytes):
+        return seed
+    return str(seed).encode('utf-8')
+
+
+def derive_key(seed: Seed, *labels: str) -> bytes:
+    """Clave de 32 bytes a partir de una semilla y una ruta de nombres"""
+    digest = hashlib.blake2b(_seed_bytes(seed), digest_size=32, person=_PERSON)
+    for label in labels:
+        digest.update(b'\x00' + label.encode('utf-8'))
+    return digest.digest()
+
+
+class CounterStream(random.Random):
+    """
+    Flujo aleatorio basado en contador.
+    Los números se agrupan en eventos numerados (una tirada de dados = un
+    evento): advance() empieza el siguiente y seek(n) vuelve al inicio del
+    evento n, independientemente de cuántos números consumió cada evento.
+    """
+
+    def __new__(cls, seed: Optional[Seed] = None, name: str = ''):
+        # Antes de Python 3.11, random.Random.__new__ sólo admite la semilla
+        return super().__new__(cls)
+
+    def __init__(self, seed: Optional[Seed] = None, name: str = ''):
+        self.name = name
+        super().__init__(seed)  # llama a self.seed()
+
+    def seed(self, a: Optional[Seed] = None, version: int = 2):
+        """Deriva la clave del flujo (semilla aleatoria del sistema si no se indica)"""
+        self._set_key(derive_key(os.urandom(32) if a is None else a, self.name))
+        self.seek(0)
+
+    def _set_key(self, key: bytes):
+        self._key = key
+        # Copiar un hash ya inicializado con la clave es más barato que crearlo cada vez
+        self._hasher = hashlib.blake2b(key=key, digest_size=_BLOCK_BYTES)
+
+    @classmethod
+    def from_key(cls, key: bytes, name: str = '') -> 'CounterStream':
+        stream = cls.__new__(cls)
+        stream.name = name
+        stream.gauss_next = None
+        stream._set_key(key)
+        stream.seek(0)
+        return stream
+
+    # ------------------------------------------------------------------
+    # Posición
+    # ------------------------------------------------------------------
+
+    @property
+    def position(self) -> int:
+        """Número del evento actual"""
+        return self._event
+
+    def advance(self) -> int:
+        """Empieza el siguiente evento y devuelve su número"""
+        self._event += 1
+        self._block = self._buffer = self._bits = 0
+        self.gauss_next = None
+        return self._event
+
+    def seek(self, event: int, offset: int = 0):
+        """Se sitúa en el evento `event`, tras `offset` bits ya consumidos"""
+        if event < 0 or offset < 0:
+            raise ValueError("La posición no puede ser negativa")
+        self._event = event
+        self._block, skipped = divmod(offset, BLOCK_BITS)
+        self._buffer = 0
+        self._bits = 0
+        self.gauss_next = None
+        if skipped:
+            self.getrandbits(skipped)
+
+    def tell(self) -> Tuple[int, int]:
+        """Posición exacta (evento, bits consumidos del evento) para seek()"""
+        return self._event, self._block * BLOCK_BITS - self._bits
+
+    def at(self, event: int) -> 'CounterStream':
+        """Copia independiente situada en el evento `event` (para repetir tiradas)"""
+        stream = CounterStream.from_key(self._key, self.name)
+        stream.seek(event)
+        return stream
+
+    def spawn(self, label: str) -> 'CounterStream':
+        """Flujo hijo con clave propia: no se solapa con el padre ni con otros hijos"""
+        name = f"{self.name}/{label}" if self.name else label
+        return CounterStream.from_key(derive_key(self._key, label), name)
+
+    # ------------------------------------------------------------------
+    # Interfaz de random.Random
+    # ------------------------------------------------------------------
+
+    def _blocks(self, count: int) -> bytes:
+        """Los `count` bloques siguientes del evento actual"""
+        event, first = self._event, self._block
+        self._block += count
+        blocks = []
+        for block in range(first, first + count):
+            hasher = self._hasher.copy()
+            hasher.update(_COUNTER.pack(event, block))
+            blocks.append(hasher.digest())
+        return b''.join(blocks)
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k > self._bits:
+            if k - self._bits <= BLOCK_BITS:
+                # Caso habitual (dados, choice): un solo bloque, sin listas intermedias
+                hasher = self._hasher.copy()
+                hasher.update(_COUNTER.pack(self._event, self._block))
+                self._block += 1
+                self._buffer |= int.from_bytes(hasher.digest(), 'little') << self._bits
+                self._bits += BLOCK_BITS
+            else:
+                blocks = -(-(k - self._bits) // BLOCK_BITS)
+                self._buffer |= int.from_bytes(self._blocks(blocks), 'little') << self._bits
+                self._bits += blocks * BLOCK_BITS
+        value = self._buffer & ((1 << k) - 1)
+        self._buffer >>= k
+        self._bits -= k
+        return value
+
+    def dice(self, count: int, sides: int) -> List[int]:
+        """
+        `count` dados de `sides` caras. Se piden todos los bits de una vez y
+        se descartan los valores fuera de rango (sin sesgo), en vez de pasar
+        por randint() dado a dado.
+        """
+        if sides < 1:
+            raise ValueError("Un dado necesita al menos una cara")
+        bits = (sides - 1).bit_length()
+        if not bits:
+            return [1] * count
+        mask = (1 << bits) - 1
+        rolls: List[int] = []
+        while len(rolls) < count:
+            # Más de la mitad de los valores son válidos: el doble suele bastar
+            attempts = 2 * (count - len(rolls))
+            pool = self.getrandbits(attempts * bits)
+            for _ in range(attempts):
+                value = pool & mask
+                pool >>= bits
+                if value < sides:
+                    rolls.append(value + 1)
+                    if len(rolls) == count:
+                        break
+        return rolls
+
+    def random(self) -> float:
+        return self.getrandbits(53) * (1.0 / (1 << 53))
+
+    def randbytes(self, n: int) -> bytes:
+        # Igual que random.Random.randbytes de Python 3.9+
+        return self.getrandbits(n * 8).to_bytes(n, 'little')
+
+    def getstate(self):
+        return ('contador', self._key, self.name, self.tell(), self.gauss_next)
+
+    def setstate(self, state):
+        tag, key, self.name, (event, offset), gauss_next = state
+        if tag != 'contador':
+            raise ValueError("Estado de generador no reconocido")
+        self._set_key(key)
+        self.seek(event, offset)
+        self.gauss_next = gauss_next
+
+    def __repr__(self):
+        return f"CounterStream({self.name!r}, evento={self._event})"
+
+
+class RNGService:
+    """Flujos con nombre de una sesión, todos derivados de la misma semilla"""
+
+    def __init__(self, seed: Optional[Seed] = None):
+        # La semilla se guarda siempre para poder reproducir la sesión
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), 'little')
+        self._streams: Dict[str, CounterStream] = {}
+
+    def stream(self, name: str) -> CounterStream:
+        """Flujo `name` de la sesión (se crea la primera vez que se pide)"""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = CounterStream.from_key(derive_key(self.seed, name), name)
+        return stream
+
+    def split(self, name: str, workers: int) -> List[CounterStream]:
+        """Un flujo independiente por trabajador, derivado del flujo `name`"""
+        parent = self.stream(name)
+        return [parent.spawn(str(i)) for i in range(workers)]
+
+    def checkpoint(self) -> Dict:
+        """Semilla y posición de cada flujo (serializable en JSON)"""
+        return {'seed': self.seed,
+                'streams': {name: list(stream.tell()) for name, stream in self._streams.items()}}
+
+    def restore(self, checkpoint: Dict):
+        """Vuelve al estado de un checkpoint() anterior"""
+        self.seed = checkpoint['seed']
+        self._streams = {}
+        for name, (event, offset) in checkpoint['streams'].items():
+            self.stream(name).seek(event, offset)
+
+
+MAX_TABLE_SIDES = 255
+
+
+def random_bytes(rng: random.Random, n: int) -> bytes:
+    """`n` bytes aleatorios de `rng` (randbytes() sin depender de Python 3.9)"""
+    if n <= 0:
+        return b''
+    return rng.getrandbits(n * 8).to_bytes(n, 'little')
+
+
+def face_table(sides: int) -> Tuple[bytes, bytes]:
+    """
+    Tabla de translate() byte -> cara para un dado de `sides` caras (≤ 255:
+    la cara 256 no cabe en un byte) y bytes a descartar: sólo se aceptan los
+    256 - 256 % sides primeros valores, así todas las caras son equiprobables.
+    """
+    if not 1 <= sides <= MAX_TABLE_SIDES:
+        raise ValueError(f"Sólo dados de 1 a {MAX_TABLE_SIDES} caras: d{sides}")
+    limit = 256 - 256 % sides
+    return bytes(b % sides + 1 for b in range(limit)) + bytes(256 - limit), bytes(range(limit, 256))
+
+
+class _FacePool:
+    """Caras ya generadas de un tipo de dado, con recarga anticipada"""
+
+    def __init__(self, stream: CounterStream, sides: int, block_size: int,
+                 executor: Optional[ThreadPoolExecutor]):
+        self.stream = stream
+        self.table, self.rejected = face_table(sides)
+        self.block_size = block_size
+        self.low_water = block_size // 4
+        self.executor = executor
+        self.faces = b''
+        self.index = 0
+        self.pending: Optional[Future] = None
+        self.lock = threading.Lock()
+
+    def _generate(self) -> bytes:
+        # Un evento del flujo por bloque: el orden de las caras no depende de los hilos
+        self.stream.advance()
+        return self.stream.randbytes(self.block_size).translate(self.table, self.rejected)
+
+    def take(self, count: int) -> List[int]:
+        with self.lock:
+            rolls: List[int] = []
+            while count > len(self.faces) - self.index:
+                rolls += self.faces[self.index:]
+                count -= len(self.faces) - self.index
+                self.faces = self.pending.result() if self.pending else self._generate()
+                self.pending = None
+                self.index = 0
+            rolls += self.faces[self.index:self.index + count]
+            self.index += count
+
+            if (self.executor is not None and self.pending is None
+                    and len(self.faces) - self.index < self.low_water):
+                self.pending = self.executor.submit(self._generate)
+            return rolls
+
+
+class FaceBuffer:
+    """
+    Generador de caras con búfer para tiradas masivas o de baja latencia.
+    Cada tipo de dado (d4-d100, hasta d255) tiene su propio flujo hijo y un
+    bloque de caras precalculadas con randbytes() + translate(); cuando queda
+    poco, el siguiente bloque se prepara en un hilo aparte. Los dados de más
+    de 255 caras se tiran directamente con CounterStream.dice().
+
+    Tiene la misma interfaz que usa DiceRoller (advance, dice), pero las
+    tiradas no son eventos individuales: no se pueden repetir con replay().
+    """
+
+    def __init__(self, rng: Optional[CounterStream] = None, block_size: int = 4096,
+                 background: bool = True):
+        self.rng = rng if rng is not None else stream('dados.bufer')
+        self.block_size = block_size
+        self._executor = (ThreadPoolExecutor(max_workers=1, thread_name_prefix='dados')
+                          if background else None)
+        self._pools: Dict[int, _FacePool] = {}
+        self._large = self.rng.spawn('grandes')
+        self.rolls = 0
+
+    def advance(self) -> int:
+        """Cuenta una tirada más (compatibilidad con CounterStream)"""
+        self.rolls += 1
+        return self.rolls
+
+    def dice(self, count: int, sides: int) -> List[int]:
+        """`count` dados de `sides` caras"""
+        pool = self._pools.get(sides)
+        if pool is None:
+            if sides > MAX_TABLE_SIDES:
+                self._large.advance()
+                return self._large.dice(count, sides)
+            pool = self._pools.setdefault(sides, _FacePool(
+                self.rng.spawn(f"d{sides}"), sides, self.block_size, self._executor))
+        return pool.take(count)
+
+    def randint(self, a: int, b: int) -> int:
+        """Entero en [a, b] usando las caras de un dado de b - a + 1 caras"""
+        return a - 1 + self.dice(1, b - a + 1)[0]
+
+    def close(self):
+        """Detiene el hilo de recarga"""
+        if self._executor is not None:
+            for pool in self._pools.values():
+                if pool.pending is not None and pool.pending.cancel():
+                    pool.pending = None
+                pool.executor = None
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# ADND_SEED fija la semilla de la sesión para poder repetirla
+_service = RNGService(os.environ.get('ADND_SEED') or None)
+
+
+def get_rng_service() -> RNGService:
+    return _service
+
+
+def set_rng_service(service: RNGService) -> RNGService:
+    """Cambia el servicio de la sesión y devuelve el anterior"""
+    global _service
+    previous, _service = _service, service
+    return previous
+
+
+def stream(name: str) -> CounterStream:
+    """Atajo: flujo `name` del servicio de la sesión vigente"""
+    return _service.stream(name)
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import List, Dict, Optional, Any
 import re
 
+from .rendimiento import instrument
+
 
 class RuleBook:
     """Base de datos de reglas de AD&D 2e"""
@@ -810,6 +812,7 @@ class RuleBook:
             }
         }
     
+    @instrument('biblio.busqueda')
     def search(self, query: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Búsqueda inteligente en toda la biblioteca
         
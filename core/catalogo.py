@@ -0,0 +1,229 @@
+"""
+Catálogo persistente de personajes AD&D 2e
+Mantiene un índice de los JSON de data/ para no reabrirlos en cada listado
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+INDEX_FILENAME = ".catalogo_personajes.json"
+CHARACTER_PATTERN = "_character.json"
+
+
+class CharacterCatalog:
+    """
+    Índice de personajes guardados, actualizado de forma incremental por mtime.
+    Se puede refrescar desde un hilo de fondo mientras la interfaz lo consulta
+    o actualiza: un lock protege entries y el índice por nombre.
+    """
+
+    def __init__(self, directory, index_file: str = INDEX_FILENAME):
+        self.directory = Path(directory)
+        self.index_path = self.directory / index_file
+        self.entries: Dict[str, Dict] = {}
+        self._by_name: Dict[str, List[str]] = {}  # nombre en minúsculas -> archivos
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # Persistencia del índice
+    # ------------------------------------------------------------------
+
+    def _load_index(self):
+        """Carga el índice guardado en disco (si existe y es válido)"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        entries = data.get('entries') if isinstance(data, dict) else None
+        # Un índice con otra forma se descarta entero: el siguiente refresh lo rehace
+        self.entries = ({k: v for k, v in entries.items() if isinstance(v, dict)}
+                        if isinstance(entries, dict) else {})
+        self._rebuild_name_index()
+
+    def _save_index(self):
+        """Guarda el índice en disco si ha cambiado"""
+        if not self._dirty:
+            return
+        try:
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError:
+            # El catálogo es sólo una caché: si no se puede escribir, seguimos en memoria
+            pass
+
+    def _rebuild_name_index(self):
+        """Nombre -> archivos (varios si el nombre se repite); sin nombre no se indexan"""
+        by_name: Dict[str, List[str]] = {}
+        for filename in sorted(self.entries):
+            name = self.entries[filename].get('name')
+            if isinstance(name, str) and name:
+                by_name.setdefault(name.lower(), []).append(filename)
+        self._by_name = by_name
+
+    # ------------------------------------------------------------------
+    # Actualización incremental
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _summarize(data: Dict, stat: os.stat_result) -> Dict:
+        """
+        Extrae los campos del catálogo de un personaje (formato nuevo o antiguo).
+        No se guarda la ruta: se rehace con el directorio al consultar, así el
+        índice sigue valiendo si data/ se mueve.
+        """
+        hp = data.get('hp')
+        if isinstance(hp, dict):
+            hp_current = hp.get('current', 0)
+            hp_max = hp.get('max', 0)
+        else:
+            hp_current = data.get('hit_points_current', 0)
+            hp_max = data.get('hit_points_max', 0)
+
+        return {
+            'name': data.get('name', 'Desconocido'),
+            'race': data.get('race', 'N/A'),
+            'class': data.get('class', 'N/A'),
+            'level': data.get('level', 1),
+            'hp_current': hp_current,
+            'hp_max': hp_max,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+        }
+
+    def refresh(self) -> List[str]:
+        """
+        Sincroniza el índice con el directorio.
+        Sólo se vuelven a leer los archivos nuevos o cuyo mtime/tamaño cambió.
+        Devuelve la lista de archivos que no se pudieron leer.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> List[str]:
+        errors = []
+        if not self.directory.exists():
+            if self.entries:
+                self.entries = {}
+                self._by_name = {}
+                self._dirty = True
+            return errors
+
+        seen = set()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(CHARACTER_PATTERN) or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                cached = self.entries.get(entry.name)
+                if (cached and cached.get('mtime') == stat.st_mtime_ns
+                        and cached.get('size') == stat.st_size):
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        raise ValueError("no es un objeto JSON")
+                except (OSError, ValueError):
+                    errors.append(entry.name)
+                    if self.entries.pop(entry.name, None) is not None:
+                        self._dirty = True
+                    continue
+                self.entries[entry.name] = self._summarize(data, stat)
+                self._dirty = True
+
+        for filename in list(self.entries):
+            if filename not in seen:
+                del self.entries[filename]
+                self._dirty = True
+
+        if self._dirty:
+            self._rebuild_name_index()
+        self._save_index()
+        return errors
+
+    def poll(self) -> bool:
+        """
+        Sondeo periódico de cambios (sólo stat() salvo en archivos modificados).
+        Devuelve True si el índice cambió.
+        """
+        with self._lock:
+            before = dict((k, v.get('mtime')) for k, v in self.entries.items())
+            self._refresh()
+            after = dict((k, v.get('mtime')) for k, v in self.entries.items())
+        return before != after
+
+    def update_file(self, filepath):
+        """Actualiza la entrada de un único archivo (p.ej. tras guardarlo)"""
+        path = Path(filepath)
+        if path.parent.resolve() != self.directory.resolve():
+            return
+        try:
+            stat = path.stat()
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        with self._lock:
+            self.entries[path.name] = self._summarize(data, stat)
+            self._dirty = True
+            self._rebuild_name_index()
+            self._save_index()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _entry(self, filename: str) -> Dict:
+        """Copia de una entrada con su nombre de archivo y su ruta actual"""
+        return dict(self.entries[filename], filename=filename,
+                    filepath=str(self.directory / filename))
+
+    def list(self) -> List[Dict]:
+        """Entradas ordenadas por nombre de archivo (orden estable para los índices)"""
+        with self._lock:
+            return [self._entry(k) for k in sorted(self.entries)]
+
+    def get_by_index(self, index: int) -> Optional[Dict]:
+        """Entrada por posición (1-based, igual que en /characters)"""
+        items = self.list()
+        if 1 <= index <= len(items):
+            return items[index - 1]
+        return None
+
+    def find_by_name(self, name: str) -> Optional[Dict]:
+        """
+        Busca un personaje por nombre exacto (sin distinguir mayúsculas).
+        Si varios archivos comparten el nombre devuelve el primero por nombre
+        de archivo; find_all_by_name() los da todos.
+        """
+        matches = self.find_all_by_name(name)
+        return matches[0] if matches else None
+
+    def find_all_by_name(self, name: str) -> List[Dict]:
+        """Todos los personajes con ese nombre, ordenados por nombre de archivo"""
+        with self._lock:
+            return [self._entry(filename) for filename in self._by_name.get(name.lower(), ())]
+
+    def duplicate_names(self) -> Dict[str, List[str]]:
+        """Nombres repetidos en varios archivos: {nombre: [archivos]}"""
+        with self._lock:
+            return {name: list(files) for name, files in self._by_name.items() if len(files) > 1}
+
+    def __len__(self):
+        with self._lock:
+            return len(self.entries)
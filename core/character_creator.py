@@ -6,12 +6,24 @@ import re
 import pandas as pd
 import os
 import json
+import copy
 from collections import defaultdict
 import logging
 import pickle
 from pathlib import Path
 import random
 
+from core.atributos import AttributeGenerator
+from core.esquema import load_character_file, to_creator_format
+from core.generador_pnj import DEFAULT_EQUIPMENT, DEFAULT_MONEY, STARTING_EQUIPMENT, STARTING_MONEY
+from core.modificadores import (
+    ATTRIBUTE_MODIFIERS, constitution_hp_bonus, dexterity_ac_adjustment, is_warrior,
+    strength_damage_bonus, strength_hit_bonus
+)
+from core.progresion import (
+    XP_TABLES, hit_points_gain, level_for_xp, saves_for, thac0_for, xp_to_next_level
+)
+
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -52,6 +64,9 @@ class ADnDDataLoader:
                 self.races = cached_data.get('races', {})
                 self.spells = cached_data.get('spells', {})
                 self.equipment = cached_data.get('equipment', {})
+            # Los caches antiguos sólo traían algunos umbrales y niveles
+            self._extract_attribute_rules("")
+            self._extract_experience_tables("")
             logger.info("✅ Datos cargados correctamente del cache")
         else:
             logger.info("🔍 Cache no encontrado. Extrayendo datos de PDFs...")
@@ -678,44 +693,8 @@ class ADnDDataLoader:
     
     def _extract_attribute_rules(self, text):
         """Extrae reglas de atributos y modificadores"""
-        self.rules['attribute_modifiers'] = {
-            'FUE': {
-                3: {'golpe': -3, 'dano': -1},
-                4: {'golpe': -2, 'dano': -1},
-                5: {'golpe': -2, 'dano': -1},
-                6: {'golpe': -1, 'dano': 0},
-                7: {'golpe': -1, 'dano': 0},
-                8: {'golpe': 0, 'dano': 0},
-                9: {'golpe': 0, 'dano': 0},
-                10: {'golpe': 0, 'dano': 0},
-                11: {'golpe': 0, 'dano': 0},
-                12: {'golpe': 0, 'dano': 0},
-                13: {'golpe': 0, 'dano': 0},
-                14: {'golpe': 0, 'dano': 0},
-                15: {'golpe': 0, 'dano': 0},
-                16: {'golpe': 0, 'dano': 1},
-                17: {'golpe': 1, 'dano': 1},
-                18: {'golpe': 1, 'dano': 2},
-            },
-            'DES': {
-                3: {'reaccion': -3, 'ca': 4, 'proyectil': -3},
-                6: {'reaccion': -1, 'ca': 1, 'proyectil': -1},
-                9: {'reaccion': 0, 'ca': 0, 'proyectil': 0},
-                13: {'reaccion': 0, 'ca': 0, 'proyectil': 0},
-                16: {'reaccion': 1, 'ca': -2, 'proyectil': 1},
-                17: {'reaccion': 2, 'ca': -3, 'proyectil': 2},
-                18: {'reaccion': 2, 'ca': -4, 'proyectil': 2},
-            },
-            'CON': {
-                3: {'pg': -2},
-                6: {'pg': -1},
-                9: {'pg': 0},
-                15: {'pg': 1},
-                16: {'pg': 2},
-                17: {'pg': 3},
-                18: {'pg': 4},
-            }
-        }
+        # Las tablas completas (con fuerza excepcional) viven en core/modificadores.py
+        self.rules['attribute_modifiers'] = copy.deepcopy(ATTRIBUTE_MODIFIERS)
     
     def _extract_combat_rules(self, text):
         """Extrae reglas de combate"""
@@ -728,12 +707,8 @@ class ADnDDataLoader:
     
     def _extract_experience_tables(self, text):
         """Extrae tablas de experiencia"""
-        self.rules['experience'] = {
-            'Guerrero': [0, 2000, 4000, 8000, 16000, 32000, 64000, 125000, 250000, 500000],
-            'Mago': [0, 2500, 5000, 10000, 20000, 40000, 60000, 90000, 135000, 250000],
-            'Clérigo': [0, 1500, 3000, 6000, 13000, 27000, 55000, 110000, 225000, 450000],
-            'Ladrón': [0, 1250, 2500, 5000, 10000, 20000, 40000, 70000, 110000, 160000]
-        }
+        # Tablas completas hasta nivel 20 en core/progresion.py
+        self.rules['experience'] = {cls: list(table) for cls, table in XP_TABLES.items()}
     
     def _extract_dwarf_details(self, text):
         """Extrae detalles específicos de enanos del manual completo"""
@@ -1127,49 +1102,6 @@ class ADnDDataLoader:
             return []
         return {name: data for name, data in self.spells[class_name].items() if data['nivel'] == level}
 
-# ============================================================================
-# SISTEMA DE GENERACIÓN DE ATRIBUTOS
-# ============================================================================
-
-import random
-
-class AttributeGenerator:
-    """Genera atributos según las reglas de AD&D 2e"""
-    
-    @staticmethod
-    def roll_3d6():
-        """Método estándar: 3d6"""
-        return sum(random.randint(1, 6) for _ in range(3))
-    
-    @staticmethod
-    def roll_4d6_drop_lowest():
-        """Método heroico: 4d6, descarta el más bajo"""
-        rolls = [random.randint(1, 6) for _ in range(4)]
-        rolls.sort()
-        return sum(rolls[1:])
-    
-    @staticmethod
-    def method_1():
-        """Método 1: Tirar 3d6 seis veces, asignar en orden"""
-        return [AttributeGenerator.roll_3d6() for _ in range(6)]
-    
-    @staticmethod
-    def method_2():
-        """Método 2: Tirar 3d6 doce veces, escoger los mejores 6"""
-        rolls = [AttributeGenerator.roll_3d6() for _ in range(12)]
-        rolls.sort(reverse=True)
-        return rolls[:6]
-    
-    @staticmethod
-    def method_3():
-        """Método 3: Tirar 3d6 seis veces, asignar donde se desee"""
-        return [AttributeGenerator.roll_3d6() for _ in range(6)]
-    
-    @staticmethod
-    def method_4():
-        """Método 4 (Heroico): 4d6 descartando el más bajo, seis veces"""
-        return [AttributeGenerator.roll_4d6_drop_lowest() for _ in range(6)]
-
 # ============================================================================
 # CLASE PERSONAJE ACTUALIZADA
 # ============================================================================
@@ -1195,6 +1127,9 @@ class Character:
             'CAR': 10
         }
         
+        # Fuerza excepcional (percentil 1-100 con FUE 18, sólo guerreros; 0 = no tiene)
+        self.exceptional_strength = 0
+        
         # Combate
         self.hit_points_max = 0
         self.hit_points_current = 0
@@ -1301,8 +1236,8 @@ class Character:
                 return False
         
         self.character_class = class_name
-        self.thac0 = class_data.get('thac0_inicial', 20)
-        self.saving_throws = class_data.get('ts_base', {}).copy()
+        self.thac0 = thac0_for(class_name, self.level)
+        self.saving_throws = saves_for(class_name, self.level)
         
         # Calcular PG iniciales
         self._calculate_hit_points()
@@ -1333,21 +1268,7 @@ class Character:
     
     def _get_constitution_modifier(self):
         """Obtiene el modificador de Constitución para PG"""
-        con = self.attributes['CON']
-        if con <= 3:
-            return -2
-        elif con <= 6:
-            return -1
-        elif con <= 14:
-            return 0
-        elif con == 15:
-            return 1
-        elif con == 16:
-            return 2
-        elif con == 17:
-            return 3
-        else:
-            return 4
+        return constitution_hp_bonus(self.attributes['CON'], is_warrior(self.character_class))
     
     def learn_spell(self, spell_name, spell_class=None):
         """Aprende un hechizo nuevo"""
@@ -1445,44 +1366,21 @@ class Character:
             return
         
         # Dinero inicial (tirada de dados según clase)
-        money_dice = {
-            'Guerrero': (5, 4, 10),  # 5d4 x10
-            'Paladín': (5, 4, 10),
-            'Ranger': (5, 4, 10),
-            'Mago': (1, 4, 10),  # 1d4 x10
-            'Especialista': (1, 4, 10),
-            'Clérigo': (3, 6, 10),  # 3d6 x10
-            'Druida': (3, 6, 10),
-            'Ladrón': (2, 6, 10),  # 2d6 x10
-            'Bardo': (2, 6, 10),
-            'Monje': (5, 4, 1)  # 5d4 (sin multiplicador)
-        }.get(self.character_class, (3, 6, 10))
-        
-        import random
+        money_dice = STARTING_MONEY.get(self.character_class, DEFAULT_MONEY)
+        
         num_dice, die_size, multiplier = money_dice
         gold = sum(random.randint(1, die_size) for _ in range(num_dice)) * multiplier
         self.money['po'] = gold
         
         # Equipo básico según clase
-        basic_equipment = {
-            'Guerrero': ['Espada larga', 'Escudo', 'Armadura de cota de mallas', 'Mochila', 'Odre', 'Raciones (1 semana)'],
-            'Paladín': ['Espada larga', 'Escudo', 'Armadura de cota de mallas', 'Símbolo sagrado', 'Mochila', 'Raciones (1 semana)'],
-            'Ranger': ['Espada larga', 'Arco largo', '20 flechas', 'Armadura de cuero', 'Mochila', 'Cuerda (50 pies)', 'Raciones (1 semana)'],
-            'Mago': ['Daga', 'Libro de hechizos', 'Componentes de hechizos', 'Mochila', 'Tinta y pluma', 'Raciones (1 semana)'],
-            'Especialista': ['Daga', 'Libro de hechizos', 'Componentes de hechizos', 'Mochila', 'Tinta y pluma', 'Raciones (1 semana)'],
-            'Clérigo': ['Maza', 'Escudo', 'Armadura de cota de mallas', 'Símbolo sagrado', 'Agua bendita', 'Mochila', 'Raciones (1 semana)'],
-            'Druida': ['Hoz', 'Dardo (6)', 'Armadura de cuero', 'Muérdago sagrado', 'Mochila', 'Raciones (1 semana)'],
-            'Ladrón': ['Espada corta', 'Daga', 'Armadura de cuero', 'Ganzúas', 'Cuerda (50 pies)', 'Mochila', 'Raciones (1 semana)'],
-            'Bardo': ['Espada larga', 'Daga', 'Armadura de cuero', 'Instrumento musical', 'Mochila', 'Raciones (1 semana)'],
-            'Monje': ['Bastón', 'Túnica', 'Cuerda (50 pies)', 'Mochila', 'Raciones (1 semana)']
-        }.get(self.character_class, ['Daga', 'Mochila', 'Raciones (1 semana)'])
+        basic_equipment = STARTING_EQUIPMENT.get(self.character_class, DEFAULT_EQUIPMENT)
         
         self.equipment = basic_equipment.copy()
         
         logger.info(f"💰 Dinero inicial: {gold} po")
         logger.info(f"🎒 Equipo básico ({len(self.equipment)} objetos)")
         
-        return gold, basic_equipment
+        return gold, list(basic_equipment)
     
     def assign_kit(self, kit_name=None):
         """Asigna un kit de personaje (opcional)"""
@@ -1515,6 +1413,7 @@ class Character:
             'level': self.level,
             'experience': self.experience,
             'attributes': self.attributes,
+            'exceptional_strength': self.exceptional_strength,
             'hit_points_max': self.hit_points_max,
             'hit_points_current': self.hit_points_current,
             'armor_class': self.armor_class,
@@ -1543,6 +1442,18 @@ class Character:
             except ValueError:
                 print("❌ Valor inválido, manteniendo actual")
         
+        # Fuerza excepcional: sólo guerreros con FUE 18
+        if self.attributes['FUE'] == 18 and is_warrior(self.character_class):
+            try:
+                new_val = input(f"FUE excepcional 18/xx (1-100, 100 = 18/00; actual: "
+                                f"{self.exceptional_strength}, Enter para mantener): ").strip()
+                if new_val:
+                    self.exceptional_strength = max(0, min(100, int(new_val)))
+            except ValueError:
+                print("❌ Valor inválido, manteniendo actual")
+        else:
+            self.exceptional_strength = 0
+        
         # Recalcular dependencias
         if self.character_class:
             self._calculate_hit_points()
@@ -1653,8 +1564,8 @@ class Character:
             logger.warning(f"'{weapon_name}' no está en el inventario")
             return False
         
-        # Bonificador de FUE para ataque y daño
-        str_bonus = self._get_strength_bonus()
+        # Bonificadores de FUE para ataque y daño
+        hit_bonus, str_bonus = self._get_strength_bonus()
         
         # Base de datos de armas (daño típico)
         weapon_data = {
@@ -1699,7 +1610,7 @@ class Character:
         weapon_slot = 'arma_principal' if slot == 'principal' else 'arma_secundaria'
         self.equipped[weapon_slot] = {
             'nombre': weapon_name,
-            'ataque': weapon_info['ataque_base'] + str_bonus + proficiency_bonus,
+            'ataque': weapon_info['ataque_base'] + hit_bonus + proficiency_bonus,
             'daño': weapon_info['daño'] + (f"{str_bonus:+d}" if str_bonus != 0 else '')
         }
         
@@ -1773,30 +1684,21 @@ class Character:
         if self.equipped['escudo']:
             base_ac += self.equipped['escudo']['ca_bonus']
         
-        # Bonus de DES (solo si no lleva armadura pesada)
-        dex_bonus = (self.attributes['DES'] - 10) // 2
+        # Ajuste de DES (solo si no lleva armadura pesada)
+        dex_adjustment = dexterity_ac_adjustment(self.attributes['DES'])
         if self.equipped['armadura']:
             # Armaduras pesadas limitan bonus de DES
             if self.equipped['armadura']['ca'] <= 4:
-                dex_bonus = min(dex_bonus, 0)  # Sin bonus en armadura pesada
+                dex_adjustment = max(dex_adjustment, 0)  # Sin bonus en armadura pesada
         
-        base_ac -= dex_bonus  # En AD&D, CA menor es mejor
+        base_ac += dex_adjustment  # En AD&D, CA menor es mejor
         self.armor_class = max(base_ac, -10)  # Mínimo CA -10
     
     def _get_strength_bonus(self):
-        """Obtiene bonus de FUE para ataque y daño"""
+        """Obtiene los bonus de FUE (ataque, daño)"""
         fue = self.attributes['FUE']
-        if fue >= 18:
-            return 3
-        elif fue >= 16:
-            return 2
-        elif fue >= 14:
-            return 1
-        elif fue <= 5:
-            return -2
-        elif fue <= 7:
-            return -1
-        return 0
+        return (strength_hit_bonus(fue, self.exceptional_strength),
+                strength_damage_bonus(fue, self.exceptional_strength))
     
     def level_up(self):
         """Sube de nivel al personaje"""
@@ -1805,39 +1707,15 @@ class Character:
             return False
         
         self.level += 1
-        class_data = self.data_loader.classes.get(self.character_class, {})
-        
-        # Calcular nuevos HP
-        hit_die = class_data.get('dado_golpe', 4)
-        import random
-        hp_roll = random.randint(1, hit_die)
-        con_mod = self._get_constitution_modifier()
-        hp_gain = max(1, hp_roll + con_mod)
         
+        # PG: dado de golpe + CON hasta el nivel de nombre, fijos a partir de ahí
+        hp_gain = hit_points_gain(self.character_class, self.level, self.attributes['CON'])
         self.hit_points_max += hp_gain
         self.hit_points_current += hp_gain
         
-        # Mejorar THAC0 (baja 1 cada ciertos niveles según clase)
-        thac0_progression = {
-            'Guerrero': 1,  # Mejora cada nivel
-            'Paladín': 1,
-            'Ranger': 1,
-            'Clérigo': 2,  # Mejora cada 2 niveles
-            'Druida': 2,
-            'Ladrón': 2,
-            'Bardo': 2,
-            'Mago': 3,  # Mejora cada 3 niveles
-            'Especialista': 3
-        }
-        
-        progression_rate = thac0_progression.get(self.character_class, 2)
-        if self.level % progression_rate == 0:
-            self.thac0 -= 1
-        
-        # Mejorar tiradas de salvación (cada 3-4 niveles)
-        if self.level % 4 == 0:
-            for save in self.saving_throws:
-                self.saving_throws[save] = max(1, self.saving_throws[save] - 1)
+        # THAC0 y salvaciones de las tablas de progresión de la clase
+        self.thac0 = thac0_for(self.character_class, self.level)
+        self.saving_throws = saves_for(self.character_class, self.level)
         
         logger.info(f"✨ ¡Nivel {self.level} alcanzado!")
         logger.info(f"   +{hp_gain} PG (Total: {self.hit_points_max})")
@@ -1850,25 +1728,14 @@ class Character:
         self.experience += xp
         logger.info(f"💎 +{xp} XP (Total: {self.experience})")
         
-        # Tabla de experiencia simplificada (varía por clase)
-        xp_table = {
-            1: 0,
-            2: 2000,
-            3: 4000,
-            4: 8000,
-            5: 16000,
-            6: 32000,
-            7: 64000,
-            8: 125000,
-            9: 250000,
-            10: 500000
-        }
-        
-        # Verificar si sube de nivel
-        next_level = self.level + 1
-        if next_level in xp_table and self.experience >= xp_table[next_level]:
-            print(f"\n🎉 ¡Has alcanzado suficiente experiencia para nivel {next_level}!")
+        # Verificar si sube de nivel (tabla de XP de la clase)
+        reachable = level_for_xp(self.character_class, self.experience)
+        if reachable > self.level:
+            print(f"\n🎉 ¡Has alcanzado suficiente experiencia para nivel {reachable}!")
             return True
+        missing = xp_to_next_level(self.character_class, self.level, self.experience)
+        if missing is not None:
+            print(f"   Faltan {missing:,} XP para nivel {self.level + 1}")
         return False
 
 # ============================================================================
@@ -2274,10 +2141,9 @@ def save_character(character, filename=None):
     return filename
 
 def load_character(filename, data_loader):
-    """Carga un personaje desde un archivo JSON"""
+    """Carga un personaje desde un archivo JSON (formato antiguo o canónico)"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = to_creator_format(load_character_file(filename))
         
         character = Character(data['name'], data_loader)
         character.race = data.get('race')
@@ -2285,31 +2151,18 @@ def load_character(filename, data_loader):
         character.level = data.get('level', 1)
         character.experience = data.get('experience', 0)
         character.attributes = data.get('attributes', {})
-        character.hit_points_max = data.get('hit_points_max', 0)
-        character.hit_points_current = data.get('hit_points_current', 0)
-        character.armor_class = data.get('armor_class', 10)
+        character.exceptional_strength = data.get('exceptional_strength', 0)
+        character.hit_points_max = data['hit_points_max']
+        character.hit_points_current = data['hit_points_current']
+        character.armor_class = data['armor_class']
         character.thac0 = data.get('thac0', 20)
         character.saving_throws = data.get('saving_throws', {})
         character.skills = data.get('skills', {})
-        character.proficiencies = data.get('proficiencies', {'armas': [], 'no_armas': []})
+        character.proficiencies = data['proficiencies']
         character.kit = data.get('kit')
-        character.equipment = data.get('equipment', [])
-        character.equipped = data.get('equipped', {
-            'arma_principal': None,
-            'arma_secundaria': None,
-            'armadura': None,
-            'escudo': None
-        })
-        character.money = data.get('money', {'po': 0, 'pp': 0, 'pe': 0, 'pc': 0})
-        character.known_spells = data.get('known_spells', [])
-        character.prepared_spells = data.get('prepared_spells', [])
-        
-        logger.info(f"📂 Personaje cargado: {character.name}")
-        return character
-        
-    except Exception as e:
-        logger.error(f"❌ Error cargando personaje: {e}")
-        return None
+        character.equipment = data['equipment']
+        character.equipped = data['equipped']
+        character.money = data['money']
         character.known_spells = data.get('known_spells', [])
         character.prepared_spells = data.get('prepared_spells', [])
         
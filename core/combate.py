@@ -5,11 +5,20 @@ Integra el sistema de dados y aplica todas las reglas de combate
 """
 
 import json
-import random
 import pickle
+from collections import deque
+from itertools import groupby
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from .dados import DiceRoller
+from .azar import stream
+from .dados import DiceRoller, parse_dice
+from .efectos import Effect, EffectEngine, effects_from_abilities, incapacitated
+from .esquema import load_character_file, normalize_character, resolve_save_name
+from .eventos import ERROR, WARNING, Emitter, formatter
+from .iniciativa import InitiativeScheduler
+from .modificadores import dexterity_reaction_bonus, strength_damage_bonus
+from .rendimiento import instrument
+from .renderizado import render_cache
 
 
 class Monster:
@@ -92,9 +101,11 @@ class Monster:
         return f"{status} {self.name} - HP: {self.hp}/{self.max_hp}, AC: {self.ac}, THAC0: {self.thac0}"
 
 
-class MonsterDatabase:
+class MonsterDatabase(Emitter):
     """Base de datos de monstruos del manual"""
-    def __init__(self):
+    def __init__(self, sink=None, rng=None):
+        self.sink = sink
+        self.rng = rng  # None = flujo 'encuentros' de la sesión
         self.monsters = self._load_monsters()
         self._build_indices()
     
@@ -136,6 +147,25 @@ class MonsterDatabase:
             if environment not in self.by_environment:
                 self.by_environment[environment] = []
             self.by_environment[environment].append(name)
+        
+        self._build_name_index()
+    
+    NGRAM_SIZE = 3
+    
+    def _build_name_index(self):
+        """
+        Índice de n-gramas (1 a NGRAM_SIZE caracteres) sobre los nombres en
+        minúsculas. Una búsqueda intersecta los conjuntos de sus n-gramas y
+        sólo verifica la subcadena en los candidatos resultantes.
+        """
+        self._name_order = {name: i for i, name in enumerate(self.monsters)}
+        self._name_lower = {name: name.lower() for name in self.monsters}
+        self._ngrams: Dict[str, set] = {}
+        
+        for name, lowered in self._name_lower.items():
+            for n in range(1, self.NGRAM_SIZE + 1):
+                for i in range(len(lowered) - n + 1):
+                    self._ngrams.setdefault(lowered[i:i + n], set()).add(name)
     
     def _load_monsters(self) -> dict:
         """Carga monstruos desde JSON o genera biblioteca básica"""
@@ -944,11 +974,25 @@ class MonsterDatabase:
         Retorna diccionario {nombre: datos}
         """
         query = query.lower()
-        results = {}
-        for name, data in self.monsters.items():
-            if query in name.lower():
-                results[name] = data
-        return results
+        if not query:
+            return dict(self.monsters)
+        
+        n = min(len(query), self.NGRAM_SIZE)
+        grams = sorted({query[i:i + n] for i in range(len(query) - n + 1)},
+                       key=lambda g: len(self._ngrams.get(g, ())))
+        
+        candidates = set(self._ngrams.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self._ngrams.get(gram, set())
+        
+        if len(query) > self.NGRAM_SIZE:
+            candidates = {name for name in candidates if query in self._name_lower[name]}
+        
+        # Mismo orden que la base de datos (como la búsqueda lineal)
+        return {name: self.monsters[name]
+                for name in sorted(candidates, key=self._name_order.__getitem__)}
     
     def filter_by_challenge(self, level: str) -> List[str]:
         """Filtra por nivel de desafío
@@ -996,34 +1040,42 @@ class MonsterDatabase:
         """Imprime ficha detallada de monstruo"""
         monster = self.monsters.get(name)
         if not monster:
-            print(f"❌ Monstruo '{name}' no encontrado")
+            self.message(f"❌ Monstruo '{name}' no encontrado", ERROR)
             return
         
-        print(f"\n{'='*60}")
-        print(f"🐉 {name.upper()}")
-        print(f"{'='*60}")
-        print(f"Tipo: {monster.get('type', 'Desconocido')}")
-        print(f"Ambiente: {monster.get('environment', 'Variado')}")
-        print(f"\n📊 ESTADÍSTICAS:")
-        print(f"  Clase de Armadura: {monster.get('ac', 10)}")
-        print(f"  Dados de Golpe: {monster.get('hd', '1d8')}")
-        print(f"  Puntos de Golpe: {monster.get('hp', 0)} (promedio)")
-        print(f"  THAC0: {monster.get('thac0', 20)}")
-        print(f"  Movimiento: {monster.get('movement', 12)}")
-        print(f"  Moral: {monster.get('morale', 10)}")
-        print(f"\n⚔️ ATAQUES:")
+        self.emit('monstruo.ficha', name=name,
+                  render=lambda: render_cache.get(monster, 'ficha',
+                                                  lambda: self._render_monster_card(name, monster)))
+    
+    def _render_monster_card(self, name: str, monster: dict) -> str:
+        """Texto de la ficha detallada de un monstruo"""
+        lines = []
+        lines.append(f"\n{'='*60}")
+        lines.append(f"🐉 {name.upper()}")
+        lines.append(f"{'='*60}")
+        lines.append(f"Tipo: {monster.get('type', 'Desconocido')}")
+        lines.append(f"Ambiente: {monster.get('environment', 'Variado')}")
+        lines.append(f"\n📊 ESTADÍSTICAS:")
+        lines.append(f"  Clase de Armadura: {monster.get('ac', 10)}")
+        lines.append(f"  Dados de Golpe: {monster.get('hd', '1d8')}")
+        lines.append(f"  Puntos de Golpe: {monster.get('hp', 0)} (promedio)")
+        lines.append(f"  THAC0: {monster.get('thac0', 20)}")
+        lines.append(f"  Movimiento: {monster.get('movement', 12)}")
+        lines.append(f"  Moral: {monster.get('morale', 10)}")
+        lines.append(f"\n⚔️ ATAQUES:")
         attacks = monster.get('attacks', [])
         for i, atk in enumerate(attacks, 1):
-            print(f"  Ataque {i}: {atk} de daño")
-        print(f"\n✨ HABILIDADES ESPECIALES:")
+            lines.append(f"  Ataque {i}: {atk} de daño")
+        lines.append(f"\n✨ HABILIDADES ESPECIALES:")
         for special in monster.get('special', []):
-            print(f"  • {special}")
+            lines.append(f"  • {special}")
         if monster.get('immunities'):
-            print(f"\n🛡️ INMUNIDADES:")
+            lines.append(f"\n🛡️ INMUNIDADES:")
             for imm in monster['immunities']:
-                print(f"  • {imm.capitalize()}")
-        print(f"\n💰 Valor en XP: {monster.get('xp', 0)}")
-        print(f"{'='*60}\n")
+                lines.append(f"  • {imm.capitalize()}")
+        lines.append(f"\n💰 Valor en XP: {monster.get('xp', 0)}")
+        lines.append(f"{'='*60}\n")
+        return "\n".join(lines)
     
     def random_encounter(self, challenge: str = None, environment: str = None) -> Optional[str]:
         """Genera un encuentro aleatorio
@@ -1043,11 +1095,12 @@ class MonsterDatabase:
         if not candidates:
             return None
         
-        return random.choice(candidates)
+        return (self.rng or stream('encuentros')).choice(candidates)
     
     def save_custom_monster(self, name: str, data: dict):
         """Guarda un monstruo personalizado"""
         self.monsters[name] = data
+        render_cache.touch(data)
         self._build_indices()  # Reconstruir índices
         self._save_to_file()
     
@@ -1064,6 +1117,7 @@ class Combatant:
         self.entity = entity
         self.is_player = is_player
         self.initiative = 0
+        self.group: Optional[str] = None  # tipo de monstruo para la iniciativa de grupo
         self.actions_this_round = 0
         self.max_actions = 1
         
@@ -1075,6 +1129,9 @@ class Combatant:
         # Distancia de combate (en metros)
         self.distance_to_enemies = 1  # 1 = melé, >1 = distancia
         
+        # Estados de los personajes (los monstruos usan Monster.conditions)
+        self._conditions: List[str] = []
+        
     @property
     def name(self) -> str:
         if self.is_player:
@@ -1108,11 +1165,36 @@ class Combatant:
             return self.entity.get('hp', {}).get('current', 0) > 0
         return self.entity.is_alive
     
+    @property
+    def conditions(self) -> List[str]:
+        """Estados activos (paralizado, envenenado...), mantenidos por los efectos"""
+        return self._conditions if self.is_player else self.entity.conditions
+    
+    @property
+    def weapon(self) -> Tuple[Optional[str], Dict]:
+        """Arma principal equipada (nombre, datos); los monstruos no tienen"""
+        if not self.is_player:
+            return None, {}
+        weapon_name = self.entity.get('equipped', {}).get('arma_principal')
+        if not weapon_name:
+            return None, {}
+        return weapon_name, self.entity.get('equipment', {}).get(weapon_name, {})
+    
+    @property
+    def speed_factor(self) -> int:
+        """Factor de velocidad del arma equipada ('velocidad' en el equipo)"""
+        weapon = self.weapon[1]
+        try:
+            return int(weapon.get('velocidad', weapon.get('speed', 0)) or 0)
+        except (TypeError, ValueError):
+            return 0
+    
     def take_damage(self, damage: int) -> str:
         if self.is_player:
             current = self.entity['hp']['current']
             current -= damage
             self.entity['hp']['current'] = max(0, current)
+            render_cache.touch(self.entity)
             if current <= 0:
                 return f"💀 {self.name} ha caído inconsciente!"
             elif current < self.max_hp * 0.25:
@@ -1128,40 +1210,126 @@ class Combatant:
             old_hp = current
             current = min(current + amount, self.max_hp)
             self.entity['hp']['current'] = current
+            render_cache.touch(self.entity)
             healed = current - old_hp
             return f"💚 {self.name} se cura {healed} HP ({current}/{self.max_hp})"
         else:
             return self.entity.heal(amount)
     
+    def snapshot(self) -> dict:
+        """Estado visible del combatiente (datos del evento de estado)"""
+        return {'name': self.name, 'hp': self.hp, 'max_hp': self.max_hp,
+                'ac': self.ac, 'thac0': self.thac0, 'alive': self.is_alive,
+                'conditions': list(self.conditions)}
+    
     def __str__(self):
-        status = "💀" if not self.is_alive else ("⚠️" if self.hp < self.max_hp / 2 else "💚")
-        return f"{status} {self.name} - HP: {self.hp}/{self.max_hp}, AC: {self.ac}, THAC0: {self.thac0}"
+        return format_combatant(self.snapshot())
+
+
+def format_combatant(data: dict) -> str:
+    status = "💀" if not data['alive'] else ("⚠️" if data['hp'] < data['max_hp'] / 2 else "💚")
+    conditions = f" [{', '.join(data['conditions'])}]" if data.get('conditions') else ""
+    return f"{status} {data['name']} - HP: {data['hp']}/{data['max_hp']}, AC: {data['ac']}, THAC0: {data['thac0']}{conditions}"
 
 
-class CombatManager:
-    """Gestiona un encuentro de combate completo"""
-    def __init__(self):
+@formatter('combate.log')
+def format_combat_log(data: dict) -> str:
+    return data['message']
+
+
+@formatter('combate.estado')
+def format_combat_status(data: dict) -> str:
+    distance = data['distance']
+    distance_str = "MELÉ" if distance <= 1 else f"{distance}m"
+    lines = [f"\n{'='*60}",
+             f"⚔️ ESTADO DEL COMBATE - Round {data['round']} ⚔️",
+             f"{'='*60}",
+             f"\n📏 Distancia de combate: {distance_str}\n",
+             "👥 PERSONAJES:"]
+    lines.extend(f"  {format_combatant(c)}" for c in data['players'])
+    lines.append("\n🐉 ENEMIGOS:")
+    lines.extend(f"  {format_combatant(c)}" for c in data['enemies'])
+    lines.append(f"\n{'='*60}\n")
+    return "\n".join(lines)
+
+
+class CombatManager(Emitter):
+    """
+    Gestiona un encuentro de combate completo.
+    monster_db permite reutilizar la base de monstruos de la interfaz en vez
+    de cargar una copia por combate. El log guarda sólo las últimas
+    MAX_COMBAT_LOG líneas para que las sesiones largas no crezcan sin límite.
+    rng se pasa al DiceRoller (p. ej. un azar.FaceBuffer para simulaciones).
+    
+    El orden de turnos lo lleva un InitiativeScheduler (montículo): los
+    caídos se saltan sin reordenar, los refuerzos que llegan con el combate
+    empezado se insertan en su puesto y, con reroll_initiative_each_round,
+    la iniciativa se vuelve a tirar al empezar cada round. Con
+    use_speed_factors el factor de velocidad del arma resta a la iniciativa.
+    Con group_initiative los monstruos del mismo tipo comparten una tirada
+    y pueden resolver sus ataques juntos con make_group_attack().
+    
+    Los efectos con duración (conjuros, veneno, parálisis, regeneración)
+    viven en un EffectEngine; cada round nuevo sólo procesa los que empiezan,
+    actúan o terminan en él.
+    """
+    
+    MAX_COMBAT_LOG = 2000
+    
+    def __init__(self, sink=None, monster_db: Optional[MonsterDatabase] = None, rng=None):
+        self.sink = sink
         self.combatants: List[Combatant] = []
         self.round_number = 0
-        self.initiative_order: List[Combatant] = []
-        self.current_turn_index = 0
-        self.dice_roller = DiceRoller()
-        self.monster_db = MonsterDatabase()
-        self.combat_log: List[str] = []
+        self.scheduler = InitiativeScheduler()
+        self.current_turn_index = 0  # turnos jugados en el round actual
+        self.reroll_initiative_each_round = False
+        self.use_speed_factors = True
+        self.group_initiative = False
+        self.dice_roller = DiceRoller(sink, rng)
+        roller = self.dice_roller  # sin referencia al manager: evita un ciclo para el gc
+        self.effects = EffectEngine(lambda dice: roller.roll(dice, 0, "Efecto")['total'])
+        self.monster_db = monster_db or MonsterDatabase(sink)
+        self.combat_log: deque = deque(maxlen=self.MAX_COMBAT_LOG)
         self.combat_distance = 1  # Distancia global entre grupos (1=melé, 10=cerca, 30=lejos)
         
     def add_player(self, character_file: str) -> bool:
         """Carga y agrega un personaje al combate"""
         try:
-            with open(character_file, 'r', encoding='utf-8') as f:
-                char_data = json.load(f)
-            combatant = Combatant(char_data, is_player=True)
-            self.combatants.append(combatant)
-            self.log(f"✅ {combatant.name} se une al combate")
-            return True
+            char_data = load_character_file(character_file)
         except Exception as e:
-            print(f"❌ Error cargando personaje: {e}")
+            self.message(f"❌ Error cargando personaje: {e}", ERROR)
             return False
+        return self.add_player_data(char_data)
+    
+    def add_player_data(self, char_data: Dict) -> bool:
+        """
+        Agrega un personaje ya cargado en memoria.
+        El combatiente comparte el mismo diccionario, así que los cambios de HP
+        durante el combate se reflejan directamente en la ficha cargada.
+        """
+        try:
+            normalize_character(char_data)
+        except ValueError as e:
+            self.message(f"❌ Ficha de personaje inválida: {e}", ERROR)
+            return False
+        
+        if any(c.entity is char_data for c in self.combatants):
+            self.message(f"⚠️ {char_data.get('name')} ya está en el combate", WARNING)
+            return False
+        
+        combatant = Combatant(char_data, is_player=True)
+        self.combatants.append(combatant)
+        self.log(f"✅ {combatant.name} se une al combate")
+        self._join_in_progress(combatant)
+        return True
+    
+    def add_party(self, party: List[Optional[Dict]]) -> int:
+        """Agrega todos los personajes de un grupo (huecos vacíos se ignoran)"""
+        added = 0
+        for char_data in party:
+            if char_data and self.add_player_data(char_data):
+                added += 1
+        return added
     
     def add_monster(self, monster_name: str, custom_name: str = None) -> bool:
         """Agrega un monstruo al combate"""
@@ -1177,55 +1345,115 @@ class CombatManager:
                 monster.max_hp = monster.hp
             
             combatant = Combatant(monster, is_player=False)
+            combatant.group = monster_name
             self.combatants.append(combatant)
             self.log(f"🐉 {monster.name} entra en combate - HP: {monster.hp}, AC: {monster.ac}")
+            # Como las reglas: la regeneración actúa desde el segundo round, no al empezar
+            for effect in effects_from_abilities(monster.special_abilities):
+                self.effects.add(effect, combatant, first_tick=max(self.round_number, 1) + 1)
+            self._join_in_progress(combatant)
             return True
         else:
-            print(f"❌ Monstruo '{monster_name}' no encontrado")
+            self.message(f"❌ Monstruo '{monster_name}' no encontrado", ERROR)
             return False
     
+    def _roll_combatant_initiative(self, combatant: Combatant) -> int:
+        """Tira 1d10 de iniciativa para un combatiente (mayor actúa antes)"""
+        roll = self.dice_roller.roll("1d10", 0, f"Iniciativa de {combatant.name}")
+        parts = [str(roll['total'])]
+        initiative = roll['total']
+        
+        # Bonus por DES para jugadores
+        if combatant.is_player:
+            abilities = combatant.entity.get('abilities', combatant.entity.get('attributes', {}))
+            dex = abilities.get('dexterity', abilities.get('DES', 10))
+            dex_bonus = dexterity_reaction_bonus(dex)
+            initiative += dex_bonus
+            parts.append(f"+ {dex_bonus} (DES)")
+        
+        # Factor de velocidad del arma: las armas lentas actúan más tarde
+        if self.use_speed_factors:
+            speed = combatant.speed_factor
+            if speed:
+                initiative -= speed
+                parts.append(f"- {speed} ({combatant.weapon[0]})")
+        
+        combatant.initiative = initiative
+        if len(parts) > 1:
+            self.log(f"  {combatant.name}: {' '.join(parts)} = {initiative}")
+        else:
+            self.log(f"  {combatant.name}: {initiative}")
+        return initiative
+    
+    def _roll_group_initiative(self, group: str, members: List[Combatant]) -> int:
+        """Una sola tirada de iniciativa para todos los monstruos de un tipo"""
+        roll = self.dice_roller.roll("1d10", 0, f"Iniciativa de {group} (x{len(members)})")
+        for combatant in members:
+            combatant.initiative = roll['total']
+        name = members[0].name if len(members) == 1 else f"{group} x{len(members)}"
+        self.log(f"  {name}: {roll['total']}")
+        return roll['total']
+    
+    def _roll_all_initiative(self) -> Dict[Combatant, int]:
+        living = [c for c in self.combatants if c.is_alive]
+        if not self.group_initiative:
+            return {c: self._roll_combatant_initiative(c) for c in living}
+        
+        initiatives = {}
+        groups: Dict[str, List[Combatant]] = {}
+        for combatant in living:
+            if combatant.group is None:
+                initiatives[combatant] = self._roll_combatant_initiative(combatant)
+            else:
+                groups.setdefault(combatant.group, []).append(combatant)
+        for group, members in groups.items():
+            initiatives.update(dict.fromkeys(members, self._roll_group_initiative(group, members)))
+        return initiatives
+    
+    def _order_key(self, combatant: Combatant):
+        if self.group_initiative and combatant.group is not None:
+            return combatant.group, combatant.initiative
+        return id(combatant)
+    
+    def _log_initiative_order(self):
+        self.log("\n📋 Orden de iniciativa:")
+        runs = groupby(self.initiative_order, key=self._order_key)
+        for i, (_, run) in enumerate(runs, 1):
+            run = list(run)
+            name = run[0].name if len(run) == 1 else f"{run[0].group} x{len(run)}"
+            self.log(f"  {i}. {name} ({run[0].initiative})")
+    
     def roll_initiative(self):
         """Tira iniciativa para todos los combatientes"""
         self.log("\n" + "="*60)
         self.log("🎲 TIRANDO INICIATIVA")
         self.log("="*60)
         
-        for combatant in self.combatants:
-            if combatant.is_alive:
-                # Tirar 1d10 para iniciativa
-                roll = self.dice_roller.roll("1d10", 0, f"Iniciativa de {combatant.name}")
-                
-                # Bonus por DES para jugadores
-                if combatant.is_player:
-                    abilities = combatant.entity.get('abilities', combatant.entity.get('attributes', {}))
-                    dex = abilities.get('dexterity', abilities.get('DES', 10))
-                    dex_bonus = self._get_dex_initiative_bonus(dex)
-                    combatant.initiative = roll['total'] + dex_bonus
-                    self.log(f"  {combatant.name}: {roll['total']} + {dex_bonus} (DES) = {combatant.initiative}")
-                else:
-                    combatant.initiative = roll['total']
-                    self.log(f"  {combatant.name}: {roll['total']}")
-        
-        # Ordenar por iniciativa (mayor primero)
-        self.initiative_order = sorted(
-            [c for c in self.combatants if c.is_alive],
-            key=lambda x: x.initiative,
-            reverse=True
-        )
-        
-        self.log("\n📋 Orden de iniciativa:")
-        for i, combatant in enumerate(self.initiative_order, 1):
-            self.log(f"  {i}. {combatant.name} ({combatant.initiative})")
-        
+        self.scheduler.start(self._roll_all_initiative())
+        self._log_initiative_order()
         self.current_turn_index = 0
     
-    def _get_dex_initiative_bonus(self, dex: int) -> int:
-        """Bonus de iniciativa por DES según AD&D 2e"""
-        if dex >= 18: return 2
-        elif dex >= 16: return 1
-        elif dex <= 5: return -2
-        elif dex <= 7: return -1
-        return 0
+    def _join_in_progress(self, combatant: Combatant):
+        """Un combatiente que llega con el combate empezado tira y entra en la cola"""
+        if self.round_number < 1 or not combatant.is_alive:
+            return
+        kin = None
+        if self.group_initiative and combatant.group is not None:
+            kin = next((c for c in self.combatants if c is not combatant and c.is_alive
+                        and c.group == combatant.group), None)
+        if kin:
+            initiative = combatant.initiative = kin.initiative  # se une a la tirada de su grupo
+        else:
+            initiative = self._roll_combatant_initiative(combatant)
+        if self.scheduler.add(combatant, initiative):
+            self.log(f"  ⏱️ {combatant.name} actuará este round (iniciativa {initiative})")
+        else:
+            self.log(f"  ⏱️ {combatant.name} actuará a partir del round {self.round_number + 1}")
+    
+    @property
+    def initiative_order(self) -> List[Combatant]:
+        """Orden de iniciativa del round actual (ya actuaron, actual y pendientes)"""
+        return self.scheduler.order()
     
     def start_combat(self):
         """Inicia el combate"""
@@ -1236,6 +1464,8 @@ class CombatManager:
         self.log(f"\n{'='*60}")
         self.log(f"⚔️ ROUND {self.round_number} ⚔️")
         self.log(f"{'='*60}\n")
+        for message in self.effects.advance(self.round_number):
+            self.log(f"  {message}")
     
     def roll_starting_distance(self):
         """Determina distancia inicial del combate"""
@@ -1304,38 +1534,135 @@ class CombatManager:
         self.current_turn_index = 0
         
         # Regeneración y efectos de inicio de round
-        for combatant in self.combatants:
-            if not combatant.is_player and combatant.is_alive:
-                if hasattr(combatant.entity, 'special_abilities'):
-                    for ability in combatant.entity.special_abilities:
-                        if 'Regeneración' in ability:
-                            # Extraer cantidad de regeneración
-                            import re
-                            match = re.search(r'(\d+)\s*HP', ability)
-                            if match:
-                                regen = int(match.group(1))
-                                msg = combatant.heal(regen)
-                                self.log(f"  🔄 {msg}")
+        for message in self.effects.advance(self.round_number):
+            self.log(f"  {message}")
         
         self.log(f"\n{'='*60}")
         self.log(f"⚔️ ROUND {self.round_number} ⚔️")
         self.log(f"{'='*60}\n")
         
-        # Re-tirar iniciativa cada round (regla opcional, puede cambiarse)
-        # self.roll_initiative()
+        # Re-tirar iniciativa cada round (regla opcional)
+        if self.reroll_initiative_each_round:
+            self.log("🎲 Nueva iniciativa:")
+            self.scheduler.new_round(self._roll_all_initiative())
+            self._log_initiative_order()
+        else:
+            self.scheduler.new_round()
+    
+    def apply_effect(self, combatant: Combatant, effect: Effect, delay: int = 0) -> Effect:
+        """Aplica un efecto a un combatiente (desde dentro de `delay` rounds)"""
+        for message in self.effects.add(effect, combatant, self.round_number + delay):
+            self.log(f"  {message}")
+        return effect
+    
+    def remove_effect(self, effect: Effect):
+        """Termina un efecto antes de tiempo"""
+        for message in self.effects.remove(effect):
+            self.log(f"  {message}")
     
     def get_current_combatant(self) -> Optional[Combatant]:
         """Obtiene el combatiente actual"""
-        if self.current_turn_index < len(self.initiative_order):
-            return self.initiative_order[self.current_turn_index]
-        return None
+        return self.scheduler.current
+    
+    def current_group(self) -> List[Combatant]:
+        """
+        Combatiente actual y, con iniciativa de grupo, los monstruos de su
+        tipo que comparten su tirada y aún no han actuado este round.
+        """
+        current = self.get_current_combatant()
+        if current is None:
+            return []
+        if not self.group_initiative or current.group is None:
+            return [current]
+        return [current] + self.scheduler.companions(current, lambda a, b: a.group == b.group)
     
     def next_turn(self):
-        """Avanza al siguiente turno"""
+        """Avanza al siguiente turno (los caídos y los que ya actuaron en grupo se saltan)"""
         self.current_turn_index += 1
-        if self.current_turn_index >= len(self.initiative_order):
+        if self.scheduler.advance() is None:
             self.next_round()
     
+    @instrument('combate.ataque_grupo')
+    def make_group_attack(self, attackers: List[Combatant], targets, weapon_index: int = 0) -> dict:
+        """
+        Resuelve de una vez los ataques de un grupo de monstruos.
+        Los atacantes se reparten los objetivos por turnos; todos los d20 salen
+        de una tirada Nd20 y el daño de una tirada por tipo de dado, y cada
+        objetivo recibe su daño sumado. Los atacantes quedan como ya actuados
+        en este round.
+        """
+        if isinstance(targets, Combatant):
+            targets = [targets]
+        attackers = [a for a in attackers if a.is_alive and not incapacitated(a)]
+        targets = [t for t in targets if t.is_alive]
+        result = {
+            'attackers': len(attackers),
+            'hits': 0,
+            'damage': 0,
+            'critical': 0,
+            'fumble': 0,
+            'per_target': {},
+            'message': '',
+            'cannot_attack': False
+        }
+        if not attackers or not targets:
+            result['message'] = "⚠️ No hay atacantes u objetivos vivos"
+            return result
+        if any(a.is_player for a in attackers):
+            raise ValueError("make_group_attack sólo agrupa monstruos")
+        
+        label = f"{len(attackers)} {attackers[0].group or attackers[0].name}"
+        if self.combat_distance > 1:
+            result['cannot_attack'] = True
+            result['message'] = f"❌ {label} no pueden atacar a {self.combat_distance}m (ataque melé)"
+            return result
+        
+        # Tiradas de ataque: un d20 por atacante en una sola tirada
+        d20s = self.dice_roller.roll(f"{len(attackers)}d20", 0, f"Ataque de {label}")['rolls']
+        hits_by_dice: Dict[str, List[Tuple[Combatant, Combatant, bool]]] = {}
+        for i, (attacker, d20_roll) in enumerate(zip(attackers, d20s)):
+            target = targets[i % len(targets)]
+            if d20_roll == 1:
+                result['fumble'] += 1
+                continue
+            if d20_roll == 20 or d20_roll >= attacker.thac0 - target.ac - attacker.temp_attack_bonus:
+                result['hits'] += 1
+                result['critical'] += d20_roll == 20
+                attacks = attacker.entity.attacks
+                dice = attacks[weapon_index] if weapon_index < len(attacks) else None
+                hits_by_dice.setdefault(dice, []).append((attacker, target, d20_roll == 20))
+        
+        # Daño: una tirada por tipo de dado, repartida entre los impactos
+        damage_by_target: Dict[Combatant, int] = {}
+        for dice, hits in hits_by_dice.items():
+            try:
+                num_dice, die_size, bonus = parse_dice(dice)
+            except (AttributeError, IndexError, ValueError):
+                continue  # sin dados de daño ('Especial', parálisis...)
+            faces = self.dice_roller.roll(f"{num_dice * len(hits)}d{die_size}", 0,
+                                          f"Daño de {label}")['rolls']
+            for n, (attacker, target, critical) in enumerate(hits):
+                damage = sum(faces[n * num_dice:(n + 1) * num_dice]) + bonus + attacker.temp_damage_bonus
+                damage *= 2 if critical else 1
+                damage_by_target[target] = damage_by_target.get(target, 0) + damage
+        
+        lines = []
+        for target, damage in damage_by_target.items():
+            result['damage'] += damage
+            result['per_target'][target.name] = damage
+            lines.append(f"  {target.take_damage(damage)}")
+        
+        summary = f"⚔️ {label} atacan: {result['hits']} impactos, {result['damage']} daño"
+        extras = [f"{result['critical']} críticos"] if result['critical'] else []
+        extras += [f"{result['fumble']} pifias"] if result['fumble'] else []
+        if extras:
+            summary += f" ({', '.join(extras)})"
+        self.log(summary)
+        result['message'] = "\n".join([summary] + lines)
+        self.scheduler.act_together(attackers)
+        return result
+    
+    @instrument('combate.ataque')
     def make_attack(self, attacker: Combatant, defender: Combatant, weapon_index: int = 0) -> dict:
         """Realiza un ataque"""
         result = {
@@ -1347,6 +1674,12 @@ class CombatManager:
             'cannot_attack': False
         }
         
+        condition = incapacitated(attacker)
+        if condition:
+            result['cannot_attack'] = True
+            result['message'] = f"❌ {attacker.name} está {condition} y no puede atacar"
+            return result
+        
         # Verificar distancia y arma
         if attacker.is_player:
             equipped = attacker.entity.get('equipped', {})
@@ -1399,7 +1732,7 @@ class CombatManager:
             return result
         else:
             # Calcular si impacta: THAC0 - tirada >= AC objetivo
-            needed_roll = attacker.thac0 - defender.ac
+            needed_roll = attacker.thac0 - defender.ac - attacker.temp_attack_bonus
             result['hit'] = d20_roll >= needed_roll
             
             if result['hit']:
@@ -1425,9 +1758,10 @@ class CombatManager:
                 # Bonus de FUE (abilities o attributes)
                 abilities = attacker.entity.get('abilities', attacker.entity.get('attributes', {}))
                 str_val = abilities.get('strength', abilities.get('FUE', 10))
-                str_bonus = self._get_str_damage_bonus(str_val)
+                str_bonus = strength_damage_bonus(str_val, attacker.entity.get('exceptional_strength', 0))
                 
-                damage_roll = self.dice_roller.roll(damage_dice, str_bonus, f"Daño de {attacker.name}")
+                damage_roll = self.dice_roller.roll(damage_dice, str_bonus + attacker.temp_damage_bonus,
+                                                    f"Daño de {attacker.name}")
                 result['damage'] = max(1, damage_roll['total'])  # Mínimo 1 de daño
                 
                 result['message'] += f"\n  💥 Causa {result['damage']} de daño"
@@ -1435,7 +1769,8 @@ class CombatManager:
                 # Monstruo
                 if weapon_index < len(attacker.entity.attacks):
                     damage_dice = attacker.entity.attacks[weapon_index]
-                    damage_roll = self.dice_roller.roll(damage_dice, 0, f"Daño de {attacker.name}")
+                    damage_roll = self.dice_roller.roll(damage_dice, attacker.temp_damage_bonus,
+                                                        f"Daño de {attacker.name}")
                     result['damage'] = damage_roll['total']
                     result['message'] += f"\n  💥 Causa {result['damage']} de daño"
             
@@ -1450,14 +1785,6 @@ class CombatManager:
         
         return result
     
-    def _get_str_damage_bonus(self, strength: int) -> int:
-        """Bonus de daño por FUE según AD&D 2e"""
-        if strength >= 18: return 2
-        elif strength >= 16: return 1
-        elif strength <= 5: return -2
-        elif strength <= 7: return -1
-        return 0
-    
     def make_saving_throw(self, combatant: Combatant, save_type: str) -> dict:
         """Realiza una tirada de salvación"""
         result = {
@@ -1470,10 +1797,9 @@ class CombatManager:
         # Obtener valor de salvación
         if combatant.is_player:
             saves = combatant.entity.get('saving_throws', {})
-            needed = saves.get(save_type, 20)
         else:
             saves = combatant.entity.saves
-            needed = saves.get(save_type, 20)
+        needed = saves.get(resolve_save_name(save_type, saves), 20)
         
         # Tirar 1d20
         roll = self.dice_roller.roll("1d20", 0, f"Salvación de {combatant.name}")
@@ -1504,36 +1830,20 @@ class CombatManager:
     
     def show_combat_status(self):
         """Muestra el estado actual del combate"""
-        print(f"\n{'='*60}")
-        print(f"⚔️ ESTADO DEL COMBATE - Round {self.round_number} ⚔️")
-        print(f"{'='*60}")
-        
-        # Mostrar distancia global
-        distance_str = "MELÉ" if self.combat_distance <= 1 else f"{self.combat_distance}m"
-        print(f"\n📏 Distancia de combate: {distance_str}\n")
-        
-        print("👥 PERSONAJES:")
-        for c in self.combatants:
-            if c.is_player:
-                print(f"  {c}")
-        
-        print("\n🐉 ENEMIGOS:")
-        for c in self.combatants:
-            if not c.is_player:
-                print(f"  {c}")
-        
-        print(f"\n{'='*60}\n")
+        self.emit('combate.estado', round=self.round_number, distance=self.combat_distance,
+                  players=[c.snapshot() for c in self.combatants if c.is_player],
+                  enemies=[c.snapshot() for c in self.combatants if not c.is_player])
     
     def log(self, message: str):
         """Agrega mensaje al log de combate"""
         self.combat_log.append(message)
-        print(message)
+        self.emit('combate.log', message=message)
     
     def save_combat_log(self, filename: str = "combat_log.txt"):
         """Guarda el log de combate a archivo"""
         with open(filename, 'w', encoding='utf-8') as f:
             f.write('\n'.join(self.combat_log))
-        print(f"📝 Log guardado en {filename}")
+        self.message(f"📝 Log guardado en {filename}")
 
 
 def main():
@@ -1,58 +1,188 @@
 """
 Sistema de lanzamiento de dados para AD&D 2e
 Incluye todas las tiradas comunes del juego con bonificadores
+
+DiceRoller no imprime: emite eventos (core/eventos.py) con los datos de
+cada tirada y el texto se genera sólo si el destino lo necesita.
 """
 
-import random
 import json
 from pathlib import Path
 
+from .azar import stream
+from .esquema import load_character_file, resolve_save_name
+from .eventos import ERROR, Emitter, formatter
+from .historial import roll_history
+from .modificadores import (
+    character_strength, dexterity_reaction_bonus, strength_damage_bonus, strength_hit_bonus
+)
+from .rendimiento import instrument
+
+
+NO_CHARACTER = "❌ Debes cargar un personaje primero"
+
+
+@formatter('tirada')
+def format_roll(data):
+    rolls_str = ' + '.join(map(str, data['rolls']))
+    bonus = data['bonus']
+    bonus_str = f" {bonus:+d}" if bonus != 0 else ""
+    reason_str = f" ({data['reason']})" if data['reason'] else ""
+    text = f"\n🎲 {data['dice']}{bonus_str}{reason_str}\n   Tiradas: [{rolls_str}]{bonus_str} = {data['total']}"
+    # Destacar críticos y pifia en d20
+    if data['critical']:
+        text += "\n   ⭐ ¡CRÍTICO! ⭐"
+    elif data['fumble']:
+        text += "\n   💀 ¡PIFIA! 💀"
+    return text
+
+
+@formatter('personaje_cargado')
+def format_loaded(data):
+    return (f"✓ Personaje cargado: {data['name']}\n"
+            f"  Clase: {data['character_class']} Nivel {data['level']}")
+
+
+@formatter('chequeo')
+def format_check(data):
+    if data['success']:
+        return f"   ✓ ÉXITO (necesitabas {data['value']} o menos)"
+    return f"   ✗ FALLO (necesitabas {data['value']} o menos)"
+
+
+@formatter('salvacion')
+def format_save(data):
+    if data['success']:
+        return f"   ✓ SALVACIÓN EXITOSA (necesitabas {data['needed']}+)"
+    return f"   ✗ SALVACIÓN FALLIDA (necesitabas {data['needed']}+)"
+
+
+@formatter('ataque')
+def format_attack(data):
+    return (f"   THAC0: {data['thac0']} | Bonus FUE: {data['str_bonus']:+d} | Total: {data['total_bonus']:+d}\n"
+            f"   ⚔️  Golpeas CA {data['ac_hit']} o mejor")
+
+
+@formatter('sorpresa')
+def format_surprise(data):
+    return "   ⚡ ¡SORPRENDIDO!" if data['surprised'] else "   👀 No sorprendido"
+
 
-class DiceRoller:
-    """Lanzador de dados con soporte para personajes"""
+@formatter('expulsion')
+def format_turn_undead(data):
+    return (f"   Nivel del clérigo: {data['level']}\n"
+            "   Consulta la tabla de expulsión para ver el resultado")
+
+
+@formatter('habilidad_ladron')
+def format_thief_skill(data):
+    if data['success']:
+        return f"   ✓ ÉXITO (necesitabas {data['chance']}% o menos)"
+    return f"   ✗ FALLO (necesitabas {data['chance']}% o menos)"
+
+
+@formatter('personaje.estadisticas')
+def format_character_stats(data):
+    character = data['character']
+    lines = ["\n" + "="*60,
+             f"📊 ESTADÍSTICAS DE {character.get('name', 'PERSONAJE')}",
+             "="*60]
+    
+    # Atributos
+    lines.append("\nATRIBUTOS:")
+    for attr, val in character.get('attributes', {}).items():
+        lines.append(f"  {attr}: {val}")
+    
+    # Combate
+    hp = character.get('hp', {})
+    lines.append(f"\nCOMBATE:")
+    lines.append(f"  PG: {hp.get('current', 0)}/{hp.get('max', 0)}")
+    lines.append(f"  CA: {character.get('ac', 10)}")
+    lines.append(f"  THAC0: {character.get('thac0', 20)}")
+    
+    # Salvaciones
+    lines.append(f"\nTIRADAS DE SALVACIÓN:")
+    for save, val in character.get('saving_throws', {}).items():
+        lines.append(f"  {save.capitalize()}: {val}+")
+    
+    # Armas equipadas (equipped tiene nombres, equipment tiene datos)
+    equipped = character.get('equipped', {})
+    equipment = character.get('equipment', {})
+    if equipped.get('arma_principal'):
+        lines.append(f"\nARMAS EQUIPADAS:")
+        for label, slot in (('Principal', 'arma_principal'), ('Secundaria', 'arma_secundaria')):
+            name = equipped.get(slot)
+            if name:
+                weapon = equipment.get(name, {})
+                lines.append(f"  {label}: {name} (Daño: {weapon.get('damage', '?')})")
     
-    def __init__(self):
+    lines.append("="*60)
+    return "\n".join(lines)
+
+
+def parse_dice(dice_string):
+    """'3d8+5' -> (3, 8, 5); 'd20' -> (1, 20, 0)"""
+    parts = dice_string.lower().replace(' ', '').split('d')
+    num_dice = int(parts[0]) if parts[0] else 1
+    
+    # Separar dado y bonus
+    if '+' in parts[1]:
+        die_parts = parts[1].split('+')
+        return num_dice, int(die_parts[0]), int(die_parts[1])
+    if '-' in parts[1]:
+        die_parts = parts[1].split('-')
+        return num_dice, int(die_parts[0]), -int(die_parts[1])
+    return num_dice, int(parts[1]), 0
+
+
+class DiceRoller(Emitter):
+    """
+    Lanzador de dados con soporte para personajes.
+    Las tiradas salen del flujo 'dados' de la sesión (core/azar.py) o del
+    flujo `rng` indicado; cada tirada es un evento numerado (roll_id) que
+    replay() puede repetir exactamente. Todas las tiradas se anotan en
+    `history` (por defecto el historial compartido de la sesión).
+    """
+    
+    def __init__(self, sink=None, rng=None, history=None):
         self.character = None
         self.last_roll = None
+        self.sink = sink
+        self.rng = rng
+        self.history = history if history is not None else roll_history
+    
+    @property
+    def stream(self):
+        """Flujo aleatorio en uso (el de la sesión vigente si no se fijó uno)"""
+        return self.rng or stream('dados')
     
     def load_character(self, filename):
         """Carga un personaje desde JSON"""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_character_file(filename)
             
             self.character = data
-            print(f"✓ Personaje cargado: {data.get('name', 'Desconocido')}")
-            print(f"  Clase: {data.get('class', '?')} Nivel {data.get('level', 1)}")
+            self.emit('personaje_cargado', name=data.get('name', 'Desconocido'),
+                      character_class=data.get('class', '?'), level=data.get('level', 1))
             return True
         except Exception as e:
-            print(f"❌ Error cargando personaje: {e}")
+            self.message(f"❌ Error cargando personaje: {e}", ERROR)
             return False
     
+    @instrument('dados.tirada')
     def roll(self, dice_string, bonus=0, reason=""):
         """
         Lanza dados en formato XdY+Z
         Ejemplos: 1d20, 2d6, 3d8+5
         """
         try:
-            # Parsear dice_string
-            parts = dice_string.lower().replace(' ', '').split('d')
-            num_dice = int(parts[0]) if parts[0] else 1
+            num_dice, die_size, dice_bonus = parse_dice(dice_string)
+            bonus += dice_bonus
             
-            # Separar dado y bonus
-            if '+' in parts[1]:
-                die_parts = parts[1].split('+')
-                die_size = int(die_parts[0])
-                bonus += int(die_parts[1])
-            elif '-' in parts[1]:
-                die_parts = parts[1].split('-')
-                die_size = int(die_parts[0])
-                bonus -= int(die_parts[1])
-            else:
-                die_size = int(parts[1])
-            
-            # Lanzar dados
-            rolls = [random.randint(1, die_size) for _ in range(num_dice)]
+            # Lanzar dados (un evento del flujo por tirada)
+            rng = self.stream
+            roll_id = rng.advance()
+            rolls = rng.dice(num_dice, die_size)
             total = sum(rolls) + bonus
             
             # Verificar crítico/pifia
@@ -67,30 +197,31 @@ class DiceRoller:
                 'total': total,
                 'reason': reason,
                 'critical': critical,
-                'fumble': fumble
+                'fumble': fumble,
+                'roll_id': roll_id
             }
             
-            # Mostrar resultado
-            rolls_str = ' + '.join(map(str, rolls))
-            bonus_str = f" {bonus:+d}" if bonus != 0 else ""
-            reason_str = f" ({reason})" if reason else ""
-            
-            print(f"\n🎲 {dice_string}{bonus_str}{reason_str}")
-            print(f"   Tiradas: [{rolls_str}]{bonus_str} = {total}")
-            
-            # Destacar críticos y pifia en d20
-            if critical:
-                print("   ⭐ ¡CRÍTICO! ⭐")
-            elif fumble:
-                print("   💀 ¡PIFIA! 💀")
-            
+            try:
+                self.history.record(die_size, rolls, bonus, total,
+                                    self.character.get('name', '') if self.character else '')
+            except (OverflowError, TypeError):
+                pass  # el historial es sólo un registro: nunca anula una tirada hecha
+            self.emit('tirada', **self.last_roll)
             return self.last_roll
             
         except Exception as e:
-            print(f"❌ Error en tirada: {e}")
-            print("Formato: XdY+Z (ej: 1d20, 2d6+3)")
+            self.message(f"❌ Error en tirada: {e}\nFormato: XdY+Z (ej: 1d20, 2d6+3)", ERROR)
             return None
     
+    def replay(self, roll_id, dice_string):
+        """
+        Repite la tirada número roll_id del flujo actual sin alterarlo
+        (para comprobar una tirada discutida). Devuelve los dados obtenidos.
+        Sólo con flujos CounterStream: un FaceBuffer no guarda las tiradas.
+        """
+        num_dice, die_size, _ = parse_dice(dice_string)
+        return self.stream.at(roll_id).dice(num_dice, die_size)
+    
     def d20(self, bonus=0, reason=""):
         """Tirada de d20 (la más común)"""
         result = self.roll("1d20", bonus, reason)
@@ -104,52 +235,46 @@ class DiceRoller:
     def ability_check(self, ability_name):
         """Tirada de atributo (tirar bajo el valor)"""
         if not self.character:
-            print("❌ Debes cargar un personaje primero")
+            self.message(NO_CHARACTER, ERROR)
             return None
         
         attrs = self.character.get('attributes', {})
         ability_value = attrs.get(ability_name.upper())
         
         if ability_value is None:
-            print(f"❌ Atributo '{ability_name}' no encontrado")
+            self.message(f"❌ Atributo '{ability_name}' no encontrado", ERROR)
             return None
         
         roll = self.d20(0, f"Chequeo de {ability_name}")
-        
-        if roll <= ability_value:
-            print(f"   ✓ ÉXITO (necesitabas {ability_value} o menos)")
-            return True
-        else:
-            print(f"   ✗ FALLO (necesitabas {ability_value} o menos)")
-            return False
+        success = roll <= ability_value
+        self.emit('chequeo', attribute=ability_name.upper(), value=ability_value,
+                  roll=roll, success=success)
+        return success
     
     def saving_throw(self, save_type):
         """Tirada de salvación"""
         if not self.character:
-            print("❌ Debes cargar un personaje primero")
+            self.message(NO_CHARACTER, ERROR)
             return None
         
         saves = self.character.get('saving_throws', {})
-        save_value = saves.get(save_type.lower())
+        save_name = resolve_save_name(save_type, saves)
+        save_value = saves.get(save_name) if save_name else None
         
         if save_value is None:
-            print(f"❌ Salvación '{save_type}' no encontrada")
-            print(f"Tipos válidos: {', '.join(saves.keys())}")
+            self.message(f"❌ Salvación '{save_type}' no encontrada\n"
+                         f"Tipos válidos: {', '.join(saves.keys())}", ERROR)
             return None
         
-        roll = self.d20(0, f"TS de {save_type.capitalize()}")
-        
-        if roll >= save_value:
-            print(f"   ✓ SALVACIÓN EXITOSA (necesitabas {save_value}+)")
-            return True
-        else:
-            print(f"   ✗ SALVACIÓN FALLIDA (necesitabas {save_value}+)")
-            return False
+        roll = self.d20(0, f"TS de {save_name}")
+        success = roll >= save_value
+        self.emit('salvacion', save=save_name, needed=save_value, roll=roll, success=success)
+        return success
     
     def attack_roll(self, weapon_name=None, bonus=0):
         """Tirada de ataque"""
         if not self.character:
-            print("❌ Debes cargar un personaje primero")
+            self.message(NO_CHARACTER, ERROR)
             return None
         
         thac0 = self.character.get('thac0', 20)
@@ -175,8 +300,7 @@ class DiceRoller:
                 weapon_str = f" con {arma_principal}"
         
         # Bonus de FUE para ataques cuerpo a cuerpo
-        str_val = self.character.get('attributes', {}).get('FUE', 10)
-        str_bonus = self._get_str_attack_bonus(str_val)
+        str_bonus = strength_hit_bonus(*character_strength(self.character))
         
         total_bonus = bonus + str_bonus
         
@@ -185,8 +309,8 @@ class DiceRoller:
         # Calcular CA golpeada
         ac_hit = thac0 - roll
         
-        print(f"   THAC0: {thac0} | Bonus FUE: {str_bonus:+d} | Total: {total_bonus:+d}")
-        print(f"   ⚔️  Golpeas CA {ac_hit} o mejor")
+        self.emit('ataque', roll=roll, thac0=thac0, str_bonus=str_bonus,
+                  total_bonus=total_bonus, ac_hit=ac_hit)
         
         return {
             'roll': roll,
@@ -195,19 +319,10 @@ class DiceRoller:
             'bonus': total_bonus
         }
     
-    def _get_str_attack_bonus(self, strength):
-        """Bonus de ataque por FUE según AD&D 2e"""
-        if strength >= 18: return 1
-        elif strength >= 17: return 1
-        elif strength >= 16: return 0
-        elif strength <= 5: return -2
-        elif strength <= 7: return -1
-        return 0
-    
     def damage_roll(self, weapon_name=None, bonus=0):
         """Tirada de daño"""
         if not self.character:
-            print("❌ Debes cargar un personaje primero")
+            self.message(NO_CHARACTER, ERROR)
             return None
         
         # Buscar arma equipada (nuevo formato)
@@ -234,8 +349,7 @@ class DiceRoller:
                 damage_dice = weapon_data.get('damage', '1d6')
         
         # Bonus de FUE para daño cuerpo a cuerpo
-        str_val = self.character.get('attributes', {}).get('FUE', 10)
-        str_bonus = self._get_str_damage_bonus(str_val)
+        str_bonus = strength_damage_bonus(*character_strength(self.character))
         
         total_bonus = bonus + str_bonus
         
@@ -246,112 +360,65 @@ class DiceRoller:
         
         return total
     
-    def _get_str_damage_bonus(self, strength):
-        """Bonus de daño por FUE según AD&D 2e"""
-        if strength >= 18: return 2
-        elif strength >= 16: return 1
-        elif strength <= 5: return -2
-        elif strength <= 7: return -1
-        return 0
-    
     def initiative(self):
         """Tirada de iniciativa (d10 en AD&D 2e)"""
         if self.character:
             dex = self.character.get('attributes', {}).get('DES', 10)
-            # Bonus de DES a iniciativa (opcional)
-            bonus = (dex - 10) // 4  # Pequeño bonus por DES alta
+            # Ajuste de reacción por DES aplicado a la iniciativa (opcional)
+            bonus = dexterity_reaction_bonus(dex)
             return self.roll("1d10", -bonus, "Iniciativa")  # Negativo porque menor es mejor
         else:
             return self.roll("1d10", 0, "Iniciativa")
     
     def surprise(self):
         """Tirada de sorpresa (d6, sorpresa en 1-2)"""
-        roll = self.roll("1d6", 0, "Sorpresa")
-        if roll <= 2:
-            print("   ⚡ ¡SORPRENDIDO!")
-            return True
-        else:
-            print("   👀 No sorprendido")
-            return False
+        result = self.roll("1d6", 0, "Sorpresa")
+        surprised = result['total'] <= 2
+        self.emit('sorpresa', roll=result['total'], surprised=surprised)
+        return surprised
     
     def turn_undead(self):
         """Tirada para expulsar no-muertos (d20)"""
         if not self.character:
-            print("❌ Debes cargar un personaje primero")
+            self.message(NO_CHARACTER, ERROR)
             return None
         
         char_class = self.character.get('class', '')
         if char_class not in ['Clérigo', 'Paladín']:
-            print(f"❌ {char_class} no puede expulsar no-muertos")
+            self.message(f"❌ {char_class} no puede expulsar no-muertos", ERROR)
             return None
         
         level = self.character.get('level', 1)
         roll = self.d20(0, "Expulsar no-muertos")
         
-        print(f"   Nivel del clérigo: {level}")
-        print("   Consulta la tabla de expulsión para ver el resultado")
+        self.emit('expulsion', level=level, roll=roll)
         
         return roll
     
     def thief_skill(self, skill_name, base_chance):
         """Tirada de habilidad de ladrón (d100)"""
         if not self.character:
-            print("❌ Debes cargar un personaje primero")
+            self.message(NO_CHARACTER, ERROR)
             return None
         
         char_class = self.character.get('class', '')
         if 'Ladrón' not in char_class and 'Bardo' not in char_class:
-            print(f"❌ {char_class} no tiene habilidades de ladrón")
+            self.message(f"❌ {char_class} no tiene habilidades de ladrón", ERROR)
             return None
         
         roll = self.d100(f"Habilidad: {skill_name}")
         
-        if roll <= base_chance:
-            print(f"   ✓ ÉXITO (necesitabas {base_chance}% o menos)")
-            return True
-        else:
-            print(f"   ✗ FALLO (necesitabas {base_chance}% o menos)")
-            return False
+        success = roll <= base_chance
+        self.emit('habilidad_ladron', skill=skill_name, chance=base_chance, roll=roll, success=success)
+        return success
     
     def show_character_stats(self):
         """Muestra las estadísticas del personaje cargado"""
         if not self.character:
-            print("❌ No hay personaje cargado")
+            self.message("❌ No hay personaje cargado", ERROR)
             return
         
-        print("\n" + "="*60)
-        print(f"📊 ESTADÍSTICAS DE {self.character.get('name', 'PERSONAJE')}")
-        print("="*60)
-        
-        # Atributos
-        print("\nATRIBUTOS:")
-        attrs = self.character.get('attributes', {})
-        for attr, val in attrs.items():
-            print(f"  {attr}: {val}")
-        
-        # Combate
-        print(f"\nCOMBATE:")
-        print(f"  PG: {self.character.get('hp_current', 0)}/{self.character.get('hp_max', 0)}")
-        print(f"  CA: {self.character.get('ac', 10)}")
-        print(f"  THAC0: {self.character.get('thac0', 20)}")
-        
-        # Salvaciones
-        print(f"\nTIRADAS DE SALVACIÓN:")
-        saves = self.character.get('saving_throws', {})
-        for save, val in saves.items():
-            print(f"  {save.capitalize()}: {val}+")
-        
-        # Armas equipadas
-        equipped = self.character.get('equipped', {})
-        if equipped.get('arma_principal'):
-            print(f"\nARMAS EQUIPADAS:")
-            wp = equipped['arma_principal']
-            print(f"  Principal: {wp['nombre']} (Ataque: {wp['ataque']:+d}, Daño: {wp['daño']})")
-            if equipped.get('arma_secundaria'):
-                ws = equipped['arma_secundaria']
-                print(f"  Secundaria: {ws['nombre']} (Ataque: {ws['ataque']:+d}, Daño: {ws['daño']})")
-        
-        print("="*60)
+        self.emit('personaje.estadisticas', character=self.character)
 
 
 def main():
@@ -0,0 +1,290 @@
+"""
+Efectos temporales y estados de combate
+
+Un Effect (bendición, veneno, parálisis, regeneración...) se aplica a un
+combatiente con una duración en rounds: al empezar suma sus modificadores a
+los bonus temporales del combatiente (temp_attack_bonus, temp_damage_bonus,
+temp_ac_bonus) y añade su estado a `conditions`; cada `every` rounds puede
+curar o dañar (per_round); al expirar lo deshace todo.
+
+EffectEngine agenda esos momentos (inicio, tick, fin) en una rueda de tiempo
+indexada por round: WHEEL_SIZE casillas, y cada evento va a la casilla
+round % WHEEL_SIZE. Avanzar un round sólo mira su casilla, así que el coste
+depende de los efectos que empiezan, actúan o terminan en ese round y no del
+número de combatientes ni de sus habilidades. Los eventos que caen más de
+una vuelta después esperan en la casilla hasta que llega su round.
+"""
+
+import re
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+WHEEL_SIZE = 64
+
+# Estados que impiden actuar (atacar) mientras duran
+INCAPACITATING = frozenset({'paralizado', 'dormido', 'aturdido', 'inmovilizado'})
+
+# Modificador del efecto -> bono temporal del combatiente
+MODIFIER_FIELDS = {
+    'attack': 'temp_attack_bonus',
+    'damage': 'temp_damage_bonus',
+    'ac': 'temp_ac_bonus',
+}
+
+_START, _TICK, _EXPIRE = 0, 1, 2
+
+
+class Effect:
+    """
+    Efecto con duración sobre un combatiente.
+    rounds=None es permanente (p. ej. la regeneración de un troll).
+    per_round: PG por tick; entero (negativo = daño) o dados ('1d4' cura,
+    '-1d4' daña).
+    """
+
+    __slots__ = ('name', 'rounds', 'per_round', 'modifiers', 'condition', 'every',
+                 'target', 'start', 'end', 'first_tick', 'active')
+
+    def __init__(self, name: str, rounds: Optional[int] = None,
+                 per_round: Union[int, str] = 0, modifiers: Optional[Dict[str, int]] = None,
+                 condition: Optional[str] = None, every: int = 1):
+        if rounds is not None and rounds < 1:
+            raise ValueError("La duración de un efecto es de al menos 1 round")
+        unknown = set(modifiers or ()) - set(MODIFIER_FIELDS)
+        if unknown:
+            raise ValueError(f"Modificadores desconocidos: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.rounds = rounds
+        self.per_round = per_round
+        self.modifiers = dict(modifiers or {})
+        self.condition = condition
+        self.every = max(1, every)
+        self.target = None
+        self.start = 0
+        self.end: Optional[int] = None
+        self.first_tick: Optional[int] = None
+        self.active = False
+
+    def __repr__(self):
+        return f"Effect({self.name!r}, rounds={self.rounds})"
+
+
+# ----------------------------------------------------------------------
+# Efectos habituales
+# ----------------------------------------------------------------------
+
+def blessing(rounds: int = 6) -> Effect:
+    """Bendecir: +1 al ataque durante 6 rounds"""
+    return Effect('Bendición', rounds, modifiers={'attack': 1})
+
+
+def poison(rounds: int = 3, damage: str = '1d4') -> Effect:
+    """Veneno lento: daño cada round mientras dura"""
+    return Effect('Veneno', rounds, per_round=f"-{damage}", condition='envenenado')
+
+
+def paralysis(rounds: int = 4) -> Effect:
+    return Effect('Parálisis', rounds, condition='paralizado')
+
+
+def sleep(rounds: int = 5) -> Effect:
+    return Effect('Sueño', rounds, condition='dormido')
+
+
+def protection(rounds: int = 10) -> Effect:
+    """Protección: CA 2 puntos mejor"""
+    return Effect('Protección', rounds, modifiers={'ac': -2})
+
+
+def regeneration(amount: int) -> Effect:
+    return Effect('Regeneración', None, per_round=amount)
+
+
+PRESETS: Dict[str, Callable[..., Effect]] = {
+    'bendicion': blessing,
+    'veneno': poison,
+    'paralisis': paralysis,
+    'sueno': sleep,
+    'proteccion': protection,
+    'regeneracion': regeneration,
+}
+
+_REGENERATION_HP = re.compile(r'(\d+)\s*HP')
+
+
+def preset_key(name: str) -> str:
+    """Clave de PRESETS para un nombre escrito con o sin tildes ni mayúsculas"""
+    return unicodedata.normalize('NFKD', name.lower()).encode('ascii', 'ignore').decode()
+
+
+def make_effect(name: str, *args) -> Effect:
+    """Crea un efecto de PRESETS por nombre (sin importar tildes ni mayúsculas)"""
+    key = preset_key(name)
+    if key not in PRESETS:
+        raise ValueError(f"Efecto desconocido: {name} (disponibles: {', '.join(PRESETS)})")
+    return PRESETS[key](*args)
+
+
+def effects_from_abilities(abilities: List[str]) -> List[Effect]:
+    """Efectos permanentes de las habilidades especiales ('Regeneración 3 HP/round')"""
+    effects = []
+    for ability in abilities:
+        if 'Regeneración' in ability:
+            match = _REGENERATION_HP.search(ability)
+            if match:
+                effects.append(regeneration(int(match.group(1))))
+    return effects
+
+
+def incapacitated(combatant) -> Optional[str]:
+    """Estado que impide actuar al combatiente, o None"""
+    for condition in combatant.conditions:
+        if condition in INCAPACITATING:
+            return condition
+    return None
+
+
+# ----------------------------------------------------------------------
+# Motor
+# ----------------------------------------------------------------------
+
+class EffectEngine:
+    """Rueda de tiempo de los efectos de un combate"""
+
+    def __init__(self, roll: Optional[Callable[[str], int]] = None, size: int = WHEEL_SIZE):
+        self.roll = roll
+        self.size = size
+        self.slots: List[List[Tuple[int, int, int, Effect]]] = [[] for _ in range(size)]
+        self.round = 0  # último round procesado
+        self._sequence = 0
+        self.by_target: Dict[int, List[Effect]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(effects) for effects in self.by_target.values())
+
+    def _schedule(self, due: int, kind: int, effect: Effect):
+        self._sequence += 1
+        self.slots[due % self.size].append((due, kind, self._sequence, effect))
+
+    def add(self, effect: Effect, target, start: Optional[int] = None,
+            first_tick: Optional[int] = None) -> List[str]:
+        """
+        Aplica `effect` a `target` desde el round `start` (por defecto el
+        actual). first_tick retrasa la primera curación o daño (por defecto
+        start + every). Devuelve los mensajes si empieza ya.
+        """
+        if effect.target is not None:
+            raise ValueError(f"El efecto {effect.name} ya está aplicado")
+        effect.target = target
+        effect.start = self.round if start is None else max(start, self.round)
+        effect.end = None if effect.rounds is None else effect.start + effect.rounds
+        effect.first_tick = first_tick
+        if effect.start > self.round:
+            self._schedule(effect.start, _START, effect)
+            return []
+        return self._begin(effect)
+
+    def remove(self, effect: Effect) -> List[str]:
+        """Termina un efecto antes de tiempo (disipar, curar veneno...)"""
+        if not effect.active:
+            effect.end = -1  # aún no empezado: el inicio se descarta
+            return []
+        return self._finish(effect)
+
+    def effects_on(self, target) -> List[Effect]:
+        return list(self.by_target.get(id(target), ()))
+
+    def clear(self, target) -> List[str]:
+        messages = []
+        for effect in self.effects_on(target):
+            messages.extend(self.remove(effect))
+        return messages
+
+    def advance(self, round_number: int) -> List[str]:
+        """Procesa los eventos hasta `round_number` (normalmente sólo ese round)"""
+        messages = []
+        while self.round < round_number:
+            self.round += 1
+            messages.extend(self._run_slot(self.round))
+        return messages
+
+    def _run_slot(self, round_number: int) -> List[str]:
+        slot = self.slots[round_number % self.size]
+        if not slot:
+            return []
+        due = [event for event in slot if event[0] == round_number]
+        if not due:
+            return []
+        slot[:] = [event for event in slot if event[0] != round_number]
+        due.sort(key=lambda event: (event[1], event[2]))
+
+        messages = []
+        for _, kind, _, effect in due:
+            if kind == _START:
+                if effect.end is None or effect.end >= effect.start:
+                    messages.extend(self._begin(effect))
+            elif not effect.active:
+                continue  # terminado antes de tiempo: el evento se descarta
+            elif kind == _TICK:
+                messages.extend(self._tick(effect, round_number))
+            else:
+                messages.extend(self._finish(effect))
+        return messages
+
+    def _begin(self, effect: Effect) -> List[str]:
+        target = effect.target
+        effect.active = True
+        for key, value in effect.modifiers.items():
+            field = MODIFIER_FIELDS[key]
+            setattr(target, field, getattr(target, field) + value)
+        if effect.condition:
+            target.conditions.append(effect.condition)
+        self.by_target.setdefault(id(target), []).append(effect)
+
+        if effect.per_round:
+            first_tick = max(effect.first_tick or 0, effect.start + effect.every)
+            if effect.end is None or first_tick <= effect.end:
+                self._schedule(first_tick, _TICK, effect)
+        if effect.end is not None:
+            self._schedule(effect.end, _EXPIRE, effect)
+        if effect.rounds is None:
+            return []  # rasgos permanentes: sin aviso
+        return [f"✨ {effect.name} afecta a {target.name} ({effect.rounds} rounds)"]
+
+    def _tick(self, effect: Effect, round_number: int) -> List[str]:
+        target = effect.target
+        if not target.is_alive:
+            self._finish(effect)
+            return []
+        next_tick = round_number + effect.every
+        if effect.end is None or next_tick <= effect.end:
+            self._schedule(next_tick, _TICK, effect)
+
+        amount = effect.per_round
+        if isinstance(amount, str):
+            sign = -1 if amount.startswith('-') else 1
+            amount = sign * self.roll(amount.lstrip('-+')) if self.roll else 0
+        if amount > 0:
+            if target.hp >= target.max_hp:
+                return []
+            return [f"🔄 {target.heal(amount)}"]
+        if amount < 0:
+            return [f"☠️ {effect.name}: {target.take_damage(-amount)}"]
+        return []
+
+    def _finish(self, effect: Effect) -> List[str]:
+        target = effect.target
+        effect.active = False
+        for key, value in effect.modifiers.items():
+            field = MODIFIER_FIELDS[key]
+            setattr(target, field, getattr(target, field) - value)
+        if effect.condition and effect.condition in target.conditions:
+            target.conditions.remove(effect.condition)
+        effects = self.by_target.get(id(target), [])
+        if effect in effects:
+            effects.remove(effect)
+            if not effects:
+                del self.by_target[id(target)]
+        if not target.is_alive:
+            return []
+        return [f"⏳ {effect.name} termina para {target.name}"]
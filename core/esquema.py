@@ -0,0 +1,390 @@
+"""
+Esquema canónico de personajes AD&D 2e
+Normaliza las distintas variantes de JSON de personaje a un único formato
+
+Formato canónico (el que usan combate, dados y las interfaces):
+    hp: {'max', 'current'}, ac, thac0
+    equipment: {nombre: {'type', 'quantity', ...}}
+    equipped: {'arma_principal', 'arma_secundaria', 'armadura', 'escudo'} -> nombre o None
+    saving_throws: nombres largos ('Paralización, Veneno o Muerte por Magia', ...)
+    money: nombres largos ('Piezas de Oro', ...)
+    proficiencies: {'weapon': [...], 'non_weapon': [...]}
+
+El creador de personajes sigue guardando el formato antiguo (hit_points_*,
+armor_class, equipped con diccionarios); se normaliza al cargar.
+
+Uso como herramienta de migración:
+    python core/esquema.py [directorio] [--write]
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SCHEMA_VERSION = 2
+
+ATTRIBUTE_KEYS = ('FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR')
+
+EQUIPPED_SLOTS = ('arma_principal', 'arma_secundaria', 'armadura', 'escudo')
+
+SAVE_NAMES = (
+    'Paralización, Veneno o Muerte por Magia',
+    'Varita Mágica',
+    'Petrificación o Transformación',
+    'Soplo de Dragón',
+    'Conjuro, Bastón o Vara',
+)
+
+# Alias cortos (formato antiguo y comandos de consola) -> nombre canónico
+SAVE_ALIASES = {
+    'paralisis': SAVE_NAMES[0],
+    'paralización': SAVE_NAMES[0],
+    'veneno': SAVE_NAMES[0],
+    'muerte': SAVE_NAMES[0],
+    'varitas': SAVE_NAMES[1],
+    'varita': SAVE_NAMES[1],
+    'petrificacion': SAVE_NAMES[2],
+    'petrificación': SAVE_NAMES[2],
+    'aliento': SAVE_NAMES[3],
+    'soplo': SAVE_NAMES[3],
+    'conjuros': SAVE_NAMES[4],
+    'conjuro': SAVE_NAMES[4],
+}
+
+COIN_NAMES = (
+    'Piezas de Oro',
+    'Piezas de Platino',
+    'Piezas de Plata',
+    'Piezas de Electro',
+    'Piezas de Cobre',
+)
+
+COIN_ALIASES = {
+    'po': 'Piezas de Oro',
+    'pp': 'Piezas de Platino',
+    'pa': 'Piezas de Plata',
+    'pe': 'Piezas de Electro',
+    'pc': 'Piezas de Cobre',
+    'oro': 'Piezas de Oro',
+    'platino': 'Piezas de Platino',
+    'plata': 'Piezas de Plata',
+    'electro': 'Piezas de Electro',
+    'cobre': 'Piezas de Cobre',
+}
+
+PROFICIENCY_ALIASES = {
+    'armas': 'weapon',
+    'no_armas': 'non_weapon',
+}
+
+
+class SchemaError(ValueError):
+    """El JSON no corresponde a ninguna variante conocida de personaje"""
+
+
+def resolve_save_name(save_type: str, saves: Optional[Dict] = None) -> Optional[str]:
+    """
+    Traduce un tipo de salvación (alias corto, nombre largo o prefijo) al
+    nombre canónico. Si se pasa `saves`, sólo devuelve claves existentes.
+    """
+    if not save_type:
+        return None
+    key = save_type.strip()
+    lowered = key.lower()
+    candidates = saves.keys() if saves is not None else SAVE_NAMES
+
+    for name in candidates:
+        if name.lower() == lowered:
+            return name
+
+    name = SAVE_ALIASES.get(lowered)
+    if name and (saves is None or name in saves):
+        return name
+
+    for name in candidates:
+        if name.lower().startswith(lowered):
+            return name
+    return None
+
+
+def resolve_coin_name(coin_type: str) -> Optional[str]:
+    """Traduce un tipo de moneda (po, oro, 'Piezas de Oro'...) al nombre canónico"""
+    if coin_type in COIN_NAMES:
+        return coin_type
+    return COIN_ALIASES.get(coin_type.lower())
+
+
+def _as_int(value: Any, field: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise SchemaError(f"Campo '{field}' no numérico: {value!r}")
+
+
+def _normalize_hp(data: Dict) -> Dict[str, int]:
+    hp = data.get('hp')
+    if isinstance(hp, dict):
+        hp_max = hp.get('max', hp.get('current', 0))
+        hp_current = hp.get('current', hp_max)
+    elif 'hit_points_max' in data or 'hit_points_current' in data:
+        hp_max = data.get('hit_points_max', data.get('hit_points_current', 0))
+        hp_current = data.get('hit_points_current', hp_max)
+    elif 'hp_max' in data or 'hp_current' in data:
+        hp_max = data.get('hp_max', data.get('hp_current', 0))
+        hp_current = data.get('hp_current', hp_max)
+    elif isinstance(hp, (int, float)):
+        hp_max = hp_current = hp
+    else:
+        raise SchemaError("No se encontraron puntos de golpe (hp / hit_points_*)")
+    return {'max': _as_int(hp_max, 'hp.max'), 'current': _as_int(hp_current, 'hp.current')}
+
+
+def _normalize_saves(saves: Dict) -> Dict[str, int]:
+    result = {}
+    for key, value in (saves or {}).items():
+        name = resolve_save_name(key) or key
+        result[name] = _as_int(value, f"saving_throws.{key}")
+    return result
+
+
+def _normalize_money(money: Dict) -> Dict[str, int]:
+    result = {name: 0 for name in COIN_NAMES}
+    for key, value in (money or {}).items():
+        name = resolve_coin_name(key) or key
+        result[name] = result.get(name, 0) + _as_int(value, f"money.{key}")
+    return result
+
+
+def _normalize_proficiencies(profs: Dict) -> Dict[str, List[str]]:
+    result = {'weapon': [], 'non_weapon': []}
+    for key, values in (profs or {}).items():
+        result.setdefault(PROFICIENCY_ALIASES.get(key, key), []).extend(values or [])
+    return result
+
+
+def _legacy_item(slot: str, item: Dict) -> Tuple[str, Dict]:
+    """Convierte una entrada antigua de 'equipped' ({nombre, daño, ca...}) en (nombre, objeto)"""
+    name = item.get('nombre') or item.get('name')
+    if not name:
+        raise SchemaError(f"Objeto equipado en '{slot}' sin nombre")
+    if slot in ('arma_principal', 'arma_secundaria'):
+        entry = {'type': 'weapon', 'damage': item.get('daño', item.get('damage', '1d6'))}
+        if item.get('ataque'):
+            entry['attack_bonus'] = item['ataque']
+    elif slot == 'armadura':
+        entry = {'type': 'armor', 'ac': item.get('ca', item.get('ac', 10))}
+    else:
+        entry = {'type': 'shield', 'ac_bonus': item.get('ca_bonus', item.get('ac_bonus', -1))}
+    entry['quantity'] = 1
+    return name, entry
+
+
+def _normalize_equipment(data: Dict) -> Tuple[Dict[str, Dict], Dict[str, Optional[str]]]:
+    raw_equipment = data.get('equipment') or {}
+    raw_equipped = data.get('equipped') or {}
+
+    if isinstance(raw_equipment, list):
+        equipment = {}
+        for item in raw_equipment:
+            if item in equipment:
+                equipment[item]['quantity'] += 1
+            else:
+                equipment[item] = {'type': 'other', 'quantity': 1}
+    elif isinstance(raw_equipment, dict):
+        equipment = {name: dict(item) for name, item in raw_equipment.items()}
+    else:
+        raise SchemaError(f"'equipment' con tipo inesperado: {type(raw_equipment).__name__}")
+
+    equipped = {slot: None for slot in EQUIPPED_SLOTS}
+    for slot, item in raw_equipped.items():
+        if item is None or item == '':
+            equipped[slot] = None
+        elif isinstance(item, str):
+            if item not in equipment:
+                raise SchemaError(f"'{item}' equipado en '{slot}' no está en el equipo")
+            equipped[slot] = item
+        elif isinstance(item, dict):
+            name, entry = _legacy_item(slot, item)
+            merged = equipment.get(name, {})
+            if merged.get('type', 'other') == 'other':
+                entry['quantity'] = merged.get('quantity', 1)
+                equipment[name] = entry
+            equipped[slot] = name
+        else:
+            raise SchemaError(f"Entrada '{slot}' con tipo inesperado: {type(item).__name__}")
+    return equipment, equipped
+
+
+def is_canonical(data: Dict) -> bool:
+    """True si el diccionario ya está en formato canónico"""
+    return data.get('schema_version') == SCHEMA_VERSION
+
+
+def normalize_character(data: Dict) -> Dict:
+    """
+    Convierte cualquier variante conocida de personaje al formato canónico.
+    Es idempotente y modifica `data` in situ (devuelve el mismo objeto), para
+    que quien ya comparte la referencia vea los cambios.
+    Lanza SchemaError si faltan campos imprescindibles o tienen tipos inválidos.
+    """
+    if not isinstance(data, dict):
+        raise SchemaError("El personaje debe ser un objeto JSON")
+    if is_canonical(data):
+        return data
+    if not data.get('name'):
+        raise SchemaError("El personaje no tiene nombre")
+
+    attributes = data.get('attributes') or {}
+    missing = [attr for attr in ATTRIBUTE_KEYS if attr not in attributes]
+    if missing:
+        raise SchemaError(f"Faltan atributos: {', '.join(missing)}")
+
+    # Se calcula todo antes de tocar `data` para no dejarlo a medio migrar
+    normalized = {
+        'race': data.get('race') or 'N/A',
+        'class': data.get('class') or 'N/A',
+        'level': _as_int(data.get('level', 1), 'level'),
+        'experience': _as_int(data.get('experience', 0), 'experience'),
+        'attributes': {attr: _as_int(value, attr) for attr, value in attributes.items()},
+        'hp': _normalize_hp(data),
+        'ac': _as_int(data.get('ac', data.get('armor_class', 10)), 'ac'),
+        'thac0': _as_int(data.get('thac0', 20), 'thac0'),
+        'saving_throws': _normalize_saves(data.get('saving_throws')),
+        'proficiencies': _normalize_proficiencies(data.get('proficiencies')),
+        'money': _normalize_money(data.get('money')),
+    }
+    normalized['equipment'], normalized['equipped'] = _normalize_equipment(data)
+
+    for legacy_key in ('hit_points_max', 'hit_points_current', 'armor_class', 'hp_max', 'hp_current'):
+        data.pop(legacy_key, None)
+    data.update(normalized)
+    data.setdefault('kit', None)
+    data.setdefault('known_spells', [])
+    data.setdefault('prepared_spells', [])
+    data['schema_version'] = SCHEMA_VERSION
+    return data
+
+
+# Claves cortas que usan los generadores de fichas (utils/generar_*_ficha.py)
+SHEET_SAVE_KEYS = dict(zip(SAVE_NAMES, ('paralisis', 'varitas', 'petrificacion', 'aliento', 'conjuros')))
+SHEET_COIN_KEYS = {'Piezas de Oro': 'po', 'Piezas de Platino': 'pp', 'Piezas de Plata': 'pa',
+                   'Piezas de Electro': 'pe', 'Piezas de Cobre': 'pc'}
+
+
+def to_sheet_format(data: Dict) -> Dict:
+    """
+    Vista plana de un personaje canónico para los generadores de fichas
+    (hp_current/hp_max, equipado con diccionarios, claves cortas).
+    No modifica `data`.
+    """
+    char = data if is_canonical(data) else normalize_character(copy.deepcopy(data))
+    equipment = char['equipment']
+
+    def item(slot):
+        name = char['equipped'].get(slot)
+        if not name:
+            return None
+        entry = equipment.get(name, {})
+        if slot in ('arma_principal', 'arma_secundaria'):
+            return {'nombre': name, 'ataque': entry.get('attack_bonus', 0),
+                    'daño': entry.get('damage', '1d6')}
+        if slot == 'armadura':
+            return {'nombre': name, 'ca': entry.get('ac', 10)}
+        return {'nombre': name, 'ca_bonus': entry.get('ac_bonus', -1)}
+
+    sheet = {k: v for k, v in char.items() if not k.startswith('_')}
+    sheet.update({
+        'hp_current': char['hp']['current'],
+        'hp_max': char['hp']['max'],
+        'saving_throws': {SHEET_SAVE_KEYS.get(k, k): v for k, v in char['saving_throws'].items()},
+        'proficiencies': {
+            'armas': list(char['proficiencies'].get('weapon', [])),
+            'no_armas': list(char['proficiencies'].get('non_weapon', [])),
+        },
+        'equipment': [
+            name if entry.get('quantity', 1) == 1 else f"{name} x{entry['quantity']}"
+            for name, entry in equipment.items()
+        ],
+        'equipped': {slot: item(slot) for slot in EQUIPPED_SLOTS},
+        'money': {SHEET_COIN_KEYS.get(k, k): v for k, v in char['money'].items()},
+    })
+    return sheet
+
+
+def to_creator_format(data: Dict) -> Dict:
+    """
+    Atributos del Character del creador (core/character_creator.py) a partir
+    de un personaje en cualquier formato: hit_points_*, armor_class y el
+    equipo como lista de nombres (repetidos según la cantidad).
+    No modifica `data`.
+    """
+    char = data if is_canonical(data) else normalize_character(copy.deepcopy(data))
+    sheet = to_sheet_format(char)
+    sheet.update({
+        'hit_points_max': char['hp']['max'],
+        'hit_points_current': char['hp']['current'],
+        'armor_class': char['ac'],
+        'equipment': [name for name, entry in char['equipment'].items()
+                      for _ in range(max(1, entry.get('quantity', 1)))],
+    })
+    return sheet
+
+
+def load_character_file(filepath) -> Dict:
+    """Lee un JSON de personaje y lo devuelve normalizado"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return normalize_character(data)
+
+
+def migrate_directory(directory, write: bool = False) -> Dict[str, List[str]]:
+    """
+    Migra todos los *_character.json de un directorio al formato canónico.
+    Con write=False sólo informa de lo que cambiaría.
+    """
+    report = {'migrated': [], 'unchanged': [], 'errors': []}
+    for filepath in sorted(Path(directory).glob("*_character.json")):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if is_canonical(data):
+                report['unchanged'].append(filepath.name)
+                continue
+            normalize_character(data)
+        except (OSError, ValueError) as e:
+            report['errors'].append(f"{filepath.name}: {e}")
+            continue
+
+        if write:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        report['migrated'].append(filepath.name)
+    return report
+
+
+def main():
+    """Herramienta de migración de fichas al formato canónico"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    write = '--write' in sys.argv
+    directory = Path(args[0]) if args else Path(__file__).parent.parent / "data"
+
+    print(f"🔄 Migrando personajes en: {directory}")
+    report = migrate_directory(directory, write=write)
+
+    action = "Migrado" if write else "Se migraría"
+    for name in report['migrated']:
+        print(f"  ✅ {action}: {name}")
+    for name in report['unchanged']:
+        print(f"  ✓ Ya canónico: {name}")
+    for error in report['errors']:
+        print(f"  ❌ {error}")
+
+    if report['migrated'] and not write:
+        print("\n💡 Ejecuta con --write para aplicar los cambios")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Eventos de salida de los motores del núcleo (dados, combate, monstruos)
+
+Los módulos del núcleo no imprimen: emiten eventos estructurados
+(tipo + datos) a un destino (sink). El texto de cada evento sólo se genera
+si algún destino lo pide, con el formateador registrado para su tipo o con
+la función `render` que acompaña al evento.
+
+Destinos disponibles:
+    ConsoleSink    - escribe el texto en la consola (comportamiento clásico)
+    CallbackSink   - pasa el texto a una función (p. ej. el log de la GUI)
+    CollectorSink  - guarda los eventos como diccionarios (JSON)
+    NullSink       - descarta todo sin formatear nada
+    TeeSink        - reparte cada evento entre varios destinos
+
+Los objetos creados sin destino usan el destino por defecto, que se puede
+cambiar con set_default_sink().
+"""
+
+import json
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Niveles de los eventos genéricos
+INFO = 'info'
+WARNING = 'aviso'
+ERROR = 'error'
+
+# Tipo de evento -> función que genera el texto a partir de los datos
+FORMATTERS: Dict[str, Callable[[Dict], str]] = {}
+
+
+def formatter(kind: str):
+    """Decorador para registrar el formateador de un tipo de evento"""
+    def register(func: Callable[[Dict], str]):
+        FORMATTERS[kind] = func
+        return func
+    return register
+
+
+@formatter('mensaje')
+def _format_message(data: Dict) -> str:
+    return data.get('message', '')
+
+
+class Event:
+    """Evento emitido por el núcleo; el texto se genera la primera vez que se pide"""
+
+    __slots__ = ('kind', 'data', 'level', '_render', '_text')
+
+    def __init__(self, kind: str, data: Dict, level: str = INFO,
+                 render: Optional[Callable[[], str]] = None):
+        self.kind = kind
+        self.data = data
+        self.level = level
+        self._render = render
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            if self._render is not None:
+                self._text = self._render()
+            else:
+                format_event = FORMATTERS.get(self.kind)
+                self._text = format_event(self.data) if format_event else str(self.data)
+        return self._text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación serializable (sin formatear)"""
+        return {'kind': self.kind, 'level': self.level, **self.data}
+
+    def __repr__(self):
+        return f"Event({self.kind!r}, {self.data!r})"
+
+
+class Sink:
+    """
+    Destino de eventos. `kinds` limita los tipos que acepta (None = todos).
+    Las subclases implementan handle(event).
+    """
+
+    enabled = True
+
+    def __init__(self, kinds: Optional[Iterable[str]] = None):
+        self.kinds = frozenset(kinds) if kinds is not None else None
+
+    def emit(self, event: Event):
+        if self.kinds is None or event.kind in self.kinds:
+            self.handle(event)
+
+    def handle(self, event: Event):
+        raise NotImplementedError
+
+
+class NullSink(Sink):
+    """Descarta los eventos (los emisores ni siquiera los construyen)"""
+
+    enabled = False
+
+    def emit(self, event: Event):
+        pass
+
+
+class ConsoleSink(Sink):
+    """Escribe el texto en un stream (por defecto la salida estándar del momento)"""
+
+    def __init__(self, stream=None, kinds: Optional[Iterable[str]] = None):
+        super().__init__(kinds)
+        self.stream = stream
+
+    def handle(self, event: Event):
+        print(event.text, file=self.stream or sys.stdout)
+
+
+class CallbackSink(Sink):
+    """Pasa el texto de cada evento a una función, p. ej. app.log de la GUI"""
+
+    def __init__(self, callback: Callable[[str], Any], kinds: Optional[Iterable[str]] = None):
+        super().__init__(kinds)
+        self.callback = callback
+
+    def handle(self, event: Event):
+        self.callback(event.text)
+
+
+class CollectorSink(Sink):
+    """Acumula los eventos sin formatearlos (para la web, tests o análisis)"""
+
+    def __init__(self, kinds: Optional[Iterable[str]] = None, max_events: Optional[int] = None):
+        super().__init__(kinds)
+        self.max_events = max_events
+        self.events: List[Event] = []
+
+    def handle(self, event: Event):
+        self.events.append(event)
+        if self.max_events and len(self.events) > self.max_events:
+            del self.events[:len(self.events) - self.max_events]
+
+    def of_kind(self, kind: str) -> List[Event]:
+        return [event for event in self.events if event.kind == kind]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [event.to_dict() for event in self.events]
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_list(), ensure_ascii=False, **kwargs)
+
+    def clear(self):
+        self.events.clear()
+
+
+class TeeSink(Sink):
+    """Reparte cada evento entre varios destinos"""
+
+    def __init__(self, *sinks: Sink):
+        super().__init__()
+        self.sinks = [sink for sink in sinks if sink.enabled]
+        self.enabled = bool(self.sinks)
+
+    def handle(self, event: Event):
+        for sink in self.sinks:
+            sink.emit(event)
+
+
+_default_sink: Sink = ConsoleSink()
+
+
+def get_default_sink() -> Sink:
+    return _default_sink
+
+
+def set_default_sink(sink: Sink) -> Sink:
+    """Cambia el destino por defecto y devuelve el anterior"""
+    global _default_sink
+    previous, _default_sink = _default_sink, sink
+    return previous
+
+
+class Emitter:
+    """
+    Mezcla para las clases del núcleo que emiten eventos.
+    self.sink = None usa el destino por defecto vigente en cada emisión.
+    """
+
+    sink: Optional[Sink] = None
+
+    def emit(self, kind: str, level: str = INFO,
+             render: Optional[Callable[[], str]] = None, **data):
+        sink = self.sink or _default_sink
+        if sink.enabled:
+            sink.emit(Event(kind, data, level, render))
+
+    def message(self, message: str, level: str = INFO):
+        """Evento de texto libre (errores de uso, avisos, confirmaciones)"""
+        sink = self.sink or _default_sink
+        if sink.enabled:
+            sink.emit(Event('mensaje', {'message': message}, level))
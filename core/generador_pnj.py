@@ -0,0 +1,324 @@
+"""
+Generador masivo de PNJ AD&D 2e
+Crea miles de personajes no interactivos (guarniciones, pueblos, gremios)
+y los escribe como JSON lines en formato canónico
+
+Todo lo que depende sólo de la raza y la clase (clases permitidas, pesos,
+requisitos, dado de golpe, kits) se precalcula al crear el generador; por
+PNJ sólo se tiran dados y se monta el diccionario. Los atributos de todo el
+lote salen de una sola matriz (atributos.attribute_matrix), los dados de
+golpe, el oro y la fuerza excepcional de un búfer de caras (azar.FaceBuffer)
+y no se registra nada por personaje.
+"""
+
+import json
+import random
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .atributos import METHODS, attribute_matrix
+from .azar import CounterStream, FaceBuffer
+from .esquema import (
+    ATTRIBUTE_KEYS, COIN_NAMES, EQUIPPED_SLOTS, SAVE_ALIASES, SCHEMA_VERSION
+)
+from .modificadores import constitution_hp_bonus, dexterity_ac_adjustment, is_warrior
+from .progresion import MAX_LEVEL, hit_points_gain, saves_for, thac0_for, xp_for_level
+
+
+# Dinero inicial por clase: (dados, caras, multiplicador) en piezas de oro
+STARTING_MONEY = {
+    'Guerrero': (5, 4, 10),  # 5d4 x10
+    'Paladín': (5, 4, 10),
+    'Ranger': (5, 4, 10),
+    'Mago': (1, 4, 10),  # 1d4 x10
+    'Especialista': (1, 4, 10),
+    'Clérigo': (3, 6, 10),  # 3d6 x10
+    'Druida': (3, 6, 10),
+    'Ladrón': (2, 6, 10),  # 2d6 x10
+    'Bardo': (2, 6, 10),
+    'Monje': (5, 4, 1)  # 5d4 (sin multiplicador)
+}
+DEFAULT_MONEY = (3, 6, 10)
+
+# Equipo básico por clase
+STARTING_EQUIPMENT = {
+    'Guerrero': ['Espada larga', 'Escudo', 'Armadura de cota de mallas', 'Mochila', 'Odre', 'Raciones (1 semana)'],
+    'Paladín': ['Espada larga', 'Escudo', 'Armadura de cota de mallas', 'Símbolo sagrado', 'Mochila', 'Raciones (1 semana)'],
+    'Ranger': ['Espada larga', 'Arco largo', '20 flechas', 'Armadura de cuero', 'Mochila', 'Cuerda (50 pies)', 'Raciones (1 semana)'],
+    'Mago': ['Daga', 'Libro de hechizos', 'Componentes de hechizos', 'Mochila', 'Tinta y pluma', 'Raciones (1 semana)'],
+    'Especialista': ['Daga', 'Libro de hechizos', 'Componentes de hechizos', 'Mochila', 'Tinta y pluma', 'Raciones (1 semana)'],
+    'Clérigo': ['Maza', 'Escudo', 'Armadura de cota de mallas', 'Símbolo sagrado', 'Agua bendita', 'Mochila', 'Raciones (1 semana)'],
+    'Druida': ['Hoz', 'Dardo (6)', 'Armadura de cuero', 'Muérdago sagrado', 'Mochila', 'Raciones (1 semana)'],
+    'Ladrón': ['Espada corta', 'Daga', 'Armadura de cuero', 'Ganzúas', 'Cuerda (50 pies)', 'Mochila', 'Raciones (1 semana)'],
+    'Bardo': ['Espada larga', 'Daga', 'Armadura de cuero', 'Instrumento musical', 'Mochila', 'Raciones (1 semana)'],
+    'Monje': ['Bastón', 'Túnica', 'Cuerda (50 pies)', 'Mochila', 'Raciones (1 semana)']
+}
+DEFAULT_EQUIPMENT = ['Daga', 'Mochila', 'Raciones (1 semana)']
+
+# Datos de combate del equipo básico (el resto queda como 'other')
+GEAR_STATS = {
+    'Espada larga': {'type': 'weapon', 'damage': '1d8'},
+    'Espada bastarda': {'type': 'weapon', 'damage': '2d4'},
+    'Espada corta': {'type': 'weapon', 'damage': '1d6'},
+    'Daga': {'type': 'weapon', 'damage': '1d4'},
+    'Maza': {'type': 'weapon', 'damage': '1d6+1'},
+    'Martillo de guerra': {'type': 'weapon', 'damage': '1d4+1'},
+    'Hacha de batalla': {'type': 'weapon', 'damage': '1d8'},
+    'Hoz': {'type': 'weapon', 'damage': '1d4+1'},
+    'Bastón': {'type': 'weapon', 'damage': '1d6'},
+    'Lanza': {'type': 'weapon', 'damage': '1d6'},
+    'Tridente': {'type': 'weapon', 'damage': '1d6+1'},
+    'Arco largo': {'type': 'weapon', 'damage': '1d6'},
+    'Armadura de cuero': {'type': 'armor', 'ac': 8},
+    'Pieles': {'type': 'armor', 'ac': 6},
+    'Armadura de cota de mallas': {'type': 'armor', 'ac': 5},
+    'Cota de mallas': {'type': 'armor', 'ac': 5},
+    'Armadura de placas': {'type': 'armor', 'ac': 3},
+    'Escudo': {'type': 'shield', 'ac_bonus': -1},
+}
+
+# Intentos de tirar atributos que cumplan los requisitos de la clase
+MAX_REROLLS = 10
+
+Weights = Union[None, int, Dict, List]
+
+
+def _distribution(options: Weights, available) -> Dict:
+    """{valor: peso} a partir de None (todos por igual), un valor, una lista o un dict"""
+    if options is None:
+        return dict.fromkeys(available, 1)
+    if isinstance(options, dict):
+        return {value: weight for value, weight in options.items() if weight > 0}
+    if isinstance(options, (list, tuple, range)):
+        return dict.fromkeys(options, 1)
+    return {options: 1}
+
+
+def _cumulative(distribution: Dict) -> Tuple[List, List[float]]:
+    """(valores, pesos acumulados) para random.choices"""
+    if not distribution:
+        raise ValueError("La distribución no tiene ningún valor con peso positivo")
+    cumulative, total = [], 0.0
+    for weight in distribution.values():
+        total += weight
+        cumulative.append(total)
+    return list(distribution), cumulative
+
+
+def allowed_classes(race_data: Dict, classes) -> List[str]:
+    """Clases de `classes` que permite la raza ('Todas', 'Todas excepto Monje'...)"""
+    permitted = race_data.get('clases_permitidas') or ['Todas']
+    allowed = set()
+    for entry in permitted:
+        if entry.startswith('Todas'):
+            excluded = entry.partition('excepto')[2].replace(' y ', ',').split(',')
+            excluded = {name.strip() for name in excluded}
+            allowed.update(name for name in classes if name not in excluded)
+        else:
+            allowed.add(entry)
+    return [name for name in classes if name in allowed]
+
+
+class NPCGenerator:
+    """
+    Generador de PNJ a partir de los datos de ADnDDataLoader
+    (classes, races y kits; sirve cualquier objeto con esos atributos).
+    """
+
+    def __init__(self, data_loader, method: int = 3, seed=None,
+                 kit_chance: float = 0.25, name_prefix: str = "PNJ"):
+        if method not in METHODS:
+            raise ValueError(f"Método de atributos no válido: {method}")
+        self.classes = data_loader.classes
+        self.races = data_loader.races
+        self.kits = getattr(data_loader, 'kits', {}) or {}
+        self.method = method
+        self.roll_attributes = METHODS[method]
+        self.rng = random.Random(seed)
+        self.faces = FaceBuffer(CounterStream(seed, 'pnj'), background=False)
+        self.kit_chance = kit_chance
+        self.name_prefix = name_prefix
+        self.count = 0
+
+        # Requisitos y ajustes raciales como (posición del atributo, valor)
+        self._requirements = {
+            name: tuple((ATTRIBUTE_KEYS.index(attr), minimum)
+                        for attr, minimum in data.get('requisitos', {}).items()
+                        if attr in ATTRIBUTE_KEYS)
+            for name, data in self.classes.items()
+        }
+        self._adjustments = {
+            name: tuple((ATTRIBUTE_KEYS.index(attr), value)
+                        for attr, value in data.get('ajustes_atributos', {}).items()
+                        if attr in ATTRIBUTE_KEYS)
+            for name, data in self.races.items()
+        }
+        self._kits = {}
+        for name, kits in self.kits.items():
+            options = [(kit, data) for kit, data in kits.items() if kit != 'Sin Kit']
+            if options:
+                self._kits[name] = options
+
+    def _plan(self, races: Weights, classes: Weights):
+        """Razas con sus pesos y, para cada raza, las clases posibles con los suyos"""
+        race_weights = _distribution(races, self.races)
+        class_weights = _distribution(classes, self.classes)
+        unknown = [name for name in race_weights if name not in self.races]
+        unknown += [name for name in class_weights if name not in self.classes]
+        if unknown:
+            raise ValueError(f"Raza o clase no encontrada: {', '.join(map(str, unknown))}")
+
+        plan = {}
+        for race in race_weights:
+            allowed = allowed_classes(self.races[race], class_weights)
+            if allowed:
+                plan[race] = _cumulative({name: class_weights[name] for name in allowed})
+        if not plan:
+            raise ValueError("Ninguna raza admite las clases pedidas")
+        return _cumulative({race: race_weights[race] for race in plan}), plan
+
+    def _attributes(self, race: str, character_class: str, first_roll) -> List[int]:
+        """
+        Aplica los ajustes raciales a la tirada ya hecha y, si no cumple los
+        requisitos de la clase, vuelve a tirar
+        """
+        adjustments = self._adjustments.get(race, ())
+        requirements = self._requirements.get(character_class, ())
+        for attempt in range(MAX_REROLLS):
+            scores = list(first_roll) if attempt == 0 else self.roll_attributes(self.rng)
+            for index, value in adjustments:
+                scores[index] += value
+            if all(scores[index] >= minimum for index, minimum in requirements):
+                return scores
+        # Sin suerte: se sube lo justo para que el PNJ pueda tener la clase
+        for index, minimum in requirements:
+            if scores[index] < minimum:
+                scores[index] = minimum
+        return scores
+
+    def _hit_points(self, character_class: str, level: int, con: int) -> int:
+        """Dado de golpe máximo a nivel 1 (como el creador) y tiradas por nivel después"""
+        hit_die = self.classes[character_class].get('dado_golpe', 4)
+        hp = max(1, hit_die + constitution_hp_bonus(con, is_warrior(character_class)))
+        for next_level in range(2, level + 1):
+            hp += hit_points_gain(character_class, next_level, con, self.faces)
+        return hp
+
+    def _gear(self, character_class: str) -> Tuple[Dict, Dict, Optional[str], int]:
+        """Equipo básico (y kit al azar), objetos equipados, kit y oro inicial"""
+        rng = self.rng
+        items = STARTING_EQUIPMENT.get(character_class, DEFAULT_EQUIPMENT)
+        kit = None
+        kits = self._kits.get(character_class)
+        if kits and rng.random() < self.kit_chance:
+            kit, kit_data = kits[rng.randrange(len(kits))]
+            items = items + kit_data.get('equipo_inicial', [])
+
+        equipment: Dict[str, Dict] = {}
+        equipped = dict.fromkeys(EQUIPPED_SLOTS)
+        for item in items:
+            if item in equipment:
+                equipment[item]['quantity'] += 1
+                continue
+            entry = dict(GEAR_STATS.get(item, {'type': 'other'}), quantity=1)
+            equipment[item] = entry
+            kind = entry['type']
+            if kind == 'weapon':
+                slot = 'arma_principal' if not equipped['arma_principal'] else 'arma_secundaria'
+                if not equipped[slot]:
+                    equipped[slot] = item
+            elif kind == 'armor':
+                current = equipped['armadura']
+                if not current or entry['ac'] < equipment[current]['ac']:
+                    equipped['armadura'] = item
+            elif kind == 'shield' and not equipped['escudo']:
+                equipped['escudo'] = item
+
+        num_dice, die_size, multiplier = STARTING_MONEY.get(character_class, DEFAULT_MONEY)
+        gold = sum(self.faces.dice(num_dice, die_size)) * multiplier
+        return equipment, equipped, kit, gold
+
+    def generate(self, count: int, races: Weights = None, classes: Weights = None,
+                 levels: Weights = 1) -> Iterator[Dict]:
+        """
+        Genera `count` PNJ en formato canónico.
+        races / classes / levels: None (todas por igual), un valor, una lista
+        o una distribución {valor: peso}.
+        """
+        rng = self.rng
+        (race_values, race_weights), plan = self._plan(races, classes)
+        level_values, level_weights = _cumulative(_distribution(levels, range(1, MAX_LEVEL + 1)))
+
+        chosen_races = rng.choices(race_values, cum_weights=race_weights, k=count)
+        chosen_levels = rng.choices(level_values, cum_weights=level_weights, k=count)
+        first_rolls = attribute_matrix(self.method, count, rng)
+
+        for race, level, first_roll in zip(chosen_races, chosen_levels, first_rolls):
+            class_values, class_weights = plan[race]
+            character_class = rng.choices(class_values, cum_weights=class_weights)[0]
+            race_data = self.races[race]
+            limit = race_data.get('limite_nivel')
+            if isinstance(limit, dict) and character_class in limit:
+                level = min(level, limit[character_class])
+            level = max(1, min(int(level), MAX_LEVEL))
+
+            scores = self._attributes(race, character_class, first_roll)
+            attributes = dict(zip(ATTRIBUTE_KEYS, scores))
+            exceptional = 0
+            if attributes['FUE'] == 18 and is_warrior(character_class):
+                exceptional = self.faces.randint(1, 100)
+
+            equipment, equipped, kit, gold = self._gear(character_class)
+            ac = 10
+            if equipped['armadura']:
+                ac = equipment[equipped['armadura']]['ac']
+            if equipped['escudo']:
+                ac += equipment[equipped['escudo']]['ac_bonus']
+            ac += dexterity_ac_adjustment(attributes['DES'])
+
+            hp = self._hit_points(character_class, level, attributes['CON'])
+            money = dict.fromkeys(COIN_NAMES, 0)
+            money['Piezas de Oro'] = gold
+            self.count += 1
+
+            yield {
+                'name': f"{self.name_prefix} {self.count}",
+                'race': race,
+                'class': character_class,
+                'level': level,
+                'experience': xp_for_level(character_class, level),
+                'attributes': attributes,
+                'exceptional_strength': exceptional,
+                'hp': {'max': hp, 'current': hp},
+                'ac': ac,
+                'thac0': thac0_for(character_class, level),
+                'saving_throws': {SAVE_ALIASES[key]: value
+                                  for key, value in saves_for(character_class, level).items()},
+                'proficiencies': {'weapon': [], 'non_weapon': []},
+                'money': money,
+                'equipment': equipment,
+                'equipped': equipped,
+                'kit': kit,
+                'known_spells': [],
+                'prepared_spells': [],
+                'schema_version': SCHEMA_VERSION,
+            }
+
+    def write_jsonl(self, stream: TextIO, count: int, races: Weights = None,
+                    classes: Weights = None, levels: Weights = 1) -> int:
+        """Escribe `count` PNJ en `stream`, uno por línea (JSON lines). Devuelve cuántos"""
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        write = stream.write
+        written = 0
+        for npc in self.generate(count, races, classes, levels):
+            write(encode(npc))
+            write('\n')
+            written += 1
+        return written
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Dict]:
+    """Lee un archivo JSON lines de PNJ (ignora líneas vacías)"""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
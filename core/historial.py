@@ -0,0 +1,186 @@
+"""
+Historial acotado de tiradas con estadísticas incrementales
+
+RollHistory guarda las últimas `capacity` tiradas en un búfer circular de
+arrays de tamaño fijo (número de dados, caras, bonus, total, hora y quién
+tiró) y, aparte, un histograma por tipo de dado con el que se calculan
+media y chi-cuadrado de uniformidad sin recorrer nunca el historial:
+
+    chi² = k · Σ O_i² / n - n
+
+con Σ O_i² actualizada en O(1) por dado (al pasar O_f a O_f + 1 la suma
+crece 2·O_f + 1). El valor p usa la aproximación de Wilson-Hilferty a la
+distribución chi-cuadrado, suficiente para detectar un dado trucado.
+"""
+
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_CAPACITY = 1000
+MAX_HISTOGRAM_SIDES = 100  # d4-d100; los dados mayores sólo van al historial
+MAX_ROLLERS = 1024  # nombres distintos recordados para la columna "quién"
+
+
+def chi_square_p_value(chi2: float, df: int) -> float:
+    """P(X ≥ chi2) para X ~ chi-cuadrado con df grados de libertad (Wilson-Hilferty)"""
+    if df <= 0 or chi2 <= 0:
+        return 1.0
+    h = 2 / (9 * df)
+    z = ((chi2 / df) ** (1 / 3) - (1 - h)) / h ** 0.5
+    return 0.5 * math.erfc(z / math.sqrt(2))  # cola superior de la normal estándar
+
+
+class DieStats:
+    """Histograma incremental de un tipo de dado"""
+
+    __slots__ = ('sides', 'counts', 'n', 'total', 'sum_squares')
+
+    def __init__(self, sides: int):
+        self.sides = sides
+        self.counts = array('Q', bytes(8 * (sides + 1)))  # índice = cara (0 sin usar)
+        self.n = 0
+        self.total = 0
+        self.sum_squares = 0
+
+    def add(self, faces: Sequence[int]):
+        counts = self.counts
+        for face in faces:
+            observed = counts[face]
+            self.sum_squares += 2 * observed + 1
+            counts[face] = observed + 1
+        self.n += len(faces)
+        self.total += sum(faces)
+
+    @property
+    def chi_square(self) -> float:
+        return self.sides * self.sum_squares / self.n - self.n if self.n else 0.0
+
+    def to_dict(self) -> Dict:
+        chi2 = self.chi_square
+        return {
+            'sides': self.sides,
+            'count': self.n,
+            'mean': self.total / self.n if self.n else 0.0,
+            'expected_mean': (self.sides + 1) / 2,
+            'histogram': list(self.counts[1:]),
+            'chi2': chi2,
+            'df': self.sides - 1,
+            'p_value': chi_square_p_value(chi2, self.sides - 1) if self.n else 1.0,
+        }
+
+
+class RollHistory:
+    """Búfer circular de tiradas con estadísticas por dado"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("La capacidad del historial debe ser positiva")
+        self.capacity = capacity
+        self._num_dice = array('Q', bytes(8 * capacity))
+        self._sides = array('Q', bytes(8 * capacity))
+        self._bonus = array('q', bytes(8 * capacity))
+        self._total = array('q', bytes(8 * capacity))
+        self._time = array('d', bytes(8 * capacity))
+        self._roller = array('H', bytes(2 * capacity))
+        self._faces: List[tuple] = [()] * capacity
+        self._rollers: List[str] = ['']
+        self._roller_ids: Dict[str, int] = {'': 0}
+        self.recorded = 0  # tiradas registradas desde el inicio (no sólo las guardadas)
+        self.stats: Dict[int, DieStats] = {}
+
+    def __len__(self) -> int:
+        return min(self.recorded, self.capacity)
+
+    def _roller_id(self, roller: str) -> int:
+        roller_id = self._roller_ids.get(roller)
+        if roller_id is None:
+            if len(self._rollers) >= MAX_ROLLERS:
+                return 0
+            roller_id = self._roller_ids[roller] = len(self._rollers)
+            self._rollers.append(roller)
+        return roller_id
+
+    def record(self, sides: int, faces: Sequence[int], bonus: int = 0,
+               total: Optional[int] = None, roller: str = '', timestamp: Optional[float] = None):
+        """
+        Añade una tirada (sobrescribe la más antigua si el búfer está lleno).
+        Lanza OverflowError, sin tocar el búfer, si algún valor no cabe en 64 bits.
+        """
+        slot = self.recorded % self.capacity
+        counts = array('Q', (len(faces), sides))
+        amounts = array('q', (bonus, sum(faces) + bonus if total is None else total))
+        self._num_dice[slot], self._sides[slot] = counts
+        self._bonus[slot], self._total[slot] = amounts
+        self._time[slot] = time.time() if timestamp is None else timestamp
+        self._roller[slot] = self._roller_id(roller)
+        self._faces[slot] = tuple(faces)
+        self.recorded += 1
+
+        if sides <= MAX_HISTOGRAM_SIDES:
+            stats = self.stats.get(sides)
+            if stats is None:
+                stats = self.stats[sides] = DieStats(sides)
+            stats.add(faces)
+
+    def _record(self, slot: int) -> Dict:
+        bonus = self._bonus[slot]
+        return {
+            'dice': f"{self._num_dice[slot]}d{self._sides[slot]}" + (f"{bonus:+d}" if bonus else ""),
+            'sides': self._sides[slot],
+            'faces': list(self._faces[slot]),
+            'bonus': bonus,
+            'total': self._total[slot],
+            'time': self._time[slot],
+            'roller': self._rollers[self._roller[slot]],
+        }
+
+    def recent(self, count: int = 10) -> List[Dict]:
+        """Las `count` tiradas más recientes, de la más nueva a la más antigua"""
+        count = max(0, min(count, len(self)))
+        return [self._record((self.recorded - 1 - i) % self.capacity) for i in range(count)]
+
+    def die_stats(self, sides: int) -> Optional[Dict]:
+        """Estadísticas del dado de `sides` caras (None si no se ha tirado)"""
+        stats = self.stats.get(sides)
+        return stats.to_dict() if stats else None
+
+    def all_stats(self) -> List[Dict]:
+        return [self.stats[sides].to_dict() for sides in sorted(self.stats)]
+
+    def clear(self):
+        """Vacía historial y estadísticas"""
+        self.__init__(self.capacity)
+
+
+def format_history(records: List[Dict]) -> str:
+    """Tabla de texto de recent()"""
+    if not records:
+        return "📜 Sin tiradas registradas"
+    lines = ["📜 ÚLTIMAS TIRADAS"]
+    for record in records:
+        stamp = time.strftime('%H:%M:%S', time.localtime(record['time']))
+        roller = f" [{record['roller']}]" if record['roller'] else ""
+        faces = ', '.join(map(str, record['faces']))
+        lines.append(f"  {stamp} {record['dice']:<10} [{faces}] = {record['total']}{roller}")
+    return "\n".join(lines)
+
+
+def format_die_stats(stats: Dict, histogram: bool = True) -> str:
+    """Resumen de texto de die_stats(): media, chi² e histograma (hasta d20)"""
+    p_value = stats['p_value']
+    verdict = "⚠️ sospechoso" if p_value < 0.01 else "✅ compatible con un dado justo"
+    lines = [f"🎲 d{stats['sides']}: {stats['count']} dados, media {stats['mean']:.2f} "
+             f"(esperada {stats['expected_mean']:.1f})",
+             f"   χ² = {stats['chi2']:.2f} con {stats['df']} g.l., p = {p_value:.3f} {verdict}"]
+    counts = stats['histogram']
+    if histogram and len(counts) <= 20:
+        peak = max(counts) or 1
+        for face, count in enumerate(counts, 1):
+            lines.append(f"   {face:>3} {'█' * round(count * 30 / peak):<30} {count}")
+    return "\n".join(lines)
+
+
+# Historial compartido de la sesión (consola, GUI y combate)
+roll_history = RollHistory()
@@ -0,0 +1,163 @@
+"""
+Orden de turnos del combate como cola de prioridad
+
+InitiativeScheduler guarda los combatientes que aún no han actuado en el
+round en un montículo (heapq) ordenado por iniciativa (mayor primero; a
+igualdad, el que entró antes). Avanzar turno es O(log n), los refuerzos se
+insertan en O(log n) en su puesto del round en curso (o en el siguiente si
+su iniciativa ya pasó) y los muertos no se quitan: se saltan al salir del
+montículo. Cada round nuevo reconstruye el montículo en O(n) con heapify,
+con las iniciativas de siempre o re-tiradas.
+
+Para la iniciativa de grupo, companions() reúne a los pendientes que
+comparten el puesto del combatiente actual y act_together() los da por
+actuados: se saltan al salir de la cola, igual que los caídos.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+
+Entry = Tuple[int, int, object]  # (-iniciativa, orden de llegada, combatiente)
+
+
+class InitiativeScheduler:
+    """Cola de turnos de un combate"""
+
+    def __init__(self, alive: Callable[[object], bool] = lambda c: c.is_alive):
+        self.alive = alive
+        self.initiative: Dict[int, int] = {}  # id(combatiente) -> iniciativa
+        self._arrival: Dict[int, int] = {}
+        self._counter = itertools.count()
+        self._heap: List[Entry] = []
+        self._acted: List[object] = []  # ya actuaron este round (o esperan al siguiente)
+        self._removed: set = set()
+        self._early: set = set()  # actuaron en grupo antes de salir de la cola
+        self.current: Optional[object] = None
+
+    def __len__(self) -> int:
+        return len(self.initiative) - len(self._removed)
+
+    def _entry(self, combatant) -> Entry:
+        key = id(combatant)
+        return -self.initiative[key], self._arrival[key], combatant
+
+    def start(self, initiatives: Dict[object, int]):
+        """Primer round: `initiatives` es {combatiente: iniciativa} en orden de llegada"""
+        self.initiative.clear()
+        self._arrival.clear()
+        self._removed.clear()
+        self._early.clear()
+        self._acted = []
+        for combatant, value in initiatives.items():
+            self.initiative[id(combatant)] = value
+            self._arrival[id(combatant)] = next(self._counter)
+        self._heap = [self._entry(c) for c in initiatives]
+        heapq.heapify(self._heap)
+        self.current = self._pop_alive()
+
+    def _pop_alive(self) -> Optional[object]:
+        """Saca el siguiente combatiente vivo (los caídos se descartan aquí)"""
+        heap = self._heap
+        while heap:
+            combatant = heapq.heappop(heap)[2]
+            if id(combatant) in self._removed:
+                continue
+            if id(combatant) in self._early:
+                self._early.discard(id(combatant))
+                self._acted.append(combatant)
+                continue
+            if self.alive(combatant):
+                return combatant
+            self._acted.append(combatant)  # puede volver si lo curan
+        return None
+
+    def advance(self) -> Optional[object]:
+        """Pasa al siguiente turno del round; None si el round ha terminado"""
+        if self.current is not None:
+            self._acted.append(self.current)
+        self.current = self._pop_alive()
+        return self.current
+
+    def new_round(self, initiatives: Optional[Dict[object, int]] = None) -> Optional[object]:
+        """
+        Empieza un round con todos los combatientes (vivos) otra vez en la cola.
+        initiatives: iniciativas re-tiradas {combatiente: valor}; sin ella se
+        conservan las del round anterior.
+        """
+        pool = self._acted + [entry[2] for entry in self._heap]
+        if self.current is not None:
+            pool.append(self.current)
+        self._early.clear()
+        if initiatives:
+            for combatant, value in initiatives.items():
+                self.initiative[id(combatant)] = value
+        heap, fallen = [], []
+        initiative, arrival, removed, alive = self.initiative, self._arrival, self._removed, self.alive
+        for combatant in pool:
+            key = id(combatant)
+            if key in removed:
+                continue
+            if alive(combatant):
+                heap.append((-initiative[key], arrival[key], combatant))
+            else:
+                fallen.append(combatant)
+        heapq.heapify(heap)
+        self._heap, self._acted = heap, fallen
+        self.current = self._pop_alive()
+        return self.current
+
+    def add(self, combatant, initiative: int) -> bool:
+        """
+        Añade un combatiente a mitad de combate. Si su iniciativa aún no ha
+        llegado en este round actúa en él; si no, espera al siguiente.
+        Devuelve True si actuará en el round en curso.
+        """
+        key = id(combatant)
+        self._removed.discard(key)
+        self.initiative[key] = initiative
+        self._arrival[key] = next(self._counter)
+        entry = self._entry(combatant)
+        if self.current is not None and entry < self._entry(self.current):
+            self._acted.append(combatant)
+            return False
+        heapq.heappush(self._heap, entry)
+        if self.current is None:
+            self.current = self._pop_alive()
+        return True
+
+    def remove(self, combatant):
+        """Quita un combatiente (huida, desaparición); se descarta al salir de la cola"""
+        self._removed.add(id(combatant))
+        if self.current is combatant:
+            self.current = self._pop_alive()
+
+    def _waiting(self, combatant) -> bool:
+        key = id(combatant)
+        return key not in self._removed and key not in self._early and self.alive(combatant)
+
+    def pending(self) -> List[object]:
+        """Combatientes vivos que aún no han actuado este round, en orden"""
+        return [entry[2] for entry in sorted(self._heap) if self._waiting(entry[2])]
+
+    def companions(self, combatant, same: Callable[[object, object], bool]) -> List[object]:
+        """Pendientes vivos con la misma iniciativa que `combatant` y same(combatant, otro)"""
+        key = -self.initiative.get(id(combatant), 0)
+        matches = [entry for entry in self._heap if entry[0] == key]
+        matches.sort()
+        return [entry[2] for entry in matches if same(combatant, entry[2]) and self._waiting(entry[2])]
+
+    def act_together(self, combatants):
+        """Marca como actuados este round a combatientes que aún esperan turno"""
+        for combatant in combatants:
+            if combatant is not self.current:
+                self._early.add(id(combatant))
+
+    def order(self) -> List[object]:
+        """Orden del round (vivos): los que actuaron, el actual y los pendientes"""
+        done = [c for c in self._acted if id(c) not in self._removed and self.alive(c)]
+        done += [entry[2] for entry in self._heap
+                 if id(entry[2]) in self._early and self.alive(entry[2])]
+        done.sort(key=lambda c: self._entry(c)[:2])
+        current = [self.current] if self.current is not None else []
+        return done + current + self.pending()
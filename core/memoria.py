@@ -0,0 +1,142 @@
+"""
+Seguimiento de memoria para sesiones largas (tracemalloc)
+
+MemoryTracker toma una instantánea inicial y, en cada informe, compara las
+asignaciones actuales con ella agrupándolas por módulo (core.combate,
+core.biblio, json.decoder...). También cuenta los objetos vivos que suelen
+delatar fugas: monstruos, combatientes y fichas de personaje.
+
+tracemalloc ralentiza el intérprete, así que sólo se activa bajo demanda
+(/mem en la consola) o al arrancar con ADND_MEM=1.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .combate import Combatant, Monster
+
+TRACE_FRAMES = 1  # el módulo sólo necesita el marco que hizo la asignación
+
+
+def module_name(filename: str) -> str:
+    """
+    Nombre de módulo de un archivo fuente a partir de sys.path:
+    '/.../core/combate.py' -> 'core.combate'
+    """
+    if filename.startswith('<'):
+        return filename  # <frozen ...>, <string>, <unknown>
+    path = os.path.abspath(filename)
+    for root in sorted((os.path.abspath(p or '.') for p in sys.path), key=len, reverse=True):
+        if path.startswith(root + os.sep):
+            relative = Path(path[len(root) + 1:]).with_suffix('')
+            parts = [part for part in relative.parts if part != '__init__']
+            return '.'.join(parts) or relative.name
+    return Path(filename).stem
+
+
+def is_character_dict(obj) -> bool:
+    """Heurística para reconocer fichas de personaje cargadas en memoria"""
+    return isinstance(obj, dict) and 'attributes' in obj and 'class' in obj and 'hp' in obj
+
+
+def object_counts() -> Dict[str, int]:
+    """Objetos vivos de los tipos que suelen acumularse durante una sesión"""
+    counts = {'Monster': 0, 'Combatant': 0, 'ficha': 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, Monster):
+            counts['Monster'] += 1
+        elif isinstance(obj, Combatant):
+            counts['Combatant'] += 1
+        elif is_character_dict(obj):
+            counts['ficha'] += 1
+    return counts
+
+
+class MemoryTracker:
+    """Instantáneas de tracemalloc comparadas con la del inicio de la sesión"""
+
+    def __init__(self):
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.baseline_objects: Dict[str, int] = {}
+        self._started_tracing = False
+
+    @property
+    def active(self) -> bool:
+        return self.baseline is not None and tracemalloc.is_tracing()
+
+    def start(self):
+        """Empieza a trazar (si no lo estaba ya) y toma la instantánea inicial"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        self.reset()
+
+    def reset(self):
+        """Toma una nueva instantánea inicial"""
+        self.baseline = self._snapshot()
+        self.baseline_objects = object_counts()
+
+    def stop(self):
+        """Deja de trazar (sólo si lo empezó este objeto) y descarta la base"""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self.baseline = None
+        self.baseline_objects = {}
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    def by_module(self) -> List[Tuple[str, int, int, int]]:
+        """
+        Diferencia con la base agrupada por módulo:
+        [(módulo, bytes actuales, diferencia de bytes, diferencia de bloques)]
+        ordenada por crecimiento.
+        """
+        if self.baseline is None:
+            raise RuntimeError("El seguimiento de memoria no está activo")
+        grouped: Dict[str, List[int]] = {}
+        for stat in self._snapshot().compare_to(self.baseline, 'filename'):
+            module = module_name(stat.traceback[0].filename)
+            entry = grouped.setdefault(module, [0, 0, 0])
+            entry[0] += stat.size
+            entry[1] += stat.size_diff
+            entry[2] += stat.count_diff
+        return sorted(((name, *values) for name, values in grouped.items()),
+                      key=lambda row: row[2], reverse=True)
+
+    def report(self, limit: int = 10) -> str:
+        """Informe de texto: totales, módulos que más crecieron y objetos vivos"""
+        current, peak = tracemalloc.get_traced_memory()
+        lines = ["🧠 MEMORIA (desde la instantánea inicial)",
+                 f"  Trazada: {_format_size(current)} (pico {_format_size(peak)})"]
+
+        rows = self.by_module()
+        lines.append(f"\n  {'Módulo':<32}{'Actual':>12}{'Cambio':>12}{'Bloques':>10}")
+        for name, size, size_diff, count_diff in rows[:limit]:
+            lines.append(f"  {name[:31]:<32}{_format_size(size):>12}"
+                         f"{_format_size(size_diff, sign=True):>12}{count_diff:>+10}")
+
+        lines.append("\n  Objetos vivos:")
+        for kind, count in object_counts().items():
+            diff = count - self.baseline_objects.get(kind, 0)
+            lines.append(f"    {kind:<12}{count:>6} ({diff:+d})")
+        return "\n".join(lines)
+
+
+def _format_size(size: int, sign: bool = False) -> str:
+    prefix = ('+' if size >= 0 else '-') if sign else ''
+    size = abs(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024 or unit == 'MiB':
+            return f"{prefix}{size:.0f} {unit}" if unit == 'B' else f"{prefix}{size:.1f} {unit}"
+        size /= 1024
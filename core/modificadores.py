@@ -0,0 +1,207 @@
+"""
+Tablas de modificadores por atributo AD&D 2e (Manual del Jugador, tablas 1-3)
+Fuente única para los bonus de FUE, DES y CON que usan dados, combate,
+el creador de personajes y el asistente
+
+Las reglas se escriben con el mismo formato que
+ADnDDataLoader.rules['attribute_modifiers'] y se expanden una vez a listas
+indexadas por puntuación (1-25), de modo que cada consulta es un acceso directo.
+La fuerza excepcional (18/01-18/00) se indexa por percentil (1-100, 100 = 18/00).
+"""
+
+from typing import Dict, List, Optional
+
+
+MIN_SCORE = 1
+MAX_SCORE = 25
+
+WARRIOR_CLASSES = ('Guerrero', 'Paladín', 'Ranger')
+
+# Formato de rules['attribute_modifiers']: las claves son una puntuación,
+# un rango '8-15' o un tramo de fuerza excepcional '18/51-75' / '18/00'
+ATTRIBUTE_MODIFIERS = {
+    'FUE': {
+        '1': {'golpe': -5, 'dano': -4},
+        '2': {'golpe': -3, 'dano': -2},
+        '3': {'golpe': -3, 'dano': -1},
+        '4-5': {'golpe': -2, 'dano': -1},
+        '6-7': {'golpe': -1, 'dano': 0},
+        '8-15': {'golpe': 0, 'dano': 0},
+        '16': {'golpe': 0, 'dano': 1},
+        '17': {'golpe': 1, 'dano': 1},
+        '18': {'golpe': 1, 'dano': 2},
+        '18/01-50': {'golpe': 1, 'dano': 3},
+        '18/51-75': {'golpe': 2, 'dano': 3},
+        '18/76-90': {'golpe': 2, 'dano': 4},
+        '18/91-99': {'golpe': 2, 'dano': 5},
+        '18/00': {'golpe': 3, 'dano': 6},
+        '19': {'golpe': 3, 'dano': 7},
+        '20': {'golpe': 3, 'dano': 8},
+        '21': {'golpe': 4, 'dano': 9},
+        '22': {'golpe': 4, 'dano': 10},
+        '23': {'golpe': 5, 'dano': 11},
+        '24': {'golpe': 6, 'dano': 12},
+        '25': {'golpe': 7, 'dano': 14},
+    },
+    'DES': {
+        '1': {'reaccion': -6, 'proyectil': -6, 'ca': 5},
+        '2': {'reaccion': -4, 'proyectil': -4, 'ca': 5},
+        '3': {'reaccion': -3, 'proyectil': -3, 'ca': 4},
+        '4': {'reaccion': -2, 'proyectil': -2, 'ca': 3},
+        '5': {'reaccion': -1, 'proyectil': -1, 'ca': 2},
+        '6': {'reaccion': 0, 'proyectil': 0, 'ca': 1},
+        '7-14': {'reaccion': 0, 'proyectil': 0, 'ca': 0},
+        '15': {'reaccion': 0, 'proyectil': 0, 'ca': -1},
+        '16': {'reaccion': 1, 'proyectil': 1, 'ca': -2},
+        '17': {'reaccion': 2, 'proyectil': 2, 'ca': -3},
+        '18': {'reaccion': 2, 'proyectil': 2, 'ca': -4},
+        '19-20': {'reaccion': 3, 'proyectil': 3, 'ca': -4},
+        '21-23': {'reaccion': 4, 'proyectil': 4, 'ca': -5},
+        '24-25': {'reaccion': 5, 'proyectil': 5, 'ca': -6},
+    },
+    'CON': {
+        # pg_guerrero: ajuste para Guerrero, Paladín y Ranger (el resto se queda en +2)
+        '1': {'pg': -3, 'pg_guerrero': -3},
+        '2-3': {'pg': -2, 'pg_guerrero': -2},
+        '4-6': {'pg': -1, 'pg_guerrero': -1},
+        '7-14': {'pg': 0, 'pg_guerrero': 0},
+        '15': {'pg': 1, 'pg_guerrero': 1},
+        '16': {'pg': 2, 'pg_guerrero': 2},
+        '17': {'pg': 2, 'pg_guerrero': 3},
+        '18': {'pg': 2, 'pg_guerrero': 4},
+        '19-20': {'pg': 2, 'pg_guerrero': 5},
+        '21-23': {'pg': 2, 'pg_guerrero': 6},
+        '24-25': {'pg': 2, 'pg_guerrero': 7},
+    },
+}
+
+
+def _parse_key(key) -> tuple:
+    """'8-15' -> (8, 15, None); '18/51-75' -> (18, 18, (51, 75)); '18/00' -> (18, 18, (100, 100))"""
+    key = str(key).strip()
+    if '/' in key:
+        score, percent = key.split('/', 1)
+        low, _, high = percent.partition('-')
+        low = int(low) or 100
+        high = (int(high) or 100) if high else low
+        return int(score), int(score), (low, high)
+    low, _, high = key.partition('-')
+    return int(low), int(high or low), None
+
+
+def build_tables(attribute_modifiers: Dict) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Expande las reglas a listas indexadas por puntuación:
+    tablas['FUE']['golpe'][17] -> bonus de ataque con FUE 17.
+    Las puntuaciones que falten heredan el valor de la anterior (así también
+    valen las reglas antiguas que sólo daban algunos umbrales).
+    La fuerza excepcional queda en tablas['FUE_excepcional'][campo][percentil].
+    """
+    tables = {}
+    for attr, rows in attribute_modifiers.items():
+        by_score: Dict[int, Dict[str, int]] = {}
+        exceptional: Dict[int, Dict[str, int]] = {}
+        for key, values in rows.items():
+            low, high, percent = _parse_key(key)
+            if percent:
+                for p in range(percent[0], percent[1] + 1):
+                    exceptional[p] = values
+            else:
+                for score in range(low, high + 1):
+                    by_score[score] = values
+
+        fields = sorted({field for values in rows.values() for field in values})
+        columns = {field: [0] * (MAX_SCORE + 1) for field in fields}
+        current: Dict[str, int] = {}
+        first = by_score[min(by_score)] if by_score else {}
+        for score in range(MAX_SCORE + 1):
+            current = by_score.get(score, current or first)
+            for field in fields:
+                columns[field][score] = current.get(field, 0)
+        tables[attr] = columns
+
+        if exceptional:
+            plain = by_score.get(18, {})
+            tables[f'{attr}_excepcional'] = {
+                field: [exceptional.get(p, plain).get(field, 0) for p in range(101)]
+                for field in fields
+            }
+    return tables
+
+
+TABLES = build_tables(ATTRIBUTE_MODIFIERS)
+
+_STR_HIT = TABLES['FUE']['golpe']
+_STR_DAMAGE = TABLES['FUE']['dano']
+_STR_EXC_HIT = TABLES['FUE_excepcional']['golpe']
+_STR_EXC_DAMAGE = TABLES['FUE_excepcional']['dano']
+_DEX_REACTION = TABLES['DES']['reaccion']
+_DEX_MISSILE = TABLES['DES']['proyectil']
+_DEX_AC = TABLES['DES']['ca']
+_CON_HP = TABLES['CON']['pg']
+_CON_HP_WARRIOR = TABLES['CON']['pg_guerrero']
+
+
+def _score(value) -> int:
+    """Puntuación dentro de la tabla (1-25)"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = 10
+    return MIN_SCORE if value < MIN_SCORE else MAX_SCORE if value > MAX_SCORE else value
+
+
+def _percentile(value) -> int:
+    """Fuerza excepcional dentro de la tabla (0-100; 0 o menos es un 18 normal)"""
+    try:
+        value = int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    return 0 if value < 0 else 100 if value > 100 else value
+
+
+def strength_hit_bonus(score, exceptional: int = 0) -> int:
+    """Bonus de ataque cuerpo a cuerpo por FUE (exceptional: percentil 1-100 con FUE 18)"""
+    score = _score(score)
+    if score == 18:
+        return _STR_EXC_HIT[_percentile(exceptional)]
+    return _STR_HIT[score]
+
+
+def strength_damage_bonus(score, exceptional: int = 0) -> int:
+    """Bonus de daño cuerpo a cuerpo por FUE"""
+    score = _score(score)
+    if score == 18:
+        return _STR_EXC_DAMAGE[_percentile(exceptional)]
+    return _STR_DAMAGE[score]
+
+
+def dexterity_reaction_bonus(score) -> int:
+    """Ajuste de reacción por DES (sorpresa e iniciativa; positivo = mejor)"""
+    return _DEX_REACTION[_score(score)]
+
+
+def dexterity_missile_bonus(score) -> int:
+    """Bonus de ataque a distancia por DES"""
+    return _DEX_MISSILE[_score(score)]
+
+
+def dexterity_ac_adjustment(score) -> int:
+    """Ajuste defensivo por DES (se suma a la CA; negativo = mejor)"""
+    return _DEX_AC[_score(score)]
+
+
+def constitution_hp_bonus(score, warrior: bool = False) -> int:
+    """Ajuste de PG por dado de golpe por CON"""
+    return (_CON_HP_WARRIOR if warrior else _CON_HP)[_score(score)]
+
+
+def is_warrior(character_class: Optional[str]) -> bool:
+    """Clases que pueden tener fuerza excepcional y el ajuste de CON de guerrero"""
+    return bool(character_class) and any(w in character_class for w in WARRIOR_CLASSES)
+
+
+def character_strength(char: Dict) -> tuple:
+    """(FUE, percentil de fuerza excepcional) de un personaje en formato JSON"""
+    attrs = char.get('attributes', {}) or {}
+    return attrs.get('FUE', 10), char.get('exceptional_strength', 0) or 0
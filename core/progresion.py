@@ -0,0 +1,225 @@
+"""
+Tablas de progresión por clase AD&D 2e (Manual del Jugador)
+THAC0, tiradas de salvación y experiencia hasta nivel 20
+
+Todo se precalcula al importar en listas indexadas por nivel, así que subir
+de nivel o repartir experiencia a toda una party cuesta lo mismo por personaje
+sin importar el nivel. El nivel a partir de la XP se busca con bisect.
+"""
+
+import random
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .esquema import SAVE_ALIASES
+from .modificadores import constitution_hp_bonus, is_warrior
+
+
+MAX_LEVEL = 20
+
+# Orden de las salvaciones (claves cortas del creador de personajes)
+SAVE_KEYS = ('paralisis', 'varitas', 'petrificacion', 'aliento', 'conjuros')
+
+# Grupo de cada clase (THAC0 y salvaciones van por grupo, la XP por clase)
+CLASS_GROUPS = {
+    'Guerrero': 'guerrero',
+    'Paladín': 'guerrero',
+    'Ranger': 'guerrero',
+    'Clérigo': 'sacerdote',
+    'Druida': 'sacerdote',
+    'Ladrón': 'picaro',
+    'Bardo': 'picaro',
+    'Monje': 'picaro',
+    'Mago': 'mago',
+    'Especialista': 'mago',
+}
+DEFAULT_GROUP = 'guerrero'
+
+# THAC0: mejora por nivel de cada grupo (tabla 53)
+THAC0_RULES = {
+    'guerrero': (1, 1),   # -1 cada nivel
+    'sacerdote': (2, 3),  # -2 cada 3 niveles
+    'picaro': (1, 2),     # -1 cada 2 niveles
+    'mago': (1, 3),       # -1 cada 3 niveles
+}
+
+# Salvaciones (tabla 60): (nivel desde el que aplica, valores en el orden de SAVE_KEYS)
+SAVE_RULES = {
+    'guerrero': (
+        (1, (14, 16, 15, 17, 17)),
+        (3, (13, 15, 14, 16, 16)),
+        (5, (11, 13, 12, 13, 14)),
+        (7, (10, 12, 11, 12, 13)),
+        (9, (8, 10, 9, 9, 11)),
+        (11, (7, 9, 8, 8, 10)),
+        (13, (5, 7, 6, 5, 8)),
+        (15, (4, 6, 5, 4, 7)),
+        (17, (3, 5, 4, 4, 6)),
+    ),
+    'sacerdote': (
+        (1, (10, 14, 13, 16, 15)),
+        (4, (9, 13, 12, 15, 14)),
+        (7, (7, 11, 10, 13, 12)),
+        (10, (6, 10, 9, 12, 11)),
+        (13, (5, 9, 8, 11, 10)),
+        (16, (4, 8, 7, 10, 9)),
+        (19, (2, 6, 5, 8, 7)),
+    ),
+    'picaro': (
+        (1, (13, 14, 12, 16, 15)),
+        (5, (12, 12, 11, 15, 13)),
+        (9, (11, 10, 10, 14, 11)),
+        (13, (10, 8, 9, 13, 9)),
+        (17, (9, 6, 8, 12, 7)),
+    ),
+    'mago': (
+        (1, (14, 11, 13, 15, 12)),
+        (6, (13, 9, 11, 13, 10)),
+        (11, (11, 7, 9, 11, 8)),
+        (16, (10, 5, 7, 9, 6)),
+    ),
+}
+
+# Dados de golpe: (caras, último nivel en que se tira, PG fijos por nivel después)
+HIT_DICE = {
+    'guerrero': (10, 9, 3),
+    'sacerdote': (8, 9, 2),
+    'picaro': (6, 10, 2),
+    'mago': (4, 10, 1),
+}
+
+# XP mínima de cada nivel (posición 0 = nivel 1)
+XP_TABLES = {
+    'Guerrero': [0, 2000, 4000, 8000, 16000, 32000, 64000, 125000, 250000, 500000,
+                 750000, 1000000, 1250000, 1500000, 1750000, 2000000, 2250000, 2500000,
+                 2750000, 3000000],
+    'Paladín': [0, 2250, 4500, 9000, 18000, 36000, 75000, 150000, 300000, 600000,
+                900000, 1200000, 1500000, 1800000, 2100000, 2400000, 2700000, 3000000,
+                3300000, 3600000],
+    'Mago': [0, 2500, 5000, 10000, 20000, 40000, 60000, 90000, 135000, 250000,
+             375000, 750000, 1125000, 1500000, 1875000, 2250000, 2625000, 3000000,
+             3375000, 3750000],
+    'Clérigo': [0, 1500, 3000, 6000, 13000, 27500, 55000, 110000, 225000, 450000,
+                675000, 900000, 1125000, 1350000, 1575000, 1800000, 2025000, 2250000,
+                2475000, 2700000],
+    'Druida': [0, 2000, 4000, 7500, 12500, 20000, 35000, 60000, 90000, 125000,
+               200000, 300000, 750000, 1500000, 3000000, 3500000, 4000000, 4500000,
+               5000000, 5500000],
+    'Ladrón': [0, 1250, 2500, 5000, 10000, 20000, 40000, 70000, 110000, 160000,
+               220000, 440000, 660000, 880000, 1100000, 1320000, 1540000, 1760000,
+               1980000, 2200000],
+}
+XP_TABLES['Ranger'] = XP_TABLES['Paladín']
+XP_TABLES['Especialista'] = XP_TABLES['Mago']
+XP_TABLES['Bardo'] = XP_TABLES['Ladrón']
+XP_TABLES['Monje'] = XP_TABLES['Ladrón']
+
+
+def _build_thac0(group: str) -> List[int]:
+    step, every = THAC0_RULES[group]
+    return [20] + [20 - step * ((level - 1) // every) for level in range(1, MAX_LEVEL + 1)]
+
+
+def _build_saves(group: str) -> List[Tuple[int, ...]]:
+    rows = SAVE_RULES[group]
+    table = [rows[0][1]]  # nivel 0 = nivel 1
+    for level in range(1, MAX_LEVEL + 1):
+        table.append(next(values for start, values in reversed(rows) if level >= start))
+    return table
+
+
+THAC0_TABLE = {group: _build_thac0(group) for group in THAC0_RULES}
+SAVE_TABLE = {group: _build_saves(group) for group in SAVE_RULES}
+
+
+def class_group(character_class: Optional[str]) -> str:
+    """Grupo de la clase ('Guerrero/Ladrón' usa la primera clase)"""
+    if not character_class:
+        return DEFAULT_GROUP
+    return CLASS_GROUPS.get(character_class.split('/')[0].strip(), DEFAULT_GROUP)
+
+
+def _level(level) -> int:
+    level = int(level or 1)
+    return 1 if level < 1 else MAX_LEVEL if level > MAX_LEVEL else level
+
+
+def thac0_for(character_class: Optional[str], level) -> int:
+    """THAC0 de la clase a ese nivel"""
+    return THAC0_TABLE[class_group(character_class)][_level(level)]
+
+
+def saves_for(character_class: Optional[str], level) -> Dict[str, int]:
+    """Tiradas de salvación de la clase a ese nivel (claves cortas)"""
+    return dict(zip(SAVE_KEYS, SAVE_TABLE[class_group(character_class)][_level(level)]))
+
+
+def xp_table(character_class: Optional[str]) -> List[int]:
+    """XP mínima por nivel de la clase"""
+    base = (character_class or '').split('/')[0].strip()
+    return XP_TABLES.get(base, XP_TABLES['Guerrero'])
+
+
+def level_for_xp(character_class: Optional[str], xp: int) -> int:
+    """Nivel que corresponde a una cantidad de XP (1-20)"""
+    return max(1, bisect_right(xp_table(character_class), xp))
+
+
+def xp_for_level(character_class: Optional[str], level) -> int:
+    """XP mínima para alcanzar el nivel"""
+    return xp_table(character_class)[_level(level) - 1]
+
+
+def xp_to_next_level(character_class: Optional[str], level, xp: int) -> Optional[int]:
+    """XP que falta para el siguiente nivel (None si ya está en el máximo)"""
+    level = _level(level)
+    if level >= MAX_LEVEL:
+        return None
+    return max(0, xp_table(character_class)[level] - xp)
+
+
+def hit_points_gain(character_class: Optional[str], level, con_score: int = 10,
+                    rng=random) -> int:
+    """PG ganados al alcanzar `level` (dado + CON hasta el nivel de nombre, fijos después)"""
+    die, last_rolled, fixed = HIT_DICE[class_group(character_class)]
+    if _level(level) > last_rolled:
+        return fixed
+    con_bonus = constitution_hp_bonus(con_score, is_warrior(character_class))
+    return max(1, rng.randint(1, die) + con_bonus)
+
+
+def level_up_character(char: Dict, rng=random) -> int:
+    """
+    Sube un nivel a una ficha JSON canónica: nivel, THAC0, salvaciones y PG.
+    Devuelve los PG ganados.
+    """
+    character_class = char.get('class')
+    level = char.get('level', 1) + 1
+    char['level'] = level
+    char['thac0'] = thac0_for(character_class, level)
+
+    saves = char.setdefault('saving_throws', {})
+    long_names = 'schema_version' in char or any(name in saves for name in SAVE_ALIASES.values())
+    for key, value in saves_for(character_class, level).items():
+        saves[SAVE_ALIASES[key] if long_names else key] = value
+
+    gained = hit_points_gain(character_class, level,
+                             char.get('attributes', {}).get('CON', 10), rng)
+    hp = char.setdefault('hp', {'max': 0, 'current': 0})
+    hp['max'] += gained
+    hp['current'] += gained
+    return gained
+
+
+def award_experience(characters: Iterable[Dict], amount: int) -> List[Tuple[Dict, int]]:
+    """
+    Reparte `amount` XP a cada personaje (fichas JSON) y devuelve
+    [(personaje, nivel alcanzable)] de los que ya pueden subir de nivel.
+    """
+    ready = []
+    for char in characters:
+        char['experience'] = char.get('experience', 0) + amount
+        reachable = level_for_xp(char.get('class'), char['experience'])
+        if reachable > char.get('level', 1):
+            ready.append((char, reachable))
+    return ready
@@ -0,0 +1,84 @@
+"""
+Caché de textos renderizados (fichas de monstruo, hojas y resúmenes de personaje)
+Las entradas se indexan por identidad de la entidad + un contador de versión
+que se incrementa cada vez que la entidad cambia (touch). Sólo se guarda la
+versión de las entidades con textos en caché: al salir la última se olvida.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from .rendimiento import metrics
+
+
+class RenderCache:
+    """Caché LRU de textos renderizados, invalidada por versión de entidad"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._versions: Dict[int, int] = {}
+        self._cached_kinds: Dict[int, int] = {}  # id(entidad) -> entradas en caché
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[Any, int, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, entity: Any) -> int:
+        """Versión actual de la entidad (0 si nunca se modificó)"""
+        return self._versions.get(id(entity), 0)
+
+    def touch(self, entity: Any):
+        """Marca la entidad como modificada: sus textos cacheados dejan de valer"""
+        key = id(entity)
+        if key in self._cached_kinds:  # sin textos en caché no hay nada que invalidar
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, entity: Any, kind: str, render: Callable[[], str]) -> str:
+        """
+        Devuelve el texto `kind` de la entidad, renderizándolo sólo si no está
+        en caché o la entidad cambió desde la última vez.
+        """
+        key = (id(entity), kind)
+        version = self._versions.get(key[0], 0)
+        cached = self._entries.get(key)
+        # Se compara también la identidad: un id() puede reutilizarse tras liberar el objeto
+        if cached is not None and cached[0] is entity and cached[1] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[2]
+
+        self.misses += 1
+        with metrics.span('render.' + kind):
+            text = render()
+        if cached is None:
+            self._cached_kinds[key[0]] = self._cached_kinds.get(key[0], 0) + 1
+        self._entries[key] = (entity, version, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            (entity_id, _), _ = self._entries.popitem(last=False)
+            self._forget(entity_id)
+        return text
+
+    def _forget(self, entity_id: int):
+        """Descuenta una entrada expulsada; sin entradas, la versión ya no hace falta"""
+        remaining = self._cached_kinds[entity_id] - 1
+        if remaining:
+            self._cached_kinds[entity_id] = remaining
+        else:
+            del self._cached_kinds[entity_id]
+            self._versions.pop(entity_id, None)
+
+    def clear(self):
+        """Vacía la caché"""
+        self._entries.clear()
+        self._versions.clear()
+        self._cached_kinds.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Estadísticas de uso"""
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Instancia compartida por core e interfaces
+render_cache = RenderCache()
@@ -0,0 +1,210 @@
+"""
+Instrumentación ligera de los caminos críticos (dados, búsquedas, ataques,
+guardado y renderizado)
+
+Cada tramo (span) con nombre acumula número de llamadas, tiempo total y las
+últimas muestras, de las que salen los percentiles p50/p95/p99. Mientras la
+medición está desactivada (lo habitual) los decoradores sólo comprueban un
+booleano y los bloques `with span(...)` usan un contexto vacío compartido.
+
+Se activa con metrics.enable(), con /perf on en la consola o con la
+variable de entorno ADND_PERF=1. También permite volcar un perfil cProfile
+de la sesión a un archivo .prof (legible con pstats o snakeviz).
+"""
+
+import cProfile
+import functools
+import io
+import json
+import math
+import os
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+MAX_SAMPLES = 4096  # muestras recientes por tramo para los percentiles
+PERCENTILES = (50, 95, 99)
+
+_NULL_SPAN = nullcontext()
+
+
+def _nearest_rank(ordered, p: float) -> float:
+    """Percentil p por rango más cercano de una lista ya ordenada"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+class SpanStats:
+    """Estadísticas acumuladas de un tramo"""
+
+    __slots__ = ('count', 'total', 'max', 'samples')
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """Percentil por rango más cercano sobre las muestras recientes (segundos)"""
+        return _nearest_rank(sorted(self.samples), p)
+
+    def to_dict(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        data = {
+            'count': self.count,
+            'total_ms': self.total * 1e3,
+            'mean_ms': self.total / self.count * 1e3 if self.count else 0.0,
+            'max_ms': self.max * 1e3,
+        }
+        for p in PERCENTILES:
+            data[f'p{p}_ms'] = _nearest_rank(ordered, p) * 1e3
+        return data
+
+
+class Metrics:
+    """Registro de tramos con nombre y perfilado opcional con cProfile"""
+
+    def __init__(self, enabled: bool = False, max_samples: int = MAX_SAMPLES):
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self.spans: Dict[str, SpanStats] = {}
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Borra las estadísticas acumuladas (no cambia el estado activado)"""
+        self.spans = {}
+
+    def record(self, name: str, seconds: float):
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans.setdefault(name, SpanStats(self.max_samples))
+        stats.add(seconds)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def span(self, name: str):
+        """Contexto que mide el bloque: with metrics.span('personaje.guardar'): ..."""
+        return self._timed(name) if self.enabled else _NULL_SPAN
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado serializable: {'enabled', 'profiling', 'spans': {nombre: {...}}}"""
+        return {
+            'enabled': self.enabled,
+            'profiling': self.profiling,
+            'spans': {name: stats.to_dict() for name, stats in sorted(self.spans.items())},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Métricas en JSON (para un endpoint /api/metrics o para guardarlas)"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, **kwargs)
+
+    def report(self) -> str:
+        """Tabla de texto con las estadísticas de cada tramo"""
+        state = "activada" if self.enabled else "desactivada"
+        lines = [f"⏱️ RENDIMIENTO (medición {state})"]
+        if self.profiling:
+            lines.append("🔬 Perfil cProfile en curso")
+        if not self.spans:
+            lines.append("  Sin datos todavía" + ("" if self.enabled else " (usa /perf on)"))
+            return "\n".join(lines)
+
+        lines.append(f"  {'Tramo':<22}{'Llamadas':>9}{'Total ms':>11}{'p50 ms':>9}"
+                     f"{'p95 ms':>9}{'p99 ms':>9}{'Máx ms':>9}")
+        for name, data in self.snapshot()['spans'].items():
+            lines.append(f"  {name:<22}{data['count']:>9}{data['total_ms']:>11.2f}"
+                         f"{data['p50_ms']:>9.3f}{data['p95_ms']:>9.3f}{data['p99_ms']:>9.3f}"
+                         f"{data['max_ms']:>9.3f}")
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------
+    # cProfile
+    # ------------------------------------------------------------------
+
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
+
+    def start_profile(self) -> bool:
+        """Empieza a perfilar el hilo actual; False si ya había un perfil en curso"""
+        if self._profiler is not None:
+            return False
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return True
+
+    def stop_profile(self, path: Union[str, Path, None] = None) -> Optional[Path]:
+        """
+        Detiene el perfil y lo guarda en formato pstats.
+        Sin ruta se usa perfil_<fecha>.prof en el directorio actual.
+        Devuelve la ruta escrita o None si no había perfil en curso.
+        Si no se puede escribir (OSError) el perfil sigue en curso y se puede
+        volver a intentar con otra ruta.
+        """
+        profiler = self._profiler
+        if profiler is None:
+            return None
+        profiler.disable()
+        path = Path(path or f"perfil_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+        try:
+            profiler.dump_stats(str(path))
+        except OSError:
+            profiler.enable()
+            raise
+        self._profiler = None
+        return path
+
+
+def profile_summary(path: Union[str, Path], limit: int = 15, sort: str = 'cumulative') -> str:
+    """Resumen de texto de un volcado .prof (las `limit` funciones más costosas)"""
+    stream = io.StringIO()
+    pstats.Stats(str(path), stream=stream).strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+# Instancia compartida por core e interfaces
+metrics = Metrics(enabled=os.environ.get('ADND_PERF', '') not in ('', '0'))
+
+
+def span(name: str):
+    """Atajo de metrics.span para medir un bloque"""
+    return metrics.span(name)
+
+
+def instrument(name: str):
+    """Decorador que mide cada llamada a la función como el tramo `name`"""
+    def decorate(func: Callable):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -23,18 +23,29 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Importar módulos del sistema
 from core.dados import DiceRoller
 from core.combate import CombatManager, MonsterDatabase, Combatant
+from core.efectos import PRESETS, make_effect, preset_key
 from core.biblio import RuleBook
+from core.catalogo import CharacterCatalog
+from core.esquema import load_character_file, resolve_coin_name, SchemaError
+from core.historial import format_die_stats, format_history, roll_history
+from core.memoria import MemoryTracker
+from core.modificadores import dexterity_ac_adjustment
+from core.progresion import award_experience, level_for_xp, level_up_character, xp_to_next_level
+from core.rendimiento import metrics, profile_summary
+from core.renderizado import render_cache
 
 
 class Character:
     """Representa un personaje cargado"""
     def __init__(self, filepath: str):
         self.filepath = filepath
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        self.data = load_character_file(filepath)
     
     def get_prompt_summary(self) -> str:
-        """Genera resumen elegante para el prompt"""
+        """Genera resumen elegante para el prompt (cacheado hasta que cambie la ficha)"""
+        return render_cache.get(self.data, 'resumen', self._render_prompt_summary)
+    
+    def _render_prompt_summary(self) -> str:
         name = self.data.get('name', 'Desconocido')
         race = self.data.get('race', 'N/A')
         char_class = self.data.get('class', 'N/A')
@@ -78,7 +89,10 @@ class Character:
         return summary.strip()
     
     def get_compact_summary(self) -> str:
-        """Resumen compacto de una línea"""
+        """Resumen compacto de una línea (cacheado hasta que cambie la ficha)"""
+        return render_cache.get(self.data, 'resumen_compacto', self._render_compact_summary)
+    
+    def _render_compact_summary(self) -> str:
         name = self.data.get('name', 'Desconocido')
         race = self.data.get('race', 'N/A')
         char_class = self.data.get('class', 'N/A')
@@ -101,6 +115,11 @@ class DMAssistant:
         self.rulebook = RuleBook()
         self.running = True
         self.characters_dir = Path(__file__).parent.parent / "data"
+        self.catalog = CharacterCatalog(self.characters_dir)
+        self.combat_party = []  # (ficha, ruta) de grupos añadidos al combate
+        self.memory = MemoryTracker()
+        if os.environ.get('ADND_MEM', '') not in ('', '0'):
+            self.memory.start()
         
     def show_banner(self):
         """Muestra banner de bienvenida"""
@@ -146,13 +165,18 @@ Escribe /help para ver todos los comandos disponibles
 ║    /damage                - Tirada de daño (personaje)         ║
 ║    /save <tipo>           - Tirada de salvación                ║
 ║    /check <atributo>      - Chequeo de atributo                ║
+║    /history [N]           - Últimas N tiradas (10 por defecto) ║
+║    /dicestats [dX]        - Histograma y χ² de cada dado       ║
 ║                                                                ║
 ║  ⚔️  COMBATE                                                    ║
 ║    /combat start          - Iniciar nuevo combate              ║
 ║    /combat add <monstruo> - Agregar monstruo al combate        ║
+║    /combat party <archivo>- Agregar grupo del Party Manager    ║
 ║    /combat init           - Tirar iniciativa y comenzar        ║
+║    /combat group [on|off] - Iniciativa por grupos de monstruos ║
 ║    /combat status         - Ver estado del combate             ║
 ║    /combat attack <N>     - Atacar al enemigo N                ║
+║    /combat effect <e> <N> - Efecto temporal (veneno, sueño...) ║
 ║    /combat next           - Siguiente turno                    ║
 ║    /combat end            - Terminar combate                   ║
 ║                                                                ║
@@ -174,6 +198,9 @@ Escribe /help para ver todos los comandos disponibles
 ║    /create                - Crear nuevo personaje              ║
 ║    /edit                  - Editar personaje actual            ║
 ║    /levelup               - Subir nivel al personaje           ║
+║    /perf [on|off|reset]   - Métricas de rendimiento            ║
+║    /perf profile [arch.]  - Iniciar/guardar perfil cProfile    ║
+║    /mem [reset|stop]      - Crecimiento de memoria             ║
 ║    /help                  - Mostrar esta ayuda                 ║
 ║    /clear                 - Limpiar pantalla                   ║
 ║    /exit                  - Salir del asistente                ║
@@ -221,9 +248,10 @@ Escribe /help para ver todos los comandos disponibles
     
     def list_characters(self):
         """Lista todos los personajes JSON disponibles"""
-        json_files = list(self.characters_dir.glob("*_character.json"))
+        errors = self.catalog.refresh()
+        entries = self.catalog.list()
         
-        if not json_files:
+        if not entries and not errors:
             print("\n⚠️ No se encontraron personajes guardados\n")
             return []
         
@@ -232,33 +260,23 @@ Escribe /help para ver todos los comandos disponibles
         print("="*70 + "\n")
         
         characters_info = []
-        for i, filepath in enumerate(json_files, 1):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    char_data = json.load(f)
-                
-                name = char_data.get('name', 'Desconocido')
-                race = char_data.get('race', 'N/A')
-                char_class = char_data.get('class', 'N/A')
-                level = char_data.get('level', 1)
-                hp = char_data.get('hp', {})
-                hp_current = hp.get('current', 0)
-                hp_max = hp.get('max', 0)
-                
-                filename = filepath.name
-                
-                print(f"  [{i}] {name:25s} - {race} {char_class} Nv.{level}")
-                print(f"      HP: {hp_current}/{hp_max}  |  Archivo: {filename}")
-                print()
-                
-                characters_info.append({
-                    'index': i,
-                    'filepath': str(filepath),
-                    'filename': filename,
-                    'name': name
-                })
-            except Exception as e:
-                print(f"  ❌ Error leyendo {filepath.name}: {e}\n")
+        for i, entry in enumerate(entries, 1):
+            name = entry['name']
+            filename = entry['filename']
+            
+            print(f"  [{i}] {name:25s} - {entry['race']} {entry['class']} Nv.{entry['level']}")
+            print(f"      HP: {entry['hp_current']}/{entry['hp_max']}  |  Archivo: {filename}")
+            print()
+            
+            characters_info.append({
+                'index': i,
+                'filepath': entry['filepath'],
+                'filename': filename,
+                'name': name
+            })
+        
+        for filename in errors:
+            print(f"  ❌ Error leyendo {filename}\n")
         
         print("="*70 + "\n")
         return characters_info
@@ -268,26 +286,26 @@ Escribe /help para ver todos los comandos disponibles
         try:
             # Si es un número, buscar en la lista de personajes
             if filepath.isdigit():
-                characters = list(self.characters_dir.glob("*_character.json"))
-                idx = int(filepath) - 1
-                if 0 <= idx < len(characters):
-                    filepath = str(characters[idx])
+                self.catalog.refresh()
+                entry = self.catalog.get_by_index(int(filepath))
+                if entry:
+                    filepath = entry['filepath']
                 else:
                     print(f"❌ Índice {filepath} inválido")
                     return False
             
             if not filepath.endswith('.json'):
-                # Buscar por nombre
-                found = None
-                for json_file in self.characters_dir.glob("*_character.json"):
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if data.get('name', '').lower() == filepath.lower():
-                            found = str(json_file)
-                            break
+                # Buscar por nombre en el catálogo
+                self.catalog.refresh()
+                matches = self.catalog.find_all_by_name(filepath)
                 
-                if found:
-                    filepath = found
+                if matches:
+                    if len(matches) > 1:
+                        files = ', '.join(m['filename'] for m in matches)
+                        print(f"⚠️ Hay {len(matches)} personajes llamados '{filepath}' ({files}); "
+                              f"se carga {matches[0]['filename']}")
+                        print("💡 Usa /character <número> (ver /characters) para elegir otro")
+                    filepath = matches[0]['filepath']
                 else:
                     filepath += '.json'
             
@@ -304,6 +322,10 @@ Escribe /help para ver todos los comandos disponibles
             self.dice_roller.character = self.current_character.data
             
             return True
+        except SchemaError as e:
+            print(f"❌ Ficha de personaje inválida: {e}")
+            print("💡 Revisa el archivo o ejecuta: python core/esquema.py --write")
+            return False
         except Exception as e:
             print(f"❌ Error cargando personaje: {e}")
             return False
@@ -324,60 +346,65 @@ Escribe /help para ver todos los comandos disponibles
             return
         
         char = self.current_character.data
-        
-        print("\n" + "="*70)
-        print(f"FICHA DE PERSONAJE: {char.get('name', 'N/A')}".center(70))
-        print("="*70)
+        print(render_cache.get(char, 'ficha', lambda: self._render_sheet(char)))
+    
+    def _render_sheet(self, char: Dict) -> str:
+        """Texto de la ficha completa de un personaje"""
+        lines = []
+        lines.append("\n" + "="*70)
+        lines.append(f"FICHA DE PERSONAJE: {char.get('name', 'N/A')}".center(70))
+        lines.append("="*70)
         
         # Información básica
-        print(f"\nRaza: {char.get('race', 'N/A')}")
-        print(f"Clase: {char.get('class', 'N/A')}")
-        print(f"Nivel: {char.get('level', 1)}")
-        print(f"Alineamiento: {char.get('alignment', 'N/A')}")
+        lines.append(f"\nRaza: {char.get('race', 'N/A')}")
+        lines.append(f"Clase: {char.get('class', 'N/A')}")
+        lines.append(f"Nivel: {char.get('level', 1)}")
+        lines.append(f"Alineamiento: {char.get('alignment', 'N/A')}")
         
         # Kit
         kit = char.get('kit')
         if kit:
-            print(f"Kit: {kit.get('name', 'N/A')}")
+            lines.append(f"Kit: {kit.get('name', 'N/A')}")
         
         # Atributos
-        print("\n📊 ATRIBUTOS:")
+        lines.append("\n📊 ATRIBUTOS:")
         attrs = char.get('attributes', {})
         for attr_name in ['FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR']:
             value = attrs.get(attr_name, 10)
-            print(f"  {attr_name}: {value}")
+            lines.append(f"  {attr_name}: {value}")
         
         # Combate
-        print("\n⚔️ ESTADÍSTICAS DE COMBATE:")
+        lines.append("\n⚔️ ESTADÍSTICAS DE COMBATE:")
         hp = char.get('hp', {})
-        print(f"  Puntos de Golpe: {hp.get('current', 0)}/{hp.get('max', 0)}")
-        print(f"  Clase de Armadura: {char.get('ac', 10)}")
-        print(f"  THAC0: {char.get('thac0', 20)}")
+        lines.append(f"  Puntos de Golpe: {hp.get('current', 0)}/{hp.get('max', 0)}")
+        lines.append(f"  Clase de Armadura: {char.get('ac', 10)}")
+        lines.append(f"  THAC0: {char.get('thac0', 20)}")
         
         # Armas equipadas
         equipped = char.get('equipped', {})
-        print("\n🗡️ EQUIPO:")
+        lines.append("\n🗡️ EQUIPO:")
         if equipped.get('arma_principal'):
-            print(f"  Arma Principal: {equipped['arma_principal']}")
+            lines.append(f"  Arma Principal: {equipped['arma_principal']}")
         if equipped.get('armadura'):
-            print(f"  Armadura: {equipped['armadura']}")
+            lines.append(f"  Armadura: {equipped['armadura']}")
         if equipped.get('escudo'):
-            print(f"  Escudo: {equipped['escudo']}")
+            lines.append(f"  Escudo: {equipped['escudo']}")
         
         # Salvaciones
-        print("\n🛡️ TIRADAS DE SALVACIÓN:")
+        lines.append("\n🛡️ TIRADAS DE SALVACIÓN:")
         saves = char.get('saving_throws', {})
         for save_type, value in saves.items():
-            print(f"  {save_type}: {value}")
+            lines.append(f"  {save_type}: {value}")
         
         # Dinero
-        print("\n💰 DINERO:")
+        lines.append("\n💰 DINERO:")
         money = char.get('money', {})
         for coin, amount in money.items():
             if amount > 0:
-                print(f"  {coin}: {amount}")
+                lines.append(f"  {coin}: {amount}")
         
-        print("\n" + "="*70 + "\n")
+        lines.append("\n" + "="*70 + "\n")
+        return "\n".join(lines)
     
     def roll_dice(self, dice_string: str = None, bonus: int = 0):
         """Lanza dados"""
@@ -526,36 +553,62 @@ Escribe /help para ver todos los comandos disponibles
             return
         
         try:
-            current_xp = self.current_character.data.get('experience', 0)
-            new_xp = current_xp + amount
-            self.current_character.data['experience'] = new_xp
+            char = self.current_character.data
+            current_xp = char.get('experience', 0)
+            ready = award_experience([char], amount)
+            new_xp = char['experience']
             
-            print(f"⭐ {self.current_character.data['name']} gana {amount} XP")
+            print(f"⭐ {char['name']} gana {amount} XP")
             print(f"   XP Total: {current_xp:,} → {new_xp:,}")
             
-            # Verificar si puede subir de nivel
-            level = self.current_character.data.get('level', 1)
-            char_class = self.current_character.data.get('class', '')
-            
-            # XP necesario para siguiente nivel (simplificado)
-            xp_needed = level * 2000  # Aproximación
-            if new_xp >= xp_needed:
-                print(f"   🎉 ¡Suficiente XP para nivel {level + 1}!")
+            # Verificar si puede subir de nivel (tabla de XP de la clase)
+            if ready:
+                print(f"   🎉 ¡Suficiente XP para nivel {ready[0][1]}!")
                 print(f"   💡 Usa /levelup para subir de nivel")
+            else:
+                missing = xp_to_next_level(char.get('class'), char.get('level', 1), new_xp)
+                if missing is not None:
+                    print(f"   Faltan {missing:,} XP para nivel {char.get('level', 1) + 1}")
             
             self.save_character()
             
         except Exception as e:
             print(f"❌ Error agregando XP: {e}")
     
+    def level_up(self):
+        """Sube un nivel al personaje actual si tiene la XP necesaria"""
+        if not self.current_character:
+            print("❌ No hay personaje cargado")
+            return
+        
+        char = self.current_character.data
+        level = char.get('level', 1)
+        if level_for_xp(char.get('class'), char.get('experience', 0)) <= level:
+            missing = xp_to_next_level(char.get('class'), level, char.get('experience', 0))
+            if missing is None:
+                print(f"⚠️ {char['name']} ya está en el nivel máximo")
+            else:
+                print(f"❌ Faltan {missing:,} XP para nivel {level + 1}")
+            return
+        
+        gained = level_up_character(char)
+        print(f"✨ {char['name']} alcanza el nivel {char['level']}")
+        print(f"   +{gained} PG (Total: {char['hp']['max']}) | THAC0: {char['thac0']}")
+        self.save_character()
+    
     def save_character(self):
         """Guarda los cambios del personaje actual"""
         if not self.current_character:
             return
         
+        # Toda edición de la ficha termina aquí: invalidar sus textos cacheados
+        render_cache.touch(self.current_character.data)
+        
         try:
-            with open(self.current_character.filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.current_character.data, f, indent=2, ensure_ascii=False)
+            with metrics.span('personaje.guardar'):
+                with open(self.current_character.filepath, 'w', encoding='utf-8') as f:
+                    json.dump(self.current_character.data, f, indent=2, ensure_ascii=False)
+                self.catalog.update_file(self.current_character.filepath)
             print("💾 Cambios guardados")
         except Exception as e:
             print(f"❌ Error guardando: {e}")
@@ -570,21 +623,7 @@ Escribe /help para ver todos los comandos disponibles
             money = self.current_character.data.get('money', {})
             
             # Normalizar tipo de moneda
-            coin_map = {
-                'po': 'Piezas de Oro',
-                'pp': 'Piezas de Platino',
-                'pa': 'Piezas de Plata',
-                'pe': 'Piezas de Electro',
-                'pc': 'Piezas de Cobre',
-                'oro': 'Piezas de Oro',
-                'platino': 'Piezas de Platino',
-                'plata': 'Piezas de Plata',
-                'electro': 'Piezas de Electro',
-                'cobre': 'Piezas de Cobre'
-            }
-            
-            coin_type_lower = coin_type.lower()
-            full_coin = coin_map.get(coin_type_lower)
+            full_coin = resolve_coin_name(coin_type)
             
             if not full_coin:
                 print(f"❌ Tipo de moneda inválido: {coin_type}")
@@ -697,12 +736,7 @@ Escribe /help para ver todos los comandos disponibles
             base_ac += shield_bonus
         
         # AC por DES
-        dex = char.get('attributes', {}).get('DES', 10)
-        dex_bonus = 0
-        if dex >= 16:
-            dex_bonus = -(dex - 15)  # -1 por cada punto sobre 15
-        elif dex <= 6:
-            dex_bonus = (7 - dex)  # +1 por cada punto bajo 7
+        dex_bonus = dexterity_ac_adjustment(char.get('attributes', {}).get('DES', 10))
         
         char['ac'] = base_ac + dex_bonus
         
@@ -738,31 +772,88 @@ Escribe /help para ver todos los comandos disponibles
         print("⚔️ INICIANDO NUEVO COMBATE".center(70))
         print("="*70 + "\n")
         
-        self.combat_manager = CombatManager()
+        self.combat_manager = CombatManager(monster_db=self.monster_db)
+        self.combat_party = []
         
-        # Agregar personaje actual si está cargado
+        # Agregar personaje actual si está cargado (comparte la misma ficha en memoria)
         if self.current_character:
-            # Guardar personaje temporalmente
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-                json.dump(self.current_character.data, f, ensure_ascii=False, indent=2)
-                temp_file = f.name
-            
-            # Agregar al combate
-            if self.combat_manager.add_player(temp_file):
+            if self.combat_manager.add_player_data(self.current_character.data):
                 print(f"✅ {self.current_character.data.get('name')} añadido al combate")
-            
-            # Limpiar archivo temporal
-            import os
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
         
         print("\n💡 Usa /combat add <monstruo> para agregar enemigos")
+        print("💡 Usa /combat party <archivo> para agregar un grupo exportado")
         print("💡 Usa /monsters list para ver monstruos disponibles")
         print("💡 Usa /combat init para tirar iniciativa y comenzar")
     
+    def combat_add_party(self, party_file: str):
+        """Agrega al combate un grupo exportado desde el Party Manager"""
+        party_path = Path(party_file.strip('"'))
+        if not party_path.exists():
+            print(f"❌ Archivo '{party_file}' no encontrado")
+            return
+        
+        try:
+            with open(party_path, 'r', encoding='utf-8') as f:
+                party_data = json.load(f)
+            party = party_data['party']
+            files = party_data.get('files', [None] * len(party))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Error leyendo el grupo: {e}")
+            return
+        
+        added = self.combat_manager.add_party(party)
+        for char_data, char_file in zip(party, files):
+            if char_data and any(c.entity is char_data for c in self.combat_manager.combatants):
+                self.combat_party.append((char_data, char_file))
+        print(f"✅ {added} personajes del grupo añadidos al combate")
+    
+    def combat_effect(self, args: str):
+        """
+        Aplica un efecto temporal a un combatiente: <efecto> <N> [rounds]
+        (regeneracion <N> <PG por round>, que dura todo el combate)
+        """
+        parts = args.split()
+        combatants = self.combat_manager.combatants
+        if len(parts) < 2 or not parts[1].isdigit():
+            print("❌ Uso: /combat effect <efecto> <N> [rounds]")
+            print(f"   Efectos: {', '.join(PRESETS)}")
+            print("\n🎯 Combatientes:")
+            for i, c in enumerate(combatants, 1):
+                print(f"  {i}. {c}")
+            return
+        
+        idx = int(parts[1]) - 1
+        if not 0 <= idx < len(combatants):
+            print(f"❌ Número inválido. Elige entre 1 y {len(combatants)}")
+            return
+        regeneration = preset_key(parts[0]) == 'regeneracion'
+        if regeneration and (len(parts) < 3 or not parts[2].isdigit()):
+            print("❌ Uso: /combat effect regeneracion <N> <PG por round>")
+            return
+        try:
+            extra = [int(parts[2])] if len(parts) > 2 else []
+            effect = make_effect(parts[0], *extra)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        self.combat_manager.apply_effect(combatants[idx], effect)
+    
+    def _save_combat_party(self):
+        """Guarda en sus archivos los personajes de grupo que participaron en el combate"""
+        for char_data, char_file in self.combat_party:
+            if not char_file:
+                continue
+            try:
+                with open(char_file, 'w', encoding='utf-8') as f:
+                    json.dump(char_data, f, indent=2, ensure_ascii=False)
+                self.catalog.update_file(char_file)
+                hp = char_data['hp']
+                print(f"💾 HP de {char_data.get('name')} actualizado: {hp['current']}/{hp['max']}")
+            except OSError as e:
+                print(f"❌ Error guardando {char_file}: {e}")
+        self.combat_party = []
+    
     def run_create_character(self):
         """Ejecuta el script de creación de personajes"""
         try:
@@ -890,15 +981,26 @@ Escribe /help para ver todos los comandos disponibles
             self.ability_check(args.upper() if args else None)
         
         # Combate
+        elif cmd == '/history':
+            count = int(args) if args.isdigit() else 10
+            print(f"\n{format_history(roll_history.recent(count))}\n")
+        
+        elif cmd == '/dicestats':
+            self.show_dice_stats(args)
+        
         elif cmd == '/combat':
             if not args:
-                print("❌ Uso: /combat [start|add|init|status|attack|move|next|auto|end]")
+                print("❌ Uso: /combat [start|add|party|init|group|status|attack|effect|move|next|auto|end]")
                 print("\nSubcomandos:")
                 print("  start                    - Iniciar nuevo combate")
                 print("  add <monstruo>           - Agregar monstruo al combate")
+                print("  party <archivo>          - Agregar un grupo exportado del Party Manager")
                 print("  init                     - Tirar iniciativa y comenzar")
+                print("  group [on|off]           - Iniciativa de grupo (monstruos iguales juntos)")
                 print("  status                   - Ver estado del combate")
                 print("  attack <objetivo>        - Atacar a un objetivo")
+                print("  effect <efecto> <N> [r]  - Aplicar un efecto durante r rounds")
+                print("  effect regeneracion <N> <PG> - Regenerar PG por round")
                 print("  move <approach|retreat>  - Acercarse o retroceder")
                 print("  next                     - Siguiente turno")
                 print("  auto [min_hp]            - Combate automático (parar si HP <= min_hp)")
@@ -951,6 +1053,14 @@ Escribe /help para ver todos los comandos disponibles
                             except ValueError:
                                 print("❌ Debes ingresar un número")
                 
+                elif subcmd == 'party':
+                    if not self.combat_manager:
+                        print("❌ Inicia combate primero con /combat start")
+                    elif not subcmd_args:
+                        print("❌ Especifica el archivo del grupo (exportado desde el Party Manager)")
+                    else:
+                        self.combat_add_party(subcmd_args)
+                
                 elif subcmd == 'init':
                     if not self.combat_manager:
                         print("❌ No hay combate activo")
@@ -972,6 +1082,23 @@ Escribe /help para ver todos los comandos disponibles
                                 print("💡 Usa /combat attack <número> para que el enemigo ataque al PJ")
                                 print("   O usa /combat next si el enemigo no ataca este turno")
                 
+                elif subcmd == 'group':
+                    if not self.combat_manager:
+                        print("❌ Inicia combate primero con /combat start")
+                    else:
+                        if subcmd_args.lower() in ('on', 'off'):
+                            self.combat_manager.group_initiative = subcmd_args.lower() == 'on'
+                        state = "activada" if self.combat_manager.group_initiative else "desactivada"
+                        print(f"👥 Iniciativa de grupo {state}")
+                        if self.combat_manager.group_initiative:
+                            print("   Los monstruos del mismo tipo tiran juntos y atacan a la vez")
+                
+                elif subcmd == 'effect':
+                    if not self.combat_manager:
+                        print("❌ No hay combate activo")
+                    else:
+                        self.combat_effect(subcmd_args)
+                
                 elif subcmd == 'status':
                     if not self.combat_manager:
                         print("❌ No hay combate activo")
@@ -1029,7 +1156,11 @@ Escribe /help para ver todos los comandos disponibles
                                 try:
                                     idx = int(subcmd_args) - 1
                                     if 0 <= idx < len(players):
-                                        result = self.combat_manager.make_attack(current, players[idx])
+                                        group = self.combat_manager.current_group()
+                                        if len(group) > 1:
+                                            result = self.combat_manager.make_group_attack(group, players[idx])
+                                        else:
+                                            result = self.combat_manager.make_attack(current, players[idx])
                                         print(f"\n{result['message']}")
                                     else:
                                         print(f"❌ Número inválido. Elige entre 1 y {len(players)}")
@@ -1127,7 +1258,13 @@ Escribe /help para ver todos los comandos disponibles
                                 # Enemigo ataca a jugadores
                                 players = [c for c in self.combat_manager.combatants 
                                          if c.is_player and c.is_alive]
-                                if players:
+                                group = self.combat_manager.current_group()
+                                if players and len(group) > 1:
+                                    # Grupo: se reparten entre los jugadores, los más heridos primero
+                                    targets = sorted(players, key=lambda p: p.hp)
+                                    result = self.combat_manager.make_group_attack(group, targets)
+                                    print(f"   {result['message']}")
+                                elif players:
                                     # Atacar al jugador con menos HP
                                     target = min(players, key=lambda p: p.hp)
                                     result = self.combat_manager.make_attack(current, target)
@@ -1190,13 +1327,13 @@ Escribe /help para ver todos los comandos disponibles
                         print(f"Jugadores vivos: {players_alive}")
                         print(f"Enemigos vivos: {monsters_alive}")
                         
-                        # Actualizar HP del personaje si está cargado
+                        # La ficha cargada se compartió con el combate: sólo falta guardarla
                         if self.current_character:
                             for c in self.combat_manager.combatants:
-                                if c.is_player and c.name == self.current_character.data.get('name'):
-                                    self.current_character.data['hp']['current'] = c.hp
+                                if c.is_player and c.entity is self.current_character.data:
                                     self.save_character()
                                     print(f"\n💾 HP de {c.name} actualizado: {c.hp}/{c.max_hp}")
+                        self._save_combat_party()
                         
                         self.combat_manager = None
                         print("\n✅ Combate terminado")
@@ -1247,10 +1384,13 @@ Escribe /help para ver todos los comandos disponibles
             self.run_edit_character()
         
         elif cmd == '/levelup':
-            if self.current_character:
-                print("⚠️ Funcionalidad disponible en character_creator.py - opción de editar personaje")
-            else:
-                print("❌ No hay personaje cargado")
+            self.level_up()
+        
+        elif cmd == '/perf':
+            self.performance(args)
+        
+        elif cmd == '/mem':
+            self.memory_report(args)
         
         elif cmd == '/help':
             self.show_help()
@@ -1266,6 +1406,81 @@ Escribe /help para ver todos los comandos disponibles
         else:
             print(f"❌ Comando '{cmd}' no reconocido. Usa /help para ver comandos disponibles")
     
+    def performance(self, args: str):
+        """Métricas de rendimiento y perfil cProfile de la sesión"""
+        parts = args.split(maxsplit=1)
+        subcmd = parts[0].lower() if parts else ''
+        
+        if subcmd == 'on':
+            metrics.enable()
+            print("⏱️ Medición de rendimiento activada")
+        elif subcmd == 'off':
+            metrics.disable()
+            print("⏱️ Medición de rendimiento desactivada")
+        elif subcmd == 'reset':
+            metrics.reset()
+            print("⏱️ Métricas reiniciadas")
+        elif subcmd == 'json':
+            print(metrics.to_json(indent=2))
+        elif subcmd == 'profile':
+            if not metrics.profiling:
+                metrics.start_profile()
+                print("🔬 Perfil cProfile iniciado (repite /perf profile [archivo] para guardarlo)")
+                return
+            try:
+                path = metrics.stop_profile(parts[1] if len(parts) > 1 else None)
+            except OSError as e:
+                print(f"❌ Error guardando el perfil: {e}")
+                print("💡 El perfil sigue en curso: repite /perf profile <otro archivo>")
+                return
+            print(f"💾 Perfil guardado en {path}")
+            print(profile_summary(path, limit=10))
+        elif not subcmd:
+            print(f"\n{metrics.report()}\n")
+        else:
+            print("❌ Uso: /perf [on|off|reset|json|profile [archivo]]")
+    
+    def show_dice_stats(self, die: str):
+        """Estadísticas de equidad de los dados tirados en la sesión"""
+        die = die.strip().lower().lstrip('d')
+        if die:
+            if not die.isdigit():
+                print("❌ Uso: /dicestats [dX] (ej: /dicestats d20)")
+                return
+            stats = roll_history.die_stats(int(die))
+            if not stats:
+                print(f"❌ Todavía no se ha tirado ningún d{die}")
+                return
+            print(f"\n{format_die_stats(stats)}\n")
+            return
+        
+        all_stats = roll_history.all_stats()
+        if not all_stats:
+            print("❌ Todavía no hay tiradas registradas")
+            return
+        print(f"\n📊 Estadísticas de {roll_history.recorded} tiradas:")
+        for stats in all_stats:
+            print(format_die_stats(stats, histogram=False))
+        print()
+    
+    def memory_report(self, args: str):
+        """Informe de memoria con tracemalloc (crecimiento por módulo y objetos vivos)"""
+        subcmd = args.strip().lower()
+        
+        if subcmd == 'stop':
+            self.memory.stop()
+            print("🧠 Seguimiento de memoria detenido")
+        elif subcmd == 'reset':
+            self.memory.start()
+            print("📸 Nueva instantánea inicial de memoria")
+        elif subcmd:
+            print("❌ Uso: /mem [reset|stop]")
+        elif not self.memory.active:
+            self.memory.start()
+            print("📸 Seguimiento de memoria iniciado: vuelve a usar /mem para ver el crecimiento")
+        else:
+            print(f"\n{self.memory.report()}\n")
+    
     def search_rules(self, query: str):
         """Busca una regla en la biblioteca"""
         if not query:
@@ -8,10 +8,9 @@ from tkinter import ttk, scrolledtext, messagebox, filedialog
 import json
 import os
 import sys
+import threading
 from pathlib import Path
 from typing import Optional, List
-import threading
-import tempfile
 
 # Agregar el directorio padre al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -19,6 +18,33 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Importar módulos del sistema
 from core.dados import DiceRoller
 from core.combate import CombatManager, MonsterDatabase, Combatant
+from core.catalogo import CharacterCatalog
+from core.esquema import load_character_file, to_sheet_format
+from core.eventos import CallbackSink
+from core.progresion import award_experience
+from core.rendimiento import metrics, profile_summary
+from core.renderizado import render_cache
+from interfaces.tareas import TaskRunner
+
+
+class TkLogSink(CallbackSink):
+    """
+    Lleva los eventos del núcleo al registro de actividad.
+    Las tiradas no se incluyen: los paneles ya muestran su propio resumen.
+    """
+    
+    KINDS = ('mensaje', 'combate.log', 'combate.estado', 'monstruo.ficha')
+    
+    def __init__(self, app, kinds=KINDS):
+        super().__init__(app.log, kinds)
+        self.app = app
+    
+    def handle(self, event):
+        # Tk sólo se puede tocar desde su hilo: desde las tareas se encola
+        if threading.current_thread() is threading.main_thread():
+            self.callback(event.text.strip('\n'))
+        else:
+            self.app.root.after(0, self.callback, event.text.strip('\n'))
 
 
 class CharacterPanel(ttk.Frame):
@@ -28,6 +54,8 @@ class CharacterPanel(ttk.Frame):
         super().__init__(parent)
         self.app = app
         self.current_character = None
+        self.catalog = CharacterCatalog(Path(__file__).parent.parent / "data")
+        self.catalog_entries = []
         
         # Lista de personajes
         list_frame = ttk.LabelFrame(self, text="📋 Personajes Disponibles", padding=10)
@@ -99,27 +127,25 @@ class CharacterPanel(ttk.Frame):
         self.load_character_list()
     
     def load_character_list(self):
-        """Carga lista de personajes"""
+        """Carga lista de personajes (el escaneo del directorio va en segundo plano)"""
+        def scan(task):
+            errors = self.catalog.refresh()
+            return errors, self.catalog.list()
+        
+        self.app.run_task(scan, description="Escaneando personajes",
+                          on_done=self._fill_character_list)
+    
+    def _fill_character_list(self, result):
+        """Rellena la lista con el resultado del escaneo"""
+        errors, self.catalog_entries = result
         self.char_listbox.delete(0, tk.END)
+        for entry in self.catalog_entries:
+            hp_str = f"{entry['hp_current']}/{entry['hp_max']}"
+            display = f"{entry['name']} [{entry['race']} {entry['class']} Nv.{entry['level']}] HP:{hp_str}"
+            self.char_listbox.insert(tk.END, display)
         
-        char_dir = Path(__file__).parent
-        for filepath in char_dir.glob("*_character.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                name = data.get('name', 'N/A')
-                race = data.get('race', 'N/A')
-                char_class = data.get('class', 'N/A')
-                level = data.get('level', 1)
-                hp = data.get('hp', {})
-                hp_str = f"{hp.get('current', 0)}/{hp.get('max', 0)}"
-                
-                display = f"{name} [{race} {char_class} Nv.{level}] HP:{hp_str}"
-                self.char_listbox.insert(tk.END, display)
-                
-            except Exception as e:
-                self.char_listbox.insert(tk.END, f"Error: {filepath.name}")
+        for filename in errors:
+            self.char_listbox.insert(tk.END, f"Error: {filename}")
     
     def on_character_select(self, event=None):
         """Carga personaje seleccionado"""
@@ -128,26 +154,26 @@ class CharacterPanel(ttk.Frame):
             return
         
         idx = selection[0]
-        char_files = list(Path(__file__).parent.glob("*_character.json"))
-        
-        if idx < len(char_files):
-            self.load_character(str(char_files[idx]))
+        if idx < len(self.catalog_entries):
+            self.load_character(self.catalog_entries[idx]['filepath'])
     
     def load_character(self, filepath: str):
-        """Carga un personaje"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.current_character = json.load(f)
-            
+        """Carga un personaje (lectura y normalización en segundo plano)"""
+        def on_done(character):
+            self.current_character = character
             self.current_character['_filepath'] = filepath
             self.update_character_display()
             self.app.log(f"✅ Personaje cargado: {self.current_character.get('name')}")
             
             # Actualizar dice roller
             self.app.dice_roller.character = self.current_character
-            
-        except Exception as e:
+        
+        def on_error(e):
             messagebox.showerror("Error", f"Error cargando personaje: {e}")
+        
+        self.app.run_task(lambda task: load_character_file(filepath),
+                          description="Cargando personaje",
+                          on_done=on_done, on_error=on_error)
     
     def update_character_display(self):
         """Actualiza la visualización del personaje"""
@@ -232,13 +258,14 @@ class CharacterPanel(ttk.Frame):
         
         try:
             xp = int(self.xp_entry.get())
-            current_xp = self.current_character.get('experience', 0)
-            new_xp = current_xp + xp
+            ready = award_experience([self.current_character], xp)
+            new_xp = self.current_character['experience']
             
-            self.current_character['experience'] = new_xp
             self.update_character_display()
             self.xp_entry.delete(0, tk.END)
             self.app.log(f"XP añadido: +{xp:,} (Total: {new_xp:,})")
+            if ready:
+                self.app.log(f"🎉 ¡Suficiente XP para nivel {ready[0][1]}!")
             
         except ValueError:
             messagebox.showerror("Error", "Valor inválido")
@@ -272,6 +299,7 @@ class CharacterPanel(ttk.Frame):
             
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(char_data, f, indent=2, ensure_ascii=False)
+            self.catalog.update_file(filepath)
             
             self.app.log(f"💾 Personaje guardado: {char_data.get('name')}")
             messagebox.showinfo("Éxito", "Personaje guardado correctamente")
@@ -404,7 +432,10 @@ class MonsterPanel(ttk.Frame):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
-        self.monster_db = MonsterDatabase()
+        self.monster_db = MonsterDatabase(app.event_sink)
+        self._search_task = None
+        self._search_after_id = None
+        self._listed_names: List[str] = []  # nombres mostrados, en orden alfabético
         
         # Search
         search_frame = ttk.Frame(self)
@@ -414,6 +445,7 @@ class MonsterPanel(ttk.Frame):
         self.search_entry = ttk.Entry(search_frame, width=20)
         self.search_entry.pack(side=tk.LEFT, padx=5)
         self.search_entry.bind('<Return>', lambda e: self.search_monsters())
+        self.search_entry.bind('<KeyRelease>', self._schedule_search)
         
         ttk.Button(search_frame, text="Buscar",
                   command=self.search_monsters).pack(side=tk.LEFT)
@@ -458,52 +490,99 @@ class MonsterPanel(ttk.Frame):
         
         self.load_all_monsters()
     
+    SEARCH_DEBOUNCE_MS = 150
+    
+    def _monster_display(self, name: str) -> str:
+        """Línea de la lista para un monstruo"""
+        data = self.monster_db.monsters[name]
+        hd = data.get('hd', '1d8')
+        ac = data.get('ac', 10)
+        return f"{name:30s} HD:{hd:8s} AC:{ac:2d}"
+    
+    def _show_monsters(self, names):
+        """
+        Muestra los monstruos indicados modificando sólo las líneas que cambian.
+        Ambas listas están ordenadas alfabéticamente, así que basta con borrar
+        las que sobran (de abajo arriba, por bloques) e insertar las nuevas.
+        """
+        new = sorted(names)
+        if new == self._listed_names:
+            return
+        
+        new_set = set(new)
+        old = self._listed_names
+        old_set = set(old)
+        
+        i = len(old) - 1
+        while i >= 0:
+            if old[i] in new_set:
+                i -= 1
+                continue
+            end = i
+            while i >= 0 and old[i] not in new_set:
+                i -= 1
+            self.monster_listbox.delete(i + 1, end)
+        
+        for index, name in enumerate(new):
+            if name not in old_set:
+                self.monster_listbox.insert(index, self._monster_display(name))
+        
+        self._listed_names = new
+    
+    def _filtered_names(self, names):
+        """Aplica el filtro de tipo seleccionado"""
+        type_selected = self.type_var.get()
+        if not type_selected or type_selected == 'Todos':
+            return list(names)
+        allowed = set(self.monster_db.filter_by_type(type_selected))
+        return [name for name in names if name in allowed]
+    
     def load_all_monsters(self):
         """Carga todos los monstruos"""
-        self.monster_listbox.delete(0, tk.END)
-        
-        for name, data in sorted(self.monster_db.monsters.items()):
-            hd = data.get('hd', '1d8')
-            ac = data.get('ac', 10)
-            display = f"{name:30s} HD:{hd:8s} AC:{ac:2d}"
-            self.monster_listbox.insert(tk.END, display)
+        self._show_monsters(self._filtered_names(self.monster_db.monsters))
     
-    def search_monsters(self):
-        """Busca monstruos"""
+    def _schedule_search(self, event=None):
+        """Búsqueda mientras se escribe, con espera para no buscar en cada tecla"""
+        if event is not None and event.keysym == 'Return':
+            return
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self.SEARCH_DEBOUNCE_MS,
+                                           lambda: self.search_monsters(live=True))
+    
+    def search_monsters(self, live: bool = False):
+        """Busca monstruos (índice de n-gramas de MonsterDatabase)"""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        
         query = self.search_entry.get().strip()
+        
+        # Una búsqueda nueva deja obsoleta la anterior
+        if self._search_task:
+            self._search_task.cancel()
+        
         if not query:
             self.load_all_monsters()
             return
         
-        results = self.monster_db.search_monsters(query)
-        
-        self.monster_listbox.delete(0, tk.END)
-        for name, data in results.items():
-            hd = data.get('hd', '1d8')
-            ac = data.get('ac', 10)
-            display = f"{name:30s} HD:{hd:8s} AC:{ac:2d}"
-            self.monster_listbox.insert(tk.END, display)
+        def on_done(results):
+            self._search_task = None
+            self._show_monsters(self._filtered_names(results))
+            if not live:
+                self.app.log(f"🔍 Búsqueda '{query}': {len(self._listed_names)} resultados")
         
-        self.app.log(f"🔍 Búsqueda '{query}': {len(results)} resultados")
+        self._search_task = self.app.run_task(
+            lambda task: self.monster_db.search_monsters(query),
+            description=f"Buscando '{query}'", on_done=on_done)
     
     def filter_by_type(self):
-        """Filtra por tipo"""
-        type_selected = self.type_var.get()
-        
-        if type_selected == 'Todos':
-            self.load_all_monsters()
+        """Filtra por tipo (combinado con el texto de búsqueda)"""
+        if self.search_entry.get().strip():
+            self.search_monsters()
             return
-        
-        results = self.monster_db.filter_by_type(type_selected)
-        
-        self.monster_listbox.delete(0, tk.END)
-        for name, data in results.items():
-            hd = data.get('hd', '1d8')
-            ac = data.get('ac', 10)
-            display = f"{name:30s} HD:{hd:8s} AC:{ac:2d}"
-            self.monster_listbox.insert(tk.END, display)
-        
-        self.app.log(f"🔍 Filtro '{type_selected}': {len(results)} monstruos")
+        self.load_all_monsters()
+        self.app.log(f"🔍 Filtro '{self.type_var.get()}': {len(self._listed_names)} monstruos")
     
     def get_selected_monster_name(self) -> Optional[str]:
         """Obtiene nombre del monstruo seleccionado"""
@@ -516,33 +595,10 @@ class MonsterPanel(ttk.Frame):
         name = text.split('HD:')[0].strip()
         return name
     
-    def show_monster_card(self, event=None):
-        """Muestra ficha del monstruo"""
-        name = self.get_selected_monster_name()
-        if not name:
-            return
-        
-        # Crear ventana popup
-        popup = tk.Toplevel(self)
-        popup.title(f"Ficha de {name}")
-        popup.geometry("500x600")
-        
-        # Text widget con scrollbar
-        text_frame = ttk.Frame(popup)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        scrollbar = ttk.Scrollbar(text_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        text = tk.Text(text_frame, wrap=tk.WORD, font=('Consolas', 10),
-                      yscrollcommand=scrollbar.set)
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=text.yview)
-        
-        # Obtener datos del monstruo
+    def _render_monster_card(self, name: str) -> str:
+        """Texto de la ficha de un monstruo"""
         monster = self.monster_db.get_monster(name)
-        if monster:
-            card = f"""
+        return f"""
 ╔══════════════════════════════════════════════════════╗
   {name:^50}
 ╠══════════════════════════════════════════════════════╣
@@ -574,6 +630,36 @@ VALOR EN XP: {monster.original_data.get('xp', 0):,}
 
 ╚══════════════════════════════════════════════════════╝
 """
+    
+    def show_monster_card(self, event=None):
+        """Muestra ficha del monstruo"""
+        name = self.get_selected_monster_name()
+        if not name:
+            return
+        
+        # Crear ventana popup
+        popup = tk.Toplevel(self)
+        popup.title(f"Ficha de {name}")
+        popup.geometry("500x600")
+        
+        # Text widget con scrollbar
+        text_frame = ttk.Frame(popup)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        scrollbar = ttk.Scrollbar(text_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        text = tk.Text(text_frame, wrap=tk.WORD, font=('Consolas', 10),
+                      yscrollcommand=scrollbar.set)
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=text.yview)
+        
+        # Obtener datos del monstruo (la ficha se cachea por entrada de la base de datos)
+        card = None
+        data = self.monster_db.monsters.get(name)
+        if data is not None:
+            card = render_cache.get(data, 'ficha_gui', lambda: self._render_monster_card(name))
+        if card:
             text.insert(1.0, card)
             text.config(state=tk.DISABLED)
         
@@ -635,7 +721,16 @@ class CombatPanel(ttk.Frame):
             self.combatants_tree.heading(col, text=col)
             self.combatants_tree.column(col, width=100)
         
+        tree_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL,
+                                    command=self.combatants_tree.yview)
+        self.combatants_tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.combatants_tree.pack(fill=tk.BOTH, expand=True)
+        self.combatants_tree.tag_configure('current', background='lightblue')
+        
+        # Filas ya dibujadas: iid -> (valores, tag). Se actualizan sólo las celdas que cambian
+        self._tree_rows = {}
+        self._tree_order = []
         
         # Combat actions
         action_frame = ttk.LabelFrame(self, text="🎯 Acciones", padding=5)
@@ -655,26 +750,13 @@ class CombatPanel(ttk.Frame):
     
     def start_combat(self):
         """Inicia combate"""
-        self.combat_manager = CombatManager()
+        self.combat_manager = CombatManager(self.app.event_sink, self.app.monster_panel.monster_db)
+        self._clear_rows()  # los id() del combate anterior pueden reutilizarse
         
-        # Añadir personaje si está cargado
+        # Añadir personaje si está cargado (comparte la ficha en memoria)
         if self.app.char_panel.current_character:
-            # Guardar temporalmente
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', 
-                                            delete=False, encoding='utf-8') as f:
-                char_data = {k: v for k, v in self.app.char_panel.current_character.items()
-                           if not k.startswith('_')}
-                json.dump(char_data, f, ensure_ascii=False, indent=2)
-                temp_file = f.name
-            
-            if self.combat_manager.add_player(temp_file):
+            if self.combat_manager.add_player_data(self.app.char_panel.current_character):
                 self.app.log(f"✅ Personaje añadido al combate")
-            
-            # Limpiar
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
         
         self.update_combatants_list()
         self.app.log("⚔️ Combate iniciado")
@@ -720,47 +802,84 @@ class CombatPanel(ttk.Frame):
         if not self.combat_manager:
             return
         
-        # Actualizar HP del personaje
-        if self.app.char_panel.current_character:
-            for c in self.combat_manager.combatants:
-                if c.is_player:
-                    name = self.app.char_panel.current_character.get('name')
-                    if c.name == name:
-                        self.app.char_panel.current_character['hp']['current'] = c.hp
-                        self.app.char_panel.update_character_display()
-                        self.app.char_panel.save_character()
+        # La ficha del panel es la misma que usó el combate: refrescar y guardar
+        character = self.app.char_panel.current_character
+        if character and any(c.entity is character for c in self.combat_manager.combatants):
+            self.app.char_panel.update_character_display()
+            self.app.char_panel.save_character()
         
         self.combat_manager = None
         self.update_combatants_list()
         self.round_label.config(text="Round: 0 | Turno: -")
         self.app.log("❌ Combate terminado")
     
+    def _clear_rows(self):
+        """Vacía la lista de combatientes y su estado incremental"""
+        if self._tree_rows:
+            self.combatants_tree.delete(*self._tree_rows)
+        self._tree_rows = {}
+        self._tree_order = []
+    
     def update_combatants_list(self):
-        """Actualiza lista de combatientes"""
-        # Limpiar
-        for item in self.combatants_tree.get_children():
-            self.combatants_tree.delete(item)
+        """
+        Actualiza lista de combatientes de forma incremental.
+        Cada combatiente tiene una fila fija (iid = id del objeto): sólo se
+        modifican las filas cuyos valores cambiaron, se eliminan las de los
+        muertos y se reordenan las que cambiaron de posición.
+        """
+        tree = self.combatants_tree
         
         if not self.combat_manager:
+            self._clear_rows()
             return
         
-        # Añadir combatientes
-        for i, c in enumerate(self.combat_manager.combatants):
-            if c.is_alive:
-                icon = "👤" if c.is_player else "👹"
-                hp_str = f"{c.hp}/{c.max_hp}"
-                
-                values = (c.name, hp_str, c.ac, c.thac0, c.initiative)
-                
-                # Resaltar turno actual
-                tag = 'current' if (self.combat_manager.initiative_order and 
-                                   self.combat_manager.current_turn_index < len(self.combat_manager.initiative_order) and
-                                   self.combat_manager.initiative_order[self.combat_manager.current_turn_index] == c) else ''
-                
-                self.combatants_tree.insert('', tk.END, text=icon, values=values, tags=(tag,))
-        
-        # Estilo para turno actual
-        self.combatants_tree.tag_configure('current', background='lightblue')
+        current = self.combat_manager.get_current_combatant()
+        current_iid = None
+        wanted = []
+        
+        for c in self.combat_manager.combatants:
+            if not c.is_alive:
+                continue
+            iid = str(id(c))
+            values = (c.name, f"{c.hp}/{c.max_hp}", c.ac, c.thac0, c.initiative)
+            tag = 'current' if c is current else ''
+            if tag:
+                current_iid = iid
+            wanted.append((iid, "👤" if c.is_player else "👹", values, tag))
+        
+        # Eliminar filas de combatientes muertos o retirados
+        wanted_iids = {iid for iid, _, _, _ in wanted}
+        stale = [iid for iid in self._tree_rows if iid not in wanted_iids]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                del self._tree_rows[iid]
+        
+        for iid, icon, values, tag in wanted:
+            previous = self._tree_rows.get(iid)
+            if previous is None:
+                tree.insert('', tk.END, iid=iid, text=icon, values=values, tags=(tag,))
+            else:
+                if previous[0] != values:
+                    tree.item(iid, values=values)
+                if previous[1] != tag:
+                    tree.item(iid, tags=(tag,))
+                if previous[2] != icon:
+                    tree.item(iid, text=icon)
+            self._tree_rows[iid] = (values, tag, icon)
+        
+        # Reordenar sólo si cambió el orden (p.ej. tras tirar iniciativa)
+        order = [iid for iid, _, _, _ in wanted]
+        if order != self._tree_order:
+            previous_order = [iid for iid in self._tree_order if iid in wanted_iids]
+            if order[:len(previous_order)] != previous_order:
+                for index, iid in enumerate(order):
+                    tree.move(iid, '', index)
+            self._tree_order = order
+        
+        # Mantener visible el turno actual en combates grandes
+        if current_iid:
+            tree.see(current_iid)
     
     def update_round_label(self):
         """Actualiza etiqueta de round"""
@@ -887,6 +1006,111 @@ class CombatPanel(ttk.Frame):
         ttk.Button(dialog, text="Cancelar", command=dialog.destroy).pack(pady=5)
 
 
+class PerformancePanel(ttk.Frame):
+    """Panel de métricas de rendimiento (tramos instrumentados y perfil cProfile)"""
+    
+    REFRESH_MS = 1000
+    COLUMNS = ('Llamadas', 'Total ms', 'p50 ms', 'p95 ms', 'p99 ms', 'Máx ms')
+    
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.app = app
+        
+        # Controles
+        ctrl_frame = ttk.Frame(self)
+        ctrl_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.enabled_var = tk.BooleanVar(value=metrics.enabled)
+        ttk.Checkbutton(ctrl_frame, text="⏱️ Medir", variable=self.enabled_var,
+                       command=self.toggle_metrics).pack(side=tk.LEFT, padx=2)
+        ttk.Button(ctrl_frame, text="🔄 Reiniciar",
+                  command=self.reset_metrics).pack(side=tk.LEFT, padx=2)
+        self.profile_button = ttk.Button(ctrl_frame, text="🔬 Iniciar perfil",
+                                         command=self.toggle_profile)
+        self.profile_button.pack(side=tk.LEFT, padx=2)
+        ttk.Button(ctrl_frame, text="💾 Exportar JSON",
+                  command=self.export_json).pack(side=tk.LEFT, padx=2)
+        
+        # Tabla de tramos
+        table_frame = ttk.LabelFrame(self, text="📈 Tramos medidos", padding=5)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.spans_tree = ttk.Treeview(table_frame, columns=self.COLUMNS,
+                                       show='tree headings', height=12)
+        self.spans_tree.heading('#0', text='Tramo')
+        self.spans_tree.column('#0', width=160)
+        for col in self.COLUMNS:
+            self.spans_tree.heading(col, text=col)
+            self.spans_tree.column(col, width=80, anchor=tk.E)
+        self.spans_tree.pack(fill=tk.BOTH, expand=True)
+        
+        self.cache_label = ttk.Label(self, text="")
+        self.cache_label.pack(anchor=tk.W, padx=5, pady=5)
+        
+        self.after(self.REFRESH_MS, self.refresh)
+    
+    def span_rows(self):
+        """Filas (tramo, valores) de la tabla a partir de las métricas actuales"""
+        return [(name, (data['count'], f"{data['total_ms']:.2f}", f"{data['p50_ms']:.3f}",
+                        f"{data['p95_ms']:.3f}", f"{data['p99_ms']:.3f}", f"{data['max_ms']:.3f}"))
+                for name, data in metrics.snapshot()['spans'].items()]
+    
+    def refresh(self):
+        """Actualiza la tabla (sólo mientras la pestaña está visible)"""
+        if self.winfo_ismapped():
+            rows = dict(self.span_rows())
+            for iid in self.spans_tree.get_children():
+                if iid not in rows:
+                    self.spans_tree.delete(iid)
+            for name, values in rows.items():
+                if self.spans_tree.exists(name):
+                    self.spans_tree.item(name, values=values)
+                else:
+                    self.spans_tree.insert('', tk.END, iid=name, text=name, values=values)
+            
+            cache = render_cache.stats()
+            self.cache_label.config(text=f"🗂️ Caché de textos: {cache['entries']} entradas, "
+                                         f"{cache['hits']} aciertos, {cache['misses']} fallos")
+        self.after(self.REFRESH_MS, self.refresh)
+    
+    def toggle_metrics(self):
+        """Activa o desactiva la medición"""
+        if self.enabled_var.get():
+            metrics.enable()
+        else:
+            metrics.disable()
+        self.app.log(f"⏱️ Medición de rendimiento {'activada' if metrics.enabled else 'desactivada'}")
+    
+    def reset_metrics(self):
+        """Borra las métricas acumuladas"""
+        metrics.reset()
+        self.spans_tree.delete(*self.spans_tree.get_children())
+    
+    def toggle_profile(self):
+        """Inicia el perfil cProfile o lo detiene y guarda el volcado .prof"""
+        if not metrics.profiling:
+            metrics.start_profile()
+            self.profile_button.config(text="💾 Guardar perfil")
+            self.app.log("🔬 Perfil cProfile iniciado")
+            return
+        
+        output = filedialog.asksaveasfilename(defaultextension='.prof',
+                                              filetypes=[("pstats", "*.prof")])
+        self.profile_button.config(text="🔬 Iniciar perfil")
+        path = metrics.stop_profile(output or None)
+        self.app.log(f"💾 Perfil guardado en {path}")
+        self.app.log(profile_summary(path, limit=10).strip())
+    
+    def export_json(self):
+        """Guarda las métricas actuales en JSON"""
+        output = filedialog.asksaveasfilename(defaultextension='.json',
+                                              filetypes=[("JSON", "*.json")])
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(metrics.to_json(indent=2))
+            self.app.log(f"💾 Métricas guardadas en {output}")
+
+
 class DMAssistantGUI:
     """Aplicación principal GUI"""
     
@@ -899,8 +1123,15 @@ class DMAssistantGUI:
         style = ttk.Style()
         style.theme_use('clam')
         
+        # Tareas en segundo plano (cargas, búsquedas, exportación de fichas)
+        self.tasks = TaskRunner(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Eventos del núcleo -> registro de actividad
+        self.event_sink = TkLogSink(self)
+        
         # Dice roller
-        self.dice_roller = DiceRoller()
+        self.dice_roller = DiceRoller(self.event_sink)
         
         # Menu bar
         self.create_menu()
@@ -927,6 +1158,9 @@ class DMAssistantGUI:
         self.monster_panel = MonsterPanel(center_notebook, self)
         center_notebook.add(self.monster_panel, text="👹 Monstruos")
         
+        self.performance_panel = PerformancePanel(center_notebook, self)
+        center_notebook.add(self.performance_panel, text="⏱️ Rendimiento")
+        
         # Right panel - Log
         right_panel = ttk.Frame(main_container)
         main_container.add(right_panel, weight=1)
@@ -957,7 +1191,15 @@ class DMAssistantGUI:
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Archivo", menu=file_menu)
-        file_menu.add_command(label="Salir", command=self.root.quit)
+        file_menu.add_command(label="Exportar ficha HTML...",
+                              command=lambda: self.export_sheet('html'))
+        file_menu.add_command(label="Exportar ficha PDF...",
+                              command=lambda: self.export_sheet('pdf'))
+        file_menu.add_separator()
+        file_menu.add_command(label="Cancelar tareas en curso",
+                              command=self.cancel_tasks)
+        file_menu.add_separator()
+        file_menu.add_command(label="Salir", command=self.on_close)
         
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -969,6 +1211,82 @@ class DMAssistantGUI:
         self.log_text.insert(tk.END, message + "\n")
         self.log_text.see(tk.END)
     
+    def set_status(self, text: str):
+        """Actualiza la barra de estado (puede llamarse antes de crearla)"""
+        if hasattr(self, 'status_bar'):
+            self.status_bar.config(text=text)
+    
+    def run_task(self, func, *args, description: str = "", on_done=None,
+                 on_error=None, **kwargs):
+        """
+        Lanza func(task, *args) en segundo plano mostrando el progreso en la
+        barra de estado. Los callbacks se ejecutan en el hilo de Tk.
+        """
+        if description:
+            self.set_status(f"⏳ {description}...")
+        
+        def finish():
+            if not self.tasks.active:
+                self.set_status("Listo")
+        
+        def done(result):
+            finish()
+            if on_done:
+                on_done(result)
+        
+        def error(e):
+            finish()
+            if on_error:
+                on_error(e)
+            else:
+                self.log(f"❌ {description or 'Tarea'}: {e}")
+        
+        def progress(current, total, message):
+            self.set_status(f"⏳ {message or description} ({current}/{total})")
+        
+        return self.tasks.submit(func, *args, name=description, on_done=done,
+                                 on_error=error, on_progress=progress, **kwargs)
+    
+    def cancel_tasks(self):
+        """Cancela las tareas en segundo plano"""
+        pending = self.tasks.active
+        self.tasks.cancel_all()
+        self.set_status("Listo")
+        if pending:
+            self.log(f"⏹️ {pending} tareas canceladas")
+    
+    def export_sheet(self, fmt: str):
+        """Genera la ficha del personaje actual (HTML o PDF) en segundo plano"""
+        character = self.char_panel.current_character
+        if not character:
+            messagebox.showwarning("Advertencia", "Carga un personaje primero")
+            return
+        
+        extension = '.html' if fmt == 'html' else '.pdf'
+        output = filedialog.asksaveasfilename(
+            defaultextension=extension,
+            initialfile=f"{character.get('name', 'personaje').replace(' ', '_')}_ficha{extension}",
+            filetypes=[(fmt.upper(), f"*{extension}")])
+        if not output:
+            return
+        
+        char_data = to_sheet_format(character)
+        
+        def generate(task):
+            if fmt == 'html':
+                from utils.generar_html_ficha import generate_html_sheet
+                return generate_html_sheet(char_data, output)
+            from utils.generar_pdf_ficha import CharacterSheetGenerator
+            return CharacterSheetGenerator().generate_sheet(char_data, output)
+        
+        self.run_task(generate, description=f"Generando ficha {fmt.upper()}",
+                      on_done=lambda path: self.log(f"📄 Ficha generada: {path}"))
+    
+    def on_close(self):
+        """Cierra la aplicación liberando los hilos de trabajo"""
+        self.tasks.shutdown()
+        self.root.destroy()
+    
     def show_about(self):
         """Muestra ventana Acerca de"""
         about_text = """
@@ -14,6 +14,9 @@ import copy
 # Agregar el directorio padre al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.esquema import load_character_file, normalize_character
+from interfaces.tareas import TaskRunner
+
 
 class CharacterCard(tk.Frame):
     """Tarjeta de personaje individual estilo RPG"""
@@ -180,6 +183,10 @@ class PartyManager(tk.Tk):
         self.selected_index: Optional[int] = None
         self.character_files: List[Optional[Path]] = [None] * 5
         
+        # Tareas en segundo plano (lectura/escritura de archivos)
+        self.tasks = TaskRunner(self)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # UI
         self.char_cards: List[CharacterCard] = []
         
@@ -387,18 +394,20 @@ class PartyManager(tk.Tk):
         if not filepath:
             return
         
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                char_data = json.load(f)
-            
-            self.party[self.selected_index] = char_data
-            self.character_files[self.selected_index] = Path(filepath)
+        slot = self.selected_index
+        
+        def on_done(char_data):
+            self.party[slot] = char_data
+            self.character_files[slot] = Path(filepath)
             
             self._update_display()
-            self._show_character_details()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar personaje:\n{e}")
+            if self.selected_index == slot:
+                self._show_character_details()
+        
+        self.tasks.submit(
+            lambda task: load_character_file(filepath),
+            name="Cargar personaje", on_done=on_done,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar personaje:\n{e}"))
     
     def _remove_character(self):
         """Remover personaje seleccionado"""
@@ -768,25 +777,37 @@ class PartyManager(tk.Tk):
             messagebox.showerror("Error", "Valor numérico inválido")
     
     def _save_all(self):
-        """Guardar todos los personajes a sus archivos"""
-        saved = 0
-        
-        for i, char in enumerate(self.party):
-            if char is not None and self.character_files[i] is not None:
+        """Guardar todos los personajes a sus archivos (en segundo plano)"""
+        # Se serializa aquí, en el hilo de Tk, para no leer fichas que se están editando
+        pending = [
+            (char['name'], self.character_files[i],
+             json.dumps(char, indent=2, ensure_ascii=False))
+            for i, char in enumerate(self.party)
+            if char is not None and self.character_files[i] is not None
+        ]
+        
+        def write_all(task):
+            saved, errors = 0, []
+            for n, (name, path, content) in enumerate(pending, 1):
+                task.report(n, len(pending), f"Guardando {name}")
                 try:
-                    with open(self.character_files[i], 'w', encoding='utf-8') as f:
-                        json.dump(char, f, indent=2, ensure_ascii=False)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(content)
                     saved += 1
-                except Exception as e:
-                    messagebox.showerror(
-                        "Error",
-                        f"Error al guardar {char['name']}:\n{e}"
-                    )
-        
-        if saved > 0:
-            messagebox.showinfo("Éxito", f"Se guardaron {saved} personaje(s)")
-        else:
-            messagebox.showwarning("Advertencia", "No hay personajes para guardar")
+                except OSError as e:
+                    errors.append(f"Error al guardar {name}:\n{e}")
+            return saved, errors
+        
+        def on_done(result):
+            saved, errors = result
+            for error in errors:
+                messagebox.showerror("Error", error)
+            if saved > 0:
+                messagebox.showinfo("Éxito", f"Se guardaron {saved} personaje(s)")
+            else:
+                messagebox.showwarning("Advertencia", "No hay personajes para guardar")
+        
+        self.tasks.submit(write_all, name="Guardar party", on_done=on_done)
     
     def _export_party(self):
         """Exportar configuración del party"""
@@ -837,23 +858,36 @@ class PartyManager(tk.Tk):
         if not filepath:
             return
         
-        try:
+        def read_party(task):
             with open(filepath, 'r', encoding='utf-8') as f:
                 party_data = json.load(f)
             
-            self.party = party_data['party']
-            self.character_files = [
+            party = [
+                normalize_character(char) if char else None
+                for char in party_data['party']
+            ]
+            files = [
                 Path(f) if f else None
                 for f in party_data['files']
             ]
+            return party, files
+        
+        def on_done(result):
+            self.party, self.character_files = result
             
             self._update_display()
             self._show_no_selection()
             
             messagebox.showinfo("Éxito", "Party importado correctamente")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al importar party:\n{e}")
+        
+        self.tasks.submit(
+            read_party, name="Importar party", on_done=on_done,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al importar party:\n{e}"))
+    
+    def _on_close(self):
+        """Cierra la ventana liberando los hilos de trabajo"""
+        self.tasks.shutdown()
+        self.destroy()
 
 
 def main():
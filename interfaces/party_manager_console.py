@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 # Agregar el directorio padre al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.esquema import load_character_file, normalize_character
+
 
 class Colors:
     """Colores ANSI para terminal"""
@@ -270,8 +272,7 @@ class PartyManagerConsole:
             return
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                char_data = json.load(f)
+            char_data = load_character_file(filepath)
             
             self.party[self.selected_index] = char_data
             self.character_files[self.selected_index] = Path(filepath)
@@ -411,7 +412,10 @@ class PartyManagerConsole:
             with open(filepath, 'r', encoding='utf-8') as f:
                 party_data = json.load(f)
             
-            self.party = party_data['party']
+            self.party = [
+                normalize_character(char) if char else None
+                for char in party_data['party']
+            ]
             self.character_files = [Path(f) if f else None for f in party_data['files']]
             self.selected_index = None
             
@@ -0,0 +1,146 @@
+"""
+Ejecutor de tareas en segundo plano para las interfaces Tkinter
+Las tareas pesadas corren en hilos; los resultados vuelven al hilo de Tk
+a través de una cola que se consulta con root.after()
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class TaskCancelled(Exception):
+    """Se lanza dentro de una tarea cuando se ha pedido su cancelación"""
+
+
+class Task:
+    """
+    Tarea en segundo plano. La función recibe la tarea como primer argumento
+    para poder informar progreso (task.report) y comprobar la cancelación
+    (task.check / task.cancelled).
+    """
+
+    def __init__(self, runner: 'TaskRunner', name: str,
+                 on_done: Optional[Callable] = None,
+                 on_error: Optional[Callable] = None,
+                 on_progress: Optional[Callable] = None):
+        self.runner = runner
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancel_event = threading.Event()
+        self.finished = False
+        self._future = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Pide la cancelación; la tarea se detiene en su siguiente check()"""
+        self._cancel_event.set()
+
+    def check(self):
+        """Lanza TaskCancelled si se pidió la cancelación"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.name)
+
+    def report(self, done: int, total: int, message: str = ""):
+        """Informa progreso (se entrega al hilo de Tk); también comprueba cancelación"""
+        self.check()
+        if self.on_progress:
+            self.runner._events.put(('progress', self, (done, total, message)))
+
+
+class TaskRunner:
+    """Pool de hilos cuyos resultados se despachan en el bucle de Tk"""
+
+    def __init__(self, root, max_workers: int = 2, poll_ms: int = 50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="dm-tarea")
+        self._events: "queue.Queue" = queue.Queue()
+        self._tasks = set()
+        self._polling = False
+        self._closed = False
+
+    @property
+    def active(self) -> int:
+        """Número de tareas pendientes o en ejecución"""
+        return len(self._tasks)
+
+    def submit(self, func: Callable[..., Any], *args,
+               name: str = "",
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[int, int, str], None]] = None,
+               **kwargs) -> Task:
+        """
+        Ejecuta func(task, *args, **kwargs) en segundo plano.
+        on_done/on_error/on_progress se llaman siempre desde el hilo de Tk.
+        Una tarea cancelada no llama a on_done ni a on_error.
+        """
+        task = Task(self, name or getattr(func, '__name__', 'tarea'),
+                    on_done, on_error, on_progress)
+        self._tasks.add(task)
+        task._future = self._executor.submit(self._run, task, func, args, kwargs)
+        self._schedule_poll()
+        return task
+
+    def _run(self, task: Task, func, args, kwargs):
+        try:
+            task.check()
+            result = func(task, *args, **kwargs)
+            self._events.put(('done', task, result))
+        except TaskCancelled:
+            self._events.put(('cancelled', task, None))
+        except BaseException as e:
+            self._events.put(('error', task, e))
+
+    def _schedule_poll(self):
+        if not self._polling and not self._closed:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Despacha los eventos pendientes en el hilo de Tk"""
+        self._polling = False
+        while True:
+            try:
+                kind, task, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                if not task.cancelled and task.on_progress:
+                    task.on_progress(*payload)
+                continue
+
+            task.finished = True
+            self._tasks.discard(task)
+            if task.cancelled or kind == 'cancelled':
+                continue
+            if kind == 'done' and task.on_done:
+                task.on_done(payload)
+            elif kind == 'error' and task.on_error:
+                task.on_error(payload)
+
+        if self._tasks:
+            self._schedule_poll()
+
+    def cancel_all(self):
+        """Cancela todas las tareas pendientes"""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def shutdown(self):
+        """Cancela las tareas y libera los hilos (al cerrar la ventana)"""
+        self._closed = True
+        self.cancel_all()
+        for task in list(self._tasks):
+            if task._future is not None:
+                task._future.cancel()  # las que aún no empezaron no llegan a ejecutarse
+        self._executor.shutdown(wait=False)
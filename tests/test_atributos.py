@@ -0,0 +1,57 @@
+"""
+Test de la generación de atributos por lotes (core/atributos.py)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.atributos import AttributeGenerator, attribute_matrix, qualification_rates
+from core.esquema import ATTRIBUTE_KEYS
+
+
+CLASSES = {
+    'Guerrero': {'requisitos': {'FUE': 9}},
+    'Paladín': {'requisitos': {'FUE': 12, 'CON': 9, 'SAB': 13, 'CAR': 17}},
+    'Monje': {'requisitos': {'FUE': 15, 'DES': 15, 'SAB': 15}},
+    'Sin requisitos': {},
+}
+
+
+def test_matriz_por_metodo():
+    rng = random.Random(11)
+    for method in (1, 2, 3, 4):
+        matrix = attribute_matrix(method, 2000, rng)
+        assert len(matrix) == 2000 and all(len(row) == 6 for row in matrix)
+        assert all(3 <= score <= 18 for row in matrix for score in row)
+
+    mean_3d6 = sum(map(sum, attribute_matrix(1, 5000, rng))) / 30000
+    mean_4d6 = sum(map(sum, attribute_matrix(4, 5000, rng))) / 30000
+    assert 10.3 < mean_3d6 < 10.7 and 12.0 < mean_4d6 < 12.6
+    assert all(list(row) == sorted(row, reverse=True) for row in attribute_matrix(2, 500, rng))
+    assert len(AttributeGenerator.method_4(rng)) == 6
+
+
+def test_tasas_de_requisitos():
+    matrix = AttributeGenerator.matrix(4, 4000, random.Random(2))
+    adjustments = {'CAR': -1, 'CON': 1}
+    rates = qualification_rates(CLASSES, matrix, adjustments)
+
+    for name, data in CLASSES.items():
+        expected = sum(
+            all(row[ATTRIBUTE_KEYS.index(attr)] + adjustments.get(attr, 0) >= minimum
+                for attr, minimum in data.get('requisitos', {}).items())
+            for row in matrix
+        ) / len(matrix)
+        assert rates[name] == expected
+    assert rates['Sin requisitos'] == 1.0
+    assert rates['Paladín'] < rates['Guerrero']
+    assert qualification_rates(CLASSES, []) == dict.fromkeys(CLASSES, 0.0)
+
+
+if __name__ == "__main__":
+    test_matriz_por_metodo()
+    test_tasas_de_requisitos()
+    print("✅ Tests de atributos completados")
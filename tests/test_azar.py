@@ -0,0 +1,143 @@
+"""
+Test de los flujos aleatorios con contador (core/azar.py)
+"""
+
+import json
+import pickle
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.atributos import AttributeGenerator
+from core.azar import (
+    CounterStream, FaceBuffer, RNGService, face_table, random_bytes, set_rng_service
+)
+from core.combate import MonsterDatabase
+from core.dados import DiceRoller
+from core.eventos import NullSink
+
+
+def test_flujos_reproducibles_y_posicionables():
+    first, second = RNGService(7), RNGService(7)
+    assert [first.stream('dados').randint(1, 20) for _ in range(20)] == \
+           [second.stream('dados').randint(1, 20) for _ in range(20)]
+    assert first.stream('dados').random() != first.stream('otro').random()
+
+    stream = CounterStream(3, 'prueba')
+    events = []
+    for _ in range(10):
+        event = stream.advance()
+        events.append((event, stream.dice(event % 4 + 1, 6)))
+    for event, rolls in events:
+        assert stream.at(event).dice(len(rolls), 6) == rolls
+
+    position = stream.tell()
+    values = [stream.getrandbits(37) for _ in range(40)]  # cruza varios bloques
+    stream.seek(*position)
+    assert values == [stream.getrandbits(37) for _ in range(40)]
+
+    copy = pickle.loads(pickle.dumps(stream))
+    assert copy.random() == stream.random()
+
+
+def test_division_sin_solapamiento():
+    service = RNGService(11)
+    workers = service.split('pnj', 4)
+    sequences = [tuple(worker.getrandbits(64) for _ in range(50)) for worker in workers]
+    assert len(set(sequences)) == 4
+    again = RNGService(11).split('pnj', 4)[0]
+    assert sequences[0] == tuple(again.getrandbits(64) for _ in range(50))
+
+    service.stream('dados').advance()
+    checkpoint = json.loads(json.dumps(service.checkpoint()))
+    expected = service.stream('dados').random()
+    service.restore(checkpoint)
+    assert service.stream('dados').random() == expected
+
+
+def test_dados_sin_sesgo():
+    rolls = CounterStream(5).dice(60000, 6)
+    counts = Counter(rolls)
+    assert set(counts) == set(range(1, 7))
+    assert all(9400 < count < 10600 for count in counts.values())
+    assert CounterStream(5).dice(3, 1) == [1, 1, 1]
+
+    # randbytes() sin Python 3.9: los mismos bytes que random.Random.randbytes
+    assert CounterStream(5).randbytes(16) == random_bytes(CounterStream(5), 16)
+    assert random_bytes(random.Random(7), 16) == random.Random(7).getrandbits(128).to_bytes(16, 'little')
+    assert random_bytes(random.Random(7), 0) == b''
+
+
+def test_bufer_de_caras():
+    for sides in (4, 6, 8, 10, 12, 20, 100):
+        table, rejected = face_table(sides)
+        accepted = Counter(table[b] for b in range(256) if b not in rejected)
+        assert set(accepted) == set(range(1, sides + 1)) and len(set(accepted.values())) == 1
+
+    background = FaceBuffer(CounterStream(9), block_size=256)
+    inline = FaceBuffer(CounterStream(9), block_size=256, background=False)
+    try:
+        rolls = [background.dice(n % 5 + 1, 20) for n in range(2000)]  # varias recargas
+        assert rolls == [inline.dice(n % 5 + 1, 20) for n in range(2000)]
+    finally:
+        background.close()
+
+    counts = Counter(inline.dice(50000, 100))
+    assert set(counts) == set(range(1, 101)) and all(380 < c < 620 for c in counts.values())
+    assert all(1 <= value <= 1000 for value in inline.dice(20, 1000))
+    assert 1 <= inline.randint(1, 8) <= 8
+
+    roller = DiceRoller(NullSink(), inline)
+    result = roller.roll("3d6+1")
+    assert len(result['rolls']) == 3 and result['total'] == sum(result['rolls']) + 1
+
+
+def test_limites_de_la_tabla_de_caras():
+    table, rejected = face_table(255)
+    accepted = Counter(table[b] for b in range(256) if b not in rejected)
+    assert set(accepted) == set(range(1, 256)) and set(accepted.values()) == {1}
+    try:
+        face_table(256)
+        assert False, "d256 no cabe en la tabla"
+    except ValueError:
+        pass
+
+    faces = FaceBuffer(CounterStream(3), block_size=256, background=False)
+    assert all(1 <= value <= 255 for value in faces.dice(2000, 255))
+    rolls = faces.dice(5000, 256)  # d256 va por CounterStream.dice
+    assert all(1 <= value <= 256 for value in rolls) and 256 in rolls
+    assert 0 <= faces.randint(0, 255) <= 255
+
+
+def test_integracion_con_el_nucleo():
+    previous = set_rng_service(RNGService(2024))
+    try:
+        roller = DiceRoller(NullSink())
+        random.seed(1)  # el módulo random global ya no influye
+        result = roller.roll("4d8+1")
+        random.seed(99)
+        assert roller.replay(result['roll_id'], "4d8") == result['rolls']
+
+        set_rng_service(RNGService(2024))
+        random.seed(123)
+        assert DiceRoller(NullSink()).roll("4d8+1")['rolls'] == result['rolls']
+
+        set_rng_service(RNGService(2024))
+        first = (AttributeGenerator.method_4(), MonsterDatabase(NullSink()).random_encounter())
+        set_rng_service(RNGService(2024))
+        assert (AttributeGenerator.method_4(), MonsterDatabase(NullSink()).random_encounter()) == first
+    finally:
+        set_rng_service(previous)
+
+
+if __name__ == "__main__":
+    test_flujos_reproducibles_y_posicionables()
+    test_division_sin_solapamiento()
+    test_dados_sin_sesgo()
+    test_bufer_de_caras()
+    test_limites_de_la_tabla_de_caras()
+    test_integracion_con_el_nucleo()
+    print("✅ Tests de flujos aleatorios completados")
@@ -0,0 +1,34 @@
+"""
+Test del banco de pruebas de rendimiento (utils/benchmark.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.benchmark import compare, run_benchmarks, run_fight
+
+
+def test_ejecucion_rapida():
+    report = run_benchmarks(['dados', 'personajes.cargar'], quick=True, repeat=2)
+    assert set(report['results']) >= {'dados.1d20', 'dados.3d6+2', 'dados.10d6'}
+    assert all(r['best_us'] <= r['median_us'] for r in report['results'].values())
+    assert report['meta']['quick'] and 'combate.pelea' not in report['results']
+    assert 1 <= run_fight(2, 2) <= 51
+
+
+def test_comparacion_con_base():
+    baseline = {'results': {'a': {'best_us': 10.0}, 'b': {'best_us': 10.0}, 'c': {'best_us': 0}}}
+    report = {'results': {'a': {'best_us': 12.0}, 'b': {'best_us': 13.0},
+                          'c': {'best_us': 1.0}, 'nueva': {'best_us': 5.0}}}
+    rows = {row['name']: row for row in compare(report, baseline, threshold=0.25)}
+    assert set(rows) == {'a', 'b'}
+    assert not rows['a']['regression'] and rows['b']['regression']
+    assert rows['b']['ratio'] == 1.3
+
+
+if __name__ == "__main__":
+    test_ejecucion_rapida()
+    test_comparacion_con_base()
+    print("✅ Tests del banco de pruebas completados")
@@ -0,0 +1,141 @@
+"""
+Test del catálogo persistente de personajes (core/catalogo.py)
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.catalogo import CharacterCatalog
+
+
+def _write(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def test_catalogo_incremental():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / "Aria_character.json", {
+            'name': 'Aria', 'race': 'Elfo', 'class': 'Mago', 'level': 3,
+            'hp': {'current': 7, 'max': 9}
+        })
+        _write(tmp / "Borin_character.json", {
+            'name': 'Borin', 'race': 'Enano', 'class': 'Guerrero', 'level': 2,
+            'hit_points_current': 15, 'hit_points_max': 18
+        })
+        (tmp / "roto_character.json").write_text("{no es json", encoding='utf-8')
+
+        catalog = CharacterCatalog(tmp)
+        errors = catalog.refresh()
+        assert errors == ["roto_character.json"]
+        assert len(catalog) == 2
+        assert catalog.get_by_index(1)['name'] == 'Aria'
+        assert catalog.find_by_name('borin')['hp_max'] == 18
+
+        # Un catálogo nuevo reutiliza el índice guardado sin releer archivos
+        reloaded = CharacterCatalog(tmp)
+        assert reloaded.find_by_name('ARIA')['level'] == 3
+        assert reloaded.poll() is False
+
+        # Los cambios se detectan por mtime/tamaño
+        _write(tmp / "Aria_character.json", {
+            'name': 'Aria', 'race': 'Elfo', 'class': 'Mago', 'level': 4,
+            'hp': {'current': 11, 'max': 12}
+        })
+        stat = os.stat(tmp / "Aria_character.json")
+        os.utime(tmp / "Aria_character.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert reloaded.poll() is True
+        assert reloaded.find_by_name('aria')['level'] == 4
+
+        # Los archivos borrados desaparecen del índice
+        os.remove(tmp / "Borin_character.json")
+        reloaded.refresh()
+        assert reloaded.find_by_name('borin') is None
+
+
+def test_refresco_en_segundo_plano():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for i in range(40):
+            _write(tmp / f"PJ{i}_character.json", {'name': f'PJ{i}', 'level': 1})
+        catalog = CharacterCatalog(tmp)
+        failures = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    catalog.refresh()
+                    catalog.list()
+            except Exception as e:  # cualquier carrera es un fallo
+                failures.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        for n in range(200):  # la interfaz guarda mientras el hilo refresca
+            path = tmp / f"PJ{n % 40}_character.json"
+            _write(path, {'name': f'PJ{n % 40}', 'level': n})
+            catalog.update_file(path)
+            catalog.find_by_name(f'pj{n % 40}')
+        thread.join()
+        assert not failures
+        assert len(catalog) == 40 and catalog.find_by_name('pj39')['level'] == 199
+
+
+def test_nombres_repetidos_y_sin_nombre():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / "Aria_character.json", {'name': 'Aria', 'level': 3})
+        _write(tmp / "Aria2_character.json", {'name': 'ARIA', 'level': 5})
+        _write(tmp / "Nadie_character.json", {'name': None, 'level': 1})
+        _write(tmp / "Lista_character.json", {'name': ['no', 'es', 'texto']})
+
+        catalog = CharacterCatalog(tmp)
+        assert catalog.refresh() == []
+        assert len(catalog) == 4  # se listan aunque no se puedan buscar por nombre
+        assert [e['filename'] for e in catalog.find_all_by_name('aria')] == \
+            ["Aria2_character.json", "Aria_character.json"]
+        assert catalog.find_by_name('Aria')['level'] == 5
+        assert catalog.duplicate_names() == {'aria': ["Aria2_character.json", "Aria_character.json"]}
+
+        # El índice guardado con entradas sin nombre también se carga
+        assert CharacterCatalog(tmp).find_by_name('aria')['level'] == 5
+
+
+def test_archivos_raros_y_directorio_movido():
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "data"
+        data.mkdir()
+        _write(data / "Aria_character.json", {'name': 'Aria', 'level': 3})
+        _write(data / "Lista_character.json", [1, 2, 3])
+        _write(data / "Numero_character.json", 42)
+        catalog = CharacterCatalog(data)
+        assert sorted(catalog.refresh()) == ["Lista_character.json", "Numero_character.json"]
+        assert len(catalog) == 1
+
+        # Un índice que no es un objeto se descarta y se rehace
+        (data / ".catalogo_personajes.json").write_text("[]", encoding='utf-8')
+        assert len(CharacterCatalog(data)) == 0
+
+        catalog.update_file(data / "Aria_character.json")  # vuelve a guardar el índice
+        moved = Path(tmp) / "movido"
+        shutil.copytree(data, moved)  # conserva los mtime: todo son aciertos de caché
+        shutil.rmtree(data)
+        entry = CharacterCatalog(moved).find_by_name('aria')
+        assert entry['filepath'] == str(moved / "Aria_character.json")
+        assert Path(entry['filepath']).exists()
+
+
+if __name__ == "__main__":
+    test_catalogo_incremental()
+    test_refresco_en_segundo_plano()
+    test_nombres_repetidos_y_sin_nombre()
+    test_archivos_raros_y_directorio_movido()
+    print("✅ Test del catálogo completado")
@@ -0,0 +1,129 @@
+"""
+Test del motor de efectos temporales (core/efectos.py)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.azar import RNGService, set_rng_service
+from core.combate import CombatManager
+from core.efectos import Effect, EffectEngine, blessing, make_effect, paralysis, poison
+from core.eventos import NullSink
+
+
+class Dummy:
+    def __init__(self, name, hp=10):
+        self.name = name
+        self.hp = self.max_hp = hp
+        self.is_alive = True
+        self.conditions = []
+        self.temp_attack_bonus = self.temp_damage_bonus = self.temp_ac_bonus = 0
+
+    def heal(self, amount):
+        self.hp = min(self.hp + amount, self.max_hp)
+        return f"{self.name} {self.hp}"
+
+    def take_damage(self, amount):
+        self.hp -= amount
+        self.is_alive = self.hp > 0
+        return f"{self.name} {self.hp}"
+
+
+def test_duracion_y_modificadores():
+    engine = EffectEngine(roll=lambda dice: 2)
+    hero = Dummy('Aldric')
+    engine.add(blessing(3), hero)
+    engine.add(poison(2), hero)
+    assert hero.temp_attack_bonus == 1 and hero.conditions == ['envenenado']
+
+    engine.advance(2)  # dos ticks de veneno (2 PG cada uno) y el veneno termina
+    assert hero.hp == 6 and hero.conditions == [] and hero.temp_attack_bonus == 1
+    engine.advance(3)
+    assert hero.temp_attack_bonus == 0 and len(engine) == 0
+
+
+def test_rueda_con_vueltas_y_retrasos():
+    engine = EffectEngine(size=4)
+    target = Dummy('Goblin')
+    long_effect = paralysis(10)
+    engine.add(long_effect, target)
+    delayed = Effect('Bendición', 2, modifiers={'attack': 1})
+    engine.add(delayed, target, start=6)
+    cancelled = paralysis(1)
+    engine.add(cancelled, target, start=3)
+    engine.remove(cancelled)
+
+    engine.advance(5)
+    assert target.conditions == ['paralizado'] and target.temp_attack_bonus == 0
+    engine.advance(6)
+    assert target.temp_attack_bonus == 1
+    messages = engine.advance(10)  # la parálisis cae 2 vueltas de rueda después
+    assert target.conditions == [] and target.temp_attack_bonus == 0
+    assert any("Parálisis termina" in m for m in messages) and not long_effect.active
+
+    assert make_effect('Sueño').condition == 'dormido' and make_effect('bendicion', 2).rounds == 2
+
+
+def test_combate_con_efectos():
+    previous = set_rng_service(RNGService(50))
+    try:
+        manager = CombatManager(NullSink())
+        manager.add_monster('Troll')
+        manager.add_monster('Goblin')
+        troll, goblin = manager.combatants
+        assert len(manager.effects.effects_on(troll)) == 1  # regeneración leída una sola vez
+        troll.take_damage(10)
+        hp = troll.hp
+        manager.start_combat()
+        manager.combat_distance = 1
+        assert troll.hp == hp  # no regenera antes del round 2
+        manager.next_round()
+        assert troll.hp == min(hp + 3, troll.max_hp)
+
+        manager.apply_effect(goblin, paralysis(2))
+        result = manager.make_attack(goblin, troll)
+        assert result['cannot_attack'] and "paralizado" in result['message']
+        assert "paralizado" in str(goblin)
+        manager.next_round()
+        manager.next_round()
+        assert goblin.conditions == [] and not manager.make_attack(goblin, troll)['cannot_attack']
+    finally:
+        set_rng_service(previous)
+
+
+def test_efecto_desde_la_consola():
+    from interfaces.dm_assistant import DMAssistant
+
+    previous = set_rng_service(RNGService(51))
+    try:
+        assistant = object.__new__(DMAssistant)
+        assistant.combat_manager = CombatManager(NullSink())
+        assistant.combat_manager.add_monster('Goblin')
+        goblin = assistant.combat_manager.combatants[0]
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assistant.combat_effect("regeneracion 1")
+            assistant.combat_effect("regeneración 1 dos")
+        assert output.getvalue().count("regeneracion <N> <PG por round>") == 2
+        assert assistant.combat_manager.effects.effects_on(goblin) == []
+
+        assistant.combat_effect("regeneracion 1 2")
+        assistant.combat_effect("veneno 1 5")
+        effects = assistant.combat_manager.effects.effects_on(goblin)
+        assert [(e.name, e.per_round, e.rounds) for e in effects] == \
+            [('Regeneración', 2, None), ('Veneno', '-1d4', 5)]
+    finally:
+        set_rng_service(previous)
+
+
+if __name__ == "__main__":
+    test_duracion_y_modificadores()
+    test_rueda_con_vueltas_y_retrasos()
+    test_combate_con_efectos()
+    test_efecto_desde_la_consola()
+    print("✅ Tests de efectos temporales completados")
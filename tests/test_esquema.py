@@ -0,0 +1,112 @@
+"""
+Test del normalizador de fichas de personaje (core/esquema.py)
+"""
+
+import copy
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.esquema import (
+    SAVE_NAMES, SHEET_SAVE_KEYS, SchemaError, load_character_file, normalize_character,
+    resolve_save_name, to_creator_format, to_sheet_format
+)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def _load(name):
+    with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_formato_antiguo_y_nuevo_coinciden():
+    legacy = normalize_character(_load("Rosamund_character.json"))
+    modern = normalize_character(_load("Flurim_hijo_de_Drebem_character.json"))
+
+    for char in (legacy, modern):
+        assert set(char['hp']) == {'max', 'current'}
+        assert isinstance(char['ac'], int)
+        assert set(char['saving_throws']) == set(SAVE_NAMES)
+        for slot, item in char['equipped'].items():
+            assert item is None or item in char['equipment']
+        assert set(char['proficiencies']) == {'weapon', 'non_weapon'}
+
+    assert legacy['hp'] == {'max': 6, 'current': 6}
+    assert legacy['ac'] == 4
+    assert 'hit_points_max' not in legacy and 'armor_class' not in legacy
+    assert legacy['equipment']['Espada corta']['damage'] == '1d6+2'
+    assert legacy['equipment']['Armadura de cuero'] == {'type': 'armor', 'ac': 8, 'quantity': 1}
+    assert legacy['money']['Piezas de Oro'] == 40
+
+
+def test_idempotente_y_estricto():
+    char = normalize_character(_load("Rosamund_character.json"))
+    assert normalize_character(copy.deepcopy(char)) == char
+
+    broken = _load("Flurim_hijo_de_Drebem_character.json")
+    broken['equipped']['arma_principal'] = 'Espada inexistente'
+    try:
+        normalize_character(broken)
+    except SchemaError:
+        pass
+    else:
+        raise AssertionError("Debía fallar con un arma equipada que no existe")
+    # Un error no deja la ficha a medio migrar
+    assert broken['hp'] == {'max': 14, 'current': 10}
+
+
+def test_alias_de_salvaciones():
+    assert resolve_save_name('paralisis') == SAVE_NAMES[0]
+    assert resolve_save_name('SOPLO') == SAVE_NAMES[3]
+    assert resolve_save_name('Varita Mágica') == SAVE_NAMES[1]
+    assert resolve_save_name('inexistente') is None
+
+
+def test_formato_de_ficha_no_modifica_el_original():
+    char = normalize_character(_load("Flurim_hijo_de_Drebem_character.json"))
+    before = copy.deepcopy(char)
+    sheet = to_sheet_format(char)
+    assert char == before
+    assert sheet['hp_max'] == char['hp']['max']
+    assert set(sheet['saving_throws']) <= set(SHEET_SAVE_KEYS.values())
+    weapon = sheet['equipped']['arma_principal']
+    assert weapon is None or weapon['nombre'] in char['equipment']
+
+
+def test_guardado_canonico_se_carga_en_el_creador():
+    char = normalize_character(_load("Rosamund_character.json"))
+    char['equipment']['Antorcha'] = {'type': 'gear', 'quantity': 3}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Rosamund_character.json"
+        path.write_text(json.dumps(char, ensure_ascii=False), encoding='utf-8')
+        creator = to_creator_format(load_character_file(path))
+
+    assert creator['hit_points_max'] == char['hp']['max'] > 0
+    assert creator['hit_points_current'] == char['hp']['current']
+    assert creator['armor_class'] == char['ac']
+    assert creator['equipment'].count('Antorcha') == 3
+    assert set(creator['equipment']) == set(char['equipment'])
+    for slot, name in char['equipped'].items():
+        assert (creator['equipped'][slot] or {}).get('nombre') == name
+
+    # Lo que el creador vuelve a guardar (to_dict) es el mismo personaje
+    saved = {key: copy.deepcopy(creator[key]) for key in (
+        'name', 'race', 'class', 'level', 'attributes', 'hit_points_max', 'hit_points_current',
+        'armor_class', 'thac0', 'saving_throws', 'proficiencies', 'equipment', 'equipped', 'money')}
+    again = normalize_character(saved)
+    assert again['hp'] == char['hp'] and again['ac'] == char['ac']
+    assert {n: e['quantity'] for n, e in again['equipment'].items()} == \
+        {n: e.get('quantity', 1) for n, e in char['equipment'].items()}
+
+
+if __name__ == "__main__":
+    test_formato_antiguo_y_nuevo_coinciden()
+    test_idempotente_y_estricto()
+    test_alias_de_salvaciones()
+    test_formato_de_ficha_no_modifica_el_original()
+    test_guardado_canonico_se_carga_en_el_creador()
+    print("✅ Tests del esquema completados")
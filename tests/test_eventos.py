@@ -0,0 +1,85 @@
+"""
+Test de la capa de eventos de salida (core/eventos.py)
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.combate import CombatManager
+from core.dados import DiceRoller
+from core.eventos import (
+    CollectorSink, ConsoleSink, Event, NullSink, TeeSink, formatter, set_default_sink
+)
+
+
+def test_tiradas_como_eventos():
+    sink = CollectorSink()
+    roller = DiceRoller(sink)
+    result = roller.roll("2d6+3", 0, "Prueba")
+    roller.roll("xd", 0, "")
+
+    roll_event, error_event = sink.events
+    assert roll_event.kind == 'tirada' and roll_event.data['total'] == result['total']
+    assert error_event.kind == 'mensaje' and error_event.level == 'error'
+    assert "🎲 2d6+3" in roll_event.text and "Prueba" in roll_event.text
+    data = json.loads(sink.to_json())
+    assert data[0]['rolls'] == result['rolls'] and data[0]['kind'] == 'tirada'
+
+    roller.character = {'name': 'A', 'attributes': {'FUE': 12}}
+    roller.ability_check('fue')
+    check = sink.of_kind('chequeo')[0]
+    assert check.data['success'] == (check.data['roll'] <= 12)
+
+
+def test_formato_diferido():
+    calls = []
+
+    @formatter('prueba.diferida')
+    def _format(data):
+        calls.append(data)
+        return f"valor {data['x']}"
+
+    collector = CollectorSink()
+    collector.emit(Event('prueba.diferida', {'x': 1}))
+    NullSink().emit(Event('prueba.diferida', {'x': 2}))
+    assert calls == []  # nadie pidió el texto todavía
+    assert collector.events[0].text == "valor 1" and collector.events[0].text == "valor 1"
+    assert len(calls) == 1
+
+    stream = io.StringIO()
+    tee = TeeSink(ConsoleSink(stream, kinds=['prueba.diferida']), NullSink())
+    tee.emit(Event('prueba.diferida', {'x': 3}))
+    tee.emit(Event('otro', {'x': 4}))
+    assert stream.getvalue() == "valor 3\n"
+
+
+def test_combate_sin_consola():
+    sink = CollectorSink()
+    previous = set_default_sink(NullSink())
+    try:
+        manager = CombatManager(sink)
+        manager.add_player_data({'name': 'Heroína', 'attributes': dict.fromkeys(
+            ('FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR'), 12), 'hp': {'max': 10, 'current': 10}})
+        manager.add_monster('Goblin')
+        manager.add_monster('No existe')
+        manager.show_combat_status()
+    finally:
+        set_default_sink(previous)
+
+    status = sink.of_kind('combate.estado')[0]
+    assert [c['name'] for c in status.data['players']] == ['Heroína']
+    assert "ESTADO DEL COMBATE" in status.text and "Heroína" in status.text
+    assert any("no encontrado" in e.text for e in sink.of_kind('mensaje'))
+    assert len(manager.combat_log) == len(sink.of_kind('combate.log'))
+    json.dumps(sink.to_list())
+
+
+if __name__ == "__main__":
+    test_tiradas_como_eventos()
+    test_formato_diferido()
+    test_combate_sin_consola()
+    print("✅ Tests de eventos completados")
@@ -0,0 +1,49 @@
+"""
+Test del exportador por lotes de fichas (utils/exportar_fichas.py)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.exportar_fichas import collect_characters, export_batch, export_booklet
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def test_rendimiento_cuenta_personajes():
+    characters, errors = collect_characters(DATA_DIR)
+    assert characters and not errors
+    with tempfile.TemporaryDirectory() as tmp:
+        report = export_batch(characters, tmp, ('pdf', 'html'), workers=2)
+        # Con PyMuPDF cada personaje da dos archivos; sin él, sólo el HTML
+        assert report['exported'] == report['characters'] == len(characters)
+        assert len(report['files']) in (len(characters), 2 * len(characters))
+        assert abs(report['sheets_per_second'] * report['elapsed'] - len(characters)) < 1e-6
+
+        booklet = export_booklet(characters, tmp, ('html',))
+        assert booklet['exported'] == len(characters) and len(booklet['files']) == 1
+
+
+def test_party_con_nombres_repetidos():
+    character = json.loads((DATA_DIR / "Rosamund_character.json").read_text(encoding='utf-8'))
+    with tempfile.TemporaryDirectory() as tmp:
+        party = Path(tmp) / "party.json"
+        party.write_text(json.dumps({'party': [character, character, "basura", None, 7]}),
+                         encoding='utf-8')
+        characters, errors = collect_characters(party)
+        assert len(characters) == 2 and len(errors) == 2
+
+        report = export_batch(characters, Path(tmp) / "fichas", ('html',), workers=1)
+        names = sorted(Path(f).name for f in report['files'])
+        stem = character['name'].replace(' ', '_')
+        assert names == [f"{stem}_2_ficha.html", f"{stem}_ficha.html"]
+
+
+if __name__ == "__main__":
+    test_rendimiento_cuenta_personajes()
+    test_party_con_nombres_repetidos()
+    print("✅ Tests del exportador de fichas completados")
@@ -0,0 +1,55 @@
+"""
+Test de la capa de textos de la ficha PDF (utils/generar_pdf_ficha.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.esquema import SHEET_SAVE_KEYS, load_character_file, to_sheet_format
+
+pytest.importorskip("fitz")  # el generador importa PyMuPDF al cargarse
+
+from utils.generar_pdf_ficha import FIELD_LAYOUT, LIST_LAYOUT, RED, WEAPON_ROW, build_overlay
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def _texts(ops):
+    return {text: (page, point, size, color)
+            for (page, color), texts in ops.items() for point, text, size in texts}
+
+
+def test_campos_de_la_ficha():
+    assert set(SHEET_SAVE_KEYS.values()) <= set(FIELD_LAYOUT)
+    assert {'FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR'} <= set(FIELD_LAYOUT)
+    assert all(page in (0, 1) and size > 0 for page, _, size, _ in FIELD_LAYOUT.values())
+    points = [(page, point) for page, point, _, _ in FIELD_LAYOUT.values()]
+    assert len(points) == len(set(points))  # ningún campo se escribe encima de otro
+
+
+def test_textos_de_un_personaje():
+    sheet = to_sheet_format(load_character_file(DATA_DIR / "Rosamund_character.json"))
+    sheet['equipped']['arma_principal'] = {'nombre': 'Espada larga', 'ataque': 1, 'daño': '1d8'}
+    sheet['equipment'] = [f"Objeto {i}" for i in range(30)]
+    ops = build_overlay(sheet)
+    texts = _texts(ops)
+
+    assert texts[sheet['name']][:2] == (0, FIELD_LAYOUT['name'][1])
+    assert texts[f"{sheet['hp_current']}/{sheet['hp_max']}"][1] == FIELD_LAYOUT['hp'][1]
+    assert (FIELD_LAYOUT['FUE'][1], str(sheet['attributes']['FUE']), 16) in ops[(0, RED)]
+    assert texts['+1'][1] == (WEAPON_ROW['columns'][1], WEAPON_ROW['y'])
+    assert texts['=== EQUIPO ==='][0] == LIST_LAYOUT['page']
+    listed = [text for text in texts if text.startswith('• Objeto')]
+    assert len(listed) == LIST_LAYOUT['max_equipment']
+
+    assert build_overlay({}) == build_overlay({})  # sin datos: valores por defecto
+
+
+if __name__ == "__main__":
+    test_campos_de_la_ficha()
+    test_textos_de_un_personaje()
+    print("✅ Tests de la ficha PDF completados")
@@ -0,0 +1,43 @@
+"""
+Test del generador de fichas HTML (utils/generar_html_ficha.py)
+"""
+
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.esquema import load_character_file, to_sheet_format
+from utils.generar_html_ficha import render_html_sheet, write_html_booklet
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def _sheets():
+    for filepath in sorted(DATA_DIR.glob("*_character.json")):
+        yield to_sheet_format(load_character_file(filepath))
+
+
+def test_ficha_completa_y_escapada():
+    sheet = next(_sheets())
+    sheet['name'] = 'Grum <el Rojo> & Cía'
+    html = render_html_sheet(sheet)
+    assert html.startswith('<!DOCTYPE html>') and html.endswith('</html>')
+    assert '{{' not in html
+    assert 'Grum &lt;el Rojo&gt; &amp; Cía' in html
+
+
+def test_libro_con_varias_fichas():
+    stream = io.StringIO()
+    count = write_html_booklet(_sheets(), stream)
+    html = stream.getvalue()
+    assert count == len(list(DATA_DIR.glob("*_character.json")))
+    assert html.count('class="character-sheet"') == count
+    assert html.count('<!DOCTYPE html>') == 1
+
+
+if __name__ == "__main__":
+    test_ficha_completa_y_escapada()
+    test_libro_con_varias_fichas()
+    print("✅ Tests de fichas HTML completados")
@@ -0,0 +1,96 @@
+"""
+Test del generador masivo de PNJ (core/generador_pnj.py)
+"""
+
+import copy
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.atributos import AttributeGenerator, d6_batch
+from core.esquema import normalize_character
+from core.generador_pnj import NPCGenerator, allowed_classes, read_jsonl
+
+
+DATA = SimpleNamespace(
+    classes={
+        'Guerrero': {'requisitos': {'FUE': 9}, 'dado_golpe': 10},
+        'Paladín': {'requisitos': {'FUE': 12, 'CON': 9, 'SAB': 13, 'CAR': 17}, 'dado_golpe': 10},
+        'Mago': {'requisitos': {'INT': 9}, 'dado_golpe': 4},
+        'Monje': {'requisitos': {'FUE': 15, 'DES': 15, 'SAB': 15}, 'dado_golpe': 4},
+    },
+    races={
+        'Humano': {'ajustes_atributos': {}, 'clases_permitidas': ['Todas']},
+        'Enano': {'ajustes_atributos': {'CON': 1, 'CAR': -1},
+                  'clases_permitidas': ['Guerrero', 'Ladrón', 'Clérigo'],
+                  'limite_nivel': {'Guerrero': 15}},
+        'Semielfo': {'ajustes_atributos': {}, 'clases_permitidas': ['Todas excepto Monje']},
+    },
+    kits={'Guerrero': {'Sin Kit': {}, 'Bárbaro': {'equipo_inicial': ['Hacha de batalla', 'Pieles']}}},
+)
+
+
+def test_dados_por_bloques():
+    import random
+    rng = random.Random(7)
+    rolls = d6_batch(6000, rng)
+    assert len(rolls) == 6000 and set(rolls) == {1, 2, 3, 4, 5, 6}
+    assert all(3 <= v <= 18 for v in AttributeGenerator.method_4(rng))
+    best = AttributeGenerator.method_2(rng)
+    assert best == sorted(best, reverse=True) and len(best) == 6
+
+
+def test_clases_permitidas():
+    classes = ['Guerrero', 'Mago', 'Monje']
+    assert allowed_classes(DATA.races['Semielfo'], classes) == ['Guerrero', 'Mago']
+    assert allowed_classes(DATA.races['Enano'], classes) == ['Guerrero']
+    assert allowed_classes(DATA.races['Humano'], classes) == classes
+
+
+def test_generacion_jsonl():
+    stream = io.StringIO()
+    generator = NPCGenerator(DATA, seed=3, kit_chance=1.0, name_prefix="Guardia")
+    written = generator.write_jsonl(stream, 500, levels={1: 3, 20: 1})
+    assert written == 500
+
+    stream.seek(0)
+    npcs = list(read_jsonl(stream))
+    assert len(npcs) == 500 and npcs[0]['name'] == "Guardia 1"
+    for npc in npcs:
+        requirements = DATA.classes[npc['class']]['requisitos']
+        assert all(npc['attributes'][attr] >= value for attr, value in requirements.items())
+        assert npc['class'] in allowed_classes(DATA.races[npc['race']], DATA.classes)
+        assert npc['hp']['max'] >= 1
+        if npc['race'] == 'Enano':
+            assert npc['level'] <= 15
+        if npc['class'] == 'Guerrero':
+            assert npc['kit'] == 'Bárbaro' and npc['equipped']['armadura'] == 'Armadura de cota de mallas'
+        # Ya sale en formato canónico
+        assert normalize_character(copy.deepcopy(npc)) == npc
+
+    # Misma semilla, mismos PNJ
+    again = list(NPCGenerator(DATA, seed=3, kit_chance=1.0, name_prefix="Guardia")
+                 .generate(500, levels={1: 3, 20: 1}))
+    assert again == npcs
+
+
+def test_distribuciones():
+    generator = NPCGenerator(DATA, seed=5)
+    npcs = list(generator.generate(200, races={'Enano': 1}, classes=['Guerrero', 'Mago'], levels=4))
+    assert {(n['race'], n['class'], n['level']) for n in npcs} == {('Enano', 'Guerrero', 4)}
+    try:
+        list(generator.generate(1, races=['Orco']))
+        assert False, "Una raza desconocida debe dar error"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_dados_por_bloques()
+    test_clases_permitidas()
+    test_generacion_jsonl()
+    test_distribuciones()
+    print("✅ Tests del generador de PNJ completados")
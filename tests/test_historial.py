@@ -0,0 +1,77 @@
+"""
+Test del historial de tiradas y sus estadísticas (core/historial.py)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dados import DiceRoller
+from core.eventos import NullSink
+from core.historial import RollHistory, chi_square_p_value, format_die_stats, format_history
+
+
+def test_bufer_circular():
+    history = RollHistory(capacity=5)
+    for i in range(1, 13):
+        history.record(6, [i % 6 + 1], bonus=i, roller=f"PJ {i % 2}", timestamp=i)
+    assert len(history) == 5 and history.recorded == 12
+    recent = history.recent(10)
+    assert [r['time'] for r in recent] == [12, 11, 10, 9, 8]
+    assert recent[0] == {'dice': '1d6+12', 'sides': 6, 'faces': [1], 'bonus': 12,
+                         'total': 13, 'time': 12, 'roller': 'PJ 0'}
+    assert history.stats[6].n == 12  # las estadísticas cubren toda la sesión
+    assert "1d6+12" in format_history(recent)
+
+    history.clear()
+    assert len(history) == 0 and history.recent() == [] and history.die_stats(6) is None
+
+
+def test_estadisticas_incrementales():
+    history = RollHistory(capacity=10)
+    rng = random.Random(4)
+    faces = [rng.randint(1, 20) for _ in range(4000)]
+    for start in range(0, len(faces), 4):
+        history.record(20, faces[start:start + 4])
+
+    stats = history.die_stats(20)
+    counts = [faces.count(face) for face in range(1, 21)]
+    expected = len(faces) / 20
+    assert stats['histogram'] == counts
+    assert abs(stats['chi2'] - sum((c - expected) ** 2 / expected for c in counts)) < 1e-6
+    assert abs(stats['mean'] - sum(faces) / len(faces)) < 1e-9
+    assert stats['p_value'] > 0.001
+
+    loaded = RollHistory()
+    loaded.record(6, [6] * 300 + [1] * 20)
+    assert loaded.die_stats(6)['p_value'] < 0.001
+    assert "sospechoso" in format_die_stats(loaded.die_stats(6))
+    assert abs(chi_square_p_value(30.144, 19) - 0.05) < 0.005  # valor de tabla
+
+
+def test_tiradas_del_lanzador():
+    history = RollHistory(capacity=3)
+    roller = DiceRoller(NullSink(), history=history)
+    roller.character = {'name': 'Aldric'}
+    result = roller.roll("2d8+1")
+    last = history.recent(1)[0]
+    assert last['faces'] == result['rolls'] and last['total'] == result['total']
+    assert last['roller'] == 'Aldric' and last['dice'] == '2d8+1'
+
+    # Valores grandes: se guardan sin recortar y el historial nunca anula la tirada
+    assert roller.roll("1d6", 2 ** 31)['total'] > 2 ** 31
+    assert history.recent(1)[0]['bonus'] == 2 ** 31
+    roller.roll("1d70000")
+    assert history.recent(1)[0]['dice'] == '1d70000'
+    before = history.recent(3)
+    assert roller.roll("1d6", 2 ** 70)['total'] > 2 ** 70  # no cabe en 64 bits
+    assert history.recent(3) == before
+
+
+if __name__ == "__main__":
+    test_bufer_circular()
+    test_estadisticas_incrementales()
+    test_tiradas_del_lanzador()
+    print("✅ Tests del historial de tiradas completados")
@@ -0,0 +1,131 @@
+"""
+Test del orden de turnos con montículo (core/iniciativa.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.azar import RNGService, set_rng_service
+from core.combate import CombatManager
+from core.eventos import NullSink
+from core.iniciativa import InitiativeScheduler
+
+
+class Dummy:
+    def __init__(self, name):
+        self.name = name
+        self.is_alive = True
+
+    def __repr__(self):
+        return self.name
+
+
+def test_cola_de_turnos():
+    a, b, c, d = (Dummy(n) for n in "abcd")
+    scheduler = InitiativeScheduler()
+    scheduler.start({a: 5, b: 9, c: 5, d: 2})
+    assert scheduler.current is b and scheduler.order() == [b, a, c, d]  # empate: orden de llegada
+
+    c.is_alive = False  # se salta sin reordenar
+    assert scheduler.advance() is a and scheduler.advance() is d
+    assert scheduler.advance() is None
+
+    c.is_alive = True  # curado: vuelve en el siguiente round
+    assert scheduler.new_round() is b and scheduler.pending() == [a, c, d]
+    assert scheduler.new_round({d: 10}) is d
+
+
+def test_refuerzos_en_su_puesto():
+    a, b, late, later = (Dummy(n) for n in ("a", "b", "late", "later"))
+    scheduler = InitiativeScheduler()
+    scheduler.start({a: 8, b: 3})
+    assert scheduler.advance() is b
+    assert not scheduler.add(late, 6)  # su iniciativa ya pasó: espera al siguiente round
+    assert scheduler.add(later, 1)
+    assert scheduler.advance() is later and scheduler.advance() is None
+    assert scheduler.new_round() is a and scheduler.pending() == [late, b, later]
+
+    scheduler.remove(late)
+    assert scheduler.pending() == [b, later] and len(scheduler) == 3
+
+
+def test_combate_con_refuerzos_y_velocidad():
+    previous = set_rng_service(RNGService(48))
+    try:
+        manager = CombatManager(NullSink())
+        fighter = {'name': 'Aldric', 'class': 'Guerrero', 'level': 1,
+                   'hp': {'max': 10, 'current': 10},
+                   'attributes': dict.fromkeys(('FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR'), 10),
+                   'equipment': {'Alabarda': {'type': 'weapon', 'damage': '1d10', 'velocidad': 9}},
+                   'equipped': {'arma_principal': 'Alabarda'}}
+        manager.add_player_data(fighter)
+        manager.add_monster('Goblin', 'Goblin 1')
+        manager.start_combat()
+        player = manager.combatants[0]
+        assert player.speed_factor == 9 and -8 <= player.initiative <= 1
+
+        manager.add_monster('Goblin', 'Goblin 2')
+        assert manager.combatants[-1] in manager.initiative_order
+
+        def play_round():
+            names, round_number = [], manager.round_number
+            while manager.round_number == round_number:
+                names.append(manager.get_current_combatant().name)
+                manager.next_turn()
+            assert manager.current_turn_index == 0
+            return names
+
+        play_round()
+        assert sorted(play_round()) == ['Aldric', 'Goblin 1', 'Goblin 2']
+
+        manager.combatants[1].take_damage(100)
+        manager.reroll_initiative_each_round = True
+        play_round()
+        assert sorted(play_round()) == ['Aldric', 'Goblin 2']
+        assert sorted(c.name for c in manager.initiative_order) == ['Aldric', 'Goblin 2']
+    finally:
+        set_rng_service(previous)
+
+
+def test_iniciativa_de_grupo():
+    previous = set_rng_service(RNGService(49))
+    try:
+        manager = CombatManager(NullSink())
+        manager.group_initiative = True
+        for i in range(12):
+            manager.add_monster('Goblin', f"Goblin {i + 1}")
+        manager.add_monster('Ogro')
+        manager.start_combat()
+        manager.combat_distance = 1
+        goblins = manager.combatants[:12]
+        assert len({g.initiative for g in goblins}) == 1
+        assert any(line.endswith(f"Goblin x12 ({goblins[0].initiative})") for line in manager.combat_log)
+
+        manager.add_monster('Goblin', "Goblin 13")  # refuerzo: comparte la tirada del grupo
+        assert manager.combatants[-1].initiative == goblins[0].initiative
+
+        while manager.get_current_combatant().group != 'Goblin':
+            manager.next_turn()
+        batch = manager.current_group()
+        assert len(batch) == 13
+        ogre = manager.combatants[12]
+        result = manager.make_group_attack(batch, ogre)
+        assert result['attackers'] == 13 and 0 <= result['hits'] <= 13
+        assert result['per_target'].get(ogre.name, 0) == result['damage']
+        assert manager.combat_log[-1].startswith("⚔️ 13 Goblin atacan:")
+
+        round_number = manager.round_number
+        manager.next_turn()
+        assert manager.round_number > round_number or manager.get_current_combatant() is ogre
+    finally:
+        set_rng_service(previous)
+
+
+if __name__ == "__main__":
+    test_cola_de_turnos()
+    test_refuerzos_en_su_puesto()
+    test_combate_con_refuerzos_y_velocidad()
+    test_iniciativa_de_grupo()
+    print("✅ Tests del orden de iniciativa completados")
@@ -0,0 +1,56 @@
+"""
+Test del seguimiento de memoria (core/memoria.py) y de los límites del combate
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.combate import CombatManager, MonsterDatabase
+from core.eventos import NullSink
+from core.memoria import MemoryTracker, module_name, object_counts
+
+
+def test_nombres_de_modulo():
+    root = Path(__file__).parent.parent
+    assert module_name(str(root / "core" / "combate.py")) == 'core.combate'
+    assert module_name(str(root / "core" / "__init__.py")) == 'core'
+    assert module_name('<frozen abc>') == '<frozen abc>'
+
+
+def test_crecimiento_por_modulo():
+    tracker = MemoryTracker()
+    tracker.start()
+    try:
+        manager = CombatManager(NullSink())
+        for i in range(30):
+            manager.add_monster('Goblin', f"Goblin {i}")
+        rows = {name: size_diff for name, _, size_diff, _ in tracker.by_module()}
+        assert rows.get('core.combate', 0) > 0
+
+        counts = object_counts()
+        assert counts['Monster'] - tracker.baseline_objects['Monster'] >= 30
+        assert counts['Combatant'] - tracker.baseline_objects['Combatant'] >= 30
+        assert "core.combate" in tracker.report()
+    finally:
+        tracker.stop()
+    assert not tracker.active
+
+
+def test_log_acotado_y_base_compartida():
+    monster_db = MonsterDatabase(NullSink())
+    manager = CombatManager(NullSink(), monster_db)
+    assert manager.monster_db is monster_db
+
+    for i in range(CombatManager.MAX_COMBAT_LOG + 50):
+        manager.log(f"línea {i}")
+    assert len(manager.combat_log) == CombatManager.MAX_COMBAT_LOG
+    assert manager.combat_log[-1] == f"línea {CombatManager.MAX_COMBAT_LOG + 49}"
+
+
+if __name__ == "__main__":
+    test_nombres_de_modulo()
+    test_crecimiento_por_modulo()
+    test_log_acotado_y_base_compartida()
+    print("✅ Tests de memoria completados")
@@ -0,0 +1,113 @@
+"""
+Test de las tablas de modificadores por atributo (core/modificadores.py)
+Comprueba que dados, asistente y creador usan los mismos valores
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.combate import CombatManager
+from core.dados import DiceRoller
+from core.eventos import NullSink
+from core.modificadores import (
+    ATTRIBUTE_MODIFIERS, TABLES, build_tables, constitution_hp_bonus,
+    dexterity_ac_adjustment, strength_damage_bonus, strength_hit_bonus
+)
+
+
+def test_tabla_del_manual():
+    assert [strength_hit_bonus(s) for s in (3, 7, 12, 16, 17, 18)] == [-3, -1, 0, 0, 1, 1]
+    assert [strength_damage_bonus(18, p) for p in (0, 1, 50, 51, 75, 76, 90, 91, 99, 100)] == \
+        [2, 3, 3, 3, 3, 4, 4, 5, 5, 6]
+    assert strength_hit_bonus(18, 100) == 3
+    assert strength_damage_bonus(17, 100) == 1  # la fuerza excepcional sólo cuenta con 18
+    # Percentiles negativos o no numéricos son un 18 normal, no el 18/00
+    assert [strength_hit_bonus(18, p) for p in (-1, -100, None, 'x')] == [1] * 4
+    assert strength_damage_bonus(18, -5) == 2 and strength_damage_bonus(18, 150) == 6
+    assert [dexterity_ac_adjustment(d) for d in (3, 6, 10, 15, 16, 18)] == [4, 1, 0, -1, -2, -4]
+    assert constitution_hp_bonus(18) == 2 and constitution_hp_bonus(18, warrior=True) == 4
+    # Valores fuera de tabla se recortan a 1-25
+    assert strength_damage_bonus(40) == strength_damage_bonus(25)
+
+
+def test_reglas_con_umbrales_se_expanden():
+    # Formato antiguo de rules['attribute_modifiers']: sólo algunos umbrales
+    old = {'CON': {3: {'pg': -2}, 6: {'pg': -1}, 9: {'pg': 0}, 15: {'pg': 1}}}
+    table = build_tables(old)['CON']['pg']
+    assert table[3:17] == [-2, -2, -2, -1, -1, -1, 0, 0, 0, 0, 0, 0, 1, 1]
+    assert build_tables(ATTRIBUTE_MODIFIERS) == TABLES
+
+
+def test_los_modulos_coinciden_con_la_tabla():
+    bonuses = []
+    roller = DiceRoller()
+    roller.roll = lambda dice, bonus=0, description="": bonuses.append(bonus) or 0
+    roller.d20 = lambda bonus=0, description="": bonuses.append(bonus) or 10
+    for strength, exceptional in [(5, 0), (16, 0), (18, 0), (18, 76), (18, 100)]:
+        roller.character = {'attributes': {'FUE': strength}, 'exceptional_strength': exceptional,
+                            'equipped': {}, 'equipment': {}}
+        bonuses.clear()
+        roller.attack_roll()
+        roller.damage_roll()
+        assert bonuses == [strength_hit_bonus(strength, exceptional),
+                           strength_damage_bonus(strength, exceptional)]
+
+    from interfaces.dm_assistant import DMAssistant
+
+    class Loaded:
+        data = {'attributes': {'DES': 17}, 'equipped': {}, 'equipment': {}}
+
+    assistant = object.__new__(DMAssistant)
+    assistant.current_character = Loaded()
+    assistant._recalculate_combat_stats()
+    assert Loaded.data['ac'] == 10 + dexterity_ac_adjustment(17)
+
+
+def test_combate_usa_la_fuerza_excepcional():
+    manager = CombatManager(NullSink())
+    manager.add_player_data({
+        'name': 'Aldric', 'class': 'Guerrero', 'level': 1, 'hp': {'max': 10, 'current': 10},
+        'attributes': {'FUE': 18, 'DES': 10, 'CON': 10, 'INT': 10, 'SAB': 10, 'CAR': 10},
+        'exceptional_strength': 76,
+    })
+    manager.add_monster('Ogro')
+    fighter, ogre = manager.combatants
+    manager.combat_distance = 1
+
+    bonuses = []
+
+    def roll(dice, bonus=0, reason=""):
+        bonuses.append(bonus)
+        return {'rolls': [19], 'total': 19 + bonus}
+
+    manager.dice_roller.roll = roll
+    assert manager.make_attack(fighter, ogre)['hit']
+    assert bonuses == [0, strength_damage_bonus(18, 76)] and bonuses[1] == 4
+
+
+def test_creador_usa_la_fuerza_excepcional():
+    pytest.importorskip("fitz")  # el creador importa PyMuPDF y pandas al cargarse
+    pytest.importorskip("pandas")
+    from core.character_creator import Character
+
+    character = Character('Aldric', None)
+    character.attributes['FUE'] = 18
+    character.exceptional_strength = 91
+    assert character._get_strength_bonus() == (strength_hit_bonus(18, 91),
+                                                strength_damage_bonus(18, 91)) == (2, 5)
+
+
+if __name__ == "__main__":
+    test_tabla_del_manual()
+    test_reglas_con_umbrales_se_expanden()
+    test_los_modulos_coinciden_con_la_tabla()
+    test_combate_usa_la_fuerza_excepcional()
+    try:
+        test_creador_usa_la_fuerza_excepcional()
+    except pytest.skip.Exception as e:
+        print(f"⏭️ Creador no comprobado: {e}")
+    print("✅ Tests de modificadores completados")
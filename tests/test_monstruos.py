@@ -0,0 +1,34 @@
+"""
+Test de la base de datos de monstruos (core/combate.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.combate import MonsterDatabase
+
+
+def test_busqueda_por_ngramas_equivale_a_la_lineal():
+    db = MonsterDatabase()
+
+    def linear(query):
+        query = query.lower()
+        return [name for name in db.monsters if query in name.lower()]
+
+    for query in ['a', 'go', 'GOB', 'goblin', 'dragón', 'ón ', 'de ', 'xyz', '']:
+        assert list(db.search_monsters(query)) == linear(query), query
+
+
+def test_indice_se_actualiza_con_monstruos_nuevos():
+    db = MonsterDatabase()
+    db._save_to_file = lambda: None  # no tocar monstruos.json
+    db.save_custom_monster("Zorgoblin Ancestral", {'type': 'Humanoide', 'hd': '3d8', 'ac': 5})
+    assert "Zorgoblin Ancestral" in db.search_monsters("zorgob")
+
+
+if __name__ == "__main__":
+    test_busqueda_por_ngramas_equivale_a_la_lineal()
+    test_indice_se_actualiza_con_monstruos_nuevos()
+    print("✅ Tests de monstruos completados")
@@ -0,0 +1,61 @@
+"""
+Test de la selección de páginas del extractor de PDF (utils/pdf_py.py)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.pdf_py import RangosPaginas, main_argumentos, parsear_rangos_paginas
+
+
+def test_rangos_solapados_se_fusionan():
+    paginas = parsear_rangos_paginas("5-10, 1, 8-12, 2, 13, 20-20")
+    assert paginas.rangos == [(1, 2), (5, 13), (20, 20)]
+    assert len(paginas) == 12 and str(paginas) == "1-2,5-13,20"
+    assert 9 in paginas and 4 not in paginas and 21 not in paginas
+    assert list(RangosPaginas([(3, 4), (1, 6), (2, 2)])) == [1, 2, 3, 4, 5, 6]
+
+    assert parsear_rangos_paginas("7-3") is None
+    assert parsear_rangos_paginas("0") is None
+    assert parsear_rangos_paginas("1-2-3") is None
+    assert parsear_rangos_paginas("a") is None
+    assert parsear_rangos_paginas(" , ") is None
+    assert parsear_rangos_paginas("1-50", max_paginas=40) is None
+
+
+def test_limite_enorme_recortado_al_documento():
+    paginas = parsear_rangos_paginas("3, 10-1000000000")
+    assert len(paginas) == 1 + 1000000000 - 9  # sin expandir la lista de páginas
+    dentro = paginas.recortar(25)
+    assert dentro.rangos == [(3, 3), (10, 25)] and len(dentro) == 17
+    assert not paginas.recortar(2)
+
+
+def test_bloques_de_n_paginas():
+    paginas = RangosPaginas([(1, 3), (7, 11), (20, 20)])
+    bloques = list(paginas.bloques(4))
+    assert [b.rangos for b in bloques] == [[(1, 3), (7, 7)], [(8, 11)], [(20, 20)]]
+    assert [page for b in bloques for page in b] == list(paginas)
+    assert [len(b) for b in paginas.bloques(1)] == [1] * len(paginas)
+    assert [b.rangos for b in paginas.bloques(100)] == [paginas.rangos]
+    assert list(RangosPaginas().bloques(3)) == []
+
+
+def test_argumentos_invalidos():
+    for valor in ('diez', '0', '-3'):
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            main_argumentos(['entrada.pdf', '1-5', 'salida.pdf', '--por-archivo', valor])
+        assert "--por-archivo necesita un número" in salida.getvalue()
+
+
+if __name__ == "__main__":
+    test_rangos_solapados_se_fusionan()
+    test_limite_enorme_recortado_al_documento()
+    test_bloques_de_n_paginas()
+    test_argumentos_invalidos()
+    print("✅ Tests de la selección de páginas completados")
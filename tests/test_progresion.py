@@ -0,0 +1,62 @@
+"""
+Test de las tablas de progresión por clase (core/progresion.py)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.esquema import SAVE_NAMES, normalize_character
+from core.progresion import (
+    MAX_LEVEL, XP_TABLES, award_experience, level_for_xp, level_up_character,
+    saves_for, thac0_for, xp_for_level
+)
+
+
+def test_thac0_y_salvaciones():
+    assert [thac0_for('Guerrero', lv) for lv in (1, 2, 10, 20)] == [20, 19, 11, 1]
+    assert [thac0_for('Clérigo', lv) for lv in (1, 3, 4, 7, 20)] == [20, 20, 18, 16, 8]
+    assert [thac0_for('Ladrón', lv) for lv in (1, 2, 3, 20)] == [20, 20, 19, 11]
+    assert [thac0_for('Mago', lv) for lv in (1, 3, 4, 20)] == [20, 20, 19, 14]
+    assert saves_for('Mago', 1) == {'paralisis': 14, 'varitas': 11, 'petrificacion': 13,
+                                    'aliento': 15, 'conjuros': 12}
+    assert saves_for('Guerrero', 17)['aliento'] == 4
+    assert thac0_for('Guerrero', 50) == thac0_for('Guerrero', MAX_LEVEL)
+
+
+def test_nivel_desde_xp():
+    for cls, table in XP_TABLES.items():
+        assert len(table) == MAX_LEVEL
+        for level, xp in enumerate(table, 1):
+            assert level_for_xp(cls, xp) == level
+            assert xp_for_level(cls, level) == xp
+            if xp:
+                assert level_for_xp(cls, xp - 1) == level - 1
+    assert level_for_xp('Ladrón', 10 ** 9) == MAX_LEVEL
+
+
+def test_reparto_y_subida_de_nivel():
+    party = [
+        normalize_character({'name': 'A', 'class': 'Ladrón', 'level': 1, 'experience': 0,
+                             'attributes': dict.fromkeys(('FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR'), 10),
+                             'hp': {'max': 6, 'current': 6}}),
+        normalize_character({'name': 'B', 'class': 'Mago', 'level': 1, 'experience': 0,
+                             'attributes': dict.fromkeys(('FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR'), 10),
+                             'hp': {'max': 4, 'current': 4}}),
+    ]
+    ready = award_experience(party, 1300)
+    assert [(c['name'], level) for c, level in ready] == [('A', 2)]
+
+    gained = level_up_character(party[0], random.Random(1))
+    assert party[0]['level'] == 2 and 1 <= gained <= 6
+    assert party[0]['hp']['max'] == 6 + gained
+    assert party[0]['saving_throws'][SAVE_NAMES[0]] == 13
+
+
+if __name__ == "__main__":
+    test_thac0_y_salvaciones()
+    test_nivel_desde_xp()
+    test_reparto_y_subida_de_nivel()
+    print("✅ Tests de progresión completados")
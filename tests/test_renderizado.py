@@ -0,0 +1,49 @@
+"""
+Test de la caché de textos renderizados (core/renderizado.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.renderizado import RenderCache
+
+
+class Entity:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_version_invalida_el_texto():
+    cache = RenderCache()
+    goblin = Entity('Goblin')
+    assert cache.get(goblin, 'ficha', lambda: goblin.name) == 'Goblin'
+    goblin.name = 'Goblin jefe'
+    assert cache.get(goblin, 'ficha', lambda: goblin.name) == 'Goblin'  # sin touch sigue en caché
+    cache.touch(goblin)
+    assert cache.get(goblin, 'ficha', lambda: goblin.name) == 'Goblin jefe'
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 2}
+
+
+def test_versiones_no_crecen_sin_limite():
+    cache = RenderCache(max_entries=4)
+    for i in range(1000):
+        entity = Entity(f"Orco {i}")
+        cache.touch(entity)  # sin textos en caché: no se guarda versión
+        cache.get(entity, 'ficha', lambda: entity.name)
+        cache.get(entity, 'resumen', lambda: entity.name)
+        cache.touch(entity)
+    assert len(cache._versions) <= 2 and len(cache._cached_kinds) <= 2
+
+    kept = Entity('Troll')
+    cache.get(kept, 'ficha', lambda: 'v0')
+    cache.touch(kept)
+    cache.get(Entity('Ogro'), 'ficha', lambda: '')  # expulsa otras entradas, no la del troll
+    assert cache.version(kept) == 1 and cache.get(kept, 'ficha', lambda: 'v1') == 'v1'
+
+
+if __name__ == "__main__":
+    test_version_invalida_el_texto()
+    test_versiones_no_crecen_sin_limite()
+    print("✅ Tests de la caché de textos completados")
@@ -0,0 +1,79 @@
+"""
+Test de la instrumentación de rendimiento (core/rendimiento.py)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dados import DiceRoller
+from core.eventos import NullSink
+from core.rendimiento import Metrics, SpanStats, metrics, profile_summary
+
+
+def test_tramos_y_percentiles():
+    registry = Metrics()
+    with registry.span('apagado'):
+        pass
+    assert registry.spans == {}
+
+    registry.enable()
+    for ms in range(1, 101):
+        registry.record('prueba', ms / 1000)
+    with registry.span('bloque'):
+        pass
+    data = registry.snapshot()['spans']
+    assert data['prueba']['count'] == 100 and data['bloque']['count'] == 1
+    assert round(data['prueba']['p50_ms']) == 50 and round(data['prueba']['p95_ms']) == 95
+    assert round(data['prueba']['p99_ms']) == 99 and round(data['prueba']['max_ms']) == 100
+    assert "prueba" in registry.report()
+    json.loads(registry.to_json())
+
+    stats = SpanStats(max_samples=10)
+    for value in range(100):
+        stats.add(value)
+    assert stats.count == 100 and stats.percentile(0) == 90  # sólo las últimas muestras
+
+
+def test_instrumentacion_del_nucleo():
+    roller = DiceRoller(NullSink())
+    was_enabled = metrics.enabled
+    metrics.reset()
+    try:
+        metrics.disable()
+        roller.roll("1d20")
+        assert 'dados.tirada' not in metrics.spans
+
+        metrics.enable()
+        for _ in range(5):
+            roller.roll("3d6")
+        assert metrics.spans['dados.tirada'].count == 5
+    finally:
+        metrics.enabled = was_enabled
+        metrics.reset()
+
+
+def test_volcado_de_perfil():
+    registry = Metrics()
+    assert registry.stop_profile() is None
+    assert registry.start_profile() and not registry.start_profile()
+    DiceRoller(NullSink()).roll("2d6")
+    try:
+        registry.stop_profile(Path(tempfile.gettempdir()) / "no_existe" / "perfil.prof")
+        assert False, "la ruta no existe"
+    except OSError:
+        assert registry.profiling  # el perfil no se pierde: se reintenta con otra ruta
+    path = registry.stop_profile(Path(tempfile.gettempdir()) / "adnd_test_perfil.prof")
+    assert path.exists() and not registry.profiling
+    assert "roll" in profile_summary(path)
+    path.unlink()
+
+
+if __name__ == "__main__":
+    test_tramos_y_percentiles()
+    test_instrumentacion_del_nucleo()
+    test_volcado_de_perfil()
+    print("✅ Tests de rendimiento completados")
@@ -0,0 +1,87 @@
+"""
+Test del ejecutor de tareas en segundo plano (interfaces/tareas.py)
+Usa una raíz falsa en lugar de Tk para poder ejecutarse sin pantalla
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interfaces.tareas import TaskRunner
+
+
+class FakeRoot:
+    """Imita root.after(): guarda los callbacks y los ejecuta en pump()"""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self, timeout=2.0):
+        end = time.time() + timeout
+        while self.pending and time.time() < end:
+            callback = self.pending.pop(0)
+            time.sleep(0.005)
+            callback()
+
+
+def test_resultado_progreso_y_errores():
+    root = FakeRoot()
+    runner = TaskRunner(root, poll_ms=1)
+    main_thread = threading.get_ident()
+    results, progress, errors, threads = [], [], [], []
+
+    def work(task, n):
+        for i in range(1, n + 1):
+            task.report(i, n, "contando")
+        return n * 2
+
+    def on_done(value):
+        threads.append(threading.get_ident())
+        results.append(value)
+
+    runner.submit(work, 3, on_done=on_done,
+                  on_progress=lambda d, t, m: progress.append((d, t)))
+    runner.submit(lambda task: 1 / 0, on_error=errors.append)
+    root.pump()
+
+    assert results == [6]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert isinstance(errors[0], ZeroDivisionError)
+    assert threads == [main_thread]  # los callbacks vuelven al hilo "de Tk"
+    assert runner.active == 0
+    runner.shutdown()
+
+
+def test_cancelacion():
+    root = FakeRoot()
+    runner = TaskRunner(root, poll_ms=1)
+    started = threading.Event()
+    results = []
+
+    def slow(task):
+        started.set()
+        for i in range(1000):
+            task.report(i, 1000)
+            time.sleep(0.001)
+        return "terminada"
+
+    task = runner.submit(slow, on_done=results.append)
+    started.wait(1)
+    task.cancel()
+    root.pump()
+
+    assert task.cancelled and task.finished
+    assert results == []
+    runner.shutdown()
+
+
+if __name__ == "__main__":
+    test_resultado_progreso_y_errores()
+    test_cancelacion()
+    print("✅ Tests del ejecutor de tareas completados")
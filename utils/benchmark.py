@@ -0,0 +1,432 @@
+"""
+Banco de pruebas de rendimiento del DM Assistant AD&D 2e
+Mide dados, búsquedas en la biblioteca, filtros de monstruos, combate,
+carga de datos y lectura/escritura de personajes
+
+Cada prueba se repite varias veces con la misma semilla y se guarda el
+mejor tiempo por operación (el menos afectado por el ruido del sistema).
+Los resultados se escriben en JSON y se comparan con una base guardada:
+si alguna prueba es más lenta que la base por encima del umbral, el
+programa termina con código 1.
+
+Uso:
+    python utils/benchmark.py [--salida resultados.json] [--base archivo.json] [--guardar-base]
+                              [--umbral 0.25] [--solo dados,combate] [--rapido]
+"""
+
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.azar import FaceBuffer, RNGService, set_rng_service
+from core.biblio import RuleBook
+from core.combate import CombatManager, MonsterDatabase
+from core.dados import DiceRoller
+from core.esquema import load_character_file
+from core.eventos import NullSink, set_default_sink
+
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_BASELINE = ROOT / "resources" / "benchmark_base.json"
+SEED = 2024
+DEFAULT_THRESHOLD = 0.25  # 25% más lento que la base = regresión
+REPEAT = 5
+MAX_ROUNDS = 50
+
+# Registro: nombre -> (grupo, preparación). La preparación devuelve
+# (función a medir, operaciones por repetición) o None si no se puede medir aquí
+BENCHMARKS: Dict[str, Tuple[str, Callable[[bool], Optional[Tuple[Callable[[], object], int]]]]] = {}
+
+
+def benchmark(name: str, group: str):
+    """Decorador para registrar una prueba"""
+    def register(setup):
+        BENCHMARKS[name] = (group, setup)
+        return setup
+    return register
+
+
+def _sample_character() -> Dict:
+    """Personaje guerrero en formato canónico para las pruebas de combate"""
+    return {
+        'name': 'Guerrera', 'race': 'Humano', 'class': 'Guerrero', 'level': 5,
+        'attributes': {'FUE': 17, 'DES': 14, 'CON': 15, 'INT': 10, 'SAB': 10, 'CAR': 10},
+        'hp': {'max': 45, 'current': 45}, 'ac': 3, 'thac0': 16,
+        'equipment': {'Espada larga': {'type': 'weapon', 'damage': '1d8', 'quantity': 1}},
+        'equipped': {'arma_principal': 'Espada larga'},
+    }
+
+
+# ----------------------------------------------------------------------
+# Dados
+# ----------------------------------------------------------------------
+
+def _dice(expression: str, buffered: bool = False):
+    def setup(quick: bool):
+        roller = DiceRoller(NullSink(), FaceBuffer() if buffered else None)
+        return (lambda: roller.roll(expression)), (2000 if quick else 20000)
+    return setup
+
+
+benchmark('dados.1d20', 'dados')(_dice("1d20"))
+benchmark('dados.3d6+2', 'dados')(_dice("3d6+2"))
+benchmark('dados.10d6', 'dados')(_dice("10d6"))
+benchmark('dados.bufer.1d20', 'dados')(_dice("1d20", buffered=True))
+benchmark('dados.bufer.10d6', 'dados')(_dice("10d6", buffered=True))
+
+
+# ----------------------------------------------------------------------
+# Biblioteca de reglas
+# ----------------------------------------------------------------------
+
+_rulebook: Optional[RuleBook] = None
+
+
+def _search(query: str, category: Optional[str]):
+    def setup(quick: bool):
+        global _rulebook
+        _rulebook = _rulebook or RuleBook()
+        rulebook = _rulebook
+        return (lambda: rulebook.search(query, category)), (50 if quick else 500)
+    return setup
+
+
+benchmark('biblio.regla', 'biblio')(_search("THAC0", "rules"))
+benchmark('biblio.conjuro', 'biblio')(_search("misiles mágicos", "spells"))
+benchmark('biblio.clase', 'biblio')(_search("mago", "classes"))
+benchmark('biblio.todo', 'biblio')(_search("espada", None))
+benchmark('biblio.sin_resultados', 'biblio')(_search("zzzz", None))
+
+
+# ----------------------------------------------------------------------
+# Monstruos
+# ----------------------------------------------------------------------
+
+_monster_db: Optional[MonsterDatabase] = None
+
+
+def _monster_database() -> MonsterDatabase:
+    global _monster_db
+    _monster_db = _monster_db or MonsterDatabase(NullSink())
+    return _monster_db
+
+
+def _monsters(operation: Callable[[MonsterDatabase], object]):
+    def setup(quick: bool):
+        db = _monster_database()
+        return (lambda: operation(db)), (500 if quick else 5000)
+    return setup
+
+
+benchmark('monstruos.tipo', 'monstruos')(_monsters(lambda db: db.filter_by_type('Humanoide')))
+benchmark('monstruos.desafio', 'monstruos')(_monsters(lambda db: db.filter_by_challenge('Medio')))
+benchmark('monstruos.dg', 'monstruos')(_monsters(lambda db: db.filter_by_hd_range(1, 4)))
+benchmark('monstruos.busqueda', 'monstruos')(_monsters(lambda db: db.search_monsters('dragón')))
+benchmark('monstruos.encuentro', 'monstruos')(_monsters(lambda db: db.random_encounter()))
+
+
+# ----------------------------------------------------------------------
+# Combate
+# ----------------------------------------------------------------------
+
+@benchmark('combate.ataque', 'combate')
+def _attack(quick: bool):
+    manager = CombatManager(NullSink())
+    manager.add_player_data(_sample_character())
+    manager.add_monster('Ogro')
+    player, monster = manager.combatants
+    entity = monster.entity
+
+    def attack():
+        entity.hp = entity.max_hp
+        entity.is_alive = True
+        return manager.make_attack(player, monster)
+    return attack, (1000 if quick else 10000)
+
+
+def run_fight(party_size: int = 4, monsters: int = 6, monster_name: str = 'Goblin',
+              rng=None, group: bool = False, distance: Optional[int] = None) -> int:
+    """Pelea automática completa; devuelve los rounds que duró (distance fija la inicial)"""
+    manager = CombatManager(NullSink(), _monster_database(), rng)
+    manager.group_initiative = group
+    for i in range(party_size):
+        character = _sample_character()
+        character['name'] = f"Guerrera {i + 1}"
+        manager.add_player_data(character)
+    for i in range(monsters):
+        manager.add_monster(monster_name, f"{monster_name} {i + 1}")
+    manager.start_combat()
+    if distance is not None:
+        manager.combat_distance = distance
+
+    while manager.check_combat_end() is None and manager.round_number <= MAX_ROUNDS:
+        current = manager.get_current_combatant()
+        if current and current.is_alive:
+            targets = [c for c in manager.combatants if c.is_player != current.is_player and c.is_alive]
+            batch = manager.current_group()
+            if targets and len(batch) > 1:
+                manager.make_group_attack(batch, targets)
+            elif targets:
+                manager.make_attack(current, targets[0])
+        manager.next_turn()
+    return manager.round_number
+
+
+@benchmark('combate.pelea', 'combate')
+def _fight(quick: bool):
+    return run_fight, (20 if quick else 200)
+
+
+@benchmark('combate.pelea_bufer', 'combate')
+def _buffered_fight(quick: bool):
+    faces = FaceBuffer(background=False)
+    return (lambda: run_fight(rng=faces)), (20 if quick else 200)
+
+
+@benchmark('combate.pelea_horda', 'combate')
+def _horde_fight(quick: bool):
+    return (lambda: run_fight(party_size=6, monsters=24, distance=1)), (5 if quick else 50)
+
+
+@benchmark('combate.pelea_horda_grupo', 'combate')
+def _group_horde_fight(quick: bool):
+    return (lambda: run_fight(party_size=6, monsters=24, group=True, distance=1)), (5 if quick else 50)
+
+
+@benchmark('combate.rounds_efectos', 'combate')
+def _effect_rounds(quick: bool):
+    manager = CombatManager(NullSink(), _monster_database())
+    for i in range(200):
+        manager.add_monster('Troll' if i % 10 == 0 else 'Goblin', f"Monstruo {i + 1}")
+    manager.start_combat()
+    manager.combat_log = deque(maxlen=1)  # sólo interesa el coste de next_round
+    return manager.next_round, (2000 if quick else 20000)
+
+
+@benchmark('combate.turnos_500', 'combate')
+def _turns(quick: bool):
+    manager = CombatManager(NullSink(), _monster_database())
+    for i in range(500):
+        manager.add_monster('Goblin', f"Goblin {i + 1}")
+    manager.start_combat()
+    for combatant in manager.combatants[::3]:
+        combatant.take_damage(100)  # los caídos se saltan sin reordenar
+    return manager.next_turn, (10000 if quick else 100000)
+
+
+# ----------------------------------------------------------------------
+# Carga de datos y personajes
+# ----------------------------------------------------------------------
+
+def _data_loader(warm: bool):
+    def setup(quick: bool):
+        if quick and not warm:
+            return None  # la extracción de los PDF tarda demasiado para el modo rápido
+        try:
+            from core.character_creator import ADnDDataLoader
+        except ImportError:
+            return None
+        import logging
+        logging.getLogger('core.character_creator').setLevel(logging.WARNING)
+
+        cache = Path(tempfile.gettempdir()) / "adnd_benchmark_cache.pkl"
+        if warm and not cache.exists():
+            ADnDDataLoader(ROOT / "resources", cache).load_or_extract_data()
+
+        def load():
+            if not warm and cache.exists():
+                cache.unlink()
+            ADnDDataLoader(ROOT / "resources", cache).load_or_extract_data()
+        return load, (1 if not warm else (5 if quick else 20))
+    return setup
+
+
+benchmark('carga.datos_frio', 'carga')(_data_loader(warm=False))
+benchmark('carga.datos_cache', 'carga')(_data_loader(warm=True))
+
+
+def _character_files() -> List[Path]:
+    return sorted((ROOT / "data").glob("*_character.json"))
+
+
+@benchmark('personajes.cargar', 'personajes')
+def _load_characters(quick: bool):
+    files = _character_files()
+    if not files:
+        return None
+    return (lambda: [load_character_file(f) for f in files]), (100 if quick else 1000)
+
+
+@benchmark('personajes.guardar', 'personajes')
+def _save_characters(quick: bool):
+    characters = [load_character_file(f) for f in _character_files()]
+    if not characters:
+        return None
+    target = Path(tempfile.gettempdir()) / "adnd_benchmark_character.json"
+
+    def save():
+        for char in characters:
+            with open(target, 'w', encoding='utf-8') as f:
+                json.dump(char, f, indent=2, ensure_ascii=False)
+    return save, (100 if quick else 1000)
+
+
+# ----------------------------------------------------------------------
+# Ejecución y comparación
+# ----------------------------------------------------------------------
+
+def run_benchmarks(only: Optional[Iterable[str]] = None, quick: bool = False,
+                   repeat: int = REPEAT) -> Dict:
+    """
+    Ejecuta las pruebas (filtradas por grupo o nombre) y devuelve
+    {'meta': {...}, 'results': {nombre: {...}}, 'skipped': [...]}.
+    Tiempos en microsegundos por operación.
+    """
+    only = set(only or ())
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': SEED,
+            'quick': quick,
+            'repeat': repeat,
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        },
+        'results': {},
+        'skipped': [],
+    }
+
+    def reseed():
+        random.seed(SEED)
+        set_rng_service(RNGService(SEED))
+
+    previous_sink = set_default_sink(NullSink())
+    previous_rng = set_rng_service(RNGService(SEED))
+    try:
+        for name, (group, setup) in BENCHMARKS.items():
+            if only and name not in only and group not in only:
+                continue
+            reseed()
+            prepared = setup(quick)
+            if prepared is None:
+                report['skipped'].append(name)
+                continue
+            func, number = prepared
+            timer = timeit.Timer(func, setup=reseed)
+            times = sorted(t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number))
+            report['results'][name] = {
+                'group': group,
+                'number': number,
+                'best_us': times[0],
+                'median_us': times[len(times) // 2],
+            }
+    finally:
+        set_default_sink(previous_sink)
+        set_rng_service(previous_rng)
+    return report
+
+
+def compare(report: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compara el mejor tiempo de cada prueba con la base.
+    Devuelve [{'name', 'base_us', 'best_us', 'ratio', 'regression'}] de las pruebas comunes.
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+    for name, result in report['results'].items():
+        base = base_results.get(name)
+        if not base or not base.get('best_us'):
+            continue
+        ratio = result['best_us'] / base['best_us']
+        rows.append({
+            'name': name,
+            'base_us': base['best_us'],
+            'best_us': result['best_us'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _format_time(us: float) -> str:
+    if us >= 1e6:
+        return f"{us / 1e6:.2f} s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f} ms"
+    return f"{us:.1f} µs"
+
+
+def _option(args, name, default=None):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def main():
+    """Ejecuta el banco de pruebas desde la línea de comandos"""
+    args = sys.argv[1:]
+    if '--ayuda' in args or '-h' in args:
+        print(__doc__.strip())
+        return 0
+
+    output = _option(args, '--salida')
+    baseline_path = Path(_option(args, '--base', DEFAULT_BASELINE))
+    threshold = float(_option(args, '--umbral', DEFAULT_THRESHOLD))
+    only = _option(args, '--solo')
+    only = [part.strip() for part in only.split(',')] if only else None
+
+    print(f"⏱️ Ejecutando pruebas de rendimiento (semilla {SEED})...")
+    report = run_benchmarks(only, quick='--rapido' in args)
+
+    for name, result in report['results'].items():
+        print(f"  {name:<25} {_format_time(result['best_us']):>12}  "
+              f"(mediana {_format_time(result['median_us'])})")
+    for name in report['skipped']:
+        print(f"  {name:<25} {'omitida':>12}")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {output}")
+
+    if '--guardar-base' in args:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Base guardada en {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\nℹ️ No hay base en {baseline_path} (usa --guardar-base para crearla)")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare(report, baseline, threshold)
+    print(f"\n📊 Comparación con la base ({baseline.get('meta', {}).get('date', '?')}, "
+          f"umbral {threshold:.0%}):")
+    for row in rows:
+        mark = "❌" if row['regression'] else "✅"
+        print(f"  {mark} {row['name']:<25} {_format_time(row['base_us']):>12} → "
+              f"{_format_time(row['best_us']):>12}  ({row['ratio']:.2f}x)")
+
+    regressions = [row['name'] for row in rows if row['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regresiones: {', '.join(regressions)}")
+        return 1
+    print("\n✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Exportador por lotes de fichas de personaje AD&D 2e (PDF y HTML)
+Procesa un directorio de personajes o un archivo de party en paralelo
+
+Uso:
+    python utils/exportar_fichas.py <directorio|party.json> [salida] [--pdf] [--html] [--workers N] [--libro]
+
+Con --libro se genera un único documento por formato con todas las fichas.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.esquema import load_character_file, normalize_character, to_sheet_format
+
+
+DEFAULT_TEMPLATE = Path(__file__).parent.parent / "resources" / "AD&D_2e_Character_Record_Sheet.pdf"
+
+# Estado de cada proceso de trabajo (se inicializa una vez por proceso)
+_worker_pdf_generator = None
+_worker_pdf_error: Optional[str] = None
+
+
+def _init_worker(template_pdf: str):
+    """Carga la plantilla PDF una sola vez por proceso"""
+    global _worker_pdf_generator, _worker_pdf_error
+    try:
+        from utils.generar_pdf_ficha import CharacterSheetGenerator
+        generator = CharacterSheetGenerator(template_pdf)
+        generator.warm_up()
+        _worker_pdf_generator = generator
+    except ImportError:
+        _worker_pdf_error = "PyMuPDF (fitz) no está instalado"
+    except Exception as e:
+        _worker_pdf_error = f"No se pudo abrir la plantilla: {e}"
+
+
+def _safe_filename(name: str) -> str:
+    keep = "".join(c if c.isalnum() or c in "-_" else "_" for c in name.strip())
+    return keep or "personaje"
+
+
+def _unique_bases(sheets: List[Dict]) -> List[str]:
+    """
+    Nombre base de los archivos de cada ficha. Los nombres repetidos en la
+    party llevan un sufijo (_2, _3...) para no sobrescribirse.
+    """
+    taken, bases = set(), []
+    for sheet in sheets:
+        stem = _safe_filename(str(sheet.get('name') or 'personaje'))
+        base, n = stem, 1
+        while base.lower() in taken:  # sin distinguir mayúsculas, como muchos sistemas de archivos
+            n += 1
+            base = f"{stem}_{n}"
+        taken.add(base.lower())
+        bases.append(f"{base}_ficha")
+    return bases
+
+
+def _export_one(sheet: Dict, base: str, formats: Tuple[str, ...]) -> Dict:
+    """
+    Genera las fichas de un personaje (se ejecuta en un proceso de trabajo).
+    base: ruta de salida sin extensión
+    """
+    from utils.generar_html_ficha import generate_html_sheet
+
+    result = {'name': sheet.get('name'), 'files': [], 'errors': []}
+
+    if 'html' in formats:
+        try:
+            result['files'].append(str(generate_html_sheet(sheet, f"{base}.html", verbose=False)))
+        except Exception as e:
+            result['errors'].append(f"HTML: {e}")
+
+    if 'pdf' in formats:
+        if _worker_pdf_generator is None:
+            result['errors'].append(f"PDF: {_worker_pdf_error}")
+        else:
+            try:
+                path = _worker_pdf_generator.generate_sheet(sheet, f"{base}.pdf", verbose=False)
+                result['files'].append(str(path))
+            except Exception as e:
+                result['errors'].append(f"PDF: {e}")
+
+    return result
+
+
+def collect_characters(source) -> Tuple[List[Dict], List[str]]:
+    """
+    Lee los personajes de un directorio (*_character.json) o de un archivo
+    de party exportado desde el Party Manager ({'party': [...]}).
+    """
+    source = Path(source)
+    characters, errors = [], []
+
+    if source.is_dir():
+        for filepath in sorted(source.glob("*_character.json")):
+            try:
+                characters.append(load_character_file(filepath))
+            except (OSError, ValueError) as e:
+                errors.append(f"{filepath.name}: {e}")
+        return characters, errors
+
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    members = data['party'] if isinstance(data, dict) and 'party' in data else [data]
+    if not isinstance(members, list):
+        members = [members]
+    for char in members:
+        if not isinstance(char, dict):
+            if char:
+                errors.append(f"Entrada de la party ignorada (no es un personaje): {char!r:.40}")
+            continue
+        if not char:
+            continue
+        try:
+            characters.append(normalize_character(char))
+        except ValueError as e:
+            errors.append(f"{char.get('name', '?')}: {e}")
+    return characters, errors
+
+
+def export_batch(characters: Iterable[Dict], output_dir,
+                 formats: Tuple[str, ...] = ('pdf', 'html'),
+                 workers: Optional[int] = None,
+                 template_pdf=DEFAULT_TEMPLATE) -> Dict:
+    """
+    Exporta las fichas en paralelo con un pool de procesos.
+    Devuelve un informe con archivos generados, errores y rendimiento.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sheets = [to_sheet_format(char) for char in characters]
+    workers = workers or min(len(sheets), os.cpu_count() or 1) or 1
+
+    report = {'files': [], 'errors': [], 'characters': len(sheets), 'exported': 0,
+              'workers': workers}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(template_pdf),)) as pool:
+        futures = [pool.submit(_export_one, sheet, str(output_dir / base), tuple(formats))
+                   for sheet, base in zip(sheets, _unique_bases(sheets))]
+        for future in as_completed(futures):
+            result = future.result()
+            report['files'].extend(result['files'])
+            report['exported'] += bool(result['files'])
+            report['errors'].extend(f"{result['name']}: {e}" for e in result['errors'])
+
+    elapsed = time.perf_counter() - start
+    report['elapsed'] = elapsed
+    # Personajes exportados por segundo (no archivos: cada uno puede generar PDF y HTML)
+    report['sheets_per_second'] = report['exported'] / elapsed if elapsed > 0 else 0.0
+    return report
+
+
+def export_booklet(characters: Iterable[Dict], output_dir,
+                   formats: Tuple[str, ...] = ('pdf', 'html'),
+                   template_pdf=DEFAULT_TEMPLATE) -> Dict:
+    """Exporta todas las fichas en un único documento por formato"""
+    from utils.generar_html_ficha import generate_html_booklet
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sheets = [to_sheet_format(char) for char in characters]
+    report = {'files': [], 'errors': [], 'characters': len(sheets), 'exported': 0, 'workers': 1}
+    start = time.perf_counter()
+
+    if 'html' in formats:
+        path = generate_html_booklet(iter(sheets), output_dir / "party_fichas.html", verbose=False)
+        report['files'].append(str(path))
+    if 'pdf' in formats:
+        try:
+            from utils.generar_pdf_ficha import CharacterSheetGenerator
+            generator = CharacterSheetGenerator(str(template_pdf))
+            path = generator.generate_party_sheet(sheets, output_dir / "party_fichas.pdf", verbose=False)
+            report['files'].append(str(path))
+        except ImportError:
+            report['errors'].append("PDF: PyMuPDF (fitz) no está instalado")
+        except Exception as e:
+            report['errors'].append(f"PDF: {e}")
+
+    if report['files']:
+        report['exported'] = len(sheets)
+    elapsed = time.perf_counter() - start
+    report['elapsed'] = elapsed
+    report['sheets_per_second'] = report['exported'] / elapsed if elapsed > 0 else 0.0
+    return report
+
+
+def main():
+    """Exportación por lotes desde la línea de comandos"""
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print(__doc__.strip())
+        return
+
+    formats = tuple(fmt for fmt in ('pdf', 'html') if f'--{fmt}' in args) or ('pdf', 'html')
+    workers = None
+    if '--workers' in args:
+        workers = int(args[args.index('--workers') + 1])
+    positional = [a for i, a in enumerate(args)
+                  if not a.startswith('--') and (i == 0 or args[i - 1] != '--workers')]
+    source = positional[0]
+    output_dir = positional[1] if len(positional) > 1 else "fichas"
+
+    characters, load_errors = collect_characters(source)
+    for error in load_errors:
+        print(f"⚠️ {error}")
+    if not characters:
+        print("❌ No se encontraron personajes para exportar")
+        return
+
+    print(f"🔄 Exportando {len(characters)} personajes ({', '.join(formats).upper()})...")
+    if '--libro' in args:
+        report = export_booklet(characters, output_dir, formats)
+    else:
+        report = export_batch(characters, output_dir, formats, workers)
+
+    for error in report['errors']:
+        print(f"  ❌ {error}")
+    print(f"\n✅ {len(report['files'])} archivos generados en: {output_dir}")
+    print(f"⏱️ {report['elapsed']:.2f}s con {report['workers']} procesos "
+          f"({report['sheets_per_second']:.1f} fichas/s)")
+
+
+if __name__ == "__main__":
+    main()
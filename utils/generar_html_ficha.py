@@ -1,60 +1,236 @@
 """
 Generador de ficha de personaje AD&D 2e en HTML
 Crea una ficha visual completa con todos los datos del personaje
+
+La plantilla se compila una sola vez al importar el módulo: se parte en
+trozos estáticos y huecos ({{hueco}}) que rellenan funciones. El HTML se
+escribe trozo a trozo en un flujo (archivo, StringIO, respuesta web...),
+así un libro con toda la party no necesita tener todas las fichas en memoria.
 """
 
-import json
+import io
+import re
 import sys
+from html import escape
 from pathlib import Path
+from typing import Callable, Dict, Iterable, List, TextIO, Union
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
-    """Genera una ficha de personaje en HTML con estilo AD&D 2e"""
-    
-    # Obtener datos del personaje
-    name = character_data.get('name', 'Sin Nombre')
-    race = character_data.get('race', '')
-    char_class = character_data.get('class', '')
-    level = character_data.get('level', 1)
-    attrs = character_data.get('attributes', {})
-    hp_current = character_data.get('hp_current', 0)
-    hp_max = character_data.get('hp_max', 0)
-    ac = character_data.get('ac', 10)
-    thac0 = character_data.get('thac0', 20)
-    saves = character_data.get('saving_throws', {})
-    profs = character_data.get('proficiencies', {})
-    equipment = character_data.get('equipment', [])
-    equipped = character_data.get('equipped', {})
-    money = character_data.get('money', {})
-    spells = character_data.get('known_spells', [])
-    
-    # Calcular modificadores de atributos
-    def get_modifier(score):
-        return (score - 10) // 2
-    
-    html_content = f"""<!DOCTYPE html>
+from core.esquema import load_character_file, to_sheet_format
+from core.modificadores import (
+    constitution_hp_bonus, dexterity_reaction_bonus, is_warrior,
+    strength_damage_bonus, strength_hit_bonus
+)
+
+
+SLOT_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+EMPTY = '<p style="color: #999; font-style: italic;">{}</p>'
+
+ATTRIBUTE_ORDER = ('FUE', 'DES', 'CON', 'INT', 'SAB', 'CAR')
+SAVE_ROWS = (
+    ('paralisis', 'Parálisis', 14),
+    ('varitas', 'Varitas', 16),
+    ('petrificacion', 'Petrificación', 15),
+    ('aliento', 'Aliento', 17),
+    ('conjuros', 'Conjuros', 17),
+)
+COIN_ROWS = (
+    ('pp', 'Platino', ' style="background: linear-gradient(135deg, #e5e4e2, #ffffff);"'),
+    ('po', 'Oro', ''),
+    ('pa', 'Plata', ' style="background: linear-gradient(135deg, #c0c0c0, #e8e8e8);"'),
+    ('pe', 'Electrum', ' style="background: linear-gradient(135deg, #cd7f32, #e8a87c);"'),
+    ('pc', 'Cobre', ' style="background: linear-gradient(135deg, #b87333, #d4a373);"'),
+)
+MAX_EQUIPMENT_ROWS = 15
+
+
+class CompiledTemplate:
+    """Plantilla partida en trozos estáticos y funciones de hueco"""
+
+    def __init__(self, source: str, slots: Dict[str, Callable[[Dict], str]]):
+        self.parts: List[Union[str, Callable[[Dict], str]]] = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            if match.start() > position:
+                self.parts.append(source[position:match.start()])
+            slot = match.group(1)
+            if slot not in slots:
+                raise KeyError(f"Hueco desconocido en la plantilla: {slot}")
+            self.parts.append(slots[slot])
+            position = match.end()
+        if position < len(source):
+            self.parts.append(source[position:])
+
+    def render(self, context: Dict, stream: TextIO):
+        """Escribe la plantilla rellenada en el flujo"""
+        write = stream.write
+        for part in self.parts:
+            write(part if part.__class__ is str else part(context))
+
+
+# --- Funciones de hueco ---------------------------------------------------
+
+def attribute_modifier(attr: str, score: int, character_data: Dict) -> str:
+    """Modificadores de la tabla del Manual del Jugador (FUE ataque/daño, DES reacción, CON PG)"""
+    if attr == 'FUE':
+        exceptional = character_data.get('exceptional_strength', 0)
+        return (f"({strength_hit_bonus(score, exceptional):+d}/"
+                f"{strength_damage_bonus(score, exceptional):+d})")
+    if attr == 'DES':
+        return f"({dexterity_reaction_bonus(score):+d})"
+    if attr == 'CON':
+        return f"({constitution_hp_bonus(score, is_warrior(character_data.get('class'))):+d} PG)"
+    return ""
+
+
+def _text(key: str, default=''):
+    return lambda c: escape(str(c.get(key, default)))
+
+
+def _slot_attributes(c: Dict) -> str:
+    attrs = c.get('attributes', {})
+    rows = []
+    for attr in ATTRIBUTE_ORDER:
+        score = attrs.get(attr, 10)
+        shown = score
+        if attr == 'FUE' and score == 18 and c.get('exceptional_strength'):
+            shown = f"18/{c['exceptional_strength'] % 100:02d}"
+        rows.append(f"""
+                <div class="attribute">
+                    <span class="attr-name">{attr}</span>
+                    <span class="attr-value">{shown}</span>
+                    <span class="attr-modifier">{attribute_modifier(attr, score, c)}</span>
+                </div>""")
+    return "".join(rows)
+
+
+def _slot_saves(c: Dict) -> str:
+    saves = c.get('saving_throws', {})
+    return "".join(f"""
+                        <div class="save-item">
+                            <span class="save-name">{label}</span>
+                            <span class="save-value">{saves.get(key, default)}</span>
+                        </div>""" for key, label, default in SAVE_ROWS)
+
+
+def _weapon(icon: str, weapon: Dict) -> str:
+    return f"""<div class="weapon-item">
+                        <div class="weapon-name">{icon} {escape(weapon['nombre'])}</div>
+                        <div class="weapon-stats">
+                            <span class="weapon-stat">Ataque: {weapon['ataque']:+d}</span>
+                            <span class="weapon-stat">Daño: {escape(str(weapon['daño']))}</span>
+                        </div>
+                    </div>"""
+
+
+def _slot_equipped(c: Dict) -> str:
+    equipped = c.get('equipped', {})
+    parts = []
+    if equipped.get('arma_principal'):
+        parts.append(_weapon('⚔️', equipped['arma_principal']))
+    else:
+        parts.append(EMPTY.format('Sin arma equipada'))
+    if equipped.get('arma_secundaria'):
+        parts.append(_weapon('🗡️', equipped['arma_secundaria']))
+    if equipped.get('armadura'):
+        armor = equipped['armadura']
+        parts.append(f"""<div style="margin-top: 10px; padding: 10px; background: #f0f0f0; border-radius: 5px;">
+                        <strong>🛡️ Armadura:</strong> {escape(armor['nombre'])} (CA {armor['ca']})
+                    </div>""")
+    if equipped.get('escudo'):
+        shield = equipped['escudo']
+        parts.append(f"""<div style="margin-top: 5px; padding: 10px; background: #f0f0f0; border-radius: 5px;">
+                        <strong>🛡️ Escudo:</strong> {escape(shield['nombre'])} ({shield['ca_bonus']:+d} CA)
+                    </div>""")
+    return "\n                    ".join(parts)
+
+
+def _slot_money(c: Dict) -> str:
+    money = c.get('money', {})
+    return "".join(f"""
+                    <div class="coin"{style}>
+                        <div class="coin-amount">{money.get(key, 0)}</div>
+                        <div class="coin-type">{label}</div>
+                    </div>""" for key, label, style in COIN_ROWS)
+
+
+def _badges(profs: Iterable[str], style: str = '') -> str:
+    return ' '.join(f'<span class="prof-badge"{style}>{escape(str(p))}</span>'
+                    for p in profs) or EMPTY.format('Ninguna')
+
+
+def _slot_equipment(c: Dict) -> str:
+    equipment = c.get('equipment', [])
+    items = ' '.join(f'<li class="equipment-item">• {escape(str(item))}</li>'
+                     for item in equipment[:MAX_EQUIPMENT_ROWS]) or EMPTY.format('Sin equipo')
+    if len(equipment) > MAX_EQUIPMENT_ROWS:
+        items += (f'\n                    <li style="color: #999; font-style: italic; padding: 8px;">'
+                  f'... y {len(equipment) - MAX_EQUIPMENT_ROWS} objetos más</li>')
+    return items
+
+
+def _slot_spells(c: Dict) -> str:
+    spells = c.get('known_spells', [])
+    if not spells:
+        return ''
+    items = ' '.join(f'<div class="spell-item">✨ {escape(str(s))}</div>' for s in spells)
+    return f"""<div class="section" style="margin-top: 20px;">
+            <div class="section-title">Hechizos Conocidos ({len(spells)})</div>
+            <div class="spell-list">
+                {items}
+            </div>
+        </div>"""
+
+
+SLOTS: Dict[str, Callable[[Dict], str]] = {
+    'title': _text('title'),
+    'name': _text('name', 'Sin Nombre'),
+    'race': _text('race'),
+    'class': _text('class'),
+    'level': _text('level', 1),
+    'hp': lambda c: f"{c.get('hp_current', 0)} / {c.get('hp_max', 0)}",
+    'ac': _text('ac', 10),
+    'thac0': _text('thac0', 20),
+    'attributes': _slot_attributes,
+    'saves': _slot_saves,
+    'equipped': _slot_equipped,
+    'money': _slot_money,
+    'weapon_profs': lambda c: _badges(c.get('proficiencies', {}).get('armas', [])),
+    'nonweapon_profs': lambda c: _badges(c.get('proficiencies', {}).get('no_armas', []),
+                                         ' style="background: #4b0082;"'),
+    'equipment_count': lambda c: str(len(c.get('equipment', []))),
+    'equipment': _slot_equipment,
+    'spells': _slot_spells,
+}
+
+
+# --- Plantillas -----------------------------------------------------------
+
+PAGE_HEAD = """<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Ficha de {name}</title>
+    <title>{{title}}</title>
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Cinzel:wght@400;600;700&family=Crimson+Text:wght@400;600&display=swap');
-        
-        * {{
+
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        
-        body {{
+        }
+
+        body {
             background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
             font-family: 'Crimson Text', serif;
             padding: 20px;
             color: #2c2c2c;
-        }}
-        
-        .character-sheet {{
+        }
+
+        .character-sheet {
             max-width: 1200px;
             margin: 0 auto;
             background: linear-gradient(to bottom, #f4e8d0 0%, #ede0c8 100%);
@@ -62,9 +238,9 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             border-radius: 10px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.5), inset 0 0 100px rgba(0,0,0,0.1);
             padding: 30px;
-        }}
-        
-        .header {{
+        }
+
+        .header {
             text-align: center;
             border-bottom: 4px double #8b0000;
             padding-bottom: 20px;
@@ -74,25 +250,25 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             padding: 20px;
             border-radius: 5px;
             box-shadow: 0 5px 15px rgba(139, 0, 0, 0.4);
-        }}
-        
-        .character-name {{
+        }
+
+        .character-name {
             font-family: 'Cinzel', serif;
             font-size: 48px;
             font-weight: 700;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
             margin-bottom: 10px;
             letter-spacing: 2px;
-        }}
-        
-        .character-title {{
+        }
+
+        .character-title {
             font-size: 24px;
             font-weight: 600;
             color: #ffd700;
             text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-        }}
-        
-        .info-bar {{
+        }
+
+        .info-bar {
             display: flex;
             justify-content: space-around;
             margin: 20px 0;
@@ -100,43 +276,43 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             background: rgba(139, 0, 0, 0.1);
             border: 2px solid #8b0000;
             border-radius: 5px;
-        }}
-        
-        .info-item {{
+        }
+
+        .info-item {
             text-align: center;
-        }}
-        
-        .info-label {{
+        }
+
+        .info-label {
             font-weight: 600;
             color: #8b0000;
             font-size: 14px;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
-        
-        .info-value {{
+        }
+
+        .info-value {
             font-size: 22px;
             font-weight: 700;
             color: #2c1810;
             margin-top: 5px;
-        }}
-        
-        .main-grid {{
+        }
+
+        .main-grid {
             display: grid;
             grid-template-columns: 1fr 2fr 1fr;
             gap: 20px;
             margin-top: 20px;
-        }}
-        
-        .section {{
+        }
+
+        .section {
             background: white;
             border: 3px solid #2c1810;
             border-radius: 8px;
             padding: 15px;
             box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }}
-        
-        .section-title {{
+        }
+
+        .section-title {
             font-family: 'Cinzel', serif;
             font-size: 20px;
             font-weight: 700;
@@ -146,9 +322,9 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             margin-bottom: 15px;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
-        
-        .attribute {{
+        }
+
+        .attribute {
             display: flex;
             justify-content: space-between;
             align-items: center;
@@ -157,30 +333,30 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             background: linear-gradient(to right, #f9f5f0, #fff);
             border-left: 4px solid #8b0000;
             border-radius: 4px;
-        }}
-        
-        .attr-name {{
+        }
+
+        .attr-name {
             font-weight: 700;
             color: #8b0000;
             font-size: 16px;
             letter-spacing: 1px;
-        }}
-        
-        .attr-value {{
+        }
+
+        .attr-value {
             font-size: 28px;
             font-weight: 700;
             color: #2c1810;
             text-align: center;
             min-width: 50px;
-        }}
-        
-        .attr-modifier {{
+        }
+
+        .attr-modifier {
             font-size: 16px;
             color: #666;
             font-weight: 600;
-        }}
-        
-        .combat-stat {{
+        }
+
+        .combat-stat {
             background: linear-gradient(135deg, #8b0000, #b22222);
             color: white;
             padding: 20px;
@@ -188,29 +364,29 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             border-radius: 8px;
             text-align: center;
             box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-        }}
-        
-        .combat-label {{
+        }
+
+        .combat-label {
             font-size: 14px;
             opacity: 0.9;
             text-transform: uppercase;
             letter-spacing: 2px;
-        }}
-        
-        .combat-value {{
+        }
+
+        .combat-value {
             font-size: 36px;
             font-weight: 700;
             margin-top: 5px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        }}
-        
-        .saves-grid {{
+        }
+
+        .saves-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 10px;
-        }}
-        
-        .save-item {{
+        }
+
+        .save-item {
             padding: 10px;
             background: #f9f5f0;
             border: 2px solid #8b0000;
@@ -218,342 +394,317 @@ def generate_html_sheet(character_data, output_filename="personaje_ficha.html"):
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        
-        .save-name {{
+        }
+
+        .save-name {
             font-weight: 600;
             color: #2c1810;
             text-transform: capitalize;
-        }}
-        
-        .save-value {{
+        }
+
+        .save-value {
             font-size: 20px;
             font-weight: 700;
             color: #8b0000;
-        }}
-        
-        .weapon-item {{
+        }
+
+        .weapon-item {
             background: #f9f5f0;
             padding: 12px;
             margin: 8px 0;
             border-left: 4px solid #b22222;
             border-radius: 4px;
-        }}
-        
-        .weapon-name {{
+        }
+
+        .weapon-name {
             font-weight: 700;
             font-size: 16px;
             color: #2c1810;
             margin-bottom: 5px;
-        }}
-        
-        .weapon-stats {{
+        }
+
+        .weapon-stats {
             display: flex;
             gap: 15px;
             font-size: 14px;
             color: #666;
-        }}
-        
-        .weapon-stat {{
+        }
+
+        .weapon-stat {
             font-weight: 600;
-        }}
-        
-        .equipment-list {{
+        }
+
+        .equipment-list {
             list-style: none;
             padding: 0;
-        }}
-        
-        .equipment-item {{
+        }
+
+        .equipment-item {
             padding: 8px 12px;
             margin: 5px 0;
             background: #f9f5f0;
             border-left: 3px solid #8b0000;
             border-radius: 3px;
             font-size: 14px;
-        }}
-        
-        .proficiency-list {{
+        }
+
+        .proficiency-list {
             display: flex;
             flex-wrap: wrap;
             gap: 8px;
-        }}
-        
-        .prof-badge {{
+        }
+
+        .prof-badge {
             background: #8b0000;
             color: white;
             padding: 6px 12px;
             border-radius: 15px;
             font-size: 13px;
             font-weight: 600;
-        }}
-        
-        .money-display {{
+        }
+
+        .money-display {
             display: grid;
             grid-template-columns: repeat(2, 1fr);
             gap: 10px;
             margin-top: 10px;
-        }}
-        
-        .coin {{
+        }
+
+        .coin {
             background: linear-gradient(135deg, #ffd700, #ffed4e);
             padding: 10px;
             border-radius: 8px;
             text-align: center;
             border: 2px solid #b8860b;
             box-shadow: 0 2px 5px rgba(0,0,0,0.2);
-        }}
-        
-        .coin-amount {{
+        }
+
+        .coin-amount {
             font-size: 20px;
             font-weight: 700;
             color: #2c1810;
-        }}
-        
-        .coin-type {{
+        }
+
+        .coin-type {
             font-size: 12px;
             color: #666;
             text-transform: uppercase;
-        }}
-        
-        .spell-list {{
+        }
+
+        .spell-list {
             max-height: 300px;
             overflow-y: auto;
-        }}
-        
-        .spell-item {{
+        }
+
+        .spell-item {
             padding: 8px;
             margin: 5px 0;
             background: linear-gradient(to right, #f0e6ff, #fff);
             border-left: 3px solid #4b0082;
             border-radius: 3px;
             font-size: 14px;
-        }}
-        
-        .bottom-section {{
+        }
+
+        .bottom-section {
             margin-top: 20px;
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 20px;
-        }}
-        
-        @media print {{
-            body {{
+        }
+
+        @media print {
+            body {
                 background: white;
-            }}
-            .character-sheet {{
+            }
+            .character-sheet {
                 box-shadow: none;
                 border: 2px solid black;
-            }}
-        }}
+                page-break-after: always;
+            }
+        }
+
+        .character-sheet + .character-sheet {
+            margin-top: 30px;
+        }
     </style>
 </head>
 <body>
-    <div class="character-sheet">
+"""
+
+SHEET = """    <div class="character-sheet">
         <div class="header">
-            <div class="character-name">{name}</div>
-            <div class="character-title">{race} {char_class} - Nivel {level}</div>
+            <div class="character-name">{{name}}</div>
+            <div class="character-title">{{race}} {{class}} - Nivel {{level}}</div>
         </div>
-        
+
         <div class="info-bar">
             <div class="info-item">
                 <div class="info-label">Puntos de Golpe</div>
-                <div class="info-value">{hp_current} / {hp_max}</div>
+                <div class="info-value">{{hp}}</div>
             </div>
             <div class="info-item">
                 <div class="info-label">Clase de Armadura</div>
-                <div class="info-value">{ac}</div>
+                <div class="info-value">{{ac}}</div>
             </div>
             <div class="info-item">
                 <div class="info-label">THAC0</div>
-                <div class="info-value">{thac0}</div>
+                <div class="info-value">{{thac0}}</div>
             </div>
         </div>
-        
+
         <div class="main-grid">
             <!-- Columna Izquierda: Atributos -->
             <div class="section">
-                <div class="section-title">Atributos</div>
-                <div class="attribute">
-                    <span class="attr-name">FUE</span>
-                    <span class="attr-value">{attrs.get('FUE', 10)}</span>
-                    <span class="attr-modifier">({get_modifier(attrs.get('FUE', 10)):+d})</span>
-                </div>
-                <div class="attribute">
-                    <span class="attr-name">DES</span>
-                    <span class="attr-value">{attrs.get('DES', 10)}</span>
-                    <span class="attr-modifier">({get_modifier(attrs.get('DES', 10)):+d})</span>
-                </div>
-                <div class="attribute">
-                    <span class="attr-name">CON</span>
-                    <span class="attr-value">{attrs.get('CON', 10)}</span>
-                    <span class="attr-modifier">({get_modifier(attrs.get('CON', 10)):+d})</span>
-                </div>
-                <div class="attribute">
-                    <span class="attr-name">INT</span>
-                    <span class="attr-value">{attrs.get('INT', 10)}</span>
-                    <span class="attr-modifier">({get_modifier(attrs.get('INT', 10)):+d})</span>
-                </div>
-                <div class="attribute">
-                    <span class="attr-name">SAB</span>
-                    <span class="attr-value">{attrs.get('SAB', 10)}</span>
-                    <span class="attr-modifier">({get_modifier(attrs.get('SAB', 10)):+d})</span>
-                </div>
-                <div class="attribute">
-                    <span class="attr-name">CAR</span>
-                    <span class="attr-value">{attrs.get('CAR', 10)}</span>
-                    <span class="attr-modifier">({get_modifier(attrs.get('CAR', 10)):+d})</span>
-                </div>
+                <div class="section-title">Atributos</div>{{attributes}}
             </div>
-            
+
             <!-- Columna Central: Combate y Armas -->
             <div>
                 <div class="section">
                     <div class="section-title">Tiradas de Salvación</div>
-                    <div class="saves-grid">
-                        <div class="save-item">
-                            <span class="save-name">Parálisis</span>
-                            <span class="save-value">{saves.get('paralisis', 14)}</span>
-                        </div>
-                        <div class="save-item">
-                            <span class="save-name">Varitas</span>
-                            <span class="save-value">{saves.get('varitas', 16)}</span>
-                        </div>
-                        <div class="save-item">
-                            <span class="save-name">Petrificación</span>
-                            <span class="save-value">{saves.get('petrificacion', 15)}</span>
-                        </div>
-                        <div class="save-item">
-                            <span class="save-name">Aliento</span>
-                            <span class="save-value">{saves.get('aliento', 17)}</span>
-                        </div>
-                        <div class="save-item">
-                            <span class="save-name">Conjuros</span>
-                            <span class="save-value">{saves.get('conjuros', 17)}</span>
-                        </div>
+                    <div class="saves-grid">{{saves}}
                     </div>
                 </div>
-                
+
                 <div class="section" style="margin-top: 20px;">
                     <div class="section-title">Armas Equipadas</div>
-                    {f'''<div class="weapon-item">
-                        <div class="weapon-name">⚔️ {equipped['arma_principal']['nombre']}</div>
-                        <div class="weapon-stats">
-                            <span class="weapon-stat">Ataque: {equipped['arma_principal']['ataque']:+d}</span>
-                            <span class="weapon-stat">Daño: {equipped['arma_principal']['daño']}</span>
-                        </div>
-                    </div>''' if equipped.get('arma_principal') else '<p style="color: #999; font-style: italic;">Sin arma equipada</p>'}
-                    
-                    {f'''<div class="weapon-item">
-                        <div class="weapon-name">🗡️ {equipped['arma_secundaria']['nombre']}</div>
-                        <div class="weapon-stats">
-                            <span class="weapon-stat">Ataque: {equipped['arma_secundaria']['ataque']:+d}</span>
-                            <span class="weapon-stat">Daño: {equipped['arma_secundaria']['daño']}</span>
-                        </div>
-                    </div>''' if equipped.get('arma_secundaria') else ''}
-                    
-                    {f'''<div style="margin-top: 10px; padding: 10px; background: #f0f0f0; border-radius: 5px;">
-                        <strong>🛡️ Armadura:</strong> {equipped['armadura']['nombre']} (CA {equipped['armadura']['ca']})
-                    </div>''' if equipped.get('armadura') else ''}
-                    
-                    {f'''<div style="margin-top: 5px; padding: 10px; background: #f0f0f0; border-radius: 5px;">
-                        <strong>🛡️ Escudo:</strong> {equipped['escudo']['nombre']} ({equipped['escudo']['ca_bonus']:+d} CA)
-                    </div>''' if equipped.get('escudo') else ''}
+                    {{equipped}}
                 </div>
             </div>
-            
+
             <!-- Columna Derecha: Dinero -->
             <div class="section">
                 <div class="section-title">Dinero</div>
-                <div class="money-display">
-                    <div class="coin">
-                        <div class="coin-amount">{money.get('po', 0)}</div>
-                        <div class="coin-type">Oro</div>
-                    </div>
-                    <div class="coin" style="background: linear-gradient(135deg, #c0c0c0, #e8e8e8);">
-                        <div class="coin-amount">{money.get('pp', 0)}</div>
-                        <div class="coin-type">Plata</div>
-                    </div>
-                    <div class="coin" style="background: linear-gradient(135deg, #cd7f32, #e8a87c);">
-                        <div class="coin-amount">{money.get('pe', 0)}</div>
-                        <div class="coin-type">Electrum</div>
-                    </div>
-                    <div class="coin" style="background: linear-gradient(135deg, #b87333, #d4a373);">
-                        <div class="coin-amount">{money.get('pc', 0)}</div>
-                        <div class="coin-type">Cobre</div>
-                    </div>
+                <div class="money-display">{{money}}
                 </div>
             </div>
         </div>
-        
+
         <div class="bottom-section">
             <div class="section">
                 <div class="section-title">Pericias</div>
                 <div style="margin-bottom: 15px;">
                     <strong style="color: #8b0000;">Armas:</strong>
                     <div class="proficiency-list" style="margin-top: 8px;">
-                        {' '.join([f'<span class="prof-badge">{prof}</span>' for prof in profs.get('armas', [])]) or '<p style="color: #999; font-style: italic;">Ninguna</p>'}
+                        {{weapon_profs}}
                     </div>
                 </div>
                 <div>
                     <strong style="color: #8b0000;">No-Armas:</strong>
                     <div class="proficiency-list" style="margin-top: 8px;">
-                        {' '.join([f'<span class="prof-badge" style="background: #4b0082;">{prof}</span>' for prof in profs.get('no_armas', [])]) or '<p style="color: #999; font-style: italic;">Ninguna</p>'}
+                        {{nonweapon_profs}}
                     </div>
                 </div>
             </div>
-            
+
             <div class="section">
-                <div class="section-title">Equipo ({len(equipment)} objetos)</div>
+                <div class="section-title">Equipo ({{equipment_count}} objetos)</div>
                 <ul class="equipment-list">
-                    {' '.join([f'<li class="equipment-item">• {item}</li>' for item in equipment[:15]]) or '<p style="color: #999; font-style: italic;">Sin equipo</p>'}
-                    {f'<li style="color: #999; font-style: italic; padding: 8px;">... y {len(equipment) - 15} objetos más</li>' if len(equipment) > 15 else ''}
+                    {{equipment}}
                 </ul>
             </div>
         </div>
-        
-        {f'''<div class="section" style="margin-top: 20px;">
-            <div class="section-title">Hechizos Conocidos ({len(spells)})</div>
-            <div class="spell-list">
-                {' '.join([f'<div class="spell-item">✨ {spell}</div>' for spell in spells])}
-            </div>
-        </div>''' if spells else ''}
-        
+
+        {{spells}}
+
         <div style="text-align: center; margin-top: 30px; padding: 15px; background: rgba(139, 0, 0, 0.1); border-radius: 5px;">
             <p style="color: #8b0000; font-style: italic;">Advanced Dungeons & Dragons 2nd Edition</p>
         </div>
     </div>
-</body>
+"""
+
+PAGE_FOOT = """</body>
 </html>"""
-    
-    # Guardar el archivo HTML
+
+HEAD_TEMPLATE = CompiledTemplate(PAGE_HEAD, SLOTS)
+SHEET_TEMPLATE = CompiledTemplate(SHEET, SLOTS)
+
+
+# --- API ------------------------------------------------------------------
+
+def write_html_sheet(character_data: Dict, stream: TextIO):
+    """Escribe la ficha completa de un personaje (formato de ficha) en el flujo"""
+    HEAD_TEMPLATE.render({'title': f"Ficha de {character_data.get('name', 'Sin Nombre')}"}, stream)
+    SHEET_TEMPLATE.render(character_data, stream)
+    stream.write(PAGE_FOOT)
+
+
+def write_html_booklet(characters: Iterable[Dict], stream: TextIO,
+                       title: str = "Fichas de la Party") -> int:
+    """
+    Escribe un único documento con la ficha de cada personaje.
+    `characters` puede ser un generador: cada ficha se escribe y se descarta.
+    Devuelve el número de fichas escritas.
+    """
+    HEAD_TEMPLATE.render({'title': title}, stream)
+    count = 0
+    for character_data in characters:
+        SHEET_TEMPLATE.render(character_data, stream)
+        count += 1
+    stream.write(PAGE_FOOT)
+    return count
+
+
+def render_html_sheet(character_data: Dict) -> str:
+    """Ficha como texto (p. ej. para servirla desde un backend web)"""
+    buffer = io.StringIO()
+    write_html_sheet(character_data, buffer)
+    return buffer.getvalue()
+
+
+def generate_html_sheet(character_data, output_filename="personaje_ficha.html", verbose=True):
+    """Genera una ficha de personaje en HTML con estilo AD&D 2e"""
     output_path = Path(output_filename)
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"✓ Ficha HTML generada: {output_path}")
-    print(f"  Abre el archivo en tu navegador para verla")
+        write_html_sheet(character_data, f)
+
+    if verbose:
+        print(f"✓ Ficha HTML generada: {output_path}")
+        print(f"  Abre el archivo en tu navegador para verla")
+    return output_path
+
+
+def generate_html_booklet(characters: Iterable[Dict], output_filename="party_fichas.html",
+                          title: str = "Fichas de la Party", verbose=True):
+    """Genera un libro HTML con las fichas de varios personajes"""
+    output_path = Path(output_filename)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        count = write_html_booklet(characters, f, title)
+
+    if verbose:
+        print(f"✓ Libro HTML generado: {output_path} ({count} fichas)")
     return output_path
 
 
 def main():
     """Función principal"""
     if len(sys.argv) < 2:
-        print("Uso: python generar_html_ficha.py <archivo_personaje.json>")
+        print("Uso: python generar_html_ficha.py <archivo_personaje.json | directorio> [...]")
         return
-    
-    input_file = sys.argv[1]
-    
-    # Cargar datos del personaje
-    if input_file.endswith('.json'):
-        with open(input_file, 'r', encoding='utf-8') as f:
-            character_data = json.load(f)
-    else:
-        print("❌ Solo se soportan archivos .json")
+
+    inputs = [Path(arg) for arg in sys.argv[1:]]
+    files = []
+    for path in inputs:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*_character.json")))
+        elif path.suffix == '.json':
+            files.append(path)
+        else:
+            print(f"❌ Solo se soportan archivos .json: {path}")
+            return
+
+    if not files:
+        print("❌ No se encontraron personajes")
         return
-    
-    # Generar HTML
-    output_name = f"{character_data.get('name', 'personaje')}_ficha.html"
-    generate_html_sheet(character_data, output_name)
+
+    if len(files) == 1 and not inputs[0].is_dir():
+        # Una sola ficha
+        character_data = to_sheet_format(load_character_file(files[0]))
+        output_name = f"{character_data.get('name', 'personaje')}_ficha.html"
+        generate_html_sheet(character_data, output_name)
+    else:
+        # Varias fichas: un único libro, leyendo cada personaje al escribirlo
+        generate_html_booklet(to_sheet_format(load_character_file(f)) for f in files)
 
 
 if __name__ == "__main__":
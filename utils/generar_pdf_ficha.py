@@ -3,214 +3,217 @@ Generador de PDF de personaje AD&D 2e usando la ficha oficial como fondo
 """
 
 import fitz  # PyMuPDF
-import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.esquema import load_character_file, to_sheet_format
+
+BLACK = (0, 0, 0)
+RED = (1, 0, 0)
+GREY = (0.2, 0.2, 0.2)
+
+# Posición de cada campo fijo en la ficha oficial: campo -> (página, (x, y), tamaño, color)
+FIELD_LAYOUT = {
+    'name': (0, (260, 72), 11, BLACK),
+    'player': (0, (830, 72), 10, BLACK),
+    'race': (0, (160, 145), 10, BLACK),
+    'class': (0, (400, 145), 10, BLACK),
+    'level': (0, (1030, 145), 10, BLACK),
+    'alignment': (0, (110, 185), 9, BLACK),
+    'sex': (0, (290, 185), 9, BLACK),
+    'age': (0, (360, 185), 9, BLACK),
+    'height': (0, (450, 185), 9, BLACK),
+    'weight': (0, (550, 185), 9, BLACK),
+    # Atributos en rojo para destacar (FUE/DES/CON/INT/SAB/CAR = STR/DEX/CON/INT/WIS/CHA)
+    'FUE': (0, (145, 530), 16, RED),
+    'DES': (0, (145, 615), 16, RED),
+    'CON': (0, (145, 700), 16, RED),
+    'INT': (0, (145, 770), 16, RED),
+    'SAB': (0, (145, 840), 16, RED),
+    'CAR': (0, (145, 910), 16, RED),
+    'hp': (0, (950, 340), 11, BLACK),
+    'ac': (0, (950, 375), 11, BLACK),
+    'thac0': (0, (950, 410), 11, BLACK),
+    'paralisis': (0, (950, 530), 10, BLACK),
+    'varitas': (0, (950, 565), 10, BLACK),
+    'petrificacion': (0, (950, 600), 10, BLACK),
+    'aliento': (0, (950, 635), 10, BLACK),
+    'conjuros': (0, (950, 670), 10, BLACK),
+    'armadura': (0, (350, 680), 8, BLACK),
+    'escudo': (0, (350, 700), 8, BLACK),
+}
+
+# Columnas de las armas equipadas (nombre, ataque, daño), una fila cada 35 puntos
+WEAPON_ROW = {'y': 530, 'step': 35, 'columns': (350, 550, 620), 'size': 9}
+# Listas de la segunda página (pericias y equipo a la izquierda, hechizos a la derecha)
+LIST_LAYOUT = {'page': 1, 'y': 100, 'left': 50, 'right': 320, 'step': 15,
+               'max_equipment': 20, 'max_spells': 15}
+
+FONT_NAME = "helv"  # Helvetica
+
+
+def build_overlay(character_data):
+    """
+    Calcula los textos que se escriben sobre la plantilla, agrupados por
+    (página, color): {(página, color): [((x, y), texto, tamaño), ...]}
+    No depende del documento, así que se puede cachear y reutilizar.
+    """
+    ops = {}
+
+    def put(page, point, text, size, color=BLACK):
+        ops.setdefault((page, color), []).append((point, str(text), size))
+
+    saves = character_data.get('saving_throws', {})
+    attrs = character_data.get('attributes', {})
+    equipped = character_data.get('equipped', {})
+
+    values = {
+        'name': character_data.get('name', ''),
+        'player': character_data.get('player', 'Jugador'),
+        'race': character_data.get('race', ''),
+        'class': character_data.get('class', ''),
+        'level': character_data.get('level', 1),
+        'alignment': character_data.get('alignment', 'Neutral'),
+        'sex': character_data.get('sex', 'M'),
+        'age': character_data.get('age', 25),
+        'height': character_data.get('height', '1.75m'),
+        'weight': character_data.get('weight', '75kg'),
+        'hp': f"{character_data.get('hp_current', 0)}/{character_data.get('hp_max', 0)}",
+        'ac': character_data.get('ac', 10),
+        'thac0': character_data.get('thac0', 20),
+    }
+    values.update({k: v for k, v in attrs.items() if k in FIELD_LAYOUT})
+    values.update({k: v for k, v in saves.items() if k in FIELD_LAYOUT})
+    if equipped.get('armadura'):
+        armor = equipped['armadura']
+        values['armadura'] = f"{armor.get('nombre', '')} (CA {armor.get('ca', 10)})"
+    if equipped.get('escudo'):
+        shield = equipped['escudo']
+        values['escudo'] = f"{shield.get('nombre', '')} ({shield.get('ca_bonus', -1):+d})"
+
+    for field, value in values.items():
+        page, point, size, color = FIELD_LAYOUT[field]
+        put(page, point, value, size, color)
+
+    # Armas equipadas
+    y_pos = WEAPON_ROW['y']
+    x_name, x_attack, x_damage = WEAPON_ROW['columns']
+    for slot in ('arma_principal', 'arma_secundaria'):
+        weapon = equipped.get(slot)
+        if not weapon:
+            continue
+        put(0, (x_name, y_pos), weapon.get('nombre', ''), WEAPON_ROW['size'])
+        put(0, (x_attack, y_pos), f"{weapon.get('ataque', 0):+d}", WEAPON_ROW['size'])
+        put(0, (x_damage, y_pos), weapon.get('daño', ''), WEAPON_ROW['size'])
+        y_pos += WEAPON_ROW['step']
+
+    # Segunda página: pericias, equipo y hechizos
+    page = LIST_LAYOUT['page']
+    step = LIST_LAYOUT['step']
+    left = LIST_LAYOUT['left']
+    y_pos = LIST_LAYOUT['y']
+    proficiencies = character_data.get('proficiencies', {})
+    sections = (
+        ("=== PERICIAS DE ARMAS ===", proficiencies.get('armas', []), 10),
+        ("=== PERICIAS DE NO-ARMAS ===", proficiencies.get('no_armas', []), 20),
+        ("=== EQUIPO ===", character_data.get('equipment', [])[:LIST_LAYOUT['max_equipment']], 0),
+    )
+    for title, items, gap in sections:
+        if not items:
+            continue
+        put(page, (left, y_pos), title, 10, GREY)
+        y_pos += 20
+        for item in items:
+            put(page, (left + 10, y_pos), f"• {item}", 9)
+            y_pos += step
+        y_pos += gap
+
+    known_spells = character_data.get('known_spells', [])
+    if known_spells:
+        right = LIST_LAYOUT['right']
+        y_pos = LIST_LAYOUT['y']
+        put(page, (right, y_pos), "=== HECHIZOS CONOCIDOS ===", 10, GREY)
+        y_pos += 20
+        for spell in known_spells[:LIST_LAYOUT['max_spells']]:
+            put(page, (right + 10, y_pos), f"• {spell}", 9)
+            y_pos += step
+
+    return ops
+
+
 class CharacterSheetGenerator:
     """Genera PDF de personaje usando la ficha oficial AD&D 2e como plantilla"""
-    
+
     def __init__(self, template_pdf="AD&D_2e_Character_Record_Sheet.pdf"):
         self.template_pdf = template_pdf
-        
-    def generate_sheet(self, character_data, output_filename="personaje_ficha.pdf"):
-        """Genera la ficha de personaje rellenando la plantilla"""
-        
-        # Abrir la plantilla
-        doc = fitz.open(self.template_pdf)
-        page = doc[0]  # Primera página
-        
-        # Configuración de fuente
-        fontsize = 10
-        font = "helv"  # Helvetica
-        
-        # ===== INFORMACIÓN BÁSICA =====
-        # Character name (arriba a la izquierda)
-        page.insert_text((260, 72), character_data.get('name', ''), 
-                        fontsize=11, fontname=font)
-        
-        # Player name (arriba a la derecha)
-        page.insert_text((830, 72), character_data.get('player', 'Jugador'), 
-                        fontsize=10, fontname=font)
-        
-        # Race
-        page.insert_text((160, 145), character_data.get('race', ''), 
-                        fontsize=10, fontname=font)
-        
-        # Class/Kit
-        page.insert_text((400, 145), character_data.get('class', ''), 
-                        fontsize=10, fontname=font)
-        
-        # Level
-        page.insert_text((1030, 145), str(character_data.get('level', 1)), 
-                        fontsize=10, fontname=font)
-        
-        # Alignment
-        page.insert_text((110, 185), character_data.get('alignment', 'Neutral'), 
-                        fontsize=9, fontname=font)
-        
-        # Sex, Age, Height, Weight
-        page.insert_text((290, 185), character_data.get('sex', 'M'), 
-                        fontsize=9, fontname=font)
-        page.insert_text((360, 185), str(character_data.get('age', 25)), 
-                        fontsize=9, fontname=font)
-        page.insert_text((450, 185), character_data.get('height', '1.75m'), 
-                        fontsize=9, fontname=font)
-        page.insert_text((550, 185), character_data.get('weight', '75kg'), 
-                        fontsize=9, fontname=font)
-        
-        # ===== ATRIBUTOS (columna izquierda) =====
-        # Posiciones basadas en la ficha real
-        attrs = character_data.get('attributes', {})
-        attr_positions = {
-            'STR': (145, 530),   # Strength
-            'DEX': (145, 615),   # Dexterity
-            'CON': (145, 700),   # Constitution
-            'INT': (145, 770),   # Intelligence
-            'WIS': (145, 840),   # Wisdom (SAB)
-            'CHA': (145, 910),   # Charisma
-        }
-        
-        # Mapeo de nombres en español a inglés
-        attr_map = {
-            'FUE': 'STR',
-            'DES': 'DEX',
-            'CON': 'CON',
-            'INT': 'INT',
-            'SAB': 'WIS',
-            'CAR': 'CHA'
-        }
-        
-        for esp_name, eng_name in attr_map.items():
-            if esp_name in attrs and eng_name in attr_positions:
-                x, y = attr_positions[eng_name]
-                page.insert_text((x, y), str(attrs[esp_name]), 
-                               fontsize=16, fontname=font, color=(1, 0, 0))  # Rojo para destacar
-        
-        # ===== COMBATE =====
-        # HP (Hit Points) - arriba a la derecha
-        hp_current = character_data.get('hp_current', 0)
-        hp_max = character_data.get('hp_max', 0)
-        page.insert_text((950, 340), f"{hp_current}/{hp_max}", 
-                        fontsize=11, fontname=font)
-        
-        # AC (Armor Class)
-        page.insert_text((950, 375), str(character_data.get('ac', 10)), 
-                        fontsize=11, fontname=font)
-        
-        # THAC0
-        page.insert_text((950, 410), str(character_data.get('thac0', 20)), 
-                        fontsize=11, fontname=font)
-        
-        # ===== TIRADAS DE SALVACIÓN =====
-        saves = character_data.get('saving_throws', {})
-        save_positions = {
-            'paralisis': (950, 530),
-            'varitas': (950, 565),
-            'petrificacion': (950, 600),
-            'aliento': (950, 635),
-            'conjuros': (950, 670),
-        }
-        
-        for save_name, (x, y) in save_positions.items():
-            if save_name in saves:
-                page.insert_text((x, y), str(saves[save_name]), 
-                               fontsize=10, fontname=font)
-        
-        # ===== ARMAS EQUIPADAS =====
-        equipped = character_data.get('equipped', {})
-        y_pos = 530
-        
-        if equipped.get('arma_principal'):
-            weapon = equipped['arma_principal']
-            page.insert_text((350, y_pos), weapon.get('nombre', ''), 
-                           fontsize=9, fontname=font)
-            page.insert_text((550, y_pos), f"+{weapon.get('ataque', 0)}", 
-                           fontsize=9, fontname=font)
-            page.insert_text((620, y_pos), weapon.get('daño', ''), 
-                           fontsize=9, fontname=font)
-            y_pos += 35
-        
-        if equipped.get('arma_secundaria'):
-            weapon = equipped['arma_secundaria']
-            page.insert_text((350, y_pos), weapon.get('nombre', ''), 
-                           fontsize=9, fontname=font)
-            page.insert_text((550, y_pos), f"+{weapon.get('ataque', 0)}", 
-                           fontsize=9, fontname=font)
-            page.insert_text((620, y_pos), weapon.get('daño', ''), 
-                           fontsize=9, fontname=font)
-        
-        # ===== ARMADURA Y ESCUDO =====
-        if equipped.get('armadura'):
-            armor = equipped['armadura']
-            page.insert_text((350, 680), f"{armor.get('nombre', '')} (CA {armor.get('ca', 10)})", 
-                           fontsize=8, fontname=font)
-        
-        if equipped.get('escudo'):
-            shield = equipped['escudo']
-            page.insert_text((350, 700), f"{shield.get('nombre', '')} ({shield.get('ca_bonus', -1):+d})", 
-                           fontsize=8, fontname=font)
-        
-        # ===== EQUIPO (segunda página) =====
-        if len(doc) > 1:
-            page2 = doc[1]
-            
-            # Pericias
-            proficiencies = character_data.get('proficiencies', {})
-            y_pos = 100
-            
-            # Pericias de armas
-            if proficiencies.get('armas'):
-                page2.insert_text((50, y_pos), "=== PERICIAS DE ARMAS ===", 
-                                fontsize=10, fontname=font, color=(0.2, 0.2, 0.2))
-                y_pos += 20
-                for prof in proficiencies['armas']:
-                    page2.insert_text((60, y_pos), f"• {prof}", 
-                                    fontsize=9, fontname=font)
-                    y_pos += 15
-                y_pos += 10
-            
-            # Pericias de no-armas
-            if proficiencies.get('no_armas'):
-                page2.insert_text((50, y_pos), "=== PERICIAS DE NO-ARMAS ===", 
-                                fontsize=10, fontname=font, color=(0.2, 0.2, 0.2))
-                y_pos += 20
-                for prof in proficiencies['no_armas']:
-                    page2.insert_text((60, y_pos), f"• {prof}", 
-                                    fontsize=9, fontname=font)
-                    y_pos += 15
-                y_pos += 20
-            
-            # Equipo
-            equipment = character_data.get('equipment', [])
-            if equipment:
-                page2.insert_text((50, y_pos), "=== EQUIPO ===", 
-                                fontsize=10, fontname=font, color=(0.2, 0.2, 0.2))
-                y_pos += 20
-                for item in equipment[:20]:  # Máximo 20 items
-                    page2.insert_text((60, y_pos), f"• {item}", 
-                                    fontsize=9, fontname=font)
-                    y_pos += 15
-            
-            # Hechizos conocidos
-            known_spells = character_data.get('known_spells', [])
-            if known_spells:
-                y_pos = 100
-                x_pos = 320
-                page2.insert_text((x_pos, y_pos), "=== HECHIZOS CONOCIDOS ===", 
-                                fontsize=10, fontname=font, color=(0.2, 0.2, 0.2))
-                y_pos += 20
-                for spell in known_spells[:15]:
-                    page2.insert_text((x_pos + 10, y_pos), f"• {spell}", 
-                                    fontsize=9, fontname=font)
-                    y_pos += 15
-        
-        # Guardar el PDF
+        self._template_bytes = None
+        self._template_doc = None
+        self._font = None
+
+    def _open_template(self):
+        """Abre una copia de la plantilla; el archivo se lee de disco una sola vez"""
+        if self._template_bytes is None:
+            with open(self.template_pdf, 'rb') as f:
+                self._template_bytes = f.read()
+        return fitz.open(stream=self._template_bytes, filetype="pdf")
+
+    def _template(self):
+        """Plantilla ya abierta en memoria (páginas base que se copian en cada ficha)"""
+        if self._template_doc is None:
+            self._template_doc = self._open_template()
+            self._font = fitz.Font(FONT_NAME)
+        return self._template_doc
+
+    def warm_up(self):
+        """Lee y abre la plantilla por adelantado (p.ej. al arrancar un proceso de trabajo)"""
+        self._template()
+
+    def _append_sheet(self, doc, character_data):
+        """Añade al documento las páginas de la plantilla con los datos escritos encima"""
+        template = self._template()
+        first_page = len(doc)
+        # Dentro del mismo documento, los recursos de la plantilla se copian una sola vez
+        doc.insert_pdf(template)
+
+        for (page_index, color), texts in build_overlay(character_data).items():
+            if page_index >= len(template):
+                continue
+            page = doc[first_page + page_index]
+            writer = fitz.TextWriter(page.rect)
+            for point, text, size in texts:
+                writer.append(point, text, font=self._font, fontsize=size)
+            # Un único bloque de contenido por página y color
+            writer.write_text(page, color=color)
+
+    def _save(self, doc, output_filename):
         output_path = Path(output_filename)
-        doc.save(output_path)
+        doc.save(output_path, garbage=3, deflate=True)
         doc.close()
-        
-        print(f"✓ Ficha de personaje generada: {output_path}")
+        return output_path
+
+    def generate_sheet(self, character_data, output_filename="personaje_ficha.pdf", verbose=True):
+        """Genera la ficha de personaje rellenando la plantilla"""
+        doc = fitz.open()
+        self._append_sheet(doc, character_data)
+        output_path = self._save(doc, output_filename)
+
+        if verbose:
+            print(f"✓ Ficha de personaje generada: {output_path}")
+        return output_path
+
+    def generate_party_sheet(self, characters, output_filename="party_fichas.pdf", verbose=True):
+        """Genera un único PDF con las fichas de varios personajes (una escritura a disco)"""
+        doc = fitz.open()
+        count = 0
+        for character_data in characters:
+            self._append_sheet(doc, character_data)
+            count += 1
+        output_path = self._save(doc, output_filename)
+
+        if verbose:
+            print(f"✓ Fichas de la party generadas: {output_path} ({count} personajes)")
         return output_path
 
 
@@ -220,14 +223,24 @@ def main():
     if len(sys.argv) < 2:
         print("Uso: python generar_pdf_ficha.py <archivo_personaje.json>")
         print("   o: python generar_pdf_ficha.py <nombre_personaje.pkl>")
+        print("   o: python generar_pdf_ficha.py <directorio | varios .json>  (PDF de la party)")
         return
     
     input_file = sys.argv[1]
     
+    # Varios personajes: un único PDF con todas las fichas
+    if len(sys.argv) > 2 or Path(input_file).is_dir():
+        files = []
+        for arg in sys.argv[1:]:
+            path = Path(arg)
+            files.extend(sorted(path.glob("*_character.json")) if path.is_dir() else [path])
+        generator = CharacterSheetGenerator()
+        generator.generate_party_sheet(to_sheet_format(load_character_file(f)) for f in files)
+        return
+    
     # Determinar si es JSON o pickle
     if input_file.endswith('.json'):
-        with open(input_file, 'r', encoding='utf-8') as f:
-            character_data = json.load(f)
+        character_data = to_sheet_format(load_character_file(input_file))
     elif input_file.endswith('.pkl'):
         import pickle
         with open(input_file, 'rb') as f:
@@ -0,0 +1,119 @@
+"""
+Generación masiva de PNJ AD&D 2e en formato JSON lines
+
+Uso:
+    python utils/generar_pnj.py <cantidad> [salida.jsonl|-] [--metodo 1-4] [--nivel N|N-M|N=peso,...]
+                                [--razas Humano=3,Enano=1] [--clases Guerrero=5,Clérigo=1]
+                                [--kits 0.25] [--semilla S] [--prefijo Guardia]
+    python utils/generar_pnj.py <muestras> --tasas [--metodo 1-4] [--razas Enano]
+
+Sin salida (o con '-') los PNJ se escriben en la salida estándar.
+Con --tasas se muestra qué porcentaje de tiradas cumple los requisitos de
+cada clase (con los ajustes de la primera raza indicada).
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.atributos import attribute_matrix, qualification_rates
+from core.generador_pnj import NPCGenerator
+
+
+def parse_distribution(text: Optional[str], numeric: bool = False) -> Optional[Dict]:
+    """'Humano=3,Enano' -> {'Humano': 3.0, 'Enano': 1.0}; '1-5' -> niveles 1 a 5"""
+    if not text:
+        return None
+    if numeric and '=' not in text and '-' in text:
+        low, _, high = text.partition('-')
+        return dict.fromkeys(range(int(low), int(high) + 1), 1.0)
+    distribution = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name:
+            distribution[int(name) if numeric else name] = float(weight) if weight else 1.0
+    return distribution
+
+
+def _option(args, name, default=None):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def show_rates(data_loader, samples: int, method: int, races: Optional[Dict], seed=None):
+    """Porcentaje de tiradas del método que cumplen los requisitos de cada clase"""
+    race = next(iter(races)) if races else None
+    adjustments = data_loader.races.get(race, {}).get('ajustes_atributos', {}) if race else None
+    rng = random.Random(int(seed) if seed is not None else None)
+    rates = qualification_rates(data_loader.classes, attribute_matrix(method, samples, rng), adjustments)
+
+    print(f"\n📊 Requisitos cumplidos con el Método {method} ({samples} tiradas"
+          f"{f', {race}' if race else ''}):")
+    for name, rate in sorted(rates.items(), key=lambda item: -item[1]):
+        print(f"  {name:<15} {rate * 100:6.2f}%")
+
+
+def main():
+    """Genera PNJ desde la línea de comandos"""
+    args = sys.argv[1:]
+    if not args or not args[0].isdigit():
+        print(__doc__.strip())
+        return
+
+    options = ('--metodo', '--nivel', '--razas', '--clases', '--kits', '--semilla', '--prefijo')
+    positional = [a for i, a in enumerate(args)
+                  if not a.startswith('--') and (i == 0 or args[i - 1] not in options)]
+    count = int(positional[0])
+    output = positional[1] if len(positional) > 1 else '-'
+
+    from core.character_creator import ADnDDataLoader
+    data_loader = ADnDDataLoader()
+    data_loader.load_or_extract_data()
+    if not data_loader.classes or not data_loader.races:
+        print("❌ No se pudieron cargar clases y razas", file=sys.stderr)
+        return
+    if not data_loader.kits:
+        data_loader._extract_kits("")
+
+    seed = _option(args, '--semilla')
+    if '--tasas' in args:
+        show_rates(data_loader, count, int(_option(args, '--metodo', 3)),
+                   parse_distribution(_option(args, '--razas')), seed)
+        return
+
+    generator = NPCGenerator(
+        data_loader,
+        method=int(_option(args, '--metodo', 3)),
+        seed=int(seed) if seed is not None else None,
+        kit_chance=float(_option(args, '--kits', 0.25)),
+        name_prefix=_option(args, '--prefijo', 'PNJ'),
+    )
+    races = parse_distribution(_option(args, '--razas'))
+    classes = parse_distribution(_option(args, '--clases'))
+    levels = parse_distribution(_option(args, '--nivel'), numeric=True) or 1
+
+    start = time.perf_counter()
+    try:
+        if output == '-':
+            written = generator.write_jsonl(sys.stdout, count, races, classes, levels)
+        else:
+            with open(output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                written = generator.write_jsonl(f, count, races, classes, levels)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return
+    elapsed = time.perf_counter() - start
+
+    destination = 'salida estándar' if output == '-' else output
+    print(f"✅ {written} PNJ generados en {destination}", file=sys.stderr)
+    print(f"⏱️ {elapsed:.2f}s ({written / elapsed if elapsed > 0 else 0:.0f} PNJ/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
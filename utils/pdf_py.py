@@ -1,102 +1,169 @@
-import PyPDF2
 import os
+import sys
+from bisect import bisect_right
+from pathlib import Path
 
-def extraer_paginas_pdf(pdf_entrada, pdf_salida, paginas_a_extraer, max_paginas_permitidas=500):
+
+class RangosPaginas:
+    """
+    Selección de páginas guardada como rangos (inicio, fin) ordenados y sin
+    solapes. No expande los rangos: '1-1000000' ocupa lo mismo que '1'.
+    """
+
+    def __init__(self, rangos=()):
+        fusionados = []
+        for inicio, fin in sorted(rangos):
+            if fusionados and inicio <= fusionados[-1][1] + 1:
+                if fin > fusionados[-1][1]:
+                    fusionados[-1] = (fusionados[-1][0], fin)
+            else:
+                fusionados.append((inicio, fin))
+        self.rangos = fusionados
+        self._inicios = [inicio for inicio, _ in fusionados]
+
+    def __iter__(self):
+        for inicio, fin in self.rangos:
+            yield from range(inicio, fin + 1)
+
+    def __len__(self):
+        return sum(fin - inicio + 1 for inicio, fin in self.rangos)
+
+    def __bool__(self):
+        return bool(self.rangos)
+
+    def __contains__(self, pagina):
+        i = bisect_right(self._inicios, pagina) - 1
+        return i >= 0 and pagina <= self.rangos[i][1]
+
+    def recortar(self, total_paginas):
+        """Rangos limitados a las páginas que existen en el documento"""
+        return RangosPaginas((inicio, min(fin, total_paginas))
+                             for inicio, fin in self.rangos if inicio <= total_paginas)
+
+    def bloques(self, tamano):
+        """Parte la selección en sub-selecciones de como mucho `tamano` páginas"""
+        actual, restantes = [], tamano
+        for inicio, fin in self.rangos:
+            while inicio <= fin:
+                tramo_fin = min(fin, inicio + restantes - 1)
+                actual.append((inicio, tramo_fin))
+                restantes -= tramo_fin - inicio + 1
+                inicio = tramo_fin + 1
+                if restantes == 0:
+                    yield RangosPaginas(actual)
+                    actual, restantes = [], tamano
+        if actual:
+            yield RangosPaginas(actual)
+
+    def __str__(self):
+        return ",".join(str(i) if i == f else f"{i}-{f}" for i, f in self.rangos)
+
+
+def _abrir_lector(archivo, password=None):
+    """Abre el PDF y lo descifra si hace falta (sin preguntar nada)"""
+    import PyPDF2
+    lector = PyPDF2.PdfReader(archivo)
+    if lector.is_encrypted and not lector.decrypt(password or ""):
+        raise PermissionError("El PDF está protegido y la contraseña no es válida")
+    return lector
+
+
+def extraer_paginas_pdf(pdf_entrada, pdf_salida, paginas_a_extraer,
+                        paginas_por_archivo=None, password=None, progreso_cada=50):
     """
-    Extrae páginas específicas de un PDF y las guarda en un nuevo archivo.
+    Extrae páginas específicas de un PDF y las guarda en uno o varios archivos.
+    No es interactiva: no hay límite de páginas ni confirmaciones.
+    Sólo la salida por bloques (paginas_por_archivo) tiene la memoria acotada:
+    en un único archivo el escritor guarda todas las páginas hasta el final.
 
     :param pdf_entrada: La ruta del archivo PDF de entrada.
-    :param pdf_salida: La ruta del nuevo archivo PDF de salida.
-    :param paginas_a_extraer: Una lista de números de página (empezando en 1) a extraer.
-    :param max_paginas_permitidas: Límite máximo de páginas a extraer para evitar problemas de memoria.
+    :param pdf_salida: La ruta del archivo PDF de salida.
+    :param paginas_a_extraer: RangosPaginas, o un iterable de números de página (empezando en 1).
+    :param paginas_por_archivo: Si se indica, se escribe un archivo cada N páginas
+        (salida_001.pdf, salida_002.pdf...) y la memoria queda acotada a un bloque.
+        Sin él, la memoria crece con el número de páginas extraídas.
+    :param password: Contraseña del PDF, si está cifrado.
+    :param progreso_cada: Cada cuántas páginas se informa del progreso.
+    :return: Lista de archivos creados (vacía si hubo un error).
     """
+    # PyPDF2 se importa aquí: la selección de páginas no lo necesita
     try:
-        # Asegúrate de que el archivo de entrada existe
-        if not os.path.exists(pdf_entrada):
-            print(f"❌ Error: El archivo de entrada '{pdf_entrada}' no fue encontrado.")
-            return False
-
-        # Verificar límite de páginas a extraer
-        if len(paginas_a_extraer) > max_paginas_permitidas:
-            print(f"⚠️ Advertencia: Intentas extraer {len(paginas_a_extraer)} páginas.")
-            print(f"   El límite recomendado es {max_paginas_permitidas} páginas para evitar problemas de memoria.")
-            respuesta = input("¿Continuar de todas formas? (s/n): ").strip().lower()
-            if respuesta != 's':
-                print("❌ Operación cancelada.")
-                return False
+        import PyPDF2
+    except ImportError:
+        print("❌ Falta PyPDF2. Instálalo con: pip install PyPDF2")
+        return []
+
+    if not isinstance(paginas_a_extraer, RangosPaginas):
+        paginas_a_extraer = RangosPaginas((p, p) for p in paginas_a_extraer)
 
-        print(f"🔄 Procesando PDF: {os.path.basename(pdf_entrada)}")
-        print(f"📄 Extrayendo {len(paginas_a_extraer)} páginas...")
+    # Asegúrate de que el archivo de entrada existe
+    if not os.path.exists(pdf_entrada):
+        print(f"❌ Error: El archivo de entrada '{pdf_entrada}' no fue encontrado.")
+        return []
 
-        # Abre el PDF de entrada
+    try:
         with open(pdf_entrada, 'rb') as archivo_pdf_entrada:
-            lector = PyPDF2.PdfReader(archivo_pdf_entrada)
-            
-            # Verificar si el PDF está cifrado
-            if lector.is_encrypted:
-                print("🔒 El PDF está protegido con contraseña.")
-                password = input("Ingresa la contraseña (o Enter si no tiene): ").strip()
-                if password:
-                    if not lector.decrypt(password):
-                        print("❌ Contraseña incorrecta.")
-                        return False
-                else:
-                    try:
-                        lector.decrypt("")
-                    except:
-                        print("❌ No se puede acceder al PDF protegido.")
-                        return False
-            
-            escritor = PyPDF2.PdfWriter()
-            paginas_procesadas = 0
-            total_paginas_pdf = len(lector.pages)
-
-            # Itera sobre los números de página solicitados
-            for i, num_pagina in enumerate(paginas_a_extraer, 1):
-                try:
-                    # Mostrar progreso cada 10 páginas
-                    if i % 10 == 0 or i == len(paginas_a_extraer):
-                        print(f"⏳ Progreso: {i}/{len(paginas_a_extraer)} páginas procesadas...")
-
-                    # PyPDF2 usa un índice base 0, por lo que restamos 1 al número de página
-                    indice_pagina = num_pagina - 1
-
-                    # Verifica si el número de página está dentro del rango válido
-                    if 0 <= indice_pagina < total_paginas_pdf:
-                        pagina = lector.pages[indice_pagina]
-                        escritor.add_page(pagina)
-                        paginas_procesadas += 1
-                    else:
-                        print(f"⚠️ Advertencia: La página {num_pagina} está fuera del rango del documento (total: {total_paginas_pdf} páginas).")
-                        
-                except Exception as e:
-                    print(f"⚠️ Error al procesar la página {num_pagina}: {e}")
-                    continue
-
-            if paginas_procesadas == 0:
-                print("❌ No se procesaron páginas válidas.")
-                return False
-
-            # Escribe las páginas extraídas en un nuevo archivo PDF
-            print(f"💾 Guardando archivo: {pdf_salida}")
-            with open(pdf_salida, 'wb') as archivo_pdf_salida:
-                escritor.write(archivo_pdf_salida)
-
-            print(f"\n✅ ¡Éxito! Se extrajeron {paginas_procesadas} páginas.")
-            print(f"✨ Archivo de salida creado en: {pdf_salida}")
-            
-            # Mostrar información del archivo creado
-            tamano_archivo = os.path.getsize(pdf_salida) / (1024 * 1024)  # MB
-            print(f"📊 Tamaño del archivo: {tamano_archivo:.2f} MB")
-            return True
+            total_paginas_pdf = len(_abrir_lector(archivo_pdf_entrada, password).pages)
+    except PermissionError as e:
+        print(f"🔒 {e}")
+        return []
+    except Exception as e:
+        print(f"\n❌ No se pudo leer el PDF: {e}")
+        return []
+
+    seleccion = paginas_a_extraer.recortar(total_paginas_pdf)
+    fuera = len(paginas_a_extraer) - len(seleccion)
+    if fuera:
+        print(f"⚠️ Advertencia: {fuera} páginas fuera del documento (total: {total_paginas_pdf} páginas).")
+    if not seleccion:
+        print("❌ No se procesaron páginas válidas.")
+        return []
+
+    total = len(seleccion)
+    print(f"🔄 Procesando PDF: {os.path.basename(pdf_entrada)}")
+    print(f"📄 Extrayendo {total} páginas...")
+
+    if paginas_por_archivo:
+        salida = Path(pdf_salida)
+        bloques = ((bloque, salida.with_name(f"{salida.stem}_{n:03d}{salida.suffix}"))
+                   for n, bloque in enumerate(seleccion.bloques(paginas_por_archivo), 1))
+    else:
+        bloques = [(seleccion, Path(pdf_salida))]
+
+    creados = []
+    procesadas = 0
+    try:
+        for bloque, destino in bloques:
+            # Cada bloque usa su propio lector y escritor: al terminar se liberan
+            # los objetos leídos, así con varios bloques la memoria no crece con
+            # el total de páginas
+            with open(pdf_entrada, 'rb') as archivo_pdf_entrada:
+                lector = _abrir_lector(archivo_pdf_entrada, password)
+                escritor = PyPDF2.PdfWriter()
+                for num_pagina in bloque:
+                    # PyPDF2 usa un índice base 0
+                    escritor.add_page(lector.pages[num_pagina - 1])
+                    procesadas += 1
+                    if procesadas % progreso_cada == 0 or procesadas == total:
+                        print(f"⏳ Progreso: {procesadas}/{total} páginas procesadas...")
+
+                print(f"💾 Guardando archivo: {destino}")
+                with open(destino, 'wb') as archivo_pdf_salida:
+                    escritor.write(archivo_pdf_salida)
+            creados.append(destino)
 
     except MemoryError:
         print(f"\n❌ Error de memoria: El PDF es demasiado grande.")
-        print("💡 Sugerencia: Intenta extraer menos páginas a la vez.")
-        return False
+        print("💡 Sugerencia: Usa paginas_por_archivo para escribir en bloques más pequeños.")
+        return []
     except Exception as e:
         print(f"\n❌ Ocurrió un error inesperado: {e}")
-        return False
+        return []
+
+    print(f"\n✅ ¡Éxito! Se extrajeron {procesadas} páginas en {len(creados)} archivo(s).")
+    tamano_archivo = sum(os.path.getsize(f) for f in creados) / (1024 * 1024)  # MB
+    print(f"📊 Tamaño total: {tamano_archivo:.2f} MB")
+    return creados
 
 def seleccionar_archivo_pdf():
     """
@@ -104,14 +171,14 @@ def seleccionar_archivo_pdf():
     """
     while True:
         ruta_pdf = input("📁 Ingresa la ruta completa del archivo PDF (o 'salir' para cancelar): ").strip()
-        
+
         if ruta_pdf.lower() == 'salir':
             print("❌ Operación cancelada por el usuario.")
             return None
-            
+
         # Remover comillas si las hay
         ruta_pdf = ruta_pdf.strip('"').strip("'")
-        
+
         if os.path.exists(ruta_pdf) and ruta_pdf.lower().endswith('.pdf'):
             return ruta_pdf
         elif not os.path.exists(ruta_pdf):
@@ -120,141 +187,165 @@ def seleccionar_archivo_pdf():
             print(f"❌ Error: El archivo '{ruta_pdf}' no es un PDF válido.")
         else:
             print("❌ Error: Archivo no válido.")
-            
+
+
+def main_argumentos(args):
+    """
+    Modo no interactivo:
+        python utils/pdf_py.py <entrada.pdf> <páginas> <salida.pdf> [--por-archivo N] [--password X]
+    """
+    opciones = {}
+    posicionales = []
+    i = 0
+    while i < len(args):
+        if args[i] in ('--por-archivo', '--password') and i + 1 < len(args):
+            opciones[args[i]] = args[i + 1]
+            i += 2
+        else:
+            posicionales.append(args[i])
+            i += 1
+
+    if len(posicionales) != 3:
+        print(main_argumentos.__doc__.strip())
+        return
+
+    entrada, texto_paginas, salida = posicionales
+    paginas = parsear_rangos_paginas(texto_paginas)
+    if not paginas:
+        return
+    por_archivo = None
+    if '--por-archivo' in opciones:
+        valor = opciones['--por-archivo']
+        if not valor.isdigit() or int(valor) < 1:
+            print(f"❌ --por-archivo necesita un número de páginas mayor que 0 (recibido: '{valor}')")
+            print(main_argumentos.__doc__.strip())
+            return
+        por_archivo = int(valor)
+    extraer_paginas_pdf(entrada, salida, paginas, por_archivo, opciones.get('--password'))
+
+
 def main():
     """
     Función principal que maneja la interacción con el usuario.
     """
+    if len(sys.argv) > 1:
+        main_argumentos(sys.argv[1:])
+        return
+
     print("🔧 Extractor de Páginas de PDF")
     print("=" * 40)
-    
+
     # Seleccionar archivo PDF de entrada
     archivo_entrada = seleccionar_archivo_pdf()
     if archivo_entrada is None:
         return
-    
+
     # Mostrar información del PDF
+    password = None
     try:
         # Información del archivo
         tamano_mb = os.path.getsize(archivo_entrada) / (1024 * 1024)
         print(f"\n📄 PDF cargado: {os.path.basename(archivo_entrada)}")
         print(f"💾 Tamaño del archivo: {tamano_mb:.2f} MB")
-        
-        # Advertencia para archivos muy grandes
-        if tamano_mb > 50:
-            print("⚠️  ADVERTENCIA: Archivo muy grande (>50 MB)")
-            print("   Se recomienda extraer pocas páginas a la vez.")
-        
+
+        import PyPDF2
         with open(archivo_entrada, 'rb') as archivo_pdf:
             lector = PyPDF2.PdfReader(archivo_pdf)
-            
+
             # Verificar si está cifrado
             if lector.is_encrypted:
                 print("🔒 El PDF está protegido con contraseña.")
-            
+                password = input("Ingresa la contraseña (o Enter si no tiene): ").strip() or None
+                if not lector.decrypt(password or ""):
+                    print("❌ Contraseña incorrecta.")
+                    return
+
             total_paginas = len(lector.pages)
-            print(f"� Total de páginas: {total_paginas}")
-            
-            # Advertencia para PDFs con muchas páginas
-            if total_paginas > 1000:
-                print("⚠️  ADVERTENCIA: PDF con muchas páginas (>1000)")
-                print("   Se recomienda extraer en lotes pequeños.")
-                
+            print(f"📚 Total de páginas: {total_paginas}")
+
     except Exception as e:
         print(f"❌ Error al leer el PDF: {e}")
         return
-    
+
     # Solicitar páginas a extraer
     while True:
         try:
             entrada_paginas = input(f"\n📝 Ingresa las páginas a extraer (1-{total_paginas})\n"
                                   "   Ejemplos: '1,3,5' o '1-5' o '1-3,7,10-12': ").strip()
-            
+
             if entrada_paginas.lower() == 'salir':
                 print("❌ Operación cancelada.")
                 return
-                
+
             paginas_seleccionadas = parsear_rangos_paginas(entrada_paginas, total_paginas)
             if paginas_seleccionadas:
                 break
         except KeyboardInterrupt:
             print("\n❌ Operación cancelada.")
             return
-    
+
     # Solicitar nombre del archivo de salida
     archivo_salida = input("\n💾 Nombre del archivo de salida (ej: 'paginas_extraidas.pdf'): ").strip()
     if not archivo_salida:
         archivo_salida = 'paginas_extraidas.pdf'
     if not archivo_salida.lower().endswith('.pdf'):
         archivo_salida += '.pdf'
-    
+
+    # Dividir en varios archivos (opcional)
+    por_archivo = input("📦 Páginas por archivo (Enter = todo en un archivo): ").strip()
+    por_archivo = int(por_archivo) if por_archivo.isdigit() and int(por_archivo) > 0 else None
+
     # Extraer las páginas
-    extraer_paginas_pdf(archivo_entrada, archivo_salida, paginas_seleccionadas)
+    extraer_paginas_pdf(archivo_entrada, archivo_salida, paginas_seleccionadas,
+                        por_archivo, password)
 
-def parsear_rangos_paginas(entrada, max_paginas):
+def parsear_rangos_paginas(entrada, max_paginas=None):
     """
     Parsea una entrada de rangos de páginas como '1,3,5-7,10'.
-    
+    Los rangos no se expanden: se devuelven fusionados y ordenados.
+
     :param entrada: String con los rangos de páginas
-    :param max_paginas: Número máximo de páginas disponibles
-    :return: Lista de números de página
+    :param max_paginas: Número máximo de páginas disponibles (None = sin comprobar)
+    :return: RangosPaginas, o None si la entrada no es válida
     """
-    paginas = []
+    rangos = []
     try:
         # Dividir por comas
-        partes = entrada.split(',')
-        for parte in partes:
+        for parte in entrada.split(','):
             parte = parte.strip()
+            if not parte:
+                continue
             if '-' in parte:
                 # Es un rango
                 rango_partes = parte.split('-')
                 if len(rango_partes) != 2:
                     print(f"❌ Formato de rango inválido: {parte}")
                     return None
-                    
                 inicio, fin = int(rango_partes[0].strip()), int(rango_partes[1].strip())
-                if inicio < 1 or fin > max_paginas or inicio > fin:
-                    print(f"❌ Rango inválido: {inicio}-{fin}")
-                    return None
-                    
-                # Verificar que el rango no sea excesivamente grande
-                if fin - inicio > 200:
-                    print(f"⚠️ Rango muy grande: {inicio}-{fin} ({fin-inicio+1} páginas)")
-                    respuesta = input("¿Continuar? (s/n): ").strip().lower()
-                    if respuesta != 's':
-                        return None
-                        
-                paginas.extend(range(inicio, fin + 1))
             else:
                 # Es un número individual
-                num = int(parte.strip())
-                if num < 1 or num > max_paginas:
-                    print(f"❌ Página fuera de rango: {num}")
-                    return None
-                paginas.append(num)
-        
-        # Remover duplicados y ordenar
-        paginas = sorted(list(set(paginas)))
-        
-        # Verificar límite total de páginas a extraer
-        if len(paginas) > 100:
-            print(f"⚠️ Vas a extraer {len(paginas)} páginas.")
-            print("   Para PDFs grandes, esto podría causar problemas de memoria.")
-            respuesta = input("¿Continuar de todas formas? (s/n): ").strip().lower()
-            if respuesta != 's':
+                inicio = fin = int(parte)
+
+            if inicio < 1 or inicio > fin or (max_paginas is not None and fin > max_paginas):
+                if inicio == fin:
+                    print(f"❌ Página fuera de rango: {inicio}")
+                else:
+                    print(f"❌ Rango inválido: {inicio}-{fin}")
                 return None
-        
-        print(f"✅ Páginas seleccionadas: {len(paginas)} páginas")
-        if len(paginas) <= 20:
-            print(f"   Páginas: {paginas}")
-        else:
-            print(f"   Páginas: {paginas[:10]}...{paginas[-5:]}")
-        return paginas
-        
+            rangos.append((inicio, fin))
+
     except ValueError:
         print("❌ Formato inválido. Usa: '1,3,5-7,10'")
         return None
 
+    paginas = RangosPaginas(rangos)
+    if not paginas:
+        print("❌ No se indicó ninguna página.")
+        return None
+
+    print(f"✅ Páginas seleccionadas: {len(paginas)} páginas ({paginas})")
+    return paginas
+
 # --- Ejecutar el Programa ---
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()